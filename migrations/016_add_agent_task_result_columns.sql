@@ -0,0 +1,30 @@
+-- Promote result-filtering fields out of the agent_tasks trace JSON so task
+-- listings can filter and paginate in SQL instead of decoding every trace.
+ALTER TABLE agent_tasks ADD COLUMN IF NOT EXISTS mcp_capability TEXT;
+ALTER TABLE agent_tasks ADD COLUMN IF NOT EXISTS has_result BOOLEAN DEFAULT FALSE;
+ALTER TABLE agent_tasks ADD COLUMN IF NOT EXISTS result_cid TEXT;
+
+UPDATE agent_tasks
+SET
+  mcp_capability = NULLIF(json_extract_string(last_update, '$.mcp_capability'), ''),
+  has_result = status = 'completed' AND (
+    coalesce(json_type(last_update, '$.mcp_result_envelope'), 'NULL') <> 'NULL'
+    OR coalesce(json_type(last_update, '$.mcp_result_preview'), 'NULL') <> 'NULL'
+    OR coalesce(json_type(last_update, '$.mcp_result_output'), 'NULL') <> 'NULL'
+  ),
+  result_cid = coalesce(
+    NULLIF(json_extract_string(last_update, '$.mcp_cid'), ''),
+    NULLIF(json_extract_string(last_update, '$.mcp_result_envelope.structured_output.cid'), ''),
+    NULLIF(json_extract_string(last_update, '$.mcp_result_output.cid'), ''),
+    NULLIF(json_extract_string(last_update, '$.mcp_result_envelope.artifact_refs.result_cid'), '')
+  )
+WHERE last_update IS NOT NULL AND json_valid(last_update);
+
+CREATE INDEX IF NOT EXISTS idx_agent_tasks_user_updated
+  ON agent_tasks(user_id, updated_at DESC, id);
+
+CREATE INDEX IF NOT EXISTS idx_agent_tasks_user_capability_result
+  ON agent_tasks(user_id, mcp_capability, has_result, updated_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_agent_tasks_result_cid
+  ON agent_tasks(user_id, result_cid);
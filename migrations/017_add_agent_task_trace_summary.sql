@@ -0,0 +1,5 @@
+-- Split agent_tasks traces into a compact hot summary used by list views and the
+-- full trace blob in last_update, which is only read for detail views.
+-- Rows written before this migration keep a NULL summary; readers derive it from
+-- last_update until the task is next updated.
+ALTER TABLE agent_tasks ADD COLUMN IF NOT EXISTS trace_summary TEXT;
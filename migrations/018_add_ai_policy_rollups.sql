@@ -0,0 +1,59 @@
+-- Pre-aggregated ai.execute.* action-log counts backing the AI backend-policy
+-- reports: one row per user, minute bucket, action, capability, outcome and
+-- policy remap. Rows are upserted as AI actions are logged (see
+-- handsfree.db.ai_policy_rollups); this migration backfills existing logs.
+CREATE TABLE IF NOT EXISTS ai_policy_rollups (
+    user_id TEXT NOT NULL,
+    bucket_start TIMESTAMPTZ NOT NULL,
+    action_type TEXT NOT NULL,
+    capability_id TEXT NOT NULL,
+    ok BOOLEAN NOT NULL,
+    policy_applied BOOLEAN NOT NULL,
+    requested_workflow TEXT NOT NULL,
+    resolved_workflow TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (
+        user_id, bucket_start, action_type, capability_id, ok, policy_applied,
+        requested_workflow, resolved_workflow
+    )
+);
+
+INSERT INTO ai_policy_rollups
+SELECT user_id, bucket_start, action_type, capability_id, ok, policy_applied,
+       requested_workflow, resolved_workflow, COUNT(*)
+FROM (
+    SELECT
+        user_id,
+        bucket_start,
+        action_type,
+        capability_id,
+        ok,
+        policy_applied,
+        CASE WHEN policy_applied THEN COALESCE(NULLIF(requested, ''), 'unknown') ELSE '' END
+            AS requested_workflow,
+        CASE WHEN policy_applied THEN COALESCE(NULLIF(resolved, ''), 'unknown') ELSE '' END
+            AS resolved_workflow
+    FROM (
+        SELECT
+            CAST(user_id AS TEXT) AS user_id,
+            date_trunc('minute', created_at) AS bucket_start,
+            action_type,
+            CASE
+                WHEN json_type(result, '$.capability_id') = 'VARCHAR'
+                     AND json_extract_string(result, '$.capability_id') <> ''
+                THEN json_extract_string(result, '$.capability_id')
+                ELSE substr(action_type, 12)
+            END AS capability_id,
+            ok,
+            COALESCE(
+                TRY_CAST(json_extract(result, '$.policy_resolution.policy_applied') AS BOOLEAN),
+                FALSE
+            ) AS policy_applied,
+            json_extract_string(result, '$.policy_resolution.requested_workflow') AS requested,
+            json_extract_string(result, '$.policy_resolution.resolved_workflow') AS resolved
+        FROM action_logs
+        WHERE action_type LIKE 'ai.execute.%'
+    ) AS logged
+)
+GROUP BY ALL
+ON CONFLICT DO NOTHING;
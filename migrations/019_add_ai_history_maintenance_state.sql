@@ -0,0 +1,11 @@
+-- Progress of background ai_history_index maintenance jobs (see
+-- handsfree.db.ai_history_index). The one-time action-log backfill records
+-- its (created_at, id) cursor here so it resumes in bounded batches and
+-- marks itself complete once every action log has been scanned.
+CREATE TABLE IF NOT EXISTS ai_history_maintenance_state (
+  name              TEXT PRIMARY KEY,
+  cursor_created_at TIMESTAMPTZ,
+  cursor_id         TEXT,
+  completed_at      TIMESTAMPTZ,
+  updated_at        TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,44 @@
+-- Recompute the compact trace summary from the trace blob for every row, so rows
+-- written before 017 (and rows holding earlier, larger summaries) are served from
+-- trace_summary without reading last_update. Mirrors summarize_agent_task_trace in
+-- handsfree.db.agent_tasks: non-null scalars only, text truncated to 280 characters.
+CREATE OR REPLACE TEMP MACRO trace_summary_scalar(doc, path) AS
+    CASE
+        WHEN json_type(doc, path) = 'VARCHAR' THEN to_json(left(json_extract_string(doc, path), 280))
+        WHEN json_type(doc, path) IN ('BIGINT', 'UBIGINT', 'DOUBLE', 'BOOLEAN')
+            THEN json_extract(doc, path)
+    END;
+
+UPDATE agent_tasks
+SET trace_summary = NULLIF(
+    json_merge_patch('{}', json_object(
+        'provider_label', trace_summary_scalar(last_update, '$.provider_label'),
+        'pr_url', trace_summary_scalar(last_update, '$.pr_url'),
+        'mcp_capability', trace_summary_scalar(last_update, '$.mcp_capability'),
+        'mcp_cid', trace_summary_scalar(last_update, '$.mcp_cid'),
+        'mcp_seed_url', trace_summary_scalar(last_update, '$.mcp_seed_url'),
+        'mcp_pin_action', trace_summary_scalar(last_update, '$.mcp_pin_action'),
+        'mcp_result_preview', trace_summary_scalar(last_update, '$.mcp_result_preview'),
+        'mcp_started_at', trace_summary_scalar(last_update, '$.mcp_started_at'),
+        'mcp_timeout_s', trace_summary_scalar(last_update, '$.mcp_timeout_s'),
+        'mcp_poll_interval_s', trace_summary_scalar(last_update, '$.mcp_poll_interval_s'),
+        'mcp_result_envelope', NULLIF(json_merge_patch('{}', json_object(
+            'summary', trace_summary_scalar(last_update, '$.mcp_result_envelope.summary'),
+            'status', trace_summary_scalar(last_update, '$.mcp_result_envelope.status'),
+            'execution_mode',
+                trace_summary_scalar(last_update, '$.mcp_result_envelope.execution_mode'),
+            'preferred_execution_mode',
+                trace_summary_scalar(last_update, '$.mcp_result_envelope.preferred_execution_mode')
+        )), '{}'),
+        'mcp_result_output', NULLIF(json_merge_patch('{}', json_object(
+            'status', trace_summary_scalar(last_update, '$.mcp_result_output.status'),
+            'message', trace_summary_scalar(last_update, '$.mcp_result_output.message'),
+            'cid', trace_summary_scalar(last_update, '$.mcp_result_output.cid')
+        )), '{}'),
+        'mcp_result_cid', to_json(result_cid)
+    )),
+    '{}'
+)
+WHERE last_update IS NOT NULL AND json_valid(last_update);
+
+DROP MACRO IF EXISTS trace_summary_scalar;
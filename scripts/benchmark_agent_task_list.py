@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark agent task listings with and without the full trace blob.
+
+Seeds an in-memory database with tasks carrying MCP result envelopes, then
+times the normalized task listing page (query plus serialization) when every
+row's trace is decoded versus when only the hot ``trace_summary`` is read.
+
+Usage:
+    python scripts/benchmark_agent_task_list.py [--tasks N] [--payload-rows N] [--pages N]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src to path so we can import handsfree
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from handsfree.api import _apply_task_result_view, _serialize_agent_task
+from handsfree.db import init_db
+from handsfree.db.agent_tasks import create_agent_task, get_agent_tasks, update_agent_task_state
+
+USER_ID = "12345678-1234-1234-1234-123456789012"
+
+
+def seed(conn, tasks: int, payload_rows: int) -> None:
+    """Create completed tasks whose traces hold sizeable MCP result payloads."""
+    rows = [{"id": i, "title": f"dataset {i}", "score": i / 7} for i in range(payload_rows)]
+    for i in range(tasks):
+        task = create_agent_task(
+            conn=conn,
+            user_id=USER_ID,
+            provider="ipfs_datasets_mcp",
+            instruction=f"Find datasets {i}",
+            trace={"mcp_capability": "dataset_discovery", "mcp_request_payload": {"q": i}},
+        )
+        update_agent_task_state(conn, task.id, "running")
+        update_agent_task_state(
+            conn,
+            task.id,
+            "completed",
+            trace_update={
+                "mcp_cid": f"bafy{i:08d}",
+                "mcp_result_output": {"message": "ok", "rows": rows},
+                "mcp_result_envelope": {
+                    "summary": f"Found {payload_rows} datasets",
+                    "status": "completed",
+                    "execution_mode": "direct_import",
+                    "structured_output": {
+                        "message": "ok",
+                        "expanded_queries": [f"datasets {i}"],
+                        "rows": rows,
+                    },
+                    "raw_response": {"rows": rows},
+                },
+            },
+        )
+
+
+def list_page(conn, include_trace: bool, limit: int) -> list[dict]:
+    tasks = get_agent_tasks(conn=conn, user_id=USER_ID, limit=limit, include_trace=include_trace)
+    return [
+        _apply_task_result_view(
+            _serialize_agent_task(task, trace=None if include_trace else task.trace_summary or {}),
+            "normalized",
+        )
+        for task in tasks
+    ]
+
+
+def measure(conn, include_trace: bool, limit: int, pages: int) -> tuple[float, float]:
+    """Return (median milliseconds per page, peak MiB allocated for one page)."""
+    list_page(conn, include_trace, limit)
+    timings = []
+    for _ in range(pages):
+        started = time.perf_counter()
+        list_page(conn, include_trace, limit)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    list_page(conn, include_trace, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / (1024 * 1024)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark agent task list trace loading")
+    parser.add_argument("--tasks", type=int, default=500, help="Tasks to seed (default: 500)")
+    parser.add_argument(
+        "--payload-rows",
+        type=int,
+        default=200,
+        help="Rows per MCP result payload (default: 200)",
+    )
+    parser.add_argument("--limit", type=int, default=100, help="Page size (default: 100)")
+    parser.add_argument("--pages", type=int, default=20, help="Timed pages (default: 20)")
+    args = parser.parse_args()
+
+    conn = init_db(":memory:")
+    seed(conn, args.tasks, args.payload_rows)
+
+    full_ms, full_mib = measure(conn, True, args.limit, args.pages)
+    hot_ms, hot_mib = measure(conn, False, args.limit, args.pages)
+    conn.close()
+
+    print(f"tasks={args.tasks} payload_rows={args.payload_rows} limit={args.limit}")
+    print(f"{'mode':<16}{'median ms':>12}{'peak MiB':>12}")
+    print(f"{'full trace':<16}{full_ms:>12.2f}{full_mib:>12.2f}")
+    print(f"{'trace summary':<16}{hot_ms:>12.2f}{hot_mib:>12.2f}")
+    print(f"speedup x{full_ms / hot_ms:.1f}, memory x{full_mib / max(hot_mib, 1e-9):.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark pipelined composite AI capabilities.
+
+Runs the failure-explanation composite against stub backends that sleep for
+configurable latencies (GitHub checks, embeddings, retrieval, generation,
+IPFS persistence) and reports median end-to-end latency next to the
+sequential cost, i.e. the sum of every backend call the composite makes.
+
+Usage:
+    python scripts/benchmark_composite_pipeline.py [--runs N] [--github-ms N]
+        [--embed-ms N] [--generate-ms N] [--persist-ms N]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path so we can import handsfree
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import handsfree.ai.capabilities as capabilities
+from handsfree.ai.capabilities import execute_ai_capability
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipelined composite capabilities")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs (default: 20)")
+    parser.add_argument("--github-ms", type=float, default=40, help="Checks fetch (default: 40)")
+    parser.add_argument("--embed-ms", type=float, default=30, help="Embedding call (default: 30)")
+    parser.add_argument(
+        "--generate-ms", type=float, default=120, help="Generation call (default: 120)"
+    )
+    parser.add_argument("--persist-ms", type=float, default=20, help="IPFS add (default: 20)")
+    args = parser.parse_args()
+
+    def sleep_ms(value: float) -> None:
+        time.sleep(value / 1000)
+
+    class GitHubProvider:
+        def get_pr_checks(self, repo, pr_number):
+            sleep_ms(args.github_ms)
+            return [{"name": "ci", "status": "completed", "conclusion": "failure"}]
+
+    class EmbeddingsRouter:
+        def embed_text(self, text, **kwargs):
+            sleep_ms(args.embed_ms)
+            return [1.0, 0.0]
+
+        def embed_texts(self, texts, **kwargs):
+            sleep_ms(args.embed_ms)
+            return [[1.0, 0.0] for _ in texts]
+
+    class LLMRouter:
+        def generate_text(self, prompt, **kwargs):
+            sleep_ms(args.generate_ms)
+            return "The test job failed on a flaky fixture."
+
+    class IPFSRouter:
+        def add_bytes(self, data, **kwargs):
+            sleep_ms(args.persist_ms)
+            return "bafy-benchmark"
+
+    capabilities.get_embeddings_router = EmbeddingsRouter
+    capabilities.get_llm_router = LLMRouter
+    capabilities.get_ipfs_router = IPFSRouter
+
+    # Checks; then checks embedding and retrieval embedding alongside each other;
+    # then generation and persistence.
+    sequential_ms = args.github_ms + 2 * args.embed_ms + args.generate_ms + args.persist_ms
+    timings = []
+    last = None
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        last = execute_ai_capability(
+            "github.check.failure_rag_explain",
+            pr_number=7,
+            repo="octo/repo",
+            github_provider=GitHubProvider(),
+            history_candidates=[{"summary": "Earlier flaky fixture failure", "pr_number": 3}],
+            persist_output=True,
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+
+    print(f"runs={args.runs} sequential={sequential_ms:.1f}ms")
+    print(f"pipelined median={statistics.median(timings):.1f}ms")
+    for name, value in last.output["trace"]["timings_ms"].items():
+        print(f"  {name}: {value:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark the failure similarity index against exact search.
+
+Builds a ``FailureVectorIndex`` over clustered synthetic embeddings (standing
+in for embedded CI failure summaries), trains its IVF layout, and reports the
+median per-query latency and recall@k of IVF search at several ``nprobe``
+values relative to exact search over the same vectors.
+
+Usage:
+    python scripts/benchmark_failure_index.py [--count N] [--dimensions N]
+        [--top-k N] [--queries N] [--noise F] [--nprobe 1,4,8,32]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path so we can import handsfree
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from handsfree.ai.failure_index import FailureVectorIndex
+from handsfree.ai.ranking import NUMPY_AVAILABLE
+
+
+def clustered_vectors(count: int, dimensions: int, clusters: int, noise: float, rng: random.Random):
+    centers = [[rng.gauss(0, 1) for _ in range(dimensions)] for _ in range(clusters)]
+    return [
+        [value + rng.gauss(0, noise) for value in centers[rng.randrange(clusters)]]
+        for _ in range(count)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark IVF vs exact failure search")
+    parser.add_argument("--count", type=int, default=50000, help="Indexed vectors (default: 50000)")
+    parser.add_argument("--dimensions", type=int, default=384, help="Vector size (default: 384)")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query (default: 10)")
+    parser.add_argument("--queries", type=int, default=50, help="Timed queries (default: 50)")
+    parser.add_argument(
+        "--noise", type=float, default=2.0, help="Per-dimension cluster spread (default: 2.0)"
+    )
+    parser.add_argument(
+        "--nprobe", default="1,4,8,32", help="Comma-separated nprobe values (default: 1,4,8,32)"
+    )
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("numpy is required for the IVF layout; install the 'vector' extra", file=sys.stderr)
+        return 1
+
+    rng = random.Random(0)
+    vectors = clustered_vectors(args.count + args.queries, args.dimensions, 256, args.noise, rng)
+    vectors, queries = vectors[: args.count], vectors[args.count :]
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = FailureVectorIndex(directory)
+        started = time.perf_counter()
+        for position, vector in enumerate(vectors):
+            index.add(f"cid-{position}", {"summary": str(position)}, vector)
+        build_s = time.perf_counter() - started
+        started = time.perf_counter()
+        index.train()
+        train_s = time.perf_counter() - started
+        print(
+            f"count={args.count} dimensions={args.dimensions} top_k={args.top_k} "
+            f"nlist={len(index._lists)} build={build_s:.1f}s train={train_s:.1f}s"
+        )
+
+        def run(exact: bool):
+            timings, results = [], []
+            for query in queries:
+                started = time.perf_counter()
+                results.append(index.search(query, args.top_k, exact=exact))
+                timings.append((time.perf_counter() - started) * 1000)
+            return statistics.median(timings), results
+
+        exact_ms, exact_results = run(exact=True)
+        print(f"{'mode':>10}{'median ms':>12}{'recall@k':>10}")
+        print(f"{'exact':>10}{exact_ms:>12.2f}{1.0:>10.3f}")
+        for nprobe in (int(value) for value in args.nprobe.split(",")):
+            index.nprobe = nprobe
+            ivf_ms, ivf_results = run(exact=False)
+            hits = sum(
+                len({cid for cid, _ in expected} & {cid for cid, _ in actual})
+                for expected, actual in zip(exact_results, ivf_results, strict=True)
+            )
+            recall = hits / (args.top_k * len(queries))
+            print(f"{f'nprobe={nprobe}':>10}{ivf_ms:>12.2f}{recall:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
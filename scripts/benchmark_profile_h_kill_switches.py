@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark the Profile H kill-switch hot path.
+
+Compares the per-request ``KillSwitches.allows_new_work`` check, which only
+stats the control file and reuses the published snapshot, against re-reading
+and parsing the file on every call (the previous behaviour), and against the
+bounded-staleness mode that skips the stat between checks. Also reports
+the cost of the first check after an operator pause, which reloads the file.
+
+Usage:
+    python scripts/benchmark_profile_h_kill_switches.py [--calls N] [--sellers N]
+        [--max-staleness-ms N]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path so we can import mcplusplus_profile_h
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mcplusplus_profile_h import KillSwitches
+
+
+def per_call_us(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) * 1_000_000 / calls
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the kill-switch hot path")
+    parser.add_argument("--calls", type=int, default=20_000, help="Checks (default: 20000)")
+    parser.add_argument("--sellers", type=int, default=3, help="Configured sellers (default: 3)")
+    parser.add_argument(
+        "--max-staleness-ms", type=int, default=100, help="Bounded-staleness mode (default: 100)"
+    )
+    args = parser.parse_args()
+
+    sellers = {f"seller-{index}" for index in range(args.sellers)}
+    seller = min(sellers)
+    with tempfile.TemporaryDirectory(prefix="profile-h-controls-") as directory:
+        path = Path(directory) / "kill-switches.json"
+        controls = KillSwitches(path, sellers=sellers)
+        operator = KillSwitches(path, sellers=sellers)
+
+        def reparse() -> bool:
+            state = controls._read()
+            return not state["globalPaused"] and not state["sellers"][seller]
+
+        cached = per_call_us(lambda: controls.allows_new_work(seller), args.calls)
+        bounded = KillSwitches(path, sellers=sellers, max_staleness_ms=args.max_staleness_ms)
+        stale_ok = per_call_us(lambda: bounded.allows_new_work(seller), args.calls)
+        uncached = per_call_us(reparse, args.calls)
+
+        reloads = max(1, args.calls // 100)
+        reload_seconds = 0.0
+        for index in range(reloads):
+            operator.set_pause(paused=bool(index % 2), seller=seller)
+            check_started = time.perf_counter()
+            controls.allows_new_work(seller)
+            reload_seconds += time.perf_counter() - check_started
+        reload_us = reload_seconds * 1_000_000 / reloads
+
+    print(f"calls: {args.calls}, sellers: {args.sellers}")
+    print(f"allows_new_work (snapshot):    {cached:8.2f} us/call")
+    print(f"  with max_staleness_ms={args.max_staleness_ms}: {stale_ok:6.2f} us/call")
+    print(f"read + parse every call:       {uncached:8.2f} us/call")
+    print(f"first check after a change:    {reload_us:8.2f} us/call")
+    print(f"speedup: {uncached / cached:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
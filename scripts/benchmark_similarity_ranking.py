@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark pure-Python and NumPy similarity ranking.
+
+Ranks random embeddings against a random query with both implementations in
+``handsfree.ai.ranking`` across candidate counts and reports the median time
+per ranking call.
+
+Usage:
+    python scripts/benchmark_similarity_ranking.py [--dimensions N] [--top-k N]
+        [--counts 100,1000,5000] [--repeat N]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+# Add src to path so we can import handsfree
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from handsfree.ai.ranking import (
+    NUMPY_AVAILABLE,
+    rank_by_similarity_numpy,
+    rank_by_similarity_python,
+)
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark similarity ranking paths")
+    parser.add_argument("--dimensions", type=int, default=768, help="Vector size (default: 768)")
+    parser.add_argument("--top-k", type=int, default=10, help="Results to keep (default: 10)")
+    parser.add_argument(
+        "--counts",
+        default="16,100,1000,5000",
+        help="Comma-separated candidate counts (default: 16,100,1000,5000)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (default: 5)")
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("numpy is not installed; only the pure-Python path can run", file=sys.stderr)
+
+    rng = random.Random(0)
+    query = [rng.uniform(-1, 1) for _ in range(args.dimensions)]
+    print(f"dimensions={args.dimensions} top_k={args.top_k}")
+    print(f"{'candidates':>10}{'python ms':>12}{'numpy ms':>12}{'speedup':>10}")
+    for count in (int(value) for value in args.counts.split(",")):
+        candidates = [[rng.uniform(-1, 1) for _ in range(args.dimensions)] for _ in range(count)]
+        python_ms = median_ms(
+            partial(rank_by_similarity_python, query, candidates, args.top_k), args.repeat
+        )
+        if NUMPY_AVAILABLE:
+            numpy_ms = median_ms(
+                partial(rank_by_similarity_numpy, query, candidates, args.top_k), args.repeat
+            )
+            print(f"{count:>10}{python_ms:>12.2f}{numpy_ms:>12.2f}{python_ms / numpy_ms:>9.1f}x")
+        else:
+            print(f"{count:>10}{python_ms:>12.2f}{'-':>12}{'-':>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,7 @@ from handsfree.cli.executor import CLIExecutor
 from handsfree.commands.profiles import Profile, ProfileConfig
 from handsfree.config import get_meta_glasses_display_widget_config
 from handsfree.db.agent_tasks import AgentTask
+from handsfree.file_tail import read_json_record, read_jsonl_records
 from handsfree.ipfs_datasets_routers import get_embeddings_router
 from handsfree.ipfs_kit_adapters import get_ipfs_kit_adapter
 from handsfree.mcp import (
@@ -1821,28 +1822,11 @@ def _virtual_ai_os_todo_daemon_default_paths() -> dict[str, str] | None:
 
 
 def _load_json_record(path: str) -> dict[str, Any]:
-    payload = json.loads(Path(path).read_text(encoding="utf-8"))
-    return payload if isinstance(payload, dict) else {}
+    return read_json_record(path)
 
 
 def _load_jsonl_records(path: str | None) -> list[dict[str, Any]]:
-    if not path:
-        return []
-    file_path = Path(path)
-    if not file_path.exists():
-        return []
-    events: list[dict[str, Any]] = []
-    for raw_line in file_path.read_text(encoding="utf-8").splitlines():
-        raw_line = raw_line.strip()
-        if not raw_line:
-            continue
-        try:
-            payload = json.loads(raw_line)
-        except json.JSONDecodeError:
-            continue
-        if isinstance(payload, dict):
-            events.append(payload)
-    return events
+    return read_jsonl_records(path)
 
 
 def _todo_daemon_task_title(
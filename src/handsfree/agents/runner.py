@@ -4,11 +4,9 @@ Provides a minimal runner loop that can transition tasks through states.
 Guarded by HANDSFREE_AGENT_RUNNER_ENABLED environment variable.
 """
 
-import json
 import logging
 import os
 import time
-import uuid
 from datetime import UTC, datetime
 from typing import Any
 
@@ -227,7 +225,7 @@ def simulate_progress_update(
     """Simulate a progress update for a running task.
 
     Updates the task trace with progress information without changing state.
-    Since we can't transition running->running, we directly update the trace field.
+    Since we can't transition running->running, only the trace is updated.
 
     Args:
         conn: Database connection.
@@ -242,30 +240,18 @@ def simulate_progress_update(
         if not task or task.state != "running":
             return False
 
-        # Update trace directly without changing state
-        # Merge new progress info with existing trace
-        updated_trace = task.trace or {}
-        updated_trace.update(
+        # Merge new progress info into the trace without changing state; the
+        # helper also refreshes the hot summary and derived result columns.
+        updated = update_agent_task_trace(
+            conn,
+            task_id,
             {
                 "last_progress_at": datetime.now(UTC).isoformat(),
                 "progress": progress_message,
-            }
+            },
         )
-
-        # Update the database directly since we're not changing state
-        try:
-            task_uuid = uuid.UUID(task_id)
-        except ValueError:
+        if updated is None:
             return False
-
-        conn.execute(
-            """
-            UPDATE agent_tasks
-            SET last_update = ?, updated_at = ?
-            WHERE id = ?
-            """,
-            [json.dumps(updated_trace), datetime.now(UTC), task_uuid],
-        )
         return True
     except Exception as e:
         logger.error("Failed to simulate progress for task %s: %s", task_id, e)
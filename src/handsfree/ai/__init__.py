@@ -1,5 +1,6 @@
 """Shared AI capability registry for CLI and ipfs_datasets_py backends."""
 
+from .batch import AIRequestBatchGroup, execute_ai_requests, plan_ai_request_batch
 from .capabilities import (
     execute_ai_capability,
     execute_ai_request,
@@ -67,6 +68,7 @@ __all__ = [
     "AICapabilitySpec",
     "AIBackendFamily",
     "AIBackendPolicy",
+    "AIRequestBatchGroup",
     "AIExecutionMode",
     "AIRequestContext",
     "CapabilityConfirmationPolicy",
@@ -87,11 +89,13 @@ __all__ = [
     "discover_failure_history_cids",
     "execute_ai_capability",
     "execute_ai_request",
+    "execute_ai_requests",
     "get_ai_backend_policy",
     "get_ai_capability",
     "get_virtual_ai_os_capability",
     "list_ai_capabilities",
     "list_virtual_ai_os_capabilities",
+    "plan_ai_request_batch",
     "resolve_policy_workflow",
     "default_virtual_ai_os_runtime_surface",
     "resolve_virtual_ai_os_runtime_placement",
@@ -0,0 +1,189 @@
+"""Batched execution of typed AI capability requests.
+
+Clients that need several capabilities at once can submit them together.
+:func:`plan_ai_request_batch` splits a batch into :class:`AIRequestBatchGroup`
+objects: compatible embedding requests (``ipfs.embeddings.embed_text`` and
+``ipfs.embeddings.embed_texts`` with the same ``embedding_options``) are
+coalesced into a single ``embed_texts`` backend call, and every other request
+forms its own group.  Groups are independent, so :func:`execute_ai_requests`
+runs them concurrently and returns one result or exception per request, in
+request order.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from handsfree.cli import CLIExecutor
+from handsfree.commands.profiles import ProfileConfig
+
+from .capabilities import execute_ai_request, get_ai_capability
+from .models import AIBackendFamily, AICapabilityRequest, AICapabilityResult, AIExecutionMode
+
+DEFAULT_MAX_WORKERS = 4
+
+_EMBED_TEXT = "ipfs.embeddings.embed_text"
+_EMBED_TEXTS = "ipfs.embeddings.embed_texts"
+
+BatchItemResult = AICapabilityResult | Exception
+
+
+@dataclass(frozen=True)
+class AIRequestBatchGroup:
+    """Requests from one batch that execute as a single backend call."""
+
+    indexes: tuple[int, ...]
+    requests: tuple[AICapabilityRequest, ...]
+    backend_family: str
+
+    @property
+    def coalesced(self) -> bool:
+        return len(self.requests) > 1
+
+    def execute(
+        self,
+        *,
+        cli_executor: CLIExecutor | None = None,
+        profile_config: ProfileConfig | None = None,
+    ) -> list[BatchItemResult]:
+        """Execute the group, returning one result or exception per request."""
+        if not self.coalesced:
+            try:
+                return [
+                    execute_ai_request(
+                        self.requests[0],
+                        cli_executor=cli_executor,
+                        profile_config=profile_config,
+                    )
+                ]
+            except Exception as exc:
+                return [exc]
+        return self._execute_coalesced_embeddings(profile_config)
+
+    def _execute_coalesced_embeddings(
+        self, profile_config: ProfileConfig | None
+    ) -> list[BatchItemResult]:
+        texts: list[str] = []
+        spans: list[tuple[int, int]] = []
+        for request in self.requests:
+            item_texts = _embedding_texts(request)
+            spans.append((len(texts), len(texts) + len(item_texts)))
+            texts.extend(item_texts)
+        merged = AICapabilityRequest(
+            capability_id=_EMBED_TEXTS,
+            inputs={"texts": texts},
+            options={"embedding_options": _embedding_options(self.requests[0])},
+        )
+        try:
+            vectors = execute_ai_request(merged, profile_config=profile_config).output
+        except Exception as exc:
+            return [exc] * len(self.requests)
+
+        results: list[BatchItemResult] = []
+        for request, (start, end) in zip(self.requests, spans, strict=True):
+            output = vectors[start] if request.capability_id == _EMBED_TEXT else vectors[start:end]
+            results.append(
+                AICapabilityResult(
+                    capability_id=request.capability_id,
+                    backend_family=AIBackendFamily.IPFS_EMBEDDINGS_ROUTER,
+                    execution_mode=AIExecutionMode.DIRECT_IMPORT,
+                    ok=True,
+                    output=output,
+                    trace={
+                        "provider": AIBackendFamily.IPFS_EMBEDDINGS_ROUTER.value,
+                        "operation": "embed_texts",
+                        "coalesced_requests": len(self.requests),
+                        "coalesced_texts": len(texts),
+                    },
+                )
+            )
+        return results
+
+
+def _embedding_texts(request: AICapabilityRequest) -> list[str] | None:
+    merged = {**request.inputs, **request.options}
+    if request.capability_id == _EMBED_TEXT and isinstance(merged.get("text"), str):
+        return [merged["text"]]
+    if request.capability_id == _EMBED_TEXTS and isinstance(merged.get("texts"), list):
+        texts = merged["texts"]
+        if all(isinstance(text, str) for text in texts):
+            return list(texts)
+    return None
+
+
+def _embedding_options(request: AICapabilityRequest) -> dict[str, Any]:
+    merged = {**request.inputs, **request.options}
+    return dict(merged.get("embedding_options") or {})
+
+
+def _backend_family(request: AICapabilityRequest) -> str:
+    try:
+        return get_ai_capability(request.capability_id).backend_family.value
+    except KeyError:
+        return "unknown"
+
+
+def plan_ai_request_batch(requests: list[AICapabilityRequest]) -> list[AIRequestBatchGroup]:
+    """Group ``requests`` so compatible embedding requests share one backend call.
+
+    Groups are ordered by the position of their first request.
+    """
+    buckets: dict[Any, list[int]] = {}
+    for index, request in enumerate(requests):
+        key: Any = index
+        if _embedding_texts(request) is not None:
+            try:
+                options_key = json.dumps(_embedding_options(request), sort_keys=True)
+            except (TypeError, ValueError):
+                options_key = None
+            if options_key is not None:
+                key = (_EMBED_TEXTS, options_key)
+        buckets.setdefault(key, []).append(index)
+
+    return [
+        AIRequestBatchGroup(
+            indexes=tuple(indexes),
+            requests=tuple(requests[index] for index in indexes),
+            backend_family=_backend_family(requests[indexes[0]]),
+        )
+        for indexes in buckets.values()
+    ]
+
+
+def execute_ai_requests(
+    requests: list[AICapabilityRequest],
+    *,
+    cli_executor: CLIExecutor | None = None,
+    profile_config: ProfileConfig | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[BatchItemResult]:
+    """Execute a batch of AI requests, coalescing compatible ones.
+
+    Independent groups run concurrently.  A failing request yields its
+    exception in its slot and does not affect the rest of the batch.
+    """
+    groups = plan_ai_request_batch(requests)
+    results: list[BatchItemResult | None] = [None] * len(requests)
+
+    def run(group: AIRequestBatchGroup) -> list[BatchItemResult]:
+        return group.execute(cli_executor=cli_executor, profile_config=profile_config)
+
+    if len(groups) <= 1 or max_workers <= 1:
+        outcomes = [run(group) for group in groups]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(groups)), thread_name_prefix="handsfree-ai-batch"
+        ) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, run, group) for group in groups
+            ]
+            outcomes = [future.result() for future in futures]
+
+    for group, group_results in zip(groups, outcomes, strict=True):
+        for index, result in zip(group.indexes, group_results, strict=True):
+            results[index] = result
+    return results  # type: ignore[return-value]
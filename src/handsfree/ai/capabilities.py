@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import json
 import os
+import threading
+from collections.abc import Callable
 from datetime import UTC, datetime
 from typing import Any
 
+from handsfree.cid_fanout import CIDFanoutResult, load_cids
 from handsfree.cli import CLIExecutor, CopilotCLIAdapter, GitHubCLIAdapter
 from handsfree.commands.profiles import Profile, ProfileConfig
 from handsfree.ipfs_accelerate_adapters import get_ipfs_accelerate_adapter
@@ -17,6 +20,8 @@ from handsfree.ipfs_datasets_routers import (
 )
 from handsfree.ipfs_kit_adapters import get_ipfs_kit_adapter
 
+from .failure_index import get_failure_index
+from .failure_index import normalize_failure_candidate as _normalize_failure_history_candidate
 from .models import (
     AIBackendFamily,
     AICapabilityRequest,
@@ -24,6 +29,8 @@ from .models import (
     AICapabilitySpec,
     AIExecutionMode,
 )
+from .pipeline import CompositePipeline, PipelineStep
+from .ranking import rank_by_similarity
 
 _CAPABILITIES: dict[str, AICapabilitySpec] = {
     "copilot.pr.explain": AICapabilitySpec(
@@ -508,21 +515,13 @@ def _execute_ipfs_rank_texts(spec: AICapabilitySpec, **kwargs: Any) -> AICapabil
     candidates = [str(candidate) for candidate in kwargs["candidates"]]
     embeddings = get_embeddings_router().embed_texts([query_text, *candidates], **embedding_options)
     query_embedding = embeddings[0]
-    candidate_embeddings = embeddings[1:]
-    ranked_items = []
-
-    for candidate, embedding in zip(candidates, candidate_embeddings, strict=False):
-        ranked_items.append(
-            {
-                "text": candidate,
-                "score": _cosine_similarity(query_embedding, embedding),
-            }
+    candidate_embeddings = embeddings[1 : len(candidates) + 1]
+    ranked_items = [
+        {"text": candidates[index], "score": score}
+        for index, score in rank_by_similarity(
+            query_embedding, candidate_embeddings, kwargs.get("top_k")
         )
-
-    ranked_items.sort(key=lambda item: item["score"], reverse=True)
-    top_k = kwargs.get("top_k")
-    if isinstance(top_k, int) and top_k > 0:
-        ranked_items = ranked_items[:top_k]
+    ]
 
     return AICapabilityResult(
         capability_id=spec.capability_id,
@@ -710,87 +709,154 @@ def _execute_ipfs_accelerate_generate_and_store(
     )
 
 
-def _execute_github_pr_rag_summary(
+def _pr_summary_prompt(pr_number: int, repo: str | None, summary_text: str) -> str:
+    return (
+        f"Summarize pull request #{pr_number}"
+        f"{f' in {repo}' if repo else ''} for a voice-first developer assistant.\n"
+        f"Base summary: {summary_text}\n"
+        "Return a concise augmented summary with risks and next action."
+    )
+
+
+def _accelerate_generated_text(generated: Any) -> str:
+    if isinstance(generated, dict):
+        return str(
+            generated.get("text")
+            or generated.get("summary")
+            or generated.get("output")
+            or generated
+        )
+    return str(generated)
+
+
+def _run_pr_summary_pipeline(
     spec: AICapabilitySpec,
     *,
-    profile_config: ProfileConfig | None,
+    resolved_profile: ProfileConfig,
+    generate_step: str,
+    generate: Callable[[str], str],
+    headline: str,
     **kwargs: Any,
-) -> AICapabilityResult:
-    resolved_profile = profile_config or ProfileConfig.for_profile(Profile.DEFAULT)
+) -> dict[str, Any]:
+    """Run the GitHub summary -> (embeddings | generation) -> persistence pipeline.
+
+    The embedding only feeds the reported ``embedding_dimensions``, so it
+    runs alongside generation rather than ahead of it.
+    """
     pr_number = kwargs["pr_number"]
     repo = kwargs.get("repo")
     embedding_options = dict(kwargs.get("embedding_options") or {})
-    generation_options = dict(kwargs.get("generation_options") or {})
 
-    pr_summary = GitHubCLIAdapter().summarize_pr(pr_number, resolved_profile)
-    summary_text = pr_summary["spoken_text"]
-    embeddings = get_embeddings_router().embed_text(summary_text, **embedding_options)
+    def persist(
+        github_pr_summary: dict[str, Any], embeddings: list[float], **generated: str
+    ) -> dict[str, Any]:
+        return _persist_composite_output_if_enabled(
+            capability_id=spec.capability_id,
+            payload={
+                "headline": headline,
+                "summary": generated[generate_step],
+                "repo": repo,
+                "pr_number": pr_number,
+                "source_summary": github_pr_summary["spoken_text"],
+                "embedding_dimensions": len(embeddings),
+            },
+            metadata=_build_persisted_metadata(
+                profile_config=resolved_profile,
+                repo=repo,
+                pr_number=pr_number,
+            ),
+            persist_output=kwargs.get("persist_output"),
+            ipfs_options=kwargs.get("ipfs_options"),
+        )
 
-    prompt = (
-        f"Summarize pull request #{pr_number}"
-        f"{f' in {repo}' if repo else ''} for a voice-first developer assistant.\n"
-        f"Base summary: {summary_text}\n"
-        f"Embedding dimensions: {len(embeddings)}\n"
-        "Return a concise augmented summary with risks and next action."
+    pipeline = CompositePipeline(
+        [
+            PipelineStep(
+                "github_pr_summary",
+                lambda: GitHubCLIAdapter().summarize_pr(pr_number, resolved_profile),
+            ),
+            PipelineStep(
+                "embeddings",
+                lambda github_pr_summary: get_embeddings_router().embed_text(
+                    github_pr_summary["spoken_text"], **embedding_options
+                ),
+                ("github_pr_summary",),
+            ),
+            PipelineStep(
+                generate_step,
+                lambda github_pr_summary: generate(
+                    _pr_summary_prompt(pr_number, repo, github_pr_summary["spoken_text"])
+                ),
+                ("github_pr_summary",),
+            ),
+            PipelineStep(
+                "ipfs_persist", persist, ("github_pr_summary", "embeddings", generate_step)
+            ),
+        ]
     )
-    generated_summary = get_llm_router().generate_text(prompt, **generation_options)
-    spoken_text = resolved_profile.truncate_spoken_text(generated_summary)
-    persisted = _persist_composite_output_if_enabled(
-        capability_id=spec.capability_id,
-        payload={
-            "headline": f"RAG summary for PR #{pr_number}",
-            "summary": generated_summary,
+    run = pipeline.run(["ipfs_persist"])
+    summary_text = run["github_pr_summary"]["spoken_text"]
+    generated_text = run[generate_step]
+    embedding_dimensions = len(run["embeddings"])
+    cid = run["ipfs_persist"].get("cid")
+    return {
+        "spoken_text": resolved_profile.truncate_spoken_text(generated_text),
+        "headline": headline,
+        "summary": generated_text,
+        "repo": repo,
+        "pr_number": pr_number,
+        "source_summary": summary_text,
+        "embedding_dimensions": embedding_dimensions,
+        "ipfs_cid": cid,
+        "trace": {
+            "provider": spec.backend_family.value,
             "repo": repo,
             "pr_number": pr_number,
-            "source_summary": summary_text,
-            "embedding_dimensions": len(embeddings),
+            "ipfs_cid": cid,
+            "steps": {
+                "github_pr_summary": run["github_pr_summary"]["trace"],
+                "embeddings": {
+                    "provider": AIBackendFamily.IPFS_EMBEDDINGS_ROUTER.value,
+                    "operation": "embed_text",
+                    "dimensions": embedding_dimensions,
+                },
+            },
+            "timings_ms": run.timings_ms,
         },
-        metadata=_build_persisted_metadata(
-            profile_config=resolved_profile,
-            repo=repo,
-            pr_number=pr_number,
-        ),
-        persist_output=kwargs.get("persist_output"),
-        ipfs_options=kwargs.get("ipfs_options"),
+    }
+
+
+def _execute_github_pr_rag_summary(
+    spec: AICapabilitySpec,
+    *,
+    profile_config: ProfileConfig | None,
+    **kwargs: Any,
+) -> AICapabilityResult:
+    resolved_profile = profile_config or ProfileConfig.for_profile(Profile.DEFAULT)
+    generation_options = dict(kwargs.get("generation_options") or {})
+    output = _run_pr_summary_pipeline(
+        spec,
+        resolved_profile=resolved_profile,
+        generate_step="llm",
+        generate=lambda prompt: get_llm_router().generate_text(prompt, **generation_options),
+        headline=f"RAG summary for PR #{kwargs['pr_number']}",
+        **kwargs,
     )
+    output["trace"]["steps"]["llm"] = {
+        "provider": AIBackendFamily.IPFS_LLM_ROUTER.value,
+        "operation": "generate_text",
+    }
 
     return AICapabilityResult(
         capability_id=spec.capability_id,
         backend_family=spec.backend_family,
         execution_mode=AIExecutionMode.ORCHESTRATED,
         ok=True,
-        output={
-            "spoken_text": spoken_text,
-            "headline": f"RAG summary for PR #{pr_number}",
-            "summary": generated_summary,
-            "repo": repo,
-            "pr_number": pr_number,
-            "source_summary": summary_text,
-            "embedding_dimensions": len(embeddings),
-            "ipfs_cid": persisted.get("cid"),
-            "trace": {
-                "provider": spec.backend_family.value,
-                "repo": repo,
-                "pr_number": pr_number,
-                "ipfs_cid": persisted.get("cid"),
-                "steps": {
-                    "github_pr_summary": pr_summary["trace"],
-                    "embeddings": {
-                        "provider": AIBackendFamily.IPFS_EMBEDDINGS_ROUTER.value,
-                        "operation": "embed_text",
-                        "dimensions": len(embeddings),
-                    },
-                    "llm": {
-                        "provider": AIBackendFamily.IPFS_LLM_ROUTER.value,
-                        "operation": "generate_text",
-                    },
-                },
-            },
-        },
+        output=output,
         trace={
             "provider": spec.backend_family.value,
-            "repo": repo,
-            "pr_number": pr_number,
+            "repo": output["repo"],
+            "pr_number": output["pr_number"],
         },
     )
 
@@ -802,230 +868,264 @@ def _execute_github_pr_accelerated_summary(
     **kwargs: Any,
 ) -> AICapabilityResult:
     resolved_profile = profile_config or ProfileConfig.for_profile(Profile.DEFAULT)
-    pr_number = kwargs["pr_number"]
-    repo = kwargs.get("repo")
-    embedding_options = dict(kwargs.get("embedding_options") or {})
     generation_options = dict(kwargs.get("generation_options") or {})
-
-    pr_summary = GitHubCLIAdapter().summarize_pr(pr_number, resolved_profile)
-    summary_text = pr_summary["spoken_text"]
-    embeddings = get_embeddings_router().embed_text(summary_text, **embedding_options)
-
-    prompt = (
-        f"Summarize pull request #{pr_number}"
-        f"{f' in {repo}' if repo else ''} for a voice-first developer assistant.\n"
-        f"Base summary: {summary_text}\n"
-        f"Embedding dimensions: {len(embeddings)}\n"
-        "Return a concise augmented summary with risks and next action."
-    )
-    generated_summary = get_ipfs_accelerate_adapter().generate(prompt, **generation_options)
-    if isinstance(generated_summary, dict):
-        generated_text = str(
-            generated_summary.get("text")
-            or generated_summary.get("summary")
-            or generated_summary.get("output")
-            or generated_summary
-        )
-    else:
-        generated_text = str(generated_summary)
-    spoken_text = resolved_profile.truncate_spoken_text(generated_text)
-    persisted = _persist_composite_output_if_enabled(
-        capability_id=spec.capability_id,
-        payload={
-            "headline": f"Accelerated summary for PR #{pr_number}",
-            "summary": generated_text,
-            "repo": repo,
-            "pr_number": pr_number,
-            "source_summary": summary_text,
-            "embedding_dimensions": len(embeddings),
-        },
-        metadata=_build_persisted_metadata(
-            profile_config=resolved_profile,
-            repo=repo,
-            pr_number=pr_number,
+    output = _run_pr_summary_pipeline(
+        spec,
+        resolved_profile=resolved_profile,
+        generate_step="accelerate_generate",
+        generate=lambda prompt: _accelerate_generated_text(
+            get_ipfs_accelerate_adapter().generate(prompt, **generation_options)
         ),
-        persist_output=kwargs.get("persist_output"),
-        ipfs_options=kwargs.get("ipfs_options"),
+        headline=f"Accelerated summary for PR #{kwargs['pr_number']}",
+        **kwargs,
     )
+    output["trace"]["steps"]["accelerate_generate"] = {
+        "provider": AIBackendFamily.IPFS_ACCELERATE.value,
+        "operation": "generate",
+    }
 
     return AICapabilityResult(
         capability_id=spec.capability_id,
         backend_family=spec.backend_family,
         execution_mode=AIExecutionMode.ORCHESTRATED,
         ok=True,
-        output={
-            "spoken_text": spoken_text,
-            "headline": f"Accelerated summary for PR #{pr_number}",
-            "summary": generated_text,
-            "repo": repo,
-            "pr_number": pr_number,
-            "source_summary": summary_text,
-            "embedding_dimensions": len(embeddings),
-            "ipfs_cid": persisted.get("cid"),
-            "trace": {
-                "provider": spec.backend_family.value,
-                "repo": repo,
-                "pr_number": pr_number,
-                "ipfs_cid": persisted.get("cid"),
-                "steps": {
-                    "github_pr_summary": pr_summary["trace"],
-                    "embeddings": {
-                        "provider": AIBackendFamily.IPFS_EMBEDDINGS_ROUTER.value,
-                        "operation": "embed_text",
-                        "dimensions": len(embeddings),
-                    },
-                    "accelerate_generate": {
-                        "provider": AIBackendFamily.IPFS_ACCELERATE.value,
-                        "operation": "generate",
-                    },
-                },
-            },
-        },
+        output=output,
         trace={
             "provider": spec.backend_family.value,
-            "repo": repo,
-            "pr_number": pr_number,
+            "repo": output["repo"],
+            "pr_number": output["pr_number"],
         },
     )
 
 
-def _execute_github_check_failure_rag_explain(
+def _failure_explain_prompt(
+    *,
+    pr_number: int,
+    repo: str | None,
+    failure_target: str | None,
+    failure_target_type: str | None,
+    checks_context: str,
+    similar_failures: list[dict[str, Any]],
+) -> str:
+    similar_failures_context = ""
+    if similar_failures:
+        similar_failures_context = "Similar prior failures:\n" + "\n".join(
+            f"- score={match['score']:.3f} repo={match.get('repo') or 'unknown'} "
+            f"pr={match.get('pr_number') or 'unknown'} summary={match.get('summary') or ''}"
+            for match in similar_failures
+        )
+    return (
+        f"Explain failing checks for pull request #{pr_number}"
+        f"{f' in {repo}' if repo else ''} for a voice-first developer assistant.\n"
+        f"Failure focus: {failure_target_type or 'checks'} {failure_target or 'overall'}\n"
+        f"Checks context: {checks_context}\n"
+        f"{similar_failures_context + chr(10) if similar_failures_context else ''}"
+        "Return a concise explanation, likely cause, and next debugging step."
+    )
+
+
+def _run_failure_explain_pipeline(
     spec: AICapabilitySpec,
     *,
-    profile_config: ProfileConfig | None,
+    resolved_profile: ProfileConfig,
+    generate_step: str,
+    generate: Callable[[str], str],
+    headline: str,
     **kwargs: Any,
-) -> AICapabilityResult:
-    resolved_profile = profile_config or ProfileConfig.for_profile(Profile.DEFAULT)
+) -> dict[str, Any]:
+    """Run the checks -> (embeddings | retrieval -> generation) -> persistence pipeline.
+
+    The checks-context embedding only feeds the reported
+    ``embedding_dimensions``, so it runs alongside retrieval and generation.
+    Retrieval is only part of the pipeline when history was supplied.
+    """
     pr_number = kwargs["pr_number"]
     repo = kwargs.get("repo")
     failure_target = kwargs.get("failure_target")
     failure_target_type = kwargs.get("failure_target_type")
     github_provider = kwargs.get("github_provider")
     history_candidates = list(kwargs.get("history_candidates") or [])
-    history_candidates.extend(
-        _load_failure_history_candidates_from_cids(kwargs.get("history_cids"))
-    )
+    history_cids = _clean_history_cids(kwargs.get("history_cids"))
     embedding_options = dict(kwargs.get("embedding_options") or {})
-    generation_options = dict(kwargs.get("generation_options") or {})
 
-    checks = _fetch_pr_checks(github_provider, repo, pr_number)
-    checks_context = _build_checks_context(
-        checks=checks,
-        pr_number=pr_number,
-        failure_target=failure_target,
-        failure_target_type=failure_target_type,
-    )
-    embeddings = get_embeddings_router().embed_text(checks_context, **embedding_options)
-    similar_failures: list[dict[str, Any]] = []
-    retrieval_trace: dict[str, Any] | None = None
-    similar_failures_context = ""
-    if history_candidates:
-        similar_failure_result = _execute_github_find_similar_failures(
+    def fetch_checks() -> dict[str, Any]:
+        checks = _fetch_pr_checks(github_provider, repo, pr_number)
+        return {
+            "checks": checks,
+            "context": _build_checks_context(
+                checks=checks,
+                pr_number=pr_number,
+                failure_target=failure_target,
+                failure_target_type=failure_target_type,
+            ),
+        }
+
+    def retrieve(github_checks: dict[str, Any]) -> AICapabilityResult:
+        return _execute_github_find_similar_failures(
             get_ai_capability("github.check.find_similar_failures"),
             pr_number=pr_number,
             repo=repo,
             failure_target=failure_target,
             failure_target_type=failure_target_type,
             github_provider=github_provider,
+            checks=github_checks["checks"],
             history_candidates=history_candidates,
+            history_cids=history_cids,
             embedding_options=embedding_options,
             top_k=kwargs.get("top_k"),
         )
-        similar_failures = list(similar_failure_result.output.get("ranked_matches", []))
-        retrieval_trace = similar_failure_result.trace
-        if similar_failures:
-            similar_failures_context = "Similar prior failures:\n" + "\n".join(
-                f"- score={match['score']:.3f} repo={match.get('repo') or 'unknown'} "
-                f"pr={match.get('pr_number') or 'unknown'} summary={match.get('summary') or ''}"
-                for match in similar_failures
+
+    def related_failures(retrieval: AICapabilityResult | None) -> list[dict[str, Any]]:
+        if retrieval is None:
+            return []
+        return list(retrieval.output.get("ranked_matches", []))
+
+    def run_generate(
+        github_checks: dict[str, Any], retrieval: AICapabilityResult | None = None
+    ) -> str:
+        return generate(
+            _failure_explain_prompt(
+                pr_number=pr_number,
+                repo=repo,
+                failure_target=failure_target,
+                failure_target_type=failure_target_type,
+                checks_context=github_checks["context"],
+                similar_failures=related_failures(retrieval),
             )
-    prompt = (
-        f"Explain failing checks for pull request #{pr_number}"
-        f"{f' in {repo}' if repo else ''} for a voice-first developer assistant.\n"
-        f"Failure focus: {failure_target_type or 'checks'} {failure_target or 'overall'}\n"
-        f"Checks context: {checks_context}\n"
-        f"{similar_failures_context + chr(10) if similar_failures_context else ''}"
-        f"Embedding dimensions: {len(embeddings)}\n"
-        "Return a concise explanation, likely cause, and next debugging step."
-    )
-    generated_summary = get_llm_router().generate_text(prompt, **generation_options)
-    spoken_text = resolved_profile.truncate_spoken_text(generated_summary)
-    persisted = _persist_composite_output_if_enabled(
-        capability_id=spec.capability_id,
-        payload={
-            "headline": f"Failure analysis for PR #{pr_number}",
-            "summary": generated_summary,
+        )
+
+    def persist(
+        github_checks: dict[str, Any],
+        embeddings: list[float],
+        retrieval: AICapabilityResult | None = None,
+        **generated: str,
+    ) -> dict[str, Any]:
+        return _persist_composite_output_if_enabled(
+            capability_id=spec.capability_id,
+            payload={
+                "headline": headline,
+                "summary": generated[generate_step],
+                "repo": repo,
+                "pr_number": pr_number,
+                "failure_target": failure_target,
+                "failure_target_type": failure_target_type,
+                "checks_context": github_checks["context"],
+                "related_failures": related_failures(retrieval),
+                "embedding_dimensions": len(embeddings),
+            },
+            metadata=_build_persisted_metadata(
+                profile_config=resolved_profile,
+                repo=repo,
+                pr_number=pr_number,
+                failure_target=failure_target,
+                failure_target_type=failure_target_type,
+            ),
+            persist_output=kwargs.get("persist_output"),
+            ipfs_options=kwargs.get("ipfs_options"),
+        )
+
+    retrieval_deps: tuple[str, ...] = ("retrieval",) if history_candidates or history_cids else ()
+    steps = [
+        PipelineStep("github_checks", fetch_checks),
+        PipelineStep(
+            "embeddings",
+            lambda github_checks: get_embeddings_router().embed_text(
+                github_checks["context"], **embedding_options
+            ),
+            ("github_checks",),
+        ),
+        PipelineStep(generate_step, run_generate, ("github_checks", *retrieval_deps)),
+        PipelineStep(
+            "ipfs_persist",
+            persist,
+            ("github_checks", "embeddings", *retrieval_deps, generate_step),
+        ),
+    ]
+    if retrieval_deps:
+        steps.append(PipelineStep("retrieval", retrieve, ("github_checks",)))
+    run = CompositePipeline(steps).run(["ipfs_persist"])
+
+    checks_context = run["github_checks"]["context"]
+    retrieval = run.get("retrieval")
+    generated_text = run[generate_step]
+    embedding_dimensions = len(run["embeddings"])
+    cid = run["ipfs_persist"].get("cid")
+    return {
+        "spoken_text": resolved_profile.truncate_spoken_text(generated_text),
+        "headline": headline,
+        "summary": generated_text,
+        "repo": repo,
+        "pr_number": pr_number,
+        "failure_target": failure_target,
+        "failure_target_type": failure_target_type,
+        "checks_context": checks_context,
+        "related_failures": related_failures(retrieval),
+        "embedding_dimensions": embedding_dimensions,
+        "ipfs_cid": cid,
+        "trace": {
+            "provider": spec.backend_family.value,
             "repo": repo,
             "pr_number": pr_number,
             "failure_target": failure_target,
             "failure_target_type": failure_target_type,
-            "checks_context": checks_context,
-            "related_failures": similar_failures,
-            "embedding_dimensions": len(embeddings),
+            "ipfs_cid": cid,
+            "steps": {
+                "github_checks": {
+                    "provider": "github_provider" if github_provider else "synthetic",
+                    "count": len(run["github_checks"]["checks"]),
+                },
+                "embeddings": {
+                    "provider": AIBackendFamily.IPFS_EMBEDDINGS_ROUTER.value,
+                    "operation": "embed_text",
+                    "dimensions": embedding_dimensions,
+                },
+                **({"retrieval": retrieval.trace} if retrieval is not None else {}),
+            },
+            "timings_ms": run.timings_ms,
         },
-        metadata=_build_persisted_metadata(
-            profile_config=resolved_profile,
-            repo=repo,
-            pr_number=pr_number,
-            failure_target=failure_target,
-            failure_target_type=failure_target_type,
-        ),
-        persist_output=kwargs.get("persist_output"),
-        ipfs_options=kwargs.get("ipfs_options"),
-    )
+    }
+
 
+def _failure_explain_result(spec: AICapabilitySpec, output: dict[str, Any]) -> AICapabilityResult:
     return AICapabilityResult(
         capability_id=spec.capability_id,
         backend_family=spec.backend_family,
         execution_mode=AIExecutionMode.ORCHESTRATED,
         ok=True,
-        output={
-            "spoken_text": spoken_text,
-            "headline": f"Failure analysis for PR #{pr_number}",
-            "summary": generated_summary,
-            "repo": repo,
-            "pr_number": pr_number,
-            "failure_target": failure_target,
-            "failure_target_type": failure_target_type,
-            "checks_context": checks_context,
-            "related_failures": similar_failures,
-            "embedding_dimensions": len(embeddings),
-            "ipfs_cid": persisted.get("cid"),
-            "trace": {
-                "provider": spec.backend_family.value,
-                "repo": repo,
-                "pr_number": pr_number,
-                "failure_target": failure_target,
-                "failure_target_type": failure_target_type,
-                "ipfs_cid": persisted.get("cid"),
-                "steps": {
-                    "github_checks": {
-                        "provider": "github_provider" if github_provider else "synthetic",
-                        "count": len(checks),
-                    },
-                    "embeddings": {
-                        "provider": AIBackendFamily.IPFS_EMBEDDINGS_ROUTER.value,
-                        "operation": "embed_text",
-                        "dimensions": len(embeddings),
-                    },
-                    "llm": {
-                        "provider": AIBackendFamily.IPFS_LLM_ROUTER.value,
-                        "operation": "generate_text",
-                    },
-                    **({"retrieval": retrieval_trace} if retrieval_trace else {}),
-                },
-            },
-        },
+        output=output,
         trace={
             "provider": spec.backend_family.value,
-            "repo": repo,
-            "pr_number": pr_number,
-            "failure_target": failure_target,
-            "failure_target_type": failure_target_type,
+            "repo": output["repo"],
+            "pr_number": output["pr_number"],
+            "failure_target": output["failure_target"],
+            "failure_target_type": output["failure_target_type"],
         },
     )
 
 
+def _execute_github_check_failure_rag_explain(
+    spec: AICapabilitySpec,
+    *,
+    profile_config: ProfileConfig | None,
+    **kwargs: Any,
+) -> AICapabilityResult:
+    resolved_profile = profile_config or ProfileConfig.for_profile(Profile.DEFAULT)
+    generation_options = dict(kwargs.get("generation_options") or {})
+    output = _run_failure_explain_pipeline(
+        spec,
+        resolved_profile=resolved_profile,
+        generate_step="llm",
+        generate=lambda prompt: get_llm_router().generate_text(prompt, **generation_options),
+        headline=f"Failure analysis for PR #{kwargs['pr_number']}",
+        **kwargs,
+    )
+    output["trace"]["steps"]["llm"] = {
+        "provider": AIBackendFamily.IPFS_LLM_ROUTER.value,
+        "operation": "generate_text",
+    }
+    return _failure_explain_result(spec, output)
+
+
 def _execute_github_find_similar_failures(
     spec: AICapabilitySpec, **kwargs: Any
 ) -> AICapabilityResult:
@@ -1035,12 +1135,13 @@ def _execute_github_find_similar_failures(
     failure_target_type = kwargs.get("failure_target_type")
     github_provider = kwargs.get("github_provider")
     history_candidates = list(kwargs.get("history_candidates") or [])
-    history_candidates.extend(
-        _load_failure_history_candidates_from_cids(kwargs.get("history_cids"))
-    )
+    history_cids = _clean_history_cids(kwargs.get("history_cids"))
+    embedding_options = dict(kwargs.get("embedding_options") or {})
     top_k = kwargs.get("top_k")
 
-    checks = _fetch_pr_checks(github_provider, repo, pr_number)
+    checks = kwargs.get("checks")
+    if checks is None:
+        checks = _fetch_pr_checks(github_provider, repo, pr_number)
     checks_context = _build_checks_context(
         checks=checks,
         pr_number=pr_number,
@@ -1048,35 +1149,43 @@ def _execute_github_find_similar_failures(
         failure_target_type=failure_target_type,
     )
 
-    candidate_payloads = [
-        _normalize_failure_history_candidate(candidate) for candidate in history_candidates
-    ]
-    ranking = _execute_ipfs_rank_texts(
-        get_ai_capability("ipfs.retrieval.rank_texts"),
-        query_text=checks_context,
-        candidates=[candidate["match_text"] for candidate in candidate_payloads],
-        embedding_options=kwargs.get("embedding_options"),
-        top_k=top_k,
-    )
-
-    ranked_lookup = {item["text"]: item["score"] for item in ranking.output["ranked_items"]}
-    ranked_matches = []
-    for candidate in candidate_payloads:
-        match_text = candidate["match_text"]
-        if match_text not in ranked_lookup:
-            continue
-        ranked_matches.append(
-            {
-                "score": ranked_lookup[match_text],
-                "summary": candidate["summary"],
-                "repo": candidate.get("repo"),
-                "pr_number": candidate.get("pr_number"),
-                "failure_target": candidate.get("failure_target"),
-                "failure_target_type": candidate.get("failure_target_type"),
-            }
+    failure_index = get_failure_index(embedding_options) if history_cids else None
+    if failure_index is not None:
+        ranked_matches, embedding_dimensions, retrieval_trace = _rank_failures_with_index(
+            failure_index,
+            query_text=checks_context,
+            history_candidates=history_candidates,
+            history_cids=history_cids,
+            embedding_options=embedding_options,
+            top_k=top_k,
         )
+    else:
+        history_loads = _load_failure_history_candidates(history_cids)
+        history_candidates.extend(history_loads.values.values())
+        candidate_payloads = [
+            _normalize_failure_history_candidate(candidate) for candidate in history_candidates
+        ]
+        ranking = _execute_ipfs_rank_texts(
+            get_ai_capability("ipfs.retrieval.rank_texts"),
+            query_text=checks_context,
+            candidates=[candidate["match_text"] for candidate in candidate_payloads],
+            embedding_options=embedding_options,
+            top_k=top_k,
+        )
+
+        ranked_lookup = {item["text"]: item["score"] for item in ranking.output["ranked_items"]}
+        ranked_matches = []
+        for candidate in candidate_payloads:
+            match_text = candidate["match_text"]
+            if match_text not in ranked_lookup:
+                continue
+            ranked_matches.append(_failure_match(candidate, ranked_lookup[match_text]))
 
-    ranked_matches.sort(key=lambda item: item["score"], reverse=True)
+        ranked_matches.sort(key=lambda item: item["score"], reverse=True)
+        embedding_dimensions = ranking.output["embedding_dimensions"]
+        retrieval_trace = ranking.trace
+        if history_cids:
+            retrieval_trace["history_cids"] = history_loads.as_trace()
 
     trace = {
         "provider": spec.backend_family.value,
@@ -1089,7 +1198,7 @@ def _execute_github_find_similar_failures(
                 "provider": "github_provider" if github_provider else "synthetic",
                 "count": len(checks),
             },
-            "retrieval": ranking.trace,
+            "retrieval": retrieval_trace,
         },
     }
 
@@ -1105,13 +1214,95 @@ def _execute_github_find_similar_failures(
             "failure_target_type": failure_target_type,
             "checks_context": checks_context,
             "ranked_matches": ranked_matches,
-            "embedding_dimensions": ranking.output["embedding_dimensions"],
+            "embedding_dimensions": embedding_dimensions,
             "trace": trace,
         },
         trace=trace,
     )
 
 
+def _failure_match(candidate: dict[str, Any], score: float) -> dict[str, Any]:
+    return {
+        "score": score,
+        "summary": candidate["summary"],
+        "repo": candidate.get("repo"),
+        "pr_number": candidate.get("pr_number"),
+        "failure_target": candidate.get("failure_target"),
+        "failure_target_type": candidate.get("failure_target_type"),
+    }
+
+
+def _rank_failures_with_index(
+    failure_index: Any,
+    *,
+    query_text: str,
+    history_candidates: list[Any],
+    history_cids: list[str],
+    embedding_options: dict[str, Any],
+    top_k: Any,
+) -> tuple[list[dict[str, Any]], int, dict[str, Any]]:
+    """Rank prior failures, answering CID-backed candidates from the failure index.
+
+    Only CIDs missing from the index are loaded from IPFS; they are embedded in
+    the same batch as the query and inline candidates and added to the index.
+    Results are ordered like the unindexed path: descending score, then inline
+    candidates before CIDs, in request order.
+    """
+    indexed_cids, missing_cids = failure_index.partition(history_cids)
+    inline_payloads = [
+        _normalize_failure_history_candidate(candidate) for candidate in history_candidates
+    ]
+    history_loads = _load_failure_history_candidates(missing_cids)
+    loaded_payloads = [
+        (cid, _normalize_failure_history_candidate(candidate))
+        for cid, candidate in history_loads.values.items()
+    ]
+    texts = [
+        query_text,
+        *(candidate["match_text"] for candidate in inline_payloads),
+        *(candidate["match_text"] for _, candidate in loaded_payloads),
+    ]
+    embeddings = get_embeddings_router().embed_texts(texts, **embedding_options)
+    query_embedding = embeddings[0]
+    for (cid, candidate), vector in zip(
+        loaded_payloads, embeddings[1 + len(inline_payloads) :], strict=False
+    ):
+        failure_index.add(cid, candidate, vector)
+
+    scored: list[tuple[float, int, dict[str, Any]]] = [
+        (score, index, inline_payloads[index])
+        for index, score in rank_by_similarity(
+            query_embedding, embeddings[1 : 1 + len(inline_payloads)], top_k
+        )
+    ]
+    cid_order = {cid: len(inline_payloads) + position for position, cid in enumerate(history_cids)}
+    for cid, score in failure_index.search(query_embedding, top_k, cids=history_cids):
+        candidate = failure_index.get(cid)
+        if candidate is not None:
+            scored.append((score, cid_order[cid], candidate))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    if isinstance(top_k, int) and top_k > 0:
+        scored = scored[:top_k]
+
+    retrieval_trace = {
+        "provider": AIBackendFamily.IPFS_EMBEDDINGS_ROUTER.value,
+        "operation": "embed_texts",
+        "candidate_count": len(inline_payloads) + len(history_cids),
+        "failure_index": {
+            "indexed_cids": len(indexed_cids),
+            "loaded_cids": len(loaded_payloads),
+            "size": len(failure_index),
+            "ivf": failure_index.trained,
+        },
+        "history_cids": history_loads.as_trace(),
+    }
+    return (
+        [_failure_match(candidate, score) for score, _, candidate in scored],
+        len(query_embedding),
+        retrieval_trace,
+    )
+
+
 def _execute_github_check_accelerated_failure_explain(
     spec: AICapabilitySpec,
     *,
@@ -1119,143 +1310,22 @@ def _execute_github_check_accelerated_failure_explain(
     **kwargs: Any,
 ) -> AICapabilityResult:
     resolved_profile = profile_config or ProfileConfig.for_profile(Profile.DEFAULT)
-    pr_number = kwargs["pr_number"]
-    repo = kwargs.get("repo")
-    failure_target = kwargs.get("failure_target")
-    failure_target_type = kwargs.get("failure_target_type")
-    github_provider = kwargs.get("github_provider")
-    history_candidates = list(kwargs.get("history_candidates") or [])
-    history_candidates.extend(
-        _load_failure_history_candidates_from_cids(kwargs.get("history_cids"))
-    )
-    embedding_options = dict(kwargs.get("embedding_options") or {})
     generation_options = dict(kwargs.get("generation_options") or {})
-
-    checks = _fetch_pr_checks(github_provider, repo, pr_number)
-    checks_context = _build_checks_context(
-        checks=checks,
-        pr_number=pr_number,
-        failure_target=failure_target,
-        failure_target_type=failure_target_type,
-    )
-    embeddings = get_embeddings_router().embed_text(checks_context, **embedding_options)
-    similar_failures: list[dict[str, Any]] = []
-    retrieval_trace: dict[str, Any] | None = None
-    similar_failures_context = ""
-    if history_candidates:
-        similar_failure_result = _execute_github_find_similar_failures(
-            get_ai_capability("github.check.find_similar_failures"),
-            pr_number=pr_number,
-            repo=repo,
-            failure_target=failure_target,
-            failure_target_type=failure_target_type,
-            github_provider=github_provider,
-            history_candidates=history_candidates,
-            embedding_options=embedding_options,
-            top_k=kwargs.get("top_k"),
-        )
-        similar_failures = list(similar_failure_result.output.get("ranked_matches", []))
-        retrieval_trace = similar_failure_result.trace
-        if similar_failures:
-            similar_failures_context = "Similar prior failures:\n" + "\n".join(
-                f"- score={match['score']:.3f} repo={match.get('repo') or 'unknown'} "
-                f"pr={match.get('pr_number') or 'unknown'} summary={match.get('summary') or ''}"
-                for match in similar_failures
-            )
-
-    prompt = (
-        f"Explain failing checks for pull request #{pr_number}"
-        f"{f' in {repo}' if repo else ''} for a voice-first developer assistant.\n"
-        f"Failure focus: {failure_target_type or 'checks'} {failure_target or 'overall'}\n"
-        f"Checks context: {checks_context}\n"
-        f"{similar_failures_context + chr(10) if similar_failures_context else ''}"
-        f"Embedding dimensions: {len(embeddings)}\n"
-        "Return a concise explanation, likely cause, and next debugging step."
-    )
-    generated_summary = get_ipfs_accelerate_adapter().generate(prompt, **generation_options)
-    if isinstance(generated_summary, dict):
-        generated_text = str(
-            generated_summary.get("text")
-            or generated_summary.get("summary")
-            or generated_summary.get("output")
-            or generated_summary
-        )
-    else:
-        generated_text = str(generated_summary)
-    spoken_text = resolved_profile.truncate_spoken_text(generated_text)
-    persisted = _persist_composite_output_if_enabled(
-        capability_id=spec.capability_id,
-        payload={
-            "headline": f"Accelerated failure analysis for PR #{pr_number}",
-            "summary": generated_text,
-            "repo": repo,
-            "pr_number": pr_number,
-            "failure_target": failure_target,
-            "failure_target_type": failure_target_type,
-            "checks_context": checks_context,
-            "related_failures": similar_failures,
-            "embedding_dimensions": len(embeddings),
-        },
-        metadata=_build_persisted_metadata(
-            profile_config=resolved_profile,
-            repo=repo,
-            pr_number=pr_number,
-            failure_target=failure_target,
-            failure_target_type=failure_target_type,
+    output = _run_failure_explain_pipeline(
+        spec,
+        resolved_profile=resolved_profile,
+        generate_step="accelerate_generate",
+        generate=lambda prompt: _accelerate_generated_text(
+            get_ipfs_accelerate_adapter().generate(prompt, **generation_options)
         ),
-        persist_output=kwargs.get("persist_output"),
-        ipfs_options=kwargs.get("ipfs_options"),
-    )
-    return AICapabilityResult(
-        capability_id=spec.capability_id,
-        backend_family=spec.backend_family,
-        execution_mode=AIExecutionMode.ORCHESTRATED,
-        ok=True,
-        output={
-            "spoken_text": spoken_text,
-            "headline": f"Accelerated failure analysis for PR #{pr_number}",
-            "summary": generated_text,
-            "repo": repo,
-            "pr_number": pr_number,
-            "failure_target": failure_target,
-            "failure_target_type": failure_target_type,
-            "checks_context": checks_context,
-            "related_failures": similar_failures,
-            "embedding_dimensions": len(embeddings),
-            "ipfs_cid": persisted.get("cid"),
-            "trace": {
-                "provider": spec.backend_family.value,
-                "repo": repo,
-                "pr_number": pr_number,
-                "failure_target": failure_target,
-                "failure_target_type": failure_target_type,
-                "ipfs_cid": persisted.get("cid"),
-                "steps": {
-                    "github_checks": {
-                        "provider": "github_provider" if github_provider else "synthetic",
-                        "count": len(checks),
-                    },
-                    "embeddings": {
-                        "provider": AIBackendFamily.IPFS_EMBEDDINGS_ROUTER.value,
-                        "operation": "embed_text",
-                        "dimensions": len(embeddings),
-                    },
-                    "accelerate_generate": {
-                        "provider": AIBackendFamily.IPFS_ACCELERATE.value,
-                        "operation": "generate",
-                    },
-                    **({"retrieval": retrieval_trace} if retrieval_trace else {}),
-                },
-            },
-        },
-        trace={
-            "provider": spec.backend_family.value,
-            "repo": repo,
-            "pr_number": pr_number,
-            "failure_target": failure_target,
-            "failure_target_type": failure_target_type,
-        },
+        headline=f"Accelerated failure analysis for PR #{kwargs['pr_number']}",
+        **kwargs,
     )
+    output["trace"]["steps"]["accelerate_generate"] = {
+        "provider": AIBackendFamily.IPFS_ACCELERATE.value,
+        "operation": "generate",
+    }
+    return _failure_explain_result(spec, output)
 
 
 def _fetch_pr_checks(
@@ -1297,84 +1367,51 @@ def _build_checks_context(
     return f"PR {pr_number} failure focus: {target_type_label} {target_label}"
 
 
-def _normalize_failure_history_candidate(candidate: Any) -> dict[str, Any]:
-    """Normalize a prior failure record into a retrieval-ready candidate shape."""
-    if isinstance(candidate, str):
-        return {
-            "summary": candidate,
-            "match_text": candidate,
-            "repo": None,
-            "pr_number": None,
-            "failure_target": None,
-            "failure_target_type": None,
-        }
+def _clean_history_cids(history_cids: Any) -> list[str]:
+    """Return the non-empty, stripped CID strings from ``history_cids``."""
+    if not history_cids:
+        return []
+    return [cid.strip() for cid in history_cids if isinstance(cid, str) and cid.strip()]
 
-    if not isinstance(candidate, dict):
-        rendered = str(candidate)
-        return {
-            "summary": rendered,
-            "match_text": rendered,
-            "repo": None,
-            "pr_number": None,
-            "failure_target": None,
-            "failure_target_type": None,
-        }
 
-    summary = str(candidate.get("summary") or candidate.get("text") or "")
-    repo = candidate.get("repo")
-    pr_number = candidate.get("pr_number")
-    failure_target = candidate.get("failure_target")
-    failure_target_type = candidate.get("failure_target_type")
-    match_text = (
-        " | ".join(
-            value
-            for value in [
-                str(repo) if repo else "",
-                f"PR {pr_number}" if pr_number is not None else "",
-                f"{failure_target_type} {failure_target}".strip() if failure_target else "",
-                summary,
-            ]
-            if value
-        )
-        or summary
-    )
+def _load_failure_history_candidate_from_cid(cid: str) -> dict[str, Any]:
+    """Load one prior failure candidate from a stored AI output."""
+    payload_bytes = get_ipfs_router().cat(cid)
+    payload = json.loads(payload_bytes.decode("utf-8"))
+    metadata = payload.get("metadata", {}) if isinstance(payload, dict) else {}
+    stored_payload = payload.get("payload", {}) if isinstance(payload, dict) else {}
     return {
-        "summary": summary,
-        "match_text": match_text,
-        "repo": repo,
-        "pr_number": pr_number,
-        "failure_target": failure_target,
-        "failure_target_type": failure_target_type,
+        "summary": stored_payload.get("summary")
+        or stored_payload.get("headline")
+        or f"Stored output {cid}",
+        "repo": metadata.get("repo") or stored_payload.get("repo"),
+        "pr_number": metadata.get("pr_number") or stored_payload.get("pr_number"),
+        "failure_target": metadata.get("failure_target") or stored_payload.get("failure_target"),
+        "failure_target_type": metadata.get("failure_target_type")
+        or stored_payload.get("failure_target_type"),
     }
 
 
-def _load_failure_history_candidates_from_cids(history_cids: Any) -> list[dict[str, Any]]:
-    """Load prior failure candidates from stored AI outputs by CID."""
-    if not history_cids:
-        return []
+def _load_failure_history_candidates(history_cids: Any) -> CIDFanoutResult:
+    """Load prior failure candidates from stored AI outputs by CID, in parallel.
 
-    loaded_candidates: list[dict[str, Any]] = []
-    for cid in history_cids:
-        if not isinstance(cid, str) or not cid.strip():
-            continue
-        payload_bytes = get_ipfs_router().cat(cid.strip())
-        payload = json.loads(payload_bytes.decode("utf-8"))
-        metadata = payload.get("metadata", {}) if isinstance(payload, dict) else {}
-        stored_payload = payload.get("payload", {}) if isinstance(payload, dict) else {}
-        loaded_candidates.append(
-            {
-                "summary": stored_payload.get("summary")
-                or stored_payload.get("headline")
-                or f"Stored output {cid}",
-                "repo": metadata.get("repo") or stored_payload.get("repo"),
-                "pr_number": metadata.get("pr_number") or stored_payload.get("pr_number"),
-                "failure_target": metadata.get("failure_target")
-                or stored_payload.get("failure_target"),
-                "failure_target_type": metadata.get("failure_target_type")
-                or stored_payload.get("failure_target_type"),
-            }
-        )
-    return loaded_candidates
+    CIDs that fail or time out are reported in the result's errors rather
+    than failing the lookup.
+    """
+    return load_cids(history_cids, _load_failure_history_candidate_from_cid)
+
+
+def _composite_output_bytes(
+    capability_id: str, payload: dict[str, Any], metadata: dict[str, Any]
+) -> bytes:
+    return json.dumps(
+        {
+            "capability_id": capability_id,
+            "metadata": metadata,
+            "payload": payload,
+        },
+        sort_keys=True,
+    ).encode("utf-8")
 
 
 def _persist_composite_output_if_enabled(
@@ -1389,19 +1426,94 @@ def _persist_composite_output_if_enabled(
     if not should_persist:
         return {"persisted": False, "cid": None}
 
-    resolved_ipfs_options = dict(ipfs_options or {})
-    data = json.dumps(
-        {
-            "capability_id": capability_id,
-            "metadata": metadata,
-            "payload": payload,
-        },
-        sort_keys=True,
-    ).encode("utf-8")
-    cid = get_ipfs_router().add_bytes(data, **resolved_ipfs_options)
+    data = _composite_output_bytes(capability_id, payload, metadata)
+    cid = _composite_output_batcher.add(data, dict(ipfs_options or {}))
     return {"persisted": True, "cid": cid}
 
 
+class _PendingCompositeOutput:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.done = False
+        self.cid: Any = None
+        self.error: BaseException | None = None
+
+
+class _CompositeOutputBatcher:
+    """Group-commits concurrent composite output persists into ``add_many`` calls.
+
+    The first caller adds its output alone; outputs persisted with the same
+    IPFS options while that add is in flight are added together by the next
+    caller in one ``add_many`` call, as in a batch of composite requests.
+    Batches mix unrelated requests, so a failed ``add_many`` is retried one
+    output at a time and each caller only sees its own error.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._pending: dict[str, list[_PendingCompositeOutput]] = {}
+        self._flushing: set[str] = set()
+
+    def add(self, data: bytes, ipfs_options: dict[str, Any]) -> Any:
+        key = json.dumps(ipfs_options, sort_keys=True, default=str)
+        entry = _PendingCompositeOutput(data)
+        batch: list[_PendingCompositeOutput] = []
+        with self._condition:
+            self._pending.setdefault(key, []).append(entry)
+            while not entry.done and key in self._flushing:
+                self._condition.wait()
+            if not entry.done:
+                # Lead the next add with everything queued under these options.
+                batch = self._pending.pop(key)
+                self._flushing.add(key)
+        if batch:
+            self._flush(key, batch, ipfs_options)
+        if entry.error is not None:
+            raise entry.error
+        return entry.cid
+
+    def _flush(
+        self, key: str, batch: list[_PendingCompositeOutput], ipfs_options: dict[str, Any]
+    ) -> None:
+        try:
+            router = get_ipfs_router()
+            if len(batch) > 1 and self._add_batch(router, batch, ipfs_options):
+                return
+            for entry in batch:
+                try:
+                    entry.cid = router.add_bytes(entry.data, **ipfs_options)
+                except Exception as exc:
+                    entry.error = exc
+        except BaseException as exc:
+            for entry in batch:
+                if entry.cid is None and entry.error is None:
+                    entry.error = exc
+        finally:
+            with self._condition:
+                for entry in batch:
+                    entry.done = True
+                self._flushing.discard(key)
+                self._condition.notify_all()
+
+    @staticmethod
+    def _add_batch(
+        router: Any, batch: list[_PendingCompositeOutput], ipfs_options: dict[str, Any]
+    ) -> bool:
+        """Add ``batch`` in one ``add_many`` call; False if it must be retried per output."""
+        try:
+            cids = list(router.add_many([entry.data for entry in batch], **ipfs_options))
+        except Exception:
+            return False
+        if len(cids) != len(batch):
+            return False
+        for entry, cid in zip(batch, cids, strict=True):
+            entry.cid = cid
+        return True
+
+
+_composite_output_batcher = _CompositeOutputBatcher()
+
+
 def _should_persist_composite_output(persist_output: Any) -> bool:
     if isinstance(persist_output, bool):
         return persist_output
@@ -1427,21 +1539,6 @@ def _build_persisted_metadata(
     }
 
 
-def _cosine_similarity(left: list[float], right: list[float]) -> float:
-    """Compute cosine similarity for two embedding vectors."""
-    if not left or not right or len(left) != len(right):
-        return 0.0
-
-    dot_product = sum(
-        left_value * right_value for left_value, right_value in zip(left, right, strict=False)
-    )
-    left_norm = sum(value * value for value in left) ** 0.5
-    right_norm = sum(value * value for value in right) ** 0.5
-    if left_norm == 0 or right_norm == 0:
-        return 0.0
-    return dot_product / (left_norm * right_norm)
-
-
 def _resolve_copilot_execution_mode(output: dict[str, Any]) -> AIExecutionMode:
     source = str(output.get("trace", {}).get("source", "")).lower()
     if source == "fixture":
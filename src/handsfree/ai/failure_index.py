@@ -0,0 +1,566 @@
+"""Persistent approximate nearest-neighbor index over embedded CI failure records.
+
+Similar-failure retrieval used to load every history CID from IPFS and
+re-embed it on each query before brute-force ranking.  This index keeps one
+unit-normalized float32 vector per stored failure record (keyed by its CID)
+together with the normalized candidate metadata, so queries only embed the
+current failure context.
+
+Search is exact over small candidate sets.  Once the index holds
+``IVF_MIN_ENTRIES`` vectors and NumPy is available, an inverted-file (IVF)
+layout is trained with spherical k-means and queries scan only the
+``nprobe`` closest lists.  Without NumPy every search is exact.
+
+On disk (one directory per embedding model and options digest):
+
+- ``vectors.f32``: appended native float32 rows;
+- ``entries.jsonl``: one ``{"cid", "candidate"}`` line per row;
+- ``centroids.f32`` and ``ivf.json``: the trained IVF centroids.
+
+Vectors and entries are appended on insert under an exclusive ``.lock`` file
+lock, so processes sharing the directory never interleave rows; a torn
+trailing write is dropped on load.  The files are a cache: deleting the
+directory only costs re-embedding.
+
+Newly stored failure records are not embedded on the request path: they are
+queued with :func:`queue_failure_history_record` and embedded in batches by
+:func:`index_pending_failure_history`, which the AI history maintenance job runs.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from handsfree.embedding_cache import (
+    embedding_options_digest,
+    resolve_embedding_model,
+    resolve_embedding_model_identity,
+)
+
+from .ranking import rank_by_similarity_python
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+IVF_MIN_ENTRIES = 1024
+EXACT_SEARCH_MAX_ROWS = 2048
+DEFAULT_NPROBE = 8
+_KMEANS_ITERATIONS = 8
+_KMEANS_SAMPLE_PER_LIST = 64
+_SCORE_CHUNK_ROWS = 16384
+PENDING_MAX_RECORDS = 1024
+
+
+def normalize_failure_candidate(candidate: Any) -> dict[str, Any]:
+    """Normalize a prior failure record into a retrieval-ready candidate shape."""
+    if isinstance(candidate, str):
+        return {
+            "summary": candidate,
+            "match_text": candidate,
+            "repo": None,
+            "pr_number": None,
+            "failure_target": None,
+            "failure_target_type": None,
+        }
+
+    if not isinstance(candidate, dict):
+        rendered = str(candidate)
+        return {
+            "summary": rendered,
+            "match_text": rendered,
+            "repo": None,
+            "pr_number": None,
+            "failure_target": None,
+            "failure_target_type": None,
+        }
+
+    summary = str(candidate.get("summary") or candidate.get("text") or "")
+    repo = candidate.get("repo")
+    pr_number = candidate.get("pr_number")
+    failure_target = candidate.get("failure_target")
+    failure_target_type = candidate.get("failure_target_type")
+    match_text = (
+        " | ".join(
+            value
+            for value in [
+                str(repo) if repo else "",
+                f"PR {pr_number}" if pr_number is not None else "",
+                f"{failure_target_type} {failure_target}".strip() if failure_target else "",
+                summary,
+            ]
+            if value
+        )
+        or summary
+    )
+    return {
+        "summary": summary,
+        "match_text": match_text,
+        "repo": repo,
+        "pr_number": pr_number,
+        "failure_target": failure_target,
+        "failure_target_type": failure_target_type,
+    }
+
+
+def _unit(vector: Sequence[float]) -> list[float]:
+    norm = math.sqrt(sum(value * value for value in vector))
+    if norm == 0:
+        return [0.0] * len(vector)
+    return [value / norm for value in vector]
+
+
+class FailureVectorIndex:
+    """CID-keyed vector index with exact and IVF search."""
+
+    def __init__(self, path: str | os.PathLike[str] | None = None, *, nprobe: int = DEFAULT_NPROBE):
+        self.path = Path(path) if path is not None else None
+        self.nprobe = max(1, nprobe)
+        self.dimensions: int | None = None
+        self._lock = threading.RLock()
+        self._cids: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._candidates: list[dict[str, Any]] = []
+        # NumPy: preallocated float32 matrix with ``len(self)`` live rows.
+        # Pure Python: list of unit vectors.
+        self._matrix: Any = None
+        self._vectors: list[list[float]] = []
+        self._centroids: Any = None
+        self._lists: list[list[int]] = []
+        self._trained_size = 0
+        if self.path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._cids)
+
+    def __contains__(self, cid: object) -> bool:
+        return cid in self._rows
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def get(self, cid: str) -> dict[str, Any] | None:
+        """Return the stored candidate for ``cid``."""
+        row = self._rows.get(cid)
+        return None if row is None else dict(self._candidates[row])
+
+    def partition(self, cids: Iterable[str]) -> tuple[list[str], list[str]]:
+        """Split CIDs into (indexed, missing), deduplicated, preserving order."""
+        indexed: list[str] = []
+        missing: list[str] = []
+        for cid in dict.fromkeys(cids):
+            (indexed if cid in self._rows else missing).append(cid)
+        return indexed, missing
+
+    # ------------------------------------------------------------------ #
+    # Mutation
+    # ------------------------------------------------------------------ #
+
+    def add(self, cid: str, candidate: dict[str, Any], vector: Sequence[float]) -> bool:
+        """Index one failure record; returns False if it is already indexed or unusable."""
+        if not cid or not vector:
+            return False
+        with self._lock:
+            if cid in self._rows:
+                return False
+            if self.dimensions is None:
+                self.dimensions = len(vector)
+                self._write_meta()
+            elif len(vector) != self.dimensions:
+                logger.warning(
+                    "Skipping failure index entry %s: %d dimensions, index has %d",
+                    cid,
+                    len(vector),
+                    self.dimensions,
+                )
+                return False
+
+            unit = _unit([float(value) for value in vector])
+            self._append_row(cid, dict(candidate), unit)
+            if self.path is not None:
+                self._persist_row(cid, candidate, unit)
+            return True
+
+    def _append_row(self, cid: str, candidate: dict[str, Any], unit: Sequence[float]) -> int:
+        row = len(self._cids)
+        self._cids.append(cid)
+        self._rows[cid] = row
+        self._candidates.append(candidate)
+        if np is None:
+            self._vectors.append(list(unit))
+        else:
+            if self._matrix is None or row >= self._matrix.shape[0]:
+                capacity = max(64, row * 2)
+                grown = np.zeros((capacity, self.dimensions), dtype=np.float32)
+                if self._matrix is not None:
+                    grown[:row] = self._matrix[:row]
+                self._matrix = grown
+            self._matrix[row] = unit
+            if self._centroids is not None:
+                self._lists[int(np.argmax(self._centroids @ self._matrix[row]))].append(row)
+        return row
+
+    # ------------------------------------------------------------------ #
+    # Search
+    # ------------------------------------------------------------------ #
+
+    def train(self, nlist: int | None = None, seed: int = 0) -> bool:
+        """Train IVF centroids with spherical k-means over the indexed vectors."""
+        with self._lock:
+            count = len(self)
+            if np is None or count < 2:
+                return False
+            nlist = nlist or max(8, int(math.sqrt(count)))
+            nlist = min(nlist, count)
+            matrix = self._matrix[:count]
+            rng = np.random.default_rng(seed)
+            sample_size = min(count, nlist * _KMEANS_SAMPLE_PER_LIST)
+            sample = matrix[rng.choice(count, size=sample_size, replace=False)]
+            centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+            for _ in range(_KMEANS_ITERATIONS):
+                assignments = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignments, sample)
+                norms = np.linalg.norm(sums, axis=1)
+                empty = norms == 0
+                sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+                norms[empty] = np.linalg.norm(sums[empty], axis=1)
+                centroids = sums / np.maximum(norms, 1e-12)[:, None]
+
+            self._centroids = centroids.astype(np.float32)
+            self._trained_size = count
+            self._assign_lists()
+            self._persist_centroids()
+            return True
+
+    def _assign_lists(self) -> None:
+        count = len(self)
+        lists: list[list[int]] = [[] for _ in range(self._centroids.shape[0])]
+        for start in range(0, count, _SCORE_CHUNK_ROWS):
+            block = self._matrix[start : min(count, start + _SCORE_CHUNK_ROWS)]
+            for offset, list_id in enumerate(np.argmax(block @ self._centroids.T, axis=1)):
+                lists[int(list_id)].append(start + offset)
+        self._lists = lists
+
+    def _maybe_train(self) -> None:
+        count = len(self)
+        if np is None or count < IVF_MIN_ENTRIES:
+            return
+        if self._centroids is None or count >= 2 * self._trained_size:
+            self.train()
+
+    def search(
+        self,
+        query: Sequence[float],
+        top_k: int | None = None,
+        cids: Iterable[str] | None = None,
+        *,
+        exact: bool = False,
+    ) -> list[tuple[str, float]]:
+        """Return ``(cid, cosine score)`` for the most similar indexed records.
+
+        Args:
+            query: Query embedding (same model/options as the index).
+            top_k: Maximum results; all eligible records when not a positive int.
+            cids: Restrict results to these CIDs (unknown CIDs are ignored).
+            exact: Force exact search even when an IVF layout is available.
+
+        Returns:
+            Pairs ordered by descending score, ties in insertion order.
+        """
+        with self._lock:
+            if not len(self) or not query or len(query) != self.dimensions:
+                return []
+            if cids is None:
+                rows = None
+            else:
+                rows = sorted({self._rows[cid] for cid in cids if cid in self._rows})
+                if not rows:
+                    return []
+            limit = top_k if isinstance(top_k, int) and top_k > 0 else None
+            unit = _unit([float(value) for value in query])
+
+            if np is None:
+                return self._search_python(unit, limit, rows)
+
+            query_vector = np.asarray(unit, dtype=np.float32)
+            eligible = len(self) if rows is None else len(rows)
+            if not exact and limit is not None and eligible > EXACT_SEARCH_MAX_ROWS:
+                self._maybe_train()
+                if self._centroids is not None:
+                    return self._search_ivf(query_vector, limit, rows)
+            selected = np.arange(len(self)) if rows is None else np.asarray(rows)
+            return self._top(selected, self._matrix[selected] @ query_vector, limit)
+
+    def _search_python(
+        self, unit: list[float], limit: int | None, rows: list[int] | None
+    ) -> list[tuple[str, float]]:
+        selected = list(range(len(self))) if rows is None else rows
+        ranked = rank_by_similarity_python(unit, [self._vectors[row] for row in selected], limit)
+        return [(self._cids[selected[index]], score) for index, score in ranked]
+
+    def _search_ivf(
+        self, query_vector: Any, limit: int, rows: list[int] | None
+    ) -> list[tuple[str, float]]:
+        allowed = None
+        if rows is not None:
+            allowed = np.zeros(len(self), dtype=bool)
+            allowed[rows] = True
+        list_order = np.argsort(-(self._centroids @ query_vector), kind="stable")
+        nprobe = min(self.nprobe, len(list_order))
+        while True:
+            probed = [self._lists[int(list_id)] for list_id in list_order[:nprobe]]
+            selected = np.fromiter(
+                (row for members in probed for row in members),
+                dtype=np.int64,
+            )
+            if allowed is not None:
+                selected = selected[allowed[selected]]
+            # Widen the probe until enough eligible rows are found.
+            if len(selected) >= limit or nprobe >= len(list_order):
+                break
+            nprobe = min(len(list_order), nprobe * 2)
+        selected.sort()
+        return self._top(selected, self._matrix[selected] @ query_vector, limit)
+
+    def _top(self, selected: Any, scores: Any, limit: int | None) -> list[tuple[str, float]]:
+        count = len(selected) if limit is None else min(limit, len(selected))
+        if count == 0:
+            return []
+        if count < len(selected):
+            kth = scores[np.argpartition(-scores, count - 1)[:count]].min()
+            keep = np.flatnonzero(scores >= kth)
+            selected, scores = selected[keep], scores[keep]
+        order = np.lexsort((selected, -scores))[:count]
+        return [(self._cids[int(selected[i])], float(scores[i])) for i in order]
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    def _file(self, name: str) -> Path:
+        assert self.path is not None
+        return self.path / name
+
+    @contextmanager
+    def _files_locked(self) -> Iterator[None]:
+        """Hold the cross-process lock that serializes writes to the index files."""
+        assert self.path is not None
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self._file(".lock"), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _write_meta(self) -> None:
+        if self.path is None:
+            return
+        with self._files_locked():
+            self._file("meta.json").write_text(
+                json.dumps({"dimensions": self.dimensions}), encoding="utf-8"
+            )
+
+    def _persist_row(self, cid: str, candidate: dict[str, Any], unit: Sequence[float]) -> None:
+        with self._files_locked():
+            with open(self._file("vectors.f32"), "ab") as handle:
+                handle.write(array("f", unit).tobytes())
+            with open(self._file("entries.jsonl"), "a", encoding="utf-8") as handle:
+                handle.write(json.dumps({"cid": cid, "candidate": candidate}, default=str) + "\n")
+
+    def _persist_centroids(self) -> None:
+        if self.path is None:
+            return
+        with self._files_locked():
+            self._file("centroids.f32").write_bytes(self._centroids.astype(np.float32).tobytes())
+            self._file("ivf.json").write_text(
+                json.dumps(
+                    {"nlist": int(self._centroids.shape[0]), "trained_size": self._trained_size}
+                ),
+                encoding="utf-8",
+            )
+
+    def _load(self) -> None:
+        if not self.path.is_dir():
+            return
+        with self._files_locked():
+            self._load_locked()
+
+    def _load_locked(self) -> None:
+        try:
+            meta = json.loads(self._file("meta.json").read_text(encoding="utf-8"))
+            self.dimensions = int(meta["dimensions"])
+            raw_vectors = self._file("vectors.f32").read_bytes()
+            entry_lines = self._file("entries.jsonl").read_text(encoding="utf-8").splitlines()
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+        vectors = array("f")
+        row_bytes = self.dimensions * vectors.itemsize
+        vectors.frombytes(raw_vectors[: len(raw_vectors) - len(raw_vectors) % row_bytes])
+        count = 0
+        for line in entry_lines[: len(vectors) // self.dimensions]:
+            try:
+                entry = json.loads(line)
+                cid, candidate = entry["cid"], entry["candidate"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                break
+            start = count * self.dimensions
+            count += 1
+            if cid in self._rows:
+                # Another process indexed the same record concurrently.
+                continue
+            self._append_row(cid, candidate, vectors[start : start + self.dimensions])
+        if count * row_bytes != len(raw_vectors) or count != len(entry_lines):
+            self._rewrite(vectors[: count * self.dimensions], entry_lines[:count])
+        self._load_centroids()
+
+    def _rewrite(self, vectors: array, entry_lines: list[str]) -> None:
+        """Drop torn or unmatched trailing rows left by an interrupted append."""
+        self._file("vectors.f32").write_bytes(vectors.tobytes())
+        self._file("entries.jsonl").write_text(
+            "".join(line + "\n" for line in entry_lines), encoding="utf-8"
+        )
+
+    def _load_centroids(self) -> None:
+        if np is None or not len(self):
+            return
+        try:
+            ivf = json.loads(self._file("ivf.json").read_text(encoding="utf-8"))
+            centroids = np.fromfile(self._file("centroids.f32"), dtype=np.float32)
+        except (OSError, ValueError):
+            return
+        nlist = int(ivf.get("nlist", 0))
+        if nlist <= 0 or centroids.size != nlist * self.dimensions:
+            return
+        self._centroids = centroids.reshape(nlist, self.dimensions)
+        self._trained_size = int(ivf.get("trained_size", len(self)))
+        self._assign_lists()
+
+
+def _failure_index_root() -> Path | None:
+    configured = os.getenv("HANDSFREE_AI_FAILURE_INDEX_PATH")
+    if configured is not None:
+        return Path(configured) if configured.strip() else None
+
+    from handsfree.db.connection import get_db_path
+
+    db_path = get_db_path()
+    if db_path == ":memory:":
+        return None
+    return Path(db_path).parent / "ai_failure_index"
+
+
+@lru_cache(maxsize=8)
+def _get_failure_index(path: str, nprobe: int) -> FailureVectorIndex:
+    return FailureVectorIndex(path, nprobe=nprobe)
+
+
+def get_failure_index(embedding_options: dict[str, Any] | None = None) -> FailureVectorIndex | None:
+    """Get the persistent failure index for vectors embedded with ``embedding_options``.
+
+    Returns None when the index is disabled: ``HANDSFREE_AI_FAILURE_INDEX_PATH``
+    is set to an empty string, or it is unset and the main database is
+    in-memory.  Otherwise the index lives under that path (default:
+    ``ai_failure_index`` next to the main database), in a directory keyed on
+    the options and the model they resolve to on the embeddings backend.
+    """
+    root = _failure_index_root()
+    if root is None:
+        return None
+    try:
+        nprobe = int(os.getenv("HANDSFREE_AI_FAILURE_INDEX_NPROBE", DEFAULT_NPROBE))
+    except ValueError:
+        nprobe = DEFAULT_NPROBE
+    from handsfree.ipfs_datasets_routers import get_embeddings_router
+
+    options = embedding_options or {}
+    model = resolve_embedding_model(
+        options, resolve_embedding_model_identity(get_embeddings_router())
+    )
+    digest = embedding_options_digest({"model": model, "options": options})[:16]
+    return _get_failure_index(str(root / digest), nprobe)
+
+
+_pending_records: deque[tuple[str, dict[str, Any]]] = deque(maxlen=PENDING_MAX_RECORDS)
+_pending_lock = threading.Lock()
+
+
+def reset_failure_index_cache() -> None:
+    """Drop loaded failure indexes and queued records (primarily for tests)."""
+    _get_failure_index.cache_clear()
+    with _pending_lock:
+        _pending_records.clear()
+
+
+def queue_failure_history_record(cid: str, candidate: dict[str, Any]) -> None:
+    """Queue a newly stored failure record for the default-options index.
+
+    The queue is bounded: when the maintenance job falls behind, the oldest
+    records are dropped and are embedded on their first similarity query instead.
+    """
+    with _pending_lock:
+        _pending_records.append((cid, dict(candidate)))
+
+
+def index_pending_failure_history(batch_size: int = 64) -> int:
+    """Embed queued failure records in batches and add them to the index.
+
+    Best effort: returns the number of records indexed.  Records are dropped
+    when the index is disabled, already indexed, or embedding fails.
+    """
+    batch_size = max(1, batch_size)
+    indexed = 0
+    while True:
+        with _pending_lock:
+            batch = [
+                _pending_records.popleft() for _ in range(min(batch_size, len(_pending_records)))
+            ]
+        if not batch:
+            return indexed
+        failure_index = get_failure_index()
+        if failure_index is None:
+            continue
+        records = {
+            cid: normalize_failure_candidate(candidate)
+            for cid, candidate in batch
+            if cid not in failure_index
+        }
+        if not records:
+            continue
+
+        from handsfree.ipfs_datasets_routers import get_embeddings_router
+
+        try:
+            vectors = get_embeddings_router().embed_texts(
+                [candidate["match_text"] for candidate in records.values()]
+            )
+        except Exception as exc:  # noqa: BLE001 - indexing is an optimization
+            logger.debug("Skipping failure index update for %d records: %s", len(records), exc)
+            continue
+        for (cid, candidate), vector in zip(records.items(), vectors, strict=False):
+            indexed += failure_index.add(cid, candidate, vector)
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any
-
 import duckdb
 
-from handsfree.db.action_logs import get_action_logs
-from handsfree.db.ai_history_index import get_ai_history_records
+from handsfree.db.ai_history_index import (
+    FAILURE_ANALYSIS_CAPABILITY,
+    get_ai_history_records,
+)
 
 
 def discover_failure_history_cids(
@@ -35,57 +35,16 @@ def discover_failure_history_cids(
         derived_failure_target = check_name
         derived_failure_target_type = "check"
 
+    # The index alone answers the lookup; logs it is missing are indexed by the
+    # maintenance job's backfill, never on the request path.
     indexed = get_ai_history_records(
         conn,
         user_id=user_id,
-        capability_id="github.check.failure_rag_explain",
+        capability_id=FAILURE_ANALYSIS_CAPABILITY,
         repo=repo,
         failure_target=derived_failure_target,
         failure_target_type=derived_failure_target_type,
         exclude_pr_number=pr_number,
         limit=limit,
     )
-    if indexed:
-        return [record.ipfs_cid for record in indexed]
-
-    logs = get_action_logs(conn, user_id=user_id, limit=limit)
-    discovered: list[str] = []
-    seen: set[str] = set()
-
-    for log in logs:
-        if log.action_type != "ai.execute.github.check.failure_rag_explain" or not log.ok:
-            continue
-        if not isinstance(log.result, dict):
-            continue
-
-        output_payload = _as_dict(log.result.get("output"))
-        typed_payload = _as_dict(log.result.get("typed_output"))
-        cid = output_payload.get("ipfs_cid") or typed_payload.get("ipfs_cid")
-        if not isinstance(cid, str) or not cid.strip() or cid in seen:
-            continue
-
-        logged_repo = output_payload.get("repo") or typed_payload.get("repo")
-        if logged_repo != repo:
-            continue
-
-        logged_pr = output_payload.get("pr_number") or typed_payload.get("pr_number")
-        if pr_number is not None and logged_pr == pr_number:
-            continue
-
-        logged_target = output_payload.get("failure_target") or typed_payload.get("failure_target")
-        logged_target_type = output_payload.get("failure_target_type") or typed_payload.get(
-            "failure_target_type"
-        )
-        if derived_failure_target and logged_target != derived_failure_target:
-            continue
-        if derived_failure_target_type and logged_target_type != derived_failure_target_type:
-            continue
-
-        discovered.append(cid)
-        seen.add(cid)
-
-    return discovered
-
-
-def _as_dict(value: Any) -> dict[str, Any]:
-    return value if isinstance(value, dict) else {}
+    return [record.ipfs_cid for record in indexed]
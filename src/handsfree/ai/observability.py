@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import os
 from collections import Counter
+from collections.abc import Iterable
 from datetime import UTC, datetime, timedelta
 
 import duckdb
 
-from handsfree.db.action_logs import get_action_logs
 from handsfree.db.ai_backend_policy_snapshots import get_latest_ai_backend_policy_snapshot
+from handsfree.db.ai_policy_rollups import AIPolicyRollup, summarize_ai_policy_rollups
 from handsfree.github.auth import _is_live_mode_requested, resolve_github_auth_source
 from handsfree.models import (
     AIBackendPolicyBucketReport,
@@ -132,44 +133,34 @@ def build_ai_backend_policy_history_report(
     bucket_hours: int = 1,
     limit: int = 1000,
 ) -> AIBackendPolicyHistoryReport:
-    """Return bucketed historical backend-policy activity from action logs."""
-    logs = get_action_logs(conn, user_id=user_id, limit=limit)
+    """Return bucketed historical backend-policy activity from the policy rollups.
+
+    ``limit`` is deprecated and ignored; rollups are never truncated.
+    """
     now = datetime.now(UTC)
     window_start = now - timedelta(hours=window_hours)
+    bucket_size = timedelta(hours=bucket_hours)
+    rollups = summarize_ai_policy_rollups(
+        conn,
+        user_id=user_id,
+        since=window_start,
+        until=now,
+        bucket_seconds=int(bucket_size.total_seconds()),
+    )
 
     buckets: list[AIBackendPolicyHistoryBucket] = []
     current_start = window_start
     while current_start < now:
-        current_end = min(current_start + timedelta(hours=bucket_hours), now)
-        ai_execute_logs = 0
-        policy_applied_count = 0
-        remap_counter: Counter[str] = Counter()
-
-        for log in logs:
-            if not log.action_type.startswith("ai.execute."):
-                continue
-            log_time = log.created_at.astimezone(UTC)
-            if not (current_start <= log_time < current_end):
-                continue
-            ai_execute_logs += 1
-            result = log.result if isinstance(log.result, dict) else {}
-            policy_resolution = result.get("policy_resolution")
-            if not isinstance(policy_resolution, dict):
-                continue
-            if not policy_resolution.get("policy_applied"):
-                continue
-            policy_applied_count += 1
-            requested = policy_resolution.get("requested_workflow") or "unknown"
-            resolved = policy_resolution.get("resolved_workflow") or "unknown"
-            remap_counter[f"{requested}->{resolved}"] += 1
-
+        current_end = min(current_start + bucket_size, now)
+        counters = _PolicyCounters()
+        counters.add_all(rollup for rollup in rollups if rollup.bucket_index == len(buckets))
         buckets.append(
             AIBackendPolicyHistoryBucket(
                 started_at=current_start,
                 ended_at=current_end,
-                ai_execute_logs=ai_execute_logs,
-                policy_applied_count=policy_applied_count,
-                remap_counts=dict(sorted(remap_counter.items())),
+                ai_execute_logs=counters.ai_execute_logs,
+                policy_applied_count=counters.applied_count,
+                remap_counts=_sorted_counts(counters.remaps),
             )
         )
         current_start = current_end
@@ -188,90 +179,83 @@ def build_ai_backend_policy_history_report(
     )
 
 
+class _PolicyCounters:
+    """Report counters accumulated from policy rollup rows."""
+
+    def __init__(self) -> None:
+        self.actions: Counter[str] = Counter()
+        self.remaps: Counter[str] = Counter()
+        self.remapped_capabilities: Counter[str] = Counter()
+        self.direct_capabilities: Counter[str] = Counter()
+        self.requested_workflows: Counter[str] = Counter()
+        self.resolved_workflows: Counter[str] = Counter()
+        self.applied_count = 0
+
+    @property
+    def ai_execute_logs(self) -> int:
+        return sum(self.actions.values())
+
+    def add_all(self, rollups: Iterable[AIPolicyRollup]) -> _PolicyCounters:
+        for rollup in rollups:
+            self.actions[rollup.action_type] += rollup.count
+            if not rollup.policy_applied:
+                self.direct_capabilities[rollup.capability_id] += rollup.count
+                continue
+            self.applied_count += rollup.count
+            self.remapped_capabilities[rollup.capability_id] += rollup.count
+            self.remaps[rollup.remap_key] += rollup.count
+            self.requested_workflows[rollup.requested_workflow] += rollup.count
+            self.resolved_workflows[rollup.resolved_workflow] += rollup.count
+        return self
+
+    def bucket_report(self) -> AIBackendPolicyBucketReport:
+        return AIBackendPolicyBucketReport(
+            ai_execute_logs=self.ai_execute_logs,
+            policy_applied_count=self.applied_count,
+            remapped_capability_counts=_sorted_counts(self.remapped_capabilities),
+            direct_capability_counts=_sorted_counts(self.direct_capabilities),
+            requested_workflow_counts=_sorted_counts(self.requested_workflows),
+            resolved_workflow_counts=_sorted_counts(self.resolved_workflows),
+            remap_counts=_sorted_counts(self.remaps),
+            action_counts=_sorted_counts(self.actions),
+        )
+
+
+def _sorted_counts(counter: Counter[str]) -> dict[str, int]:
+    return dict(sorted(counter.items()))
+
+
 def build_ai_backend_policy_report(
     conn: duckdb.DuckDBPyConnection,
     *,
     user_id: str,
     limit: int = 200,
+    window_hours: int | None = None,
 ) -> AIBackendPolicyReport:
-    """Return current backend policy plus recent remap counts from action logs."""
-    logs = get_action_logs(conn, user_id=user_id, limit=limit)
-    now = datetime.now(UTC)
+    """Return current backend policy plus remap counts from the policy rollups.
 
-    remap_counter: Counter[str] = Counter()
-    remapped_capability_counter: Counter[str] = Counter()
-    direct_capability_counter: Counter[str] = Counter()
-    requested_workflow_counter: Counter[str] = Counter()
-    resolved_workflow_counter: Counter[str] = Counter()
-    action_counter: Counter[str] = Counter()
-    applied_count = 0
-    bucket_counters: dict[str, dict[str, Counter[str] | int]] = {
-        "last_hour": {
-            "action_counter": Counter(),
-            "remap_counter": Counter(),
-            "remapped_capability_counter": Counter(),
-            "direct_capability_counter": Counter(),
-            "requested_workflow_counter": Counter(),
-            "resolved_workflow_counter": Counter(),
-            "applied_count": 0,
-        },
-        "last_24_hours": {
-            "action_counter": Counter(),
-            "remap_counter": Counter(),
-            "remapped_capability_counter": Counter(),
-            "direct_capability_counter": Counter(),
-            "requested_workflow_counter": Counter(),
-            "resolved_workflow_counter": Counter(),
-            "applied_count": 0,
-        },
+    Overall counts cover the last ``window_hours`` (default: all recorded
+    activity).  ``limit`` is deprecated and ignored, since rollups are never
+    truncated; it is only echoed in the deprecated ``recent_window.log_limit``.
+    """
+    now = datetime.now(UTC)
+    overall = _PolicyCounters().add_all(
+        summarize_ai_policy_rollups(
+            conn,
+            user_id=user_id,
+            since=now - timedelta(hours=window_hours) if window_hours else None,
+        )
+    )
+    time_buckets = {
+        bucket_name: _PolicyCounters()
+        .add_all(summarize_ai_policy_rollups(conn, user_id=user_id, since=now - window))
+        .bucket_report()
+        for bucket_name, window in (
+            ("last_hour", timedelta(hours=1)),
+            ("last_24_hours", timedelta(hours=24)),
+        )
     }
 
-    for log in logs:
-        if not log.action_type.startswith("ai.execute."):
-            continue
-        action_counter[log.action_type] += 1
-        age = now - log.created_at.astimezone(UTC)
-        matching_buckets = []
-        if age <= timedelta(hours=1):
-            matching_buckets.append("last_hour")
-        if age <= timedelta(hours=24):
-            matching_buckets.append("last_24_hours")
-        for bucket_name in matching_buckets:
-            bucket_counters[bucket_name]["action_counter"][log.action_type] += 1
-        result = log.result if isinstance(log.result, dict) else {}
-        policy_resolution = result.get("policy_resolution")
-        capability_id = None
-        if isinstance(result, dict):
-            raw_capability_id = result.get("capability_id")
-            if isinstance(raw_capability_id, str) and raw_capability_id:
-                capability_id = raw_capability_id
-        if capability_id is None:
-            capability_id = log.action_type.removeprefix("ai.execute.")
-        if not isinstance(policy_resolution, dict):
-            direct_capability_counter[capability_id] += 1
-            for bucket_name in matching_buckets:
-                bucket_counters[bucket_name]["direct_capability_counter"][capability_id] += 1
-            continue
-        if not policy_resolution.get("policy_applied"):
-            direct_capability_counter[capability_id] += 1
-            for bucket_name in matching_buckets:
-                bucket_counters[bucket_name]["direct_capability_counter"][capability_id] += 1
-            continue
-        applied_count += 1
-        remapped_capability_counter[capability_id] += 1
-        requested = policy_resolution.get("requested_workflow") or "unknown"
-        resolved = policy_resolution.get("resolved_workflow") or "unknown"
-        remap_key = f"{requested}->{resolved}"
-        remap_counter[remap_key] += 1
-        requested_workflow_counter[requested] += 1
-        resolved_workflow_counter[resolved] += 1
-        for bucket_name in matching_buckets:
-            bucket_counters[bucket_name]["applied_count"] += 1
-            bucket_counters[bucket_name]["remap_counter"][remap_key] += 1
-            bucket_counters[bucket_name]["remapped_capability_counter"][capability_id] += 1
-            bucket_counters[bucket_name]["requested_workflow_counter"][requested] += 1
-            bucket_counters[bucket_name]["resolved_workflow_counter"][resolved] += 1
-
     def _top_entries(counter: Counter[str], max_items: int = 5) -> list[AICapabilityUsageCount]:
         return [
             AICapabilityUsageCount(capability_id=capability_id, count=count)
@@ -295,44 +279,23 @@ def build_ai_backend_policy_report(
         policy=policy,
         recent_window=AIBackendPolicyWindow(
             log_limit=limit,
-            ai_execute_logs=sum(action_counter.values()),
-            policy_applied_count=applied_count,
+            window_hours=window_hours,
+            ai_execute_logs=overall.ai_execute_logs,
+            policy_applied_count=overall.applied_count,
         ),
-        time_buckets={
-            bucket_name: AIBackendPolicyBucketReport(
-                ai_execute_logs=sum(bucket_data["action_counter"].values()),
-                policy_applied_count=int(bucket_data["applied_count"]),
-                remapped_capability_counts=dict(
-                    sorted(bucket_data["remapped_capability_counter"].items())
-                ),
-                direct_capability_counts=dict(
-                    sorted(bucket_data["direct_capability_counter"].items())
-                ),
-                requested_workflow_counts=dict(
-                    sorted(bucket_data["requested_workflow_counter"].items())
-                ),
-                resolved_workflow_counts=dict(
-                    sorted(bucket_data["resolved_workflow_counter"].items())
-                ),
-                remap_counts=dict(sorted(bucket_data["remap_counter"].items())),
-                action_counts=dict(sorted(bucket_data["action_counter"].items())),
-            )
-            for bucket_name, bucket_data in bucket_counters.items()
-        },
+        time_buckets=time_buckets,
         top_capabilities=AITopCapabilities(
-            overall=_top_entries(
-                Counter(remapped_capability_counter) + Counter(direct_capability_counter)
-            ),
-            remapped=_top_entries(remapped_capability_counter),
-            direct=_top_entries(direct_capability_counter),
+            overall=_top_entries(overall.remapped_capabilities + overall.direct_capabilities),
+            remapped=_top_entries(overall.remapped_capabilities),
+            direct=_top_entries(overall.direct_capabilities),
         ),
-        top_remaps=_top_remaps(remap_counter),
-        remapped_capability_counts=dict(sorted(remapped_capability_counter.items())),
-        direct_capability_counts=dict(sorted(direct_capability_counter.items())),
-        requested_workflow_counts=dict(sorted(requested_workflow_counter.items())),
-        resolved_workflow_counts=dict(sorted(resolved_workflow_counter.items())),
-        remap_counts=dict(sorted(remap_counter.items())),
-        action_counts=dict(sorted(action_counter.items())),
+        top_remaps=_top_remaps(overall.remaps),
+        remapped_capability_counts=_sorted_counts(overall.remapped_capabilities),
+        direct_capability_counts=_sorted_counts(overall.direct_capabilities),
+        requested_workflow_counts=_sorted_counts(overall.requested_workflows),
+        resolved_workflow_counts=_sorted_counts(overall.resolved_workflows),
+        remap_counts=_sorted_counts(overall.remaps),
+        action_counts=_sorted_counts(overall.actions),
         snapshot_summary=build_snapshot_summary(policy=policy, latest_snapshot=latest_snapshot),
         latest_snapshot=latest_snapshot,
         snapshot_health=build_snapshot_health(latest_snapshot),
@@ -0,0 +1,144 @@
+"""Dependency-graph executor for composite AI capabilities.
+
+Composite capabilities chain several backend calls (GitHub, embeddings,
+retrieval, generation, IPFS persistence).  Expressing them as a
+:class:`CompositePipeline` of named :class:`PipelineStep` objects lets steps
+that do not depend on each other run concurrently, skips steps whose outputs
+are not needed for the requested targets, and records per-step timings.
+
+Each step's callable receives the outputs of its dependencies as keyword
+arguments named after those steps.  Steps run inline in the calling thread
+when nothing else is ready; otherwise ready steps are started on a per-run
+thread pool.  The first step failure is re-raised and no further steps are
+started.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class PipelineStep:
+    """One named unit of work and the steps whose outputs it consumes."""
+
+    name: str
+    run: Callable[..., Any]
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class PipelineRun:
+    """Outputs and wall-clock timings of the steps a pipeline executed."""
+
+    outputs: dict[str, Any] = field(default_factory=dict)
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.outputs[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.outputs.get(name, default)
+
+
+class CompositePipeline:
+    """A validated, acyclic set of :class:`PipelineStep` objects."""
+
+    def __init__(self, steps: Iterable[PipelineStep]) -> None:
+        self.steps: dict[str, PipelineStep] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"Duplicate pipeline step: {step.name}")
+            self.steps[step.name] = step
+        for step in self.steps.values():
+            unknown = [name for name in step.depends_on if name not in self.steps]
+            if unknown:
+                raise ValueError(f"Step {step.name} depends on unknown steps: {unknown}")
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        state: dict[str, int] = {}
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Pipeline cycle: {' -> '.join((*path, name))}")
+            state[name] = 1
+            for dependency in self.steps[name].depends_on:
+                visit(dependency, (*path, name))
+            state[name] = 2
+
+        for name in self.steps:
+            visit(name, ())
+
+    def required_steps(self, targets: Iterable[str] | None = None) -> set[str]:
+        """Return ``targets`` and everything they transitively depend on."""
+        if targets is None:
+            return set(self.steps)
+        required: set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in required:
+                continue
+            if name not in self.steps:
+                raise KeyError(f"Unknown pipeline step: {name}")
+            required.add(name)
+            stack.extend(self.steps[name].depends_on)
+        return required
+
+    def _call(self, step: PipelineStep, run: PipelineRun) -> Any:
+        kwargs = {name: run.outputs[name] for name in step.depends_on}
+        started = time.perf_counter()
+        try:
+            return step.run(**kwargs)
+        finally:
+            run.timings_ms[step.name] = round((time.perf_counter() - started) * 1000, 3)
+
+    def run(
+        self,
+        targets: Iterable[str] | None = None,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> PipelineRun:
+        """Execute the steps needed for ``targets`` (all steps when None)."""
+        required = self.required_steps(targets)
+        waiting = {name: set(self.steps[name].depends_on) for name in required}
+        result = PipelineRun()
+        executor: ThreadPoolExecutor | None = None
+        running: dict[Future[Any], str] = {}
+        try:
+            while waiting or running:
+                ready = [name for name, deps in waiting.items() if not deps]
+                for name in ready:
+                    del waiting[name]
+                if len(ready) == 1 and not running:
+                    completed = [(ready[0], self._call(self.steps[ready[0]], result))]
+                else:
+                    if ready and executor is None:
+                        executor = ThreadPoolExecutor(
+                            max_workers=max(1, max_workers),
+                            thread_name_prefix="handsfree-ai-pipeline",
+                        )
+                    for name in ready:
+                        context = contextvars.copy_context()
+                        future = executor.submit(context.run, self._call, self.steps[name], result)
+                        running[future] = name
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    completed = [(running.pop(future), future.result()) for future in done]
+                for name, output in completed:
+                    result.outputs[name] = output
+                    for deps in waiting.values():
+                        deps.discard(name)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        return result
@@ -0,0 +1,132 @@
+"""Similarity ranking for embedding vectors.
+
+With NumPy installed, candidates are stacked into one matrix, scored against
+the normalized query with a single matrix-vector product divided by the row
+norms, and the top ``k`` are selected with ``argpartition`` instead of a full
+sort.  Without NumPy (or for inputs the vectorized path cannot represent, such
+as ragged vectors) the pure-Python implementation is used.  Both paths order
+results by descending score and keep input order for ties.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from itertools import chain
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+    NUMPY_AVAILABLE = False
+
+# Below this many candidates, building the matrix costs more than it saves.
+VECTORIZED_MIN_CANDIDATES = 16
+
+RankedIndex = tuple[int, float]
+
+
+def cosine_similarity(left: Sequence[float], right: Sequence[float]) -> float:
+    """Compute cosine similarity for two embedding vectors."""
+    if not left or not right or len(left) != len(right):
+        return 0.0
+
+    dot_product = sum(
+        left_value * right_value for left_value, right_value in zip(left, right, strict=False)
+    )
+    left_norm = sum(value * value for value in left) ** 0.5
+    right_norm = sum(value * value for value in right) ** 0.5
+    if left_norm == 0 or right_norm == 0:
+        return 0.0
+    return dot_product / (left_norm * right_norm)
+
+
+def _limit(top_k: int | None, count: int) -> int:
+    if isinstance(top_k, int) and top_k > 0:
+        return min(top_k, count)
+    return count
+
+
+def rank_by_similarity_python(
+    query: Sequence[float],
+    candidates: Sequence[Sequence[float]],
+    top_k: int | None = None,
+) -> list[RankedIndex]:
+    """Rank candidates with the pure-Python cosine similarity and a full sort."""
+    scored = [(index, cosine_similarity(query, vector)) for index, vector in enumerate(candidates)]
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[: _limit(top_k, len(scored))]
+
+
+def rank_by_similarity_numpy(
+    query: Sequence[float],
+    candidates: Sequence[Sequence[float]],
+    top_k: int | None = None,
+) -> list[RankedIndex] | None:
+    """Rank candidates with one matrix-vector product and ``argpartition``.
+
+    Returns None when NumPy is unavailable or the vectors do not form a
+    matrix matching the query's dimensions.
+    """
+    if np is None or not candidates or not query:
+        return None
+    dimensions = len(query)
+    if any(len(vector) != dimensions for vector in candidates):
+        return None
+    try:
+        matrix = np.fromiter(
+            chain.from_iterable(candidates),
+            dtype=np.float64,
+            count=len(candidates) * dimensions,
+        ).reshape(len(candidates), dimensions)
+        query_vector = np.asarray(query, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+
+    scores = np.zeros(len(candidates))
+    query_norm = float(np.linalg.norm(query_vector))
+    if query_norm > 0:
+        # Normalize the query once and divide the raw dot products by the row
+        # norms, rather than materializing a normalized copy of the matrix.
+        row_norms = np.linalg.norm(matrix, axis=1)
+        np.divide(
+            matrix @ (query_vector / query_norm),
+            row_norms,
+            out=scores,
+            where=row_norms > 0,
+        )
+
+    count = _limit(top_k, len(candidates))
+    if count < len(candidates):
+        partitioned = np.argpartition(-scores, count - 1)[:count]
+        # Widen to every candidate tied with the k-th score so tie-breaking by
+        # index below matches the stable sort of the pure-Python path.
+        selected = np.flatnonzero(scores >= scores[partitioned].min())
+    else:
+        selected = np.arange(len(candidates))
+    # Descending score, then ascending index so ties keep input order.
+    order = selected[np.lexsort((selected, -scores[selected]))][:count]
+    return [(int(index), float(scores[index])) for index in order]
+
+
+def rank_by_similarity(
+    query: Sequence[float],
+    candidates: Sequence[Sequence[float]],
+    top_k: int | None = None,
+) -> list[RankedIndex]:
+    """Return ``(candidate_index, score)`` pairs for the ``top_k`` most similar candidates.
+
+    Args:
+        query: Query embedding.
+        candidates: Candidate embeddings.
+        top_k: Maximum number of results; all candidates when not a positive int.
+
+    Returns:
+        Pairs ordered by descending cosine similarity, ties in input order.
+    """
+    if len(candidates) >= VECTORIZED_MIN_CANDIDATES:
+        ranked = rank_by_similarity_numpy(query, candidates, top_k)
+        if ranked is not None:
+            return ranked
+    return rank_by_similarity_python(query, candidates, top_k)
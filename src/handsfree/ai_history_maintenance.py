@@ -0,0 +1,163 @@
+"""Background maintenance for the AI history index.
+
+Pruning ``ai_history_index`` used to run on every
+:func:`~handsfree.db.ai_history_index.store_ai_history_record` call.
+:class:`AIHistoryMaintenance` moves it to a background thread.  Each cycle
+first advances the backfill cursor over action logs (indexing analyses whose
+write-path indexing failed) and embeds the failure records queued for the
+similarity index.  It then repeats bounded compaction
+passes (retention, deduplication, per-user limits) until a pass removes
+nothing, and sleeps for ``interval_seconds``.  The thread
+works on its own cursor of the application's connection, so its batches
+commit independently of request handling.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from typing import Any
+
+import duckdb
+
+from handsfree.ai.failure_index import index_pending_failure_history
+from handsfree.db.ai_history_index import (
+    DEFAULT_MAINTENANCE_BATCH_SIZE,
+    backfill_ai_history_index,
+    compact_ai_history_index,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 300.0
+
+
+class AIHistoryMaintenance:
+    """Backfills and compacts ``ai_history_index`` off the request path."""
+
+    def __init__(
+        self,
+        conn: duckdb.DuckDBPyConnection,
+        *,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        batch_size: int = DEFAULT_MAINTENANCE_BATCH_SIZE,
+    ) -> None:
+        self.conn = conn
+        self.interval_seconds = interval_seconds
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_run: dict[str, Any] = {}
+
+    def run_once(self, conn: duckdb.DuckDBPyConnection | None = None) -> dict[str, Any]:
+        """Run one maintenance cycle and return what it did."""
+        conn = conn or self.conn
+        backfilled = backfill_ai_history_index(conn, batch_size=self.batch_size)
+        indexed = index_pending_failure_history(batch_size=self.batch_size)
+        removed = {"expired": 0, "duplicates": 0, "over_limit": 0}
+        while not self._stopped.is_set():
+            compaction = compact_ai_history_index(conn, batch_size=self.batch_size)
+            removed["expired"] += compaction.expired
+            removed["duplicates"] += compaction.duplicates
+            removed["over_limit"] += compaction.over_limit
+            if not compaction.total:
+                break
+        summary = {"backfilled": backfilled, "indexed": indexed, "removed": removed}
+        with self._lock:
+            self._last_run = summary
+        return summary
+
+    def _run(self) -> None:
+        cursor = self.conn.cursor()
+        try:
+            while not self._stopped.is_set():
+                try:
+                    self.run_once(cursor)
+                except duckdb.Error as exc:
+                    # Typically a write conflict with a request or a closed
+                    # connection; retried next cycle.
+                    logger.warning("AI history maintenance failed: %s", exc)
+                self._stopped.wait(self.interval_seconds)
+        finally:
+            cursor.close()
+
+    def start(self) -> None:
+        """Start the background maintenance thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="handsfree-ai-history-maintenance", daemon=True
+            )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the thread and wait for it to release its cursor."""
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def last_run(self) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._last_run)
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+_service: AIHistoryMaintenance | None = None
+_service_lock = threading.Lock()
+
+
+def start_ai_history_maintenance(
+    conn: duckdb.DuckDBPyConnection,
+) -> AIHistoryMaintenance | None:
+    """Start maintenance for ``conn``, replacing any job for a previous connection.
+
+    ``HANDSFREE_AI_HISTORY_MAINTENANCE_INTERVAL_SECONDS`` sets the cycle
+    period (``0`` disables the background job) and
+    ``HANDSFREE_AI_HISTORY_MAINTENANCE_BATCH_SIZE`` the rows per batch.
+    """
+    global _service
+    interval_seconds = _float_env(
+        "HANDSFREE_AI_HISTORY_MAINTENANCE_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS
+    )
+    with _service_lock:
+        if _service is not None:
+            _service.stop()
+            _service = None
+        if interval_seconds <= 0:
+            return None
+        _service = AIHistoryMaintenance(
+            conn,
+            interval_seconds=interval_seconds,
+            batch_size=int(
+                _float_env(
+                    "HANDSFREE_AI_HISTORY_MAINTENANCE_BATCH_SIZE", DEFAULT_MAINTENANCE_BATCH_SIZE
+                )
+            ),
+        )
+        _service.start()
+        return _service
+
+
+@atexit.register
+def stop_ai_history_maintenance() -> None:
+    """Stop the running maintenance job, if any.
+
+    Registered to run at exit so the thread's cursor is closed before DuckDB
+    shuts down.
+    """
+    global _service
+    with _service_lock:
+        if _service is not None:
+            _service.stop()
+            _service = None
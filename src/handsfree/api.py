@@ -5,9 +5,12 @@ This implementation combines webhook handling with comprehensive API endpoints.
 
 __all__ = ["app", "get_db", "FIXTURE_USER_ID"]
 
+import asyncio
 import base64
 import json
 import logging
+import threading
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -24,6 +27,8 @@ from handsfree.actions import (
 from handsfree.agents.results_views import resolve_result_query
 from handsfree.ai import (
     AICapabilityRequest,
+    AICapabilityResult,
+    AIRequestBatchGroup,
     AIRequestContext,
     build_ai_backend_policy_config,
     build_ai_backend_policy_history_report,
@@ -35,10 +40,18 @@ from handsfree.ai import (
     build_snapshot_summary,
     discover_failure_history_cids,
     execute_ai_request,
+    get_ai_capability,
+    plan_ai_request_batch,
     resolve_policy_workflow,
 )
+from handsfree.ai_history_maintenance import start_ai_history_maintenance
 from handsfree.audio_fetch import fetch_audio_data
 from handsfree.auth import FIXTURE_USER_ID, CurrentUser
+from handsfree.backend_pools import (
+    BackendPoolSaturatedError,
+    BackendPoolTimeoutError,
+    run_in_backend_pool,
+)
 from handsfree.commands.intent_parser import IntentParser
 from handsfree.commands.intent_parser import ParsedIntent as RouterParsedIntent
 from handsfree.commands.pending_actions import PendingActionManager, RedisPendingActionManager
@@ -73,6 +86,8 @@ from handsfree.github import GitHubProvider
 from handsfree.handlers.inbox import handle_inbox_list
 from handsfree.handlers.pr_summary import handle_pr_summarize
 from handsfree.image_fetch import fetch_image_data
+from handsfree.ipfs_module_registry import start_ipfs_module_registry
+from handsfree.ipfs_status import start_ipfs_status_service
 from handsfree.logging_utils import (
     clear_request_id,
     log_error,
@@ -116,6 +131,10 @@ from handsfree.models import (
     AIBackendPolicyReport,
     AIBackendPolicySnapshotResponse,
     AIBackendPolicySnapshotsResponse,
+    AICapabilityBatchExecuteRequest,
+    AICapabilityBatchExecuteResponse,
+    AICapabilityBatchItemResult,
+    AICapabilityContext,
     AICapabilityExecuteRequest,
     AICapabilityExecuteResponse,
     AICopilotExplainFailureExecuteRequest,
@@ -125,6 +144,7 @@ from handsfree.models import (
     AIFindSimilarFailuresExecuteRequest,
     AIPRRAGSummaryExecuteRequest,
     AIStoredOutputReadExecuteRequest,
+    AIWorkflow,
     ApiKeyResponse,
     ApiKeysListResponse,
     AudioInput,
@@ -160,6 +180,7 @@ from handsfree.models import (
     DevTransportSessionClearResponse,
     DevTransportSessionCursor,
     DevTransportSessionsResponse,
+    Error,
     FollowOnTask,
     GitHubConnectionResponse,
     GitHubConnectionsListResponse,
@@ -235,6 +256,8 @@ app = FastAPI(
 from handsfree.handlers.ipfs_integration import router as ipfs_router  # noqa: E402
 
 app.include_router(ipfs_router)
+app.router.add_event_handler("startup", start_ipfs_module_registry)
+app.router.add_event_handler("startup", start_ipfs_status_service)
 
 # Database connection (initialized lazily)
 _db_conn = None
@@ -1238,10 +1261,12 @@ def get_db():
 
     Uses DUCKDB_PATH environment variable or defaults to data/handsfree.db.
     Tests set DUCKDB_PATH=:memory: in conftest.py for isolation.
+    AI history index maintenance runs in the background for the connection.
     """
     global _db_conn
     if _db_conn is None:
         _db_conn = init_db()  # Uses get_db_path() from connection.py
+        start_ai_history_maintenance(_db_conn)
     return _db_conn
 
 
@@ -1320,11 +1345,100 @@ def _invalid_parameter(message: str) -> HTTPException:
     )
 
 
-async def _execute_ai_capability_request(
+def _backend_pool_http_error(exc: Exception) -> HTTPException:
+    """Map a backend pool rejection or timeout to a 503/504 API error."""
+    if isinstance(exc, BackendPoolTimeoutError):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail={"error": "backend_timeout", "message": str(exc)},
+        )
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={"error": "backend_saturated", "message": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+def _ai_backend_pool_name(capability_id: str) -> str:
+    """Name of the backend pool that runs a capability: its backend family."""
+    try:
+        return get_ai_capability(capability_id).backend_family.value
+    except KeyError:
+        return "unknown"
+
+
+async def _execute_ai_request_in_backend_pool(
+    ai_request: AICapabilityRequest,
+    profile_config: ProfileConfig,
+) -> AICapabilityResult:
+    """Run an AI request on its backend family's pool instead of the event loop."""
+    try:
+        return await run_in_backend_pool(
+            _ai_backend_pool_name(ai_request.capability_id),
+            execute_ai_request,
+            ai_request,
+            profile_config=profile_config,
+        )
+    except (BackendPoolSaturatedError, BackendPoolTimeoutError) as exc:
+        raise _backend_pool_http_error(exc) from exc
+
+
+async def _route_command(router: CommandRouter, **route_kwargs: Any) -> dict[str, Any]:
+    """Route an intent, running AI intents on a backend pool instead of the event loop.
+
+    AI intents block on backend calls, so like ``/v1/ai/execute`` they run on
+    the pool of their capability's backend family, with their own cursor of the
+    database connection.  Other intents are routed inline.
+    """
+    capability_id = router.resolve_ai_capability_id(route_kwargs["intent"])
+    if capability_id is None:
+        return router.route(**route_kwargs)
+
+    cursor = get_db().cursor()
+    # Whoever claims the cursor closes it: the pool thread if the command runs,
+    # otherwise this coroutine once the pool rejected or dropped it.
+    claimed = threading.Lock()
+
+    def route() -> dict[str, Any]:
+        if not claimed.acquire(blocking=False):
+            return {}
+        try:
+            with router.bound_connection(cursor):
+                return router.route(**route_kwargs)
+        finally:
+            cursor.close()
+
+    try:
+        return await run_in_backend_pool(_ai_backend_pool_name(capability_id), route)
+    except (BackendPoolSaturatedError, BackendPoolTimeoutError) as exc:
+        if claimed.acquire(blocking=False):
+            cursor.close()
+        raise _backend_pool_http_error(exc) from exc
+
+
+@dataclass
+class _PreparedAIExecution:
+    """A validated AI execute request, ready to run and record."""
+
+    request: AICapabilityExecuteRequest
+    ai_request: AICapabilityRequest
+    profile_config: ProfileConfig
+    resolved_capability_id: str
+    resolved_workflow: AIWorkflow | None
+    normalized_context: AICapabilityContext
+    request_inputs: dict[str, Any]
+    options: dict[str, Any]
+
+
+def _prepare_ai_capability_request(
     request: AICapabilityExecuteRequest,
     user_id: CurrentUser,
-) -> AICapabilityExecuteResponse:
-    """Execute a shared AI capability request through the unified AI contract."""
+) -> _PreparedAIExecution | AICapabilityExecuteResponse:
+    """Resolve policy, validate, and build the typed AI request.
+
+    Returns the stored response instead when the idempotency key was already
+    processed.
+    """
     try:
         policy_workflow, policy_capability_id = resolve_policy_workflow(
             workflow=request.workflow,
@@ -1394,7 +1508,28 @@ async def _execute_ai_capability_request(
         inputs=request_inputs,
         options=options,
     )
-    result = execute_ai_request(ai_request, profile_config=profile_config)
+    return _PreparedAIExecution(
+        request=request,
+        ai_request=ai_request,
+        profile_config=profile_config,
+        resolved_capability_id=resolved_capability_id,
+        resolved_workflow=resolved_workflow,
+        normalized_context=normalized_context,
+        request_inputs=request_inputs,
+        options=options,
+    )
+
+
+def _record_ai_capability_result(
+    prepared: _PreparedAIExecution,
+    result: AICapabilityResult,
+    user_id: CurrentUser,
+) -> AICapabilityExecuteResponse:
+    """Build the API response and persist the action log, history, and idempotency key."""
+    request = prepared.request
+    resolved_capability_id = prepared.resolved_capability_id
+    resolved_workflow = prepared.resolved_workflow
+    normalized_context = prepared.normalized_context
     output = result.output if isinstance(result.output, dict) else {"value": result.output}
 
     response = build_api_execute_response(result)
@@ -1429,8 +1564,8 @@ async def _execute_ai_capability_request(
             "workflow": resolved_workflow.value if resolved_workflow else None,
             "profile": request.profile.value,
             "context": normalized_context.model_dump(),
-            "inputs": request_inputs,
-            "options": options,
+            "inputs": prepared.request_inputs,
+            "options": prepared.options,
         },
         result=response.model_dump(),
         idempotency_key=request.idempotency_key,
@@ -1456,6 +1591,7 @@ async def _execute_ai_capability_request(
             failure_target_type=output.get("failure_target_type")
             or normalized_context.failure_target_type,
             ipfs_cid=output["ipfs_cid"].strip(),
+            summary=output.get("summary"),
         )
 
     if request.idempotency_key:
@@ -1473,6 +1609,88 @@ async def _execute_ai_capability_request(
     return response
 
 
+async def _execute_ai_capability_request(
+    request: AICapabilityExecuteRequest,
+    user_id: CurrentUser,
+) -> AICapabilityExecuteResponse:
+    """Execute a shared AI capability request through the unified AI contract."""
+    prepared = _prepare_ai_capability_request(request, user_id)
+    if isinstance(prepared, AICapabilityExecuteResponse):
+        return prepared
+    result = await _execute_ai_request_in_backend_pool(prepared.ai_request, prepared.profile_config)
+    return _record_ai_capability_result(prepared, result, user_id)
+
+
+def _batch_item_error(index: int, exc: Exception) -> AICapabilityBatchItemResult:
+    """Convert a failed batch item into its per-item error entry."""
+    if isinstance(exc, BackendPoolSaturatedError | BackendPoolTimeoutError):
+        exc = _backend_pool_http_error(exc)
+    if isinstance(exc, HTTPException) and isinstance(exc.detail, dict):
+        error = Error(
+            error=str(exc.detail.get("error", "request_failed")),
+            message=str(exc.detail.get("message", "")),
+        )
+    elif isinstance(exc, KeyError | ValueError):
+        error = Error(error="invalid_request", message=str(exc).strip("'\""))
+    else:
+        error = Error(error="execution_failed", message=str(exc))
+    return AICapabilityBatchItemResult(index=index, ok=False, error=error)
+
+
+async def _execute_ai_capability_batch(
+    batch: AICapabilityBatchExecuteRequest,
+    user_id: CurrentUser,
+) -> AICapabilityBatchExecuteResponse:
+    """Execute batch items, coalescing compatible ones, and report each in order."""
+    results: list[AICapabilityBatchItemResult | None] = [None] * len(batch.items)
+    prepared_items: list[tuple[int, _PreparedAIExecution]] = []
+    for index, item in enumerate(batch.items):
+        try:
+            prepared = _prepare_ai_capability_request(item, user_id)
+        except HTTPException as exc:
+            results[index] = _batch_item_error(index, exc)
+            continue
+        if isinstance(prepared, AICapabilityExecuteResponse):
+            results[index] = AICapabilityBatchItemResult(
+                index=index, ok=prepared.ok, response=prepared
+            )
+        else:
+            prepared_items.append((index, prepared))
+
+    # Items only share a backend call when they also share a profile.
+    by_profile: dict[Profile, list[tuple[int, _PreparedAIExecution]]] = {}
+    for index, prepared in prepared_items:
+        by_profile.setdefault(prepared.request.profile, []).append((index, prepared))
+
+    async def run_group(
+        group: AIRequestBatchGroup,
+        members: list[tuple[int, _PreparedAIExecution]],
+    ) -> None:
+        profile_config = members[0][1].profile_config
+        try:
+            outcomes = await run_in_backend_pool(
+                group.backend_family, group.execute, profile_config=profile_config
+            )
+        except (BackendPoolSaturatedError, BackendPoolTimeoutError) as exc:
+            outcomes = [exc] * len(members)
+        for (index, prepared), outcome in zip(members, outcomes, strict=True):
+            if isinstance(outcome, Exception):
+                results[index] = _batch_item_error(index, outcome)
+                continue
+            response = _record_ai_capability_result(prepared, outcome, user_id)
+            results[index] = AICapabilityBatchItemResult(
+                index=index, ok=response.ok, response=response
+            )
+
+    tasks = []
+    for members in by_profile.values():
+        for group in plan_ai_request_batch([prepared.ai_request for _, prepared in members]):
+            tasks.append(run_group(group, [members[position] for position in group.indexes]))
+    await asyncio.gather(*tasks)
+
+    return AICapabilityBatchExecuteResponse(results=[result for result in results if result])
+
+
 @app.post("/v1/ai/execute", response_model=AICapabilityExecuteResponse)
 async def execute_ai_capability_endpoint(
     request: AICapabilityExecuteRequest,
@@ -1482,6 +1700,15 @@ async def execute_ai_capability_endpoint(
     return await _execute_ai_capability_request(request, user_id)
 
 
+@app.post("/v1/ai/execute/batch", response_model=AICapabilityBatchExecuteResponse)
+async def execute_ai_capability_batch_endpoint(
+    request: AICapabilityBatchExecuteRequest,
+    user_id: CurrentUser,
+) -> AICapabilityBatchExecuteResponse:
+    """Execute several shared AI capabilities, returning per-item results in order."""
+    return await _execute_ai_capability_batch(request, user_id)
+
+
 @app.post("/v1/ai/copilot/explain-pr", response_model=AICapabilityExecuteResponse)
 async def execute_ai_copilot_explain_pr_endpoint(
     request: AICopilotExplainPRExecuteRequest,
@@ -1572,9 +1799,16 @@ async def execute_ai_accelerate_generate_and_store_endpoint(
     return await _execute_ai_capability_request(request.to_execute_request(), user_id)
 
 
-def _normalize_mcp_task_result(task: Any) -> dict[str, Any] | None:
-    """Return a client-friendly MCP result summary for an agent task."""
-    trace = task.trace or {}
+def _normalize_mcp_task_result(
+    task: Any, trace: dict[str, Any] | None = None
+) -> dict[str, Any] | None:
+    """Return a client-friendly MCP result summary for an agent task.
+
+    ``trace`` overrides ``task.trace``, e.g. with the task's hot trace summary.
+    """
+    if trace is None:
+        trace = task.trace
+    trace = trace or {}
     if not isinstance(trace, dict):
         return None
 
@@ -1643,6 +1877,10 @@ def _normalize_mcp_task_result(task: Any) -> dict[str, Any] | None:
         if isinstance(follow_up_actions, list) and follow_up_actions:
             normalized["follow_up_actions"] = follow_up_actions
 
+    # Hot trace summaries carry the result CID in place of the result payloads.
+    if "cid" not in normalized and trace.get("mcp_result_cid"):
+        normalized["cid"] = trace["mcp_result_cid"]
+
     started_at = trace.get("mcp_started_at")
     if isinstance(started_at, str) and started_at.strip():
         normalized["mcp_started_at"] = started_at
@@ -1663,8 +1901,13 @@ def _normalize_mcp_task_result(task: Any) -> dict[str, Any] | None:
     return normalized
 
 
-def _serialize_agent_task(task: Any) -> dict[str, Any]:
-    """Serialize an AgentTask into API shape."""
+def _serialize_agent_task(task: Any, trace: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Serialize an AgentTask into API shape.
+
+    ``trace`` overrides ``task.trace``, e.g. with the task's hot trace summary.
+    """
+    if trace is None:
+        trace = task.trace
     task_data = {
         "id": task.id,
         "state": task.state,
@@ -1677,40 +1920,38 @@ def _serialize_agent_task(task: Any) -> dict[str, Any]:
         task_data["target_type"] = task.target_type
     if task.target_ref:
         task_data["target_ref"] = task.target_ref
-    if task.trace and isinstance(task.trace, dict):
-        task_data["trace"] = task.trace
-        if "pr_url" in task.trace:
-            task_data["pr_url"] = task.trace["pr_url"]
-        envelope = task.trace.get("mcp_result_envelope")
+    if trace and isinstance(trace, dict):
+        task_data["trace"] = trace
+        if "pr_url" in trace:
+            task_data["pr_url"] = trace["pr_url"]
+        envelope = trace.get("mcp_result_envelope")
         envelope = envelope if isinstance(envelope, dict) else None
         if envelope and isinstance(envelope.get("summary"), str):
             task_data["result_preview"] = envelope["summary"]
-        elif "mcp_result_preview" in task.trace:
-            task_data["result_preview"] = task.trace["mcp_result_preview"]
+        elif "mcp_result_preview" in trace:
+            task_data["result_preview"] = trace["mcp_result_preview"]
         if envelope and "structured_output" in envelope:
             task_data["result_output"] = envelope.get("structured_output")
             task_data["result_envelope"] = envelope
             follow_up_actions = envelope.get("follow_up_actions")
             if isinstance(follow_up_actions, list):
                 task_data["follow_up_actions"] = follow_up_actions
-        elif "mcp_result_output" in task.trace:
-            task_data["result_output"] = task.trace["mcp_result_output"]
-        if isinstance(task.trace.get("mcp_started_at"), str):
-            task_data["mcp_started_at"] = task.trace["mcp_started_at"]
+        elif "mcp_result_output" in trace:
+            task_data["result_output"] = trace["mcp_result_output"]
+        if isinstance(trace.get("mcp_started_at"), str):
+            task_data["mcp_started_at"] = trace["mcp_started_at"]
             try:
-                started = datetime.fromisoformat(
-                    task.trace["mcp_started_at"].replace("Z", "+00:00")
-                )
+                started = datetime.fromisoformat(trace["mcp_started_at"].replace("Z", "+00:00"))
                 task_data["mcp_elapsed_s"] = max(
                     0, int((datetime.now(UTC) - started).total_seconds())
                 )
             except ValueError:
                 pass
-        if isinstance(task.trace.get("mcp_timeout_s"), int | float):
-            task_data["mcp_timeout_s"] = task.trace["mcp_timeout_s"]
-        if isinstance(task.trace.get("mcp_poll_interval_s"), int | float):
-            task_data["mcp_poll_interval_s"] = task.trace["mcp_poll_interval_s"]
-    normalized_result = _normalize_mcp_task_result(task)
+        if isinstance(trace.get("mcp_timeout_s"), int | float):
+            task_data["mcp_timeout_s"] = trace["mcp_timeout_s"]
+        if isinstance(trace.get("mcp_poll_interval_s"), int | float):
+            task_data["mcp_poll_interval_s"] = trace["mcp_poll_interval_s"]
+    normalized_result = _normalize_mcp_task_result(task, trace)
     if normalized_result is not None:
         task_data["result"] = normalized_result
     return task_data
@@ -1764,71 +2005,6 @@ def _apply_task_result_view(
     return task_data
 
 
-def _filter_agent_tasks_for_results(
-    tasks: list[Any],
-    *,
-    capability: str | None = None,
-    results_only: bool = False,
-) -> list[Any]:
-    """Apply capability/result availability filtering to a task list."""
-    if capability:
-        tasks = [
-            task
-            for task in tasks
-            if isinstance(task.trace, dict) and task.trace.get("mcp_capability") == capability
-        ]
-    if results_only:
-        tasks = [
-            task
-            for task in tasks
-            if task.state == "completed"
-            and isinstance(task.trace, dict)
-            and (
-                task.trace.get("mcp_result_envelope") is not None
-                or task.trace.get("mcp_result_preview") is not None
-                or task.trace.get("mcp_result_output") is not None
-            )
-        ]
-    return tasks
-
-
-def _paginate_task_list(tasks: list[Any], *, limit: int, offset: int) -> tuple[list[Any], bool]:
-    """Paginate an in-memory task list and return page plus has_more flag."""
-    has_more = len(tasks) > offset + limit
-    return tasks[offset : offset + limit], has_more
-
-
-def _latest_tasks_by_result_key(tasks: list[Any]) -> list[Any]:
-    """Keep only the first task for each provider/capability combination."""
-    latest: list[Any] = []
-    seen: set[tuple[str, str | None]] = set()
-    for task in tasks:
-        trace = task.trace if isinstance(task.trace, dict) else {}
-        key = (task.provider, trace.get("mcp_capability"))
-        if key in seen:
-            continue
-        seen.add(key)
-        latest.append(task)
-    return latest
-
-
-def _summarize_result_tasks(tasks: list[Any]) -> dict[str, Any]:
-    """Build aggregate counts for a filtered result task set."""
-    by_provider: dict[str, int] = {}
-    by_capability: dict[str, int] = {}
-    for task in tasks:
-        by_provider[task.provider] = by_provider.get(task.provider, 0) + 1
-        trace = task.trace if isinstance(task.trace, dict) else {}
-        capability = trace.get("mcp_capability")
-        if isinstance(capability, str) and capability:
-            by_capability[capability] = by_capability.get(capability, 0) + 1
-    return {
-        "total_results": len(tasks),
-        "by_provider": by_provider,
-        "by_capability": by_capability,
-    }
-
-
 def get_peer_transport():
     """Get or initialize the configured peer transport provider."""
     global _peer_transport_provider
@@ -3497,7 +3673,8 @@ async def submit_command(
 
     # Route through CommandRouter for other intents
     router = get_command_router()
-    router_response = router.route(
+    router_response = await _route_command(
+        router,
         intent=parsed_intent,
         profile=request.profile,
         session_id=session_id,  # Use session ID from header or idempotency key
@@ -3745,7 +3922,8 @@ async def submit_action_command(
         action_session_id = action_session_id or f"action-notification-{notification.id}"
         router.seed_navigation_card(action_session_id, seeded_card)
 
-    router_response = router.route(
+    router_response = await _route_command(
+        router,
         intent=parsed_intent,
         profile=request.profile,
         session_id=action_session_id,
@@ -6642,6 +6820,7 @@ async def list_agent_tasks(
     direction: str = Query("desc"),
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = Query(None),
 ) -> JSONResponse:
     """List agent tasks for the authenticated user.
 
@@ -6659,6 +6838,8 @@ async def list_agent_tasks(
         direction: Sort direction (`asc` or `desc`).
         limit: Maximum number of tasks to return (default: 100, max: 100).
         offset: Number of tasks to skip for pagination (default: 0).
+        cursor: Opaque keyset cursor from a previous page's `pagination.next_cursor`.
+            Cannot be combined with a non-zero offset.
 
     Returns:
         200 OK with list of tasks.
@@ -6678,7 +6859,8 @@ async def list_agent_tasks(
             "pagination": {
                 "limit": 100,
                 "offset": 0,
-                "has_more": false
+                "has_more": false,
+                "next_cursor": null
             }
         }
     """
@@ -6689,6 +6871,8 @@ async def list_agent_tasks(
     # Validate offset
     if offset < 0:
         raise _invalid_parameter("offset must be non-negative")
+    if cursor and offset:
+        raise _invalid_parameter("cursor cannot be combined with offset")
 
     if result_view not in {"full", "normalized", "raw"}:
         raise _invalid_parameter("result_view must be one of: full, normalized, raw")
@@ -6699,40 +6883,48 @@ async def list_agent_tasks(
 
     db = get_db()
     from handsfree.auth import get_auth_mode
-    from handsfree.db.agent_tasks import get_agent_tasks
+    from handsfree.db.agent_tasks import encode_agent_task_cursor, get_agent_tasks
 
     effective_user_id = user_id
     if get_auth_mode() == "dev" and x_user_id_raw:
         effective_user_id = x_user_id_raw
 
     # Query tasks with filters, fetch one extra to check if there are more
-    tasks = get_agent_tasks(
-        conn=db,
-        user_id=effective_user_id,
-        provider=provider,
-        state="completed" if results_only and task_status is None else task_status,
-        sort_by=sort,
-        direction=direction,
-        limit=1000 if (capability or results_only) else limit + 1,
-        offset=0 if (capability or results_only) else offset,
-    )
+    try:
+        tasks = get_agent_tasks(
+            conn=db,
+            user_id=effective_user_id,
+            provider=provider,
+            state="completed" if results_only and task_status is None else task_status,
+            sort_by=sort,
+            direction=direction,
+            limit=limit + 1,
+            offset=offset,
+            capability=capability,
+            results_only=results_only,
+            cursor=cursor,
+            # The normalized view is served from the hot trace summary; the full
+            # trace blob is only read for the full and raw views.
+            include_trace=result_view != "normalized",
+        )
+    except ValueError as exc:
+        raise _invalid_parameter(str(exc)) from exc
 
-    tasks = _filter_agent_tasks_for_results(
-        tasks,
-        capability=capability,
-        results_only=results_only,
-    )
-    if capability or results_only:
-        tasks, has_more = _paginate_task_list(tasks, limit=limit, offset=offset)
-    else:
-        # Check if there are more results
-        has_more = len(tasks) > limit
-        if has_more:
-            tasks = tasks[:limit]
+    has_more = len(tasks) > limit
+    if has_more:
+        tasks = tasks[:limit]
+    next_cursor = encode_agent_task_cursor(tasks[-1], sort) if has_more else None
 
     # Format response
     task_list = [
-        _apply_task_result_view(_serialize_agent_task(task), result_view) for task in tasks
+        _apply_task_result_view(
+            _serialize_agent_task(
+                task,
+                trace=(task.trace_summary or {}) if result_view == "normalized" else None,
+            ),
+            result_view,
+        )
+        for task in tasks
     ]
 
     return JSONResponse(
@@ -6743,6 +6935,7 @@ async def list_agent_tasks(
                 "limit": limit,
                 "offset": offset,
                 "has_more": has_more,
+                "next_cursor": next_cursor,
             },
             "filters": {
                 "status": task_status,
@@ -6989,12 +7182,18 @@ async def list_agent_results(
 
     db = get_db()
     from handsfree.auth import get_auth_mode
-    from handsfree.db.agent_tasks import get_agent_tasks
+    from handsfree.db.agent_tasks import get_agent_tasks, summarize_agent_task_results
 
     effective_user_id = user_id
     if get_auth_mode() == "dev" and x_user_id_raw:
         effective_user_id = x_user_id_raw
 
+    summary = summarize_agent_task_results(
+        conn=db,
+        user_id=effective_user_id,
+        provider=provider,
+        capability=capability,
+    )
     tasks = get_agent_tasks(
         conn=db,
         user_id=effective_user_id,
@@ -7002,18 +7201,15 @@ async def list_agent_results(
         state="completed",
         sort_by=sort,
         direction=direction,
-        limit=1000,
-        offset=0,
-    )
-    tasks = _filter_agent_tasks_for_results(
-        tasks,
+        limit=limit + 1,
+        offset=offset,
         capability=capability,
         results_only=True,
+        latest_per_result_key=latest_only,
     )
-    summary = _summarize_result_tasks(tasks)
-    if latest_only:
-        tasks = _latest_tasks_by_result_key(tasks)
-    tasks, has_more = _paginate_task_list(tasks, limit=limit, offset=offset)
+    has_more = len(tasks) > limit
+    if has_more:
+        tasks = tasks[:limit]
 
     results: list[dict[str, Any]] = []
     for task in tasks:
@@ -7493,12 +7689,21 @@ async def revoke_api_key(
 @app.get("/v1/admin/ai/backend-policy", response_model=AIBackendPolicyReport)
 async def get_ai_backend_policy_report(
     user_id: CurrentUser,
-    limit: int = Query(default=200, ge=1, le=1000),
+    limit: int = Query(
+        default=200,
+        ge=1,
+        le=1000,
+        deprecated=True,
+        description="Ignored; counts cover window_hours (default all recorded activity).",
+    ),
     capture: bool = Query(default=True),
+    window_hours: int | None = Query(default=None, ge=1, le=8760),
 ) -> AIBackendPolicyReport:
     """Return current AI backend policy and recent workflow remap counts."""
     db = get_db()
-    report = build_ai_backend_policy_report(db, user_id=user_id, limit=limit)
+    report = build_ai_backend_policy_report(
+        db, user_id=user_id, limit=limit, window_hours=window_hours
+    )
     latest_snapshot = None
     snapshot_capture = None
     if capture:
@@ -7544,7 +7749,13 @@ async def get_ai_backend_policy_history_report(
     user_id: CurrentUser,
     window_hours: int = Query(default=24, ge=1, le=168),
     bucket_hours: int = Query(default=1, ge=1, le=24),
-    limit: int = Query(default=1000, ge=1, le=5000),
+    limit: int = Query(
+        default=1000,
+        ge=1,
+        le=5000,
+        deprecated=True,
+        description="Ignored; buckets always cover the full window.",
+    ),
 ) -> AIBackendPolicyHistoryReport:
     """Return bucketed historical AI backend policy activity."""
     db = get_db()
@@ -0,0 +1,195 @@
+"""Bulkheaded thread pools for blocking AI and IPFS backends.
+
+The embeddings, LLM, IPFS and accelerate routers are synchronous.  Async
+handlers run them through :func:`run_in_backend_pool`, which gives every
+backend family its own bounded :class:`BackendPool`, so a slow family can only
+exhaust its own workers and queue.  A pool that is full rejects new work
+immediately with :class:`BackendPoolSaturatedError`, and work that misses its
+deadline raises :class:`BackendPoolTimeoutError`.  Outcomes and utilization
+are exported through the ``backend_pools`` metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import re
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from handsfree.metrics import get_metrics_collector
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_QUEUE = 16
+DEFAULT_DEADLINE_SECONDS = 60.0
+
+
+class BackendPoolSaturatedError(RuntimeError):
+    """Raised when a backend pool has no free worker or queue slot."""
+
+    def __init__(self, pool: str) -> None:
+        super().__init__(f"Backend pool {pool} is saturated")
+        self.pool = pool
+
+
+class BackendPoolTimeoutError(TimeoutError):
+    """Raised when backend work does not finish before its deadline."""
+
+    def __init__(self, pool: str, deadline_seconds: float) -> None:
+        super().__init__(f"Backend pool {pool} did not finish within {deadline_seconds:g}s")
+        self.pool = pool
+        self.deadline_seconds = deadline_seconds
+
+
+class BackendPool:
+    """A bounded worker pool with a bounded queue for one backend family."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        deadline_seconds: float = DEFAULT_DEADLINE_SECONDS,
+    ) -> None:
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.deadline_seconds = deadline_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"handsfree-pool-{name}",
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+
+    def _publish(self) -> None:
+        get_metrics_collector().set_backend_pool_gauges(
+            self.name,
+            active=self._active,
+            queued=self._queued,
+            max_workers=self.max_workers,
+            max_queue=self.max_queue,
+        )
+
+    def _run(self, fn: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._publish()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._publish()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future[Any]:
+        """Queue ``fn`` or raise :class:`BackendPoolSaturatedError` when full."""
+        with self._lock:
+            if self._active + self._queued >= self.max_workers + self.max_queue:
+                get_metrics_collector().record_backend_pool(self.name, "rejected")
+                raise BackendPoolSaturatedError(self.name)
+            self._queued += 1
+            self._publish()
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, self._run, fn, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future[Any]) -> None:
+        if future.cancelled():
+            # Cancelled before it started, so _run never took it off the queue.
+            with self._lock:
+                self._queued -= 1
+                self._publish()
+            return
+        outcome = "failed" if future.exception() is not None else "completed"
+        get_metrics_collector().record_backend_pool(self.name, outcome)
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        deadline_seconds: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run ``fn`` on the pool and await its result within the deadline.
+
+        Work that is still queued when the deadline passes is cancelled;
+        work that already started finishes in the background and its result
+        is discarded.
+        """
+        deadline = self.deadline_seconds if deadline_seconds is None else deadline_seconds
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=deadline if deadline > 0 else None
+            )
+        except TimeoutError as exc:
+            future.cancel()
+            get_metrics_collector().record_backend_pool(self.name, "timed_out")
+            raise BackendPoolTimeoutError(self.name, deadline) from exc
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "active": self._active,
+                "queued": self._queued,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _pool_setting(pool: str, setting: str, default: float) -> float:
+    # Per-pool override (e.g. HANDSFREE_BACKEND_POOL_IPFS_LLM_ROUTER_MAX_WORKERS),
+    # then the shared default (HANDSFREE_BACKEND_POOL_MAX_WORKERS).
+    suffix = re.sub(r"[^A-Z0-9]+", "_", pool.upper())
+    for name in (f"HANDSFREE_BACKEND_POOL_{suffix}_{setting}", f"HANDSFREE_BACKEND_POOL_{setting}"):
+        value = os.getenv(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            break
+    return default
+
+
+_pools: dict[str, BackendPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_backend_pool(name: str) -> BackendPool:
+    """Get (or create from environment configuration) the pool for ``name``."""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = BackendPool(
+                name,
+                max_workers=int(_pool_setting(name, "MAX_WORKERS", DEFAULT_MAX_WORKERS)),
+                max_queue=int(_pool_setting(name, "MAX_QUEUE", DEFAULT_MAX_QUEUE)),
+                deadline_seconds=_pool_setting(name, "DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS),
+            )
+        return pool
+
+
+async def run_in_backend_pool(name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run blocking backend work for family ``name`` on its bulkheaded pool."""
+    return await get_backend_pool(name).run(fn, *args, **kwargs)
+
+
+def reset_backend_pools() -> None:
+    """Shut down and drop all pools (primarily for tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
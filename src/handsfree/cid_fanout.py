@@ -0,0 +1,174 @@
+"""Bounded parallel loading of CID lists.
+
+:func:`load_cids` resolves a list of CIDs with a caller-supplied loader on at
+most ``max_concurrency`` worker threads.  Each CID gets its own timeout,
+measured from when its load starts, and the whole call has a deadline measured
+from submission, after which every CID still loading or queued fails.
+Failures are recorded per CID instead of aborting the batch, so one slow or
+missing block only drops that block from the result.
+
+Loads that time out cannot be interrupted; their daemon threads finish in the
+background, their results are discarded, and their slot goes to the next
+queued CID.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_DEADLINE_SECONDS = 30.0
+
+
+@dataclass
+class CIDFanoutResult:
+    """Outcome of a :func:`load_cids` call.
+
+    ``values`` and ``errors`` are keyed by CID; ``values`` preserves the
+    request order of the CIDs that loaded.
+    """
+
+    values: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    timed_out: list[str] = field(default_factory=list)
+
+    def as_trace(self) -> dict[str, Any]:
+        return {
+            "requested": len(self.values) + len(self.errors),
+            "loaded": len(self.values),
+            "failed": len(self.errors),
+            "timed_out": list(self.timed_out),
+            "errors": dict(self.errors),
+        }
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def load_cids(
+    cids: Iterable[Any],
+    loader: Callable[[str], Any],
+    *,
+    max_concurrency: int | None = None,
+    timeout_seconds: float | None = None,
+    deadline_seconds: float | None = None,
+) -> CIDFanoutResult:
+    """Load ``cids`` concurrently, returning partial results with per-CID errors.
+
+    Args:
+        cids: CIDs to load; non-strings and blanks are skipped, duplicates
+            are loaded once.
+        loader: Called with one stripped CID; its return value is the result.
+        max_concurrency: Loads in flight at once (default:
+            ``HANDSFREE_CID_FANOUT_CONCURRENCY`` or 8).  Timed-out loads no
+            longer count against it.
+        timeout_seconds: Per-CID timeout from the start of its load; zero or
+            negative disables it (default:
+            ``HANDSFREE_CID_FANOUT_TIMEOUT_SECONDS`` or 10).
+        deadline_seconds: Deadline for the whole call from submission; CIDs
+            still loading or queued when it passes time out.  Zero or negative
+            disables it (default: ``HANDSFREE_CID_FANOUT_DEADLINE_SECONDS`` or 30).
+
+    Returns:
+        Loaded values and errors keyed by CID, in request order.
+    """
+    ordered = list(
+        dict.fromkeys(cid.strip() for cid in cids if isinstance(cid, str) and cid.strip())
+    )
+    result = CIDFanoutResult()
+    if not ordered:
+        return result
+    if max_concurrency is None:
+        max_concurrency = _int_env("HANDSFREE_CID_FANOUT_CONCURRENCY", DEFAULT_CONCURRENCY)
+    if timeout_seconds is None:
+        timeout_seconds = _float_env(
+            "HANDSFREE_CID_FANOUT_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS
+        )
+    if deadline_seconds is None:
+        deadline_seconds = _float_env(
+            "HANDSFREE_CID_FANOUT_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS
+        )
+    max_concurrency = max(1, max_concurrency)
+    deadline = time.monotonic() + deadline_seconds if deadline_seconds > 0 else None
+
+    values: dict[str, Any] = {}
+    queued = deque(ordered)
+    running: dict[str, float] = {}
+    changed = threading.Condition()
+
+    def run(cid: str) -> None:
+        try:
+            value, error = loader(cid), None
+        except Exception as exc:  # noqa: BLE001 - recorded per CID
+            value, error = None, f"{type(exc).__name__}: {exc}"
+        with changed:
+            # Dropped from ``running`` once timed out; the result is discarded.
+            if running.pop(cid, None) is not None:
+                if error is None:
+                    values[cid] = value
+                else:
+                    result.errors[cid] = error
+                changed.notify()
+
+    def time_out(cid: str, message: str) -> None:
+        result.timed_out.append(cid)
+        result.errors[cid] = f"TimeoutError: {message}"
+
+    with changed:
+        while True:
+            while queued and len(running) < max_concurrency:
+                cid = queued.popleft()
+                running[cid] = time.monotonic()
+                threading.Thread(
+                    target=run, args=(cid,), name="handsfree-cid-fanout", daemon=True
+                ).start()
+            if not running:
+                break
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                for cid in [*running, *queued]:
+                    time_out(cid, f"not loaded within the {deadline_seconds:g}s deadline")
+                running.clear()
+                queued.clear()
+                break
+            if timeout_seconds > 0:
+                expired = [cid for cid, began in running.items() if now - began >= timeout_seconds]
+                for cid in expired:
+                    del running[cid]
+                    time_out(cid, f"no result after {timeout_seconds:g}s")
+                if expired:
+                    # Their slots are free for queued loads.
+                    continue
+            wake_at = [deadline] if deadline is not None else []
+            if timeout_seconds > 0:
+                wake_at.extend(began + timeout_seconds for began in running.values())
+            changed.wait(max(0.0, min(wake_at) - now) if wake_at else None)
+
+    if result.errors:
+        logger.warning(
+            "Failed to load %d of %d CIDs: %s", len(result.errors), len(ordered), result.errors
+        )
+    result.values = {cid: values[cid] for cid in ordered if cid in values}
+    result.errors = {cid: result.errors[cid] for cid in ordered if cid in result.errors}
+    return result
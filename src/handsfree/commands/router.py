@@ -3,6 +3,9 @@
 import json
 import logging
 import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
 import duckdb
@@ -507,6 +510,55 @@ class CommandRouter:
         "pr.comment",
     }
 
+    # AI intents and the capability each one executes unless a backend is selected
+    AI_COMMANDS = {
+        "ai.explain_pr": {
+            "capability_id": "copilot.pr.explain",
+            "card_title": "Copilot explanation",
+            "error_label": "explain",
+        },
+        "ai.summarize_diff": {
+            "capability_id": "copilot.pr.diff_summary",
+            "card_title": "Copilot diff summary",
+            "error_label": "summarize diff for",
+        },
+        "ai.explain_failure": {
+            "capability_id": "copilot.pr.failure_explain",
+            "card_title": "Failure analysis",
+            "error_label": "explain failing checks for",
+        },
+        "ai.accelerated_explain_failure": {
+            "capability_id": "github.check.accelerated_failure_explain",
+            "card_title": "Accelerated failure analysis",
+            "error_label": "build accelerated failure analysis for",
+        },
+        "ai.accelerated_rag_summary": {
+            "capability_id": "github.pr.accelerated_summary",
+            "card_title": "Accelerated PR summary",
+            "error_label": "build an accelerated summary for",
+        },
+        "ai.rag_summary": {
+            "capability_id": "github.pr.rag_summary",
+            "card_title": "Augmented PR summary",
+            "error_label": "build an augmented summary for",
+        },
+        "ai.find_similar_failures": {
+            "capability_id": "github.check.find_similar_failures",
+            "card_title": "Similar failures",
+            "error_label": "find similar failures for",
+        },
+        "ai.read_cid": {
+            "capability_id": "ipfs.content.read_ai_output",
+            "card_title": "Stored AI output",
+            "error_label": "read stored AI output for",
+        },
+        "ai.accelerate_generate_and_store": {
+            "capability_id": "ipfs.accelerate.generate_and_store",
+            "card_title": "Accelerated stored output",
+            "error_label": "generate and store accelerated output for",
+        },
+    }
+
     def __init__(
         self,
         pending_actions: PendingActionManager,
@@ -521,7 +573,8 @@ class CommandRouter:
             github_provider: Optional GitHub provider for fetching PR/check data
         """
         self.pending_actions = pending_actions
-        self.db_conn = db_conn
+        self._db_conn = db_conn
+        self._bound = threading.local()
         self.github_provider = github_provider
         # Session state for system.repeat - maps session_id to last response
         self._last_responses: dict[str, dict[str, Any]] = {}
@@ -537,6 +590,28 @@ class CommandRouter:
 
             self._agent_service = AgentService(db_conn)
 
+    @property
+    def db_conn(self) -> duckdb.DuckDBPyConnection | None:
+        """The database connection, or the one bound to the current thread."""
+        return getattr(self._bound, "db_conn", self._db_conn)
+
+    @contextmanager
+    def bound_connection(self, conn: duckdb.DuckDBPyConnection) -> Iterator[None]:
+        """Use ``conn`` (e.g. a cursor) for database access from this thread.
+
+        A DuckDB connection must not be used from several threads at once, so
+        intents routed off the event loop are given their own cursor.
+        """
+        previous = getattr(self._bound, "db_conn", None)
+        self._bound.db_conn = conn
+        try:
+            yield
+        finally:
+            if previous is None:
+                del self._bound.db_conn
+            else:
+                self._bound.db_conn = previous
+
     def route(
         self,
         intent: ParsedIntent,
@@ -1396,54 +1471,7 @@ class CommandRouter:
         user_id: str | None = None,
     ) -> dict[str, Any]:
         """Handle AI / Copilot read-only intents."""
-        command_map = {
-            "ai.explain_pr": {
-                "capability_id": "copilot.pr.explain",
-                "card_title": "Copilot explanation",
-                "error_label": "explain",
-            },
-            "ai.summarize_diff": {
-                "capability_id": "copilot.pr.diff_summary",
-                "card_title": "Copilot diff summary",
-                "error_label": "summarize diff for",
-            },
-            "ai.explain_failure": {
-                "capability_id": "copilot.pr.failure_explain",
-                "card_title": "Failure analysis",
-                "error_label": "explain failing checks for",
-            },
-            "ai.accelerated_explain_failure": {
-                "capability_id": "github.check.accelerated_failure_explain",
-                "card_title": "Accelerated failure analysis",
-                "error_label": "build accelerated failure analysis for",
-            },
-            "ai.accelerated_rag_summary": {
-                "capability_id": "github.pr.accelerated_summary",
-                "card_title": "Accelerated PR summary",
-                "error_label": "build an accelerated summary for",
-            },
-            "ai.rag_summary": {
-                "capability_id": "github.pr.rag_summary",
-                "card_title": "Augmented PR summary",
-                "error_label": "build an augmented summary for",
-            },
-            "ai.find_similar_failures": {
-                "capability_id": "github.check.find_similar_failures",
-                "card_title": "Similar failures",
-                "error_label": "find similar failures for",
-            },
-            "ai.read_cid": {
-                "capability_id": "ipfs.content.read_ai_output",
-                "card_title": "Stored AI output",
-                "error_label": "read stored AI output for",
-            },
-            "ai.accelerate_generate_and_store": {
-                "capability_id": "ipfs.accelerate.generate_and_store",
-                "card_title": "Accelerated stored output",
-                "error_label": "generate and store accelerated output for",
-            },
-        }
-        if intent.name not in command_map:
+        if intent.name not in self.AI_COMMANDS:
             spoken_text = profile_config.truncate_spoken_text("I don't know that AI command yet.")
             return {
                 "status": "error",
@@ -1473,7 +1501,7 @@ class CommandRouter:
                 }
 
         try:
-            config = dict(command_map[intent.name])
+            config = dict(self.AI_COMMANDS[intent.name])
             requested_workflow = None
             if intent.name == "ai.rag_summary":
                 from handsfree.models import AIWorkflow
@@ -1599,6 +1627,7 @@ class CommandRouter:
                     failure_target_type=result.get("failure_target_type")
                     or intent.entities.get("failure_target_type"),
                     ipfs_cid=result["ipfs_cid"].strip(),
+                    summary=result.get("summary"),
                 )
             if intent.name == "ai.read_cid":
                 card_title = f"{config['card_title']} {result['cid']}"
@@ -1665,7 +1694,7 @@ class CommandRouter:
         except Exception as e:
             logger.error("Failed AI CLI command %s for PR %s: %s", intent.name, pr_num, str(e))
             spoken_text = profile_config.truncate_spoken_text(
-                f"Could not {command_map[intent.name]['error_label']} PR {pr_num} with Copilot."
+                f"Could not {self.AI_COMMANDS[intent.name]['error_label']} PR {pr_num} with Copilot."
             )
             return {
                 "status": "error",
@@ -1707,6 +1736,16 @@ class CommandRouter:
             limit=limit,
         )
 
+    def resolve_ai_capability_id(self, intent: ParsedIntent) -> str | None:
+        """Return the capability an AI intent will execute, or None for other intents."""
+        if intent.name not in self.AI_COMMANDS:
+            return None
+        if intent.name == "ai.explain_failure":
+            return self._select_failure_ai_capability(intent)["capability_id"]
+        if intent.name == "ai.rag_summary":
+            return self._select_pr_summary_ai_capability(intent)["capability_id"]
+        return self.AI_COMMANDS[intent.name]["capability_id"]
+
     def _select_failure_ai_capability(self, intent: ParsedIntent) -> dict[str, str]:
         """Select the backend capability for failure analysis intents."""
         provider = str(intent.entities.get("provider") or "").lower()
@@ -11,6 +11,8 @@ from typing import Any
 
 import duckdb
 
+from handsfree.db.ai_policy_rollups import AI_EXECUTE_PREFIX, record_ai_policy_rollup
+
 
 @dataclass
 class ActionLog:
@@ -39,6 +41,9 @@ def write_action_log(
 ) -> ActionLog:
     """Write an action log entry.
 
+    Must not be called inside an open transaction: the log row and its AI
+    policy rollup are committed together in a transaction of its own.
+
     Args:
         conn: Database connection.
         user_id: UUID of the user performing the action.
@@ -55,26 +60,37 @@ def write_action_log(
     Raises:
         ValueError: If idempotency_key is provided and already exists.
     """
-    # Check for existing idempotency key
-    if idempotency_key:
-        existing = conn.execute(
-            "SELECT id FROM action_logs WHERE idempotency_key = ?",
-            [idempotency_key],
-        ).fetchone()
-        if existing:
-            raise ValueError(f"Action log with idempotency_key '{idempotency_key}' already exists")
-
     log_id = str(uuid.uuid4())
     now = datetime.now(UTC)
 
-    conn.execute(
-        """
-        INSERT INTO action_logs
-        (id, user_id, action_type, target, request, result, ok, idempotency_key, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        [log_id, user_id, action_type, target, request, result, ok, idempotency_key, now],
-    )
+    # The log row and its AI policy rollup are written in one transaction so
+    # the rollups never count a log that was not written, or miss one that was.
+    conn.begin()
+    try:
+        if idempotency_key:
+            existing = conn.execute(
+                "SELECT id FROM action_logs WHERE idempotency_key = ?",
+                [idempotency_key],
+            ).fetchone()
+            if existing:
+                raise ValueError(
+                    f"Action log with idempotency_key '{idempotency_key}' already exists"
+                )
+
+        conn.execute(
+            """
+            INSERT INTO action_logs
+            (id, user_id, action_type, target, request, result, ok, idempotency_key, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [log_id, user_id, action_type, target, request, result, ok, idempotency_key, now],
+        )
+        if action_type.startswith(AI_EXECUTE_PREFIX):
+            record_ai_policy_rollup(conn, action_log_id=log_id)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
 
     return ActionLog(
         id=log_id,
@@ -3,9 +3,12 @@
 Manages lifecycle and state transitions for agent delegation tasks.
 """
 
+import base64
+import binascii
 import json
 import uuid
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
@@ -21,10 +24,38 @@ VALID_TRANSITIONS = {
 }
 
 
+class _LazyTrace:
+    """Data descriptor backing ``AgentTask.trace``.
+
+    The full trace is the cold part of a task: list queries attach a loader
+    instead of decoding it, and it is only read from the database when accessed.
+    """
+
+    def __get__(self, task: "AgentTask | None", owner: type | None = None) -> Any:
+        if task is None:
+            # No class-level default, so ``trace`` stays a required field.
+            raise AttributeError("trace")
+        loader = task._trace_loader
+        if loader is not None:
+            task._trace_loader = None
+            task._trace = loader()
+        return task._trace
+
+    def __set__(self, task: "AgentTask", value: dict[str, Any] | None) -> None:
+        task._trace_loader = None
+        task._trace = value
+
+
 @dataclass
 class AgentTask:
     """Represents an agent task."""
 
+    # Storage for ``trace``; declared first so ``__init__`` sets them before it.
+    _trace: dict[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+    _trace_loader: Callable[[], dict[str, Any] | None] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     id: str
     user_id: str
     provider: str
@@ -32,9 +63,19 @@ class AgentTask:
     target_ref: str | None  # e.g., "owner/repo#123"
     instruction: str | None
     state: str
-    trace: dict[str, Any] | None
+    trace: dict[str, Any] | None = _LazyTrace()
     created_at: datetime
     updated_at: datetime
+    trace_summary: dict[str, Any] | None = None
+
+    def defer_trace(self, loader: Callable[[], dict[str, Any] | None]) -> None:
+        """Load the full trace with ``loader`` on first access instead of eagerly."""
+        self._trace_loader = loader
+
+    @property
+    def trace_loaded(self) -> bool:
+        """Whether the full trace has been materialized."""
+        return self._trace_loader is None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for API responses."""
@@ -52,6 +93,167 @@ class AgentTask:
         }
 
 
+# Scalar trace keys copied into the hot summary. Result payloads are cut down
+# to a few scalar fields and long text is truncated, so the summary stays small;
+# the full payloads are only served from the lazily loaded trace. Migration
+# 020_backfill_agent_task_trace_summary.sql computes the same projection in SQL.
+_TRACE_SUMMARY_KEYS = (
+    "provider_label",
+    "pr_url",
+    "mcp_capability",
+    "mcp_cid",
+    "mcp_seed_url",
+    "mcp_pin_action",
+    "mcp_result_preview",
+    "mcp_started_at",
+    "mcp_timeout_s",
+    "mcp_poll_interval_s",
+)
+_RESULT_ENVELOPE_SUMMARY_KEYS = ("summary", "status", "execution_mode", "preferred_execution_mode")
+_RESULT_OUTPUT_SUMMARY_KEYS = ("status", "message", "cid")
+TRACE_SUMMARY_TEXT_LIMIT = 280
+
+
+def _summary_scalar(value: Any) -> Any:
+    if isinstance(value, str):
+        return value[:TRACE_SUMMARY_TEXT_LIMIT]
+    if isinstance(value, bool | int | float):
+        return value
+    return None
+
+
+def _summary_fields(payload: Any, keys: tuple[str, ...]) -> dict[str, Any]:
+    if not isinstance(payload, dict):
+        return {}
+    fields = {key: _summary_scalar(payload.get(key)) for key in keys}
+    return {key: value for key, value in fields.items() if value is not None}
+
+
+def summarize_agent_task_trace(trace: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Project a trace onto the compact summary stored in the hot ``trace_summary`` column.
+
+    Only non-null scalar values are kept, with text truncated to
+    ``TRACE_SUMMARY_TEXT_LIMIT`` characters. Result envelopes and outputs keep
+    their status, summary and message fields, and ``mcp_result_cid`` records the
+    result CID wherever the trace carried it. The projection is idempotent.
+    """
+    if not isinstance(trace, dict) or not trace:
+        return None
+    summary = _summary_fields(trace, _TRACE_SUMMARY_KEYS)
+    for key, keys in (
+        ("mcp_result_envelope", _RESULT_ENVELOPE_SUMMARY_KEYS),
+        ("mcp_result_output", _RESULT_OUTPUT_SUMMARY_KEYS),
+    ):
+        fields = _summary_fields(trace.get(key), keys)
+        if fields:
+            summary[key] = fields
+    result_cid = _trace_result_columns("completed", trace)[2] or _nonempty_str(
+        trace.get("mcp_result_cid")
+    )
+    if result_cid:
+        summary["mcp_result_cid"] = result_cid
+    return summary or None
+
+
+def _dump_trace_summary(trace: dict[str, Any] | None) -> str | None:
+    summary = summarize_agent_task_trace(trace)
+    return json.dumps(summary) if summary else None
+
+
+def _nonempty_str(value: Any) -> str | None:
+    if isinstance(value, str) and value.strip():
+        return value
+    return None
+
+
+def _trace_result_columns(
+    state: str, trace: dict[str, Any] | None
+) -> tuple[str | None, bool, str | None]:
+    """Derive the indexed (mcp_capability, has_result, result_cid) columns from a trace.
+
+    These mirror the fields the result listing endpoints filter on, so they can be
+    matched in SQL without decoding the trace JSON.
+    """
+    if not isinstance(trace, dict):
+        return None, False, None
+
+    capability = _nonempty_str(trace.get("mcp_capability"))
+    has_result = state == "completed" and (
+        trace.get("mcp_result_envelope") is not None
+        or trace.get("mcp_result_preview") is not None
+        or trace.get("mcp_result_output") is not None
+    )
+
+    envelope = trace.get("mcp_result_envelope")
+    envelope = envelope if isinstance(envelope, dict) else {}
+    structured_output = envelope.get("structured_output")
+    result_output = trace.get("mcp_result_output")
+    artifact_refs = envelope.get("artifact_refs")
+    result_cid = (
+        _nonempty_str(trace.get("mcp_cid"))
+        or (
+            _nonempty_str(structured_output.get("cid"))
+            if isinstance(structured_output, dict)
+            else None
+        )
+        or (_nonempty_str(result_output.get("cid")) if isinstance(result_output, dict) else None)
+        or (
+            _nonempty_str(artifact_refs.get("result_cid"))
+            if isinstance(artifact_refs, dict)
+            else None
+        )
+    )
+    return capability, has_result, result_cid
+
+
+def encode_agent_task_cursor(task: AgentTask, sort_by: str = "created_at") -> str:
+    """Encode an opaque keyset cursor positioned just after ``task``.
+
+    Args:
+        task: Last task of the current page.
+        sort_by: Sort field the page was ordered by (`created_at` or `updated_at`).
+
+    Returns:
+        URL-safe cursor string.
+    """
+    sort_column = "updated_at" if sort_by == "updated_at" else "created_at"
+    sort_value = task.updated_at if sort_column == "updated_at" else task.created_at
+    payload = json.dumps(
+        {"s": sort_column, "t": sort_value.isoformat(), "id": task.id},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_agent_task_cursor(cursor: str) -> tuple[str, datetime, uuid.UUID]:
+    """Decode a cursor produced by :func:`encode_agent_task_cursor`.
+
+    Returns:
+        Tuple of (sort column, sort value, task id).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort_column = payload["s"]
+        sort_value = datetime.fromisoformat(payload["t"])
+        task_uuid = uuid.UUID(payload["id"])
+    except (
+        binascii.Error,
+        UnicodeError,
+        json.JSONDecodeError,
+        KeyError,
+        TypeError,
+        ValueError,
+    ) as exc:
+        raise ValueError("cursor is malformed") from exc
+    if sort_column not in {"created_at", "updated_at"}:
+        raise ValueError("cursor is malformed")
+    return sort_column, sort_value, task_uuid
+
+
 def create_agent_task(
     conn: duckdb.DuckDBPyConnection,
     user_id: str,
@@ -107,12 +309,15 @@ def create_agent_task(
             except ValueError:
                 pass
 
+    mcp_capability, has_result, result_cid = _trace_result_columns(state, trace)
+
     conn.execute(
         """
         INSERT INTO agent_tasks
-        (id, user_id, provider, repo_full_name, issue_number, pr_number, 
-         instruction, status, last_update, created_at, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        (id, user_id, provider, repo_full_name, issue_number, pr_number,
+         instruction, status, last_update, mcp_capability, has_result, result_cid,
+         trace_summary, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         [
             uuid.UUID(task_id),
@@ -124,6 +329,10 @@ def create_agent_task(
             instruction,
             state,
             json.dumps(trace) if trace else None,
+            mcp_capability,
+            has_result,
+            result_cid,
+            _dump_trace_summary(trace),
             now,
             now,
         ],
@@ -140,6 +349,7 @@ def create_agent_task(
         trace=trace,
         created_at=now,
         updated_at=now,
+        trace_summary=summarize_agent_task_trace(trace),
     )
 
 
@@ -188,13 +398,25 @@ def update_agent_task_state(
     except ValueError:
         return None
 
+    mcp_capability, has_result, result_cid = _trace_result_columns(new_state, updated_trace)
+
     conn.execute(
         """
         UPDATE agent_tasks
-        SET status = ?, last_update = ?, updated_at = ?
+        SET status = ?, last_update = ?, mcp_capability = ?, has_result = ?, result_cid = ?,
+            trace_summary = ?, updated_at = ?
         WHERE id = ?
         """,
-        [new_state, json.dumps(updated_trace) if updated_trace else None, now, task_uuid],
+        [
+            new_state,
+            json.dumps(updated_trace) if updated_trace else None,
+            mcp_capability,
+            has_result,
+            result_cid,
+            _dump_trace_summary(updated_trace),
+            now,
+            task_uuid,
+        ],
     )
 
     return AgentTask(
@@ -208,6 +430,7 @@ def update_agent_task_state(
         trace=updated_trace,
         created_at=task.created_at,
         updated_at=now,
+        trace_summary=summarize_agent_task_trace(updated_trace),
     )
 
 
@@ -230,13 +453,24 @@ def update_agent_task_trace(
     except ValueError:
         return None
 
+    mcp_capability, has_result, result_cid = _trace_result_columns(task.state, updated_trace)
+
     conn.execute(
         """
         UPDATE agent_tasks
-        SET last_update = ?, updated_at = ?
+        SET last_update = ?, mcp_capability = ?, has_result = ?, result_cid = ?,
+            trace_summary = ?, updated_at = ?
         WHERE id = ?
         """,
-        [json.dumps(updated_trace), now, task_uuid],
+        [
+            json.dumps(updated_trace),
+            mcp_capability,
+            has_result,
+            result_cid,
+            _dump_trace_summary(updated_trace),
+            now,
+            task_uuid,
+        ],
     )
 
     return AgentTask(
@@ -250,9 +484,70 @@ def update_agent_task_trace(
         trace=updated_trace,
         created_at=task.created_at,
         updated_at=now,
+        trace_summary=summarize_agent_task_trace(updated_trace),
+    )
+
+
+def _decode_trace(raw: Any) -> dict[str, Any] | None:
+    if not raw:
+        return None
+    try:
+        trace = json.loads(raw) if isinstance(raw, str) else raw
+    except (json.JSONDecodeError, TypeError):
+        return None
+    return trace if isinstance(trace, dict) else None
+
+
+def _row_to_agent_task(row: tuple[Any, ...]) -> AgentTask:
+    # Reconstruct target_type and target_ref
+    target_type = None
+    target_ref = None
+    if row[4] is not None:  # issue_number
+        target_type = "issue"
+        target_ref = f"{row[3]}#{row[4]}" if row[3] else f"#{row[4]}"
+    elif row[5] is not None:  # pr_number
+        target_type = "pr"
+        target_ref = f"{row[3]}#{row[5]}" if row[3] else f"#{row[5]}"
+
+    trace = _decode_trace(row[8])  # last_update
+
+    return AgentTask(
+        id=str(row[0]),
+        user_id=str(row[1]),
+        provider=row[2],
+        target_type=target_type,
+        target_ref=target_ref,
+        instruction=row[6],
+        state=row[7],
+        trace=trace,
+        created_at=row[9],
+        updated_at=row[10],
+        trace_summary=summarize_agent_task_trace(trace),
     )
 
 
+def _load_agent_task_trace(
+    conn: duckdb.DuckDBPyConnection, task_uuid: uuid.UUID
+) -> dict[str, Any] | None:
+    row = conn.execute("SELECT last_update FROM agent_tasks WHERE id = ?", [task_uuid]).fetchone()
+    return _decode_trace(row[0]) if row else None
+
+
+def _summary_row_to_agent_task(conn: duckdb.DuckDBPyConnection, row: tuple[Any, ...]) -> AgentTask:
+    task = _row_to_agent_task((*row[:8], None, *row[9:11]))
+    legacy_trace = _decode_trace(row[11])
+    if legacy_trace is not None:
+        # Written before trace_summary existed: the blob was read anyway, keep it.
+        task.trace = legacy_trace
+        task.trace_summary = summarize_agent_task_trace(legacy_trace)
+        return task
+
+    task.trace_summary = _decode_trace(row[8])
+    task_uuid = row[0]
+    task.defer_trace(lambda: _load_agent_task_trace(conn, task_uuid))
+    return task
+
+
 def get_agent_task_by_id(
     conn: duckdb.DuckDBPyConnection,
     task_id: str,
@@ -284,35 +579,67 @@ def get_agent_task_by_id(
     if not result:
         return None
 
-    # Reconstruct target_type and target_ref
-    target_type = None
-    target_ref = None
-    if result[4] is not None:  # issue_number
-        target_type = "issue"
-        target_ref = f"{result[3]}#{result[4]}" if result[3] else f"#{result[4]}"
-    elif result[5] is not None:  # pr_number
-        target_type = "pr"
-        target_ref = f"{result[3]}#{result[5]}" if result[3] else f"#{result[5]}"
+    return _row_to_agent_task(result)
 
-    trace = None
-    if result[8]:  # last_update
-        try:
-            trace = json.loads(result[8]) if isinstance(result[8], str) else result[8]
-        except (json.JSONDecodeError, TypeError):
-            trace = None
 
-    return AgentTask(
-        id=str(result[0]),
-        user_id=str(result[1]),
-        provider=result[2],
-        target_type=target_type,
-        target_ref=target_ref,
-        instruction=result[6],
-        state=result[7],
-        trace=trace,
-        created_at=result[9],
-        updated_at=result[10],
-    )
+_AGENT_TASK_COLUMNS = (
+    "id, user_id, provider, repo_full_name, issue_number, pr_number, "
+    "instruction, status, last_update, created_at, updated_at"
+)
+
+# Same layout with the hot summary in place of the trace blob; the blob is only
+# selected for rows written before the summary column existed.
+_AGENT_TASK_SUMMARY_COLUMNS = (
+    "id, user_id, provider, repo_full_name, issue_number, pr_number, "
+    "instruction, status, trace_summary, created_at, updated_at, "
+    "CASE WHEN trace_summary IS NULL THEN last_update END"
+)
+
+
+def _user_uuid(user_id: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(user_id) if "-" in user_id else uuid.uuid5(uuid.NAMESPACE_DNS, user_id)
+    except (ValueError, AttributeError):
+        return uuid.uuid5(uuid.NAMESPACE_DNS, user_id)
+
+
+def _agent_task_filters(
+    *,
+    user_id: str | None = None,
+    provider: str | None = None,
+    state: str | None = None,
+    capability: str | None = None,
+    results_only: bool = False,
+    result_cid: str | None = None,
+) -> tuple[str, list[Any]]:
+    """Build the shared WHERE clause and parameters for agent task queries."""
+    clauses = ["1=1"]
+    params: list[Any] = []
+
+    if user_id:
+        clauses.append("user_id = ?")
+        params.append(_user_uuid(user_id))
+
+    if provider:
+        clauses.append("provider = ?")
+        params.append(provider)
+
+    if state:
+        clauses.append("status = ?")
+        params.append(state)
+
+    if capability:
+        clauses.append("mcp_capability = ?")
+        params.append(capability)
+
+    if results_only:
+        clauses.append("has_result")
+
+    if result_cid:
+        clauses.append("result_cid = ?")
+        params.append(result_cid)
+
+    return " AND ".join(clauses), params
 
 
 def get_agent_tasks(
@@ -324,6 +651,12 @@ def get_agent_tasks(
     direction: str = "desc",
     limit: int = 100,
     offset: int = 0,
+    capability: str | None = None,
+    results_only: bool = False,
+    result_cid: str | None = None,
+    cursor: str | None = None,
+    latest_per_result_key: bool = False,
+    include_trace: bool = True,
 ) -> list[AgentTask]:
     """Query agent tasks with optional filters.
 
@@ -336,77 +669,115 @@ def get_agent_tasks(
         direction: Sort direction (`asc` or `desc`).
         limit: Maximum number of tasks to return.
         offset: Number of tasks to skip (for pagination).
+        capability: Filter by normalized MCP capability.
+        results_only: Only return completed tasks that carry MCP result data.
+        result_cid: Filter by result CID.
+        cursor: Keyset cursor from :func:`encode_agent_task_cursor`; returns tasks
+            strictly after the cursor position in the requested order.
+        latest_per_result_key: Only keep the first matching task (in the requested
+            order) for each provider/capability combination.
+        include_trace: Decode the full trace for every row. When False only the
+            hot ``trace_summary`` is read and ``trace`` is loaded on first access.
 
     Returns:
-        List of AgentTask objects, ordered by created_at DESC.
+        List of AgentTask objects, ordered by the sort field then id.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort field.
     """
-    query = (
-        "SELECT id, user_id, provider, repo_full_name, issue_number, pr_number, "
-        "instruction, status, last_update, created_at, updated_at "
-        "FROM agent_tasks WHERE 1=1"
+    where, params = _agent_task_filters(
+        user_id=user_id,
+        provider=provider,
+        state=state,
+        capability=capability,
+        results_only=results_only,
+        result_cid=result_cid,
     )
-    params = []
-
-    if user_id:
-        # Convert user_id to UUID
-        try:
-            user_uuid = (
-                uuid.UUID(user_id) if "-" in user_id else uuid.uuid5(uuid.NAMESPACE_DNS, user_id)
-            )
-        except (ValueError, AttributeError):
-            user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, user_id)
-        query += " AND user_id = ?"
-        params.append(user_uuid)
-
-    if provider:
-        query += " AND provider = ?"
-        params.append(provider)
-
-    if state:
-        query += " AND status = ?"
-        params.append(state)
-
     sort_column = "updated_at" if sort_by == "updated_at" else "created_at"
     sort_direction = "ASC" if direction.lower() == "asc" else "DESC"
 
-    query += f" ORDER BY {sort_column} {sort_direction} LIMIT ? OFFSET ?"
+    if latest_per_result_key:
+        # Keep the first task per (provider, capability) in the requested order,
+        # ranked before the cursor is applied so paging does not change the winners.
+        source = (
+            f"(SELECT *, ROW_NUMBER() OVER ("
+            f"PARTITION BY provider, mcp_capability "
+            f"ORDER BY {sort_column} {sort_direction}, id {sort_direction}"
+            f") AS result_key_rank FROM agent_tasks WHERE {where}) AS ranked"
+        )
+        where = "result_key_rank = 1"
+    else:
+        source = "agent_tasks"
+
+    if cursor:
+        cursor_column, cursor_value, cursor_id = decode_agent_task_cursor(cursor)
+        if cursor_column != sort_column:
+            raise ValueError(f"cursor was issued for sort={cursor_column}")
+        comparison = ">" if sort_direction == "ASC" else "<"
+        where += f" AND ({sort_column}, id) {comparison} (?, ?)"
+        params.extend([cursor_value, cursor_id])
+
+    columns = _AGENT_TASK_COLUMNS if include_trace else _AGENT_TASK_SUMMARY_COLUMNS
+    query = (
+        f"SELECT {columns} FROM {source} WHERE {where} "
+        f"ORDER BY {sort_column} {sort_direction}, id {sort_direction} LIMIT ? OFFSET ?"
+    )
     params.append(limit)
     params.append(offset)
 
     results = conn.execute(query, params).fetchall()
+    if include_trace:
+        return [_row_to_agent_task(row) for row in results]
+    return [_summary_row_to_agent_task(conn, row) for row in results]
 
-    tasks = []
-    for row in results:
-        # Reconstruct target_type and target_ref
-        target_type = None
-        target_ref = None
-        if row[4] is not None:  # issue_number
-            target_type = "issue"
-            target_ref = f"{row[3]}#{row[4]}" if row[3] else f"#{row[4]}"
-        elif row[5] is not None:  # pr_number
-            target_type = "pr"
-            target_ref = f"{row[3]}#{row[5]}" if row[3] else f"#{row[5]}"
-
-        trace = None
-        if row[8]:  # last_update
-            try:
-                trace = json.loads(row[8]) if isinstance(row[8], str) else row[8]
-            except (json.JSONDecodeError, TypeError):
-                trace = None
-
-        tasks.append(
-            AgentTask(
-                id=str(row[0]),
-                user_id=str(row[1]),
-                provider=row[2],
-                target_type=target_type,
-                target_ref=target_ref,
-                instruction=row[6],
-                state=row[7],
-                trace=trace,
-                created_at=row[9],
-                updated_at=row[10],
-            )
-        )
 
-    return tasks
+def summarize_agent_task_results(
+    conn: duckdb.DuckDBPyConnection,
+    user_id: str | None = None,
+    provider: str | None = None,
+    capability: str | None = None,
+) -> dict[str, Any]:
+    """Count completed tasks with MCP results, grouped by provider and capability.
+
+    Args:
+        conn: Database connection.
+        user_id: Filter by user ID.
+        provider: Filter by provider.
+        capability: Filter by normalized MCP capability.
+
+    Returns:
+        Dict with `total_results`, `by_provider` and `by_capability` counts.
+    """
+    where, params = _agent_task_filters(
+        user_id=user_id,
+        provider=provider,
+        state="completed",
+        capability=capability,
+        results_only=True,
+    )
+    rows = conn.execute(
+        f"""
+        SELECT GROUPING(provider), GROUPING(mcp_capability), provider, mcp_capability,
+               COUNT(*)
+        FROM agent_tasks
+        WHERE {where}
+        GROUP BY GROUPING SETS ((provider), (mcp_capability), ())
+        """,
+        params,
+    ).fetchall()
+
+    total = 0
+    by_provider: dict[str, int] = {}
+    by_capability: dict[str, int] = {}
+    for provider_grouped, capability_grouped, row_provider, row_capability, count in rows:
+        if provider_grouped and capability_grouped:
+            total = count
+        elif not provider_grouped:
+            by_provider[row_provider] = count
+        elif row_capability:
+            by_capability[row_capability] = count
+    return {
+        "total_results": total,
+        "by_provider": by_provider,
+        "by_capability": by_capability,
+    }
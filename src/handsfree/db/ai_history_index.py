@@ -1,14 +1,31 @@
-"""Persistence helpers for reusable AI history artifacts."""
+"""Persistence helpers for reusable AI history artifacts.
+
+Retention, deduplication and the backfill from action logs run as
+bounded maintenance batches (:func:`compact_ai_history_index` and
+:func:`backfill_ai_history_index`, driven by
+:mod:`handsfree.ai_history_maintenance`) rather than on the write path.
+"""
 
 from __future__ import annotations
 
+import json
 import os
+import threading
 import uuid
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
 import duckdb
 
+FAILURE_ANALYSIS_CAPABILITY = "github.check.failure_rag_explain"
+BACKFILL_JOB = "action_log_backfill"
+DEFAULT_MAINTENANCE_BATCH_SIZE = 500
+
+# Serializes backfill batches within the process so concurrent maintenance runs
+# don't interleave cursor updates.
+_backfill_lock = threading.Lock()
+
 
 @dataclass
 class AIHistoryRecord:
@@ -35,10 +52,13 @@ def store_ai_history_record(
     pr_number: int | None = None,
     failure_target: str | None = None,
     failure_target_type: str | None = None,
+    summary: str | None = None,
 ) -> AIHistoryRecord:
-    """Store a reusable persisted AI artifact unless it already exists for the user/CID."""
-    _maybe_prune_ai_history(conn, user_id=user_id, capability_id=capability_id)
+    """Store a reusable persisted AI artifact unless it already exists for the user/CID.
 
+    When ``summary`` is given, a newly stored record is also queued for the
+    persistent failure similarity index; the maintenance job embeds it.
+    """
     existing = conn.execute(
         """
         SELECT id, user_id, capability_id, repo, pr_number, failure_target,
@@ -73,7 +93,20 @@ def store_ai_history_record(
             created_at,
         ],
     )
-    _maybe_prune_ai_history(conn, user_id=user_id, capability_id=capability_id)
+    if summary:
+        # Imported lazily: handsfree.ai imports this module.
+        from handsfree.ai.failure_index import queue_failure_history_record
+
+        queue_failure_history_record(
+            ipfs_cid,
+            {
+                "summary": summary,
+                "repo": repo,
+                "pr_number": pr_number,
+                "failure_target": failure_target,
+                "failure_target_type": failure_target_type,
+            },
+        )
     return AIHistoryRecord(
         id=record_id,
         user_id=user_id,
@@ -184,37 +217,243 @@ def get_ai_history_records(
     return [_row_to_record(row) for row in rows]
 
 
-def _maybe_prune_ai_history(
+@dataclass
+class AIHistoryCompaction:
+    """Rows removed by one :func:`compact_ai_history_index` pass."""
+
+    expired: int = 0
+    duplicates: int = 0
+    over_limit: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.expired + self.duplicates + self.over_limit
+
+
+def _int_env(name: str) -> int | None:
+    raw_value = os.getenv(name, "").strip()
+    if not raw_value:
+        return None
+    try:
+        value = int(raw_value)
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+def _delete_ids(conn: duckdb.DuckDBPyConnection, select_ids_sql: str, params: list[object]) -> int:
+    rows = conn.execute(
+        f"DELETE FROM ai_history_index WHERE id IN ({select_ids_sql}) RETURNING id", params
+    ).fetchall()
+    return len(rows)
+
+
+def compact_ai_history_index(
     conn: duckdb.DuckDBPyConnection,
     *,
-    user_id: str,
-    capability_id: str,
-) -> int:
-    """Best-effort env-driven pruning hook for long-running deployments."""
-    deleted = 0
-    raw_days = os.getenv("HANDSFREE_AI_HISTORY_RETENTION_DAYS", "").strip()
-    if raw_days:
-        try:
-            retention_days = int(raw_days)
-        except ValueError:
-            retention_days = -1
-        if retention_days >= 0:
-            deleted += prune_ai_history_records(conn, older_than_days=retention_days)
-
-    raw_max_records = os.getenv("HANDSFREE_AI_HISTORY_MAX_RECORDS_PER_USER", "").strip()
-    if raw_max_records:
+    batch_size: int = DEFAULT_MAINTENANCE_BATCH_SIZE,
+) -> AIHistoryCompaction:
+    """Run one bounded maintenance pass over ``ai_history_index``.
+
+    Deletes at most ``batch_size`` rows of each kind: records older than
+    ``HANDSFREE_AI_HISTORY_RETENTION_DAYS``, duplicate user/capability/CID
+    records (the oldest is kept), and records beyond the newest
+    ``HANDSFREE_AI_HISTORY_MAX_RECORDS_PER_USER`` per user and capability.
+    Callers repeat the pass until it removes nothing.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    result = AIHistoryCompaction()
+    retention_days = _int_env("HANDSFREE_AI_HISTORY_RETENTION_DAYS")
+    if retention_days is not None:
+        cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+        result.expired = _delete_ids(
+            conn,
+            "SELECT id FROM ai_history_index WHERE created_at < ? LIMIT ?",
+            [cutoff, batch_size],
+        )
+
+    result.duplicates = _delete_ids(
+        conn,
+        """
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY user_id, capability_id, ipfs_cid ORDER BY created_at, id
+            ) AS position
+            FROM ai_history_index
+        ) WHERE position > 1 LIMIT ?
+        """,
+        [batch_size],
+    )
+
+    max_records = _int_env("HANDSFREE_AI_HISTORY_MAX_RECORDS_PER_USER")
+    if max_records is not None:
+        result.over_limit = _delete_ids(
+            conn,
+            """
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY user_id, capability_id ORDER BY created_at DESC, id DESC
+                ) AS position
+                FROM ai_history_index
+            ) WHERE position > ? LIMIT ?
+            """,
+            [max_records, batch_size],
+        )
+
+    if result.total:
         try:
-            max_records = int(raw_max_records)
-        except ValueError:
-            max_records = -1
-        if max_records >= 0:
-            deleted += prune_ai_history_records_to_limit(
-                conn,
-                user_id=user_id,
-                capability_id=capability_id,
-                max_records=max_records,
+            # Reclaim the deleted rows' storage; skipped while other
+            # transactions are open.
+            conn.execute("CHECKPOINT")
+        except duckdb.Error:
+            pass
+    return result
+
+
+def ai_history_backfill_complete(conn: duckdb.DuckDBPyConnection) -> bool:
+    """Return whether the backfill has caught up with the action logs at least once."""
+    row = conn.execute(
+        "SELECT completed_at FROM ai_history_maintenance_state WHERE name = ?",
+        [BACKFILL_JOB],
+    ).fetchone()
+    return row is not None and row[0] is not None
+
+
+def backfill_ai_history_index(
+    conn: duckdb.DuckDBPyConnection,
+    *,
+    batch_size: int = DEFAULT_MAINTENANCE_BATCH_SIZE,
+    max_batches: int | None = None,
+) -> int:
+    """Index persisted failure analyses recorded only in action logs.
+
+    Successful ``ai.execute.github.check.failure_rag_explain`` logs are
+    scanned in ``(created_at, id)`` order, ``batch_size`` at a time, with the
+    cursor saved after every batch so each call resumes where the previous one
+    stopped.  The cursor is kept after the job first catches up, so later
+    calls also index new logs whose best-effort ``store_ai_history_record``
+    failed.  Returns the number of scanned logs that carried an artifact CID
+    (already-indexed CIDs are skipped).
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    indexed = 0
+    batches = 0
+    with _backfill_lock:
+        state = conn.execute(
+            """
+            SELECT cursor_created_at, cursor_id
+            FROM ai_history_maintenance_state
+            WHERE name = ?
+            """,
+            [BACKFILL_JOB],
+        ).fetchone()
+        cursor_created_at, cursor_id = (state[0], state[1]) if state else (None, None)
+
+        while max_batches is None or batches < max_batches:
+            query = """
+                SELECT id, user_id, created_at, result
+                FROM action_logs
+                WHERE action_type = ? AND ok
+            """
+            params: list[object] = [f"ai.execute.{FAILURE_ANALYSIS_CAPABILITY}"]
+            if cursor_created_at is not None:
+                query += " AND (created_at > ? OR (created_at = ? AND CAST(id AS TEXT) > ?))"
+                params.extend([cursor_created_at, cursor_created_at, cursor_id])
+            query += " ORDER BY created_at, CAST(id AS TEXT) LIMIT ?"
+            params.append(batch_size)
+            rows = conn.execute(query, params).fetchall()
+
+            indexed += _index_backfilled_logs(conn, rows)
+            batches += 1
+            complete = len(rows) < batch_size
+            if rows:
+                cursor_created_at, cursor_id = rows[-1][2], str(rows[-1][0])
+            conn.execute(
+                """
+                INSERT INTO ai_history_maintenance_state
+                (name, cursor_created_at, cursor_id, completed_at, updated_at)
+                VALUES (?, ?, ?, ?, now())
+                ON CONFLICT (name) DO UPDATE SET
+                    cursor_created_at = excluded.cursor_created_at,
+                    cursor_id = excluded.cursor_id,
+                    completed_at = coalesce(
+                        ai_history_maintenance_state.completed_at, excluded.completed_at
+                    ),
+                    updated_at = excluded.updated_at
+                """,
+                [
+                    BACKFILL_JOB,
+                    cursor_created_at,
+                    cursor_id,
+                    datetime.now(UTC) if complete else None,
+                ],
             )
-    return deleted
+            if complete:
+                break
+    return indexed
+
+
+def _index_backfilled_logs(conn: duckdb.DuckDBPyConnection, rows: list[tuple[object, ...]]) -> int:
+    records: list[list[object]] = []
+    seen: set[tuple[str, str]] = set()
+    for _log_id, user_id, created_at, raw_result in rows:
+        result = json.loads(raw_result) if isinstance(raw_result, str) else raw_result
+        if not isinstance(result, dict):
+            continue
+        # Same precedence as the logged AI response: output, then typed_output.
+        payloads = (_as_dict(result.get("output")), _as_dict(result.get("typed_output")))
+
+        def field(name: str, payloads=payloads) -> Any:
+            return payloads[0].get(name) or payloads[1].get(name)
+
+        cid = field("ipfs_cid")
+        if not isinstance(cid, str) or not cid.strip() or (str(user_id), cid) in seen:
+            continue
+        seen.add((str(user_id), cid))
+        pr_number = field("pr_number")
+        records.append(
+            [
+                str(uuid.uuid4()),
+                str(user_id),
+                FAILURE_ANALYSIS_CAPABILITY,
+                _optional_str(field("repo")),
+                pr_number if isinstance(pr_number, int) else None,
+                _optional_str(field("failure_target")),
+                _optional_str(field("failure_target_type")),
+                cid,
+                created_at,
+                str(user_id),
+                FAILURE_ANALYSIS_CAPABILITY,
+                cid,
+            ]
+        )
+    if records:
+        conn.executemany(
+            """
+            INSERT INTO ai_history_index
+            (id, user_id, capability_id, repo, pr_number, failure_target,
+             failure_target_type, ipfs_cid, created_at)
+            SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM ai_history_index
+                WHERE user_id = ? AND capability_id = ? AND ipfs_cid = ?
+            )
+            """,
+            records,
+        )
+    return len(records)
+
+
+def _as_dict(value: Any) -> dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _optional_str(value: Any) -> str | None:
+    return value if isinstance(value, str) else None
 
 
 def _row_to_record(row: tuple[object, ...]) -> AIHistoryRecord:
@@ -0,0 +1,167 @@
+"""Pre-aggregated AI backend-policy activity.
+
+Each ``ai.execute.*`` action log is counted into ``ai_policy_rollups`` when it
+is written, keyed by user, minute bucket, action, capability, outcome and
+policy remap.  The backend-policy reports read these buckets instead of
+re-parsing action logs, so they cover arbitrary time windows without a log
+limit.  Windows are resolved to whole minutes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+import duckdb
+
+AI_EXECUTE_PREFIX = "ai.execute."
+
+# One row per ai.execute.* action log, classified the way the reports count
+# it.  migrations/018_add_ai_policy_rollups.sql backfills with the same query.
+# ``{filters}`` is replaced with extra conditions on action_logs.
+_ROLLUP_SOURCE_SQL = f"""
+    SELECT
+        user_id,
+        bucket_start,
+        action_type,
+        capability_id,
+        ok,
+        policy_applied,
+        CASE WHEN policy_applied THEN COALESCE(NULLIF(requested, ''), 'unknown') ELSE '' END
+            AS requested_workflow,
+        CASE WHEN policy_applied THEN COALESCE(NULLIF(resolved, ''), 'unknown') ELSE '' END
+            AS resolved_workflow
+    FROM (
+        SELECT
+            CAST(user_id AS TEXT) AS user_id,
+            date_trunc('minute', created_at) AS bucket_start,
+            action_type,
+            CASE
+                WHEN json_type(result, '$.capability_id') = 'VARCHAR'
+                     AND json_extract_string(result, '$.capability_id') <> ''
+                THEN json_extract_string(result, '$.capability_id')
+                ELSE substr(action_type, {len(AI_EXECUTE_PREFIX) + 1})
+            END AS capability_id,
+            ok,
+            COALESCE(
+                TRY_CAST(json_extract(result, '$.policy_resolution.policy_applied') AS BOOLEAN),
+                FALSE
+            ) AS policy_applied,
+            json_extract_string(result, '$.policy_resolution.requested_workflow') AS requested,
+            json_extract_string(result, '$.policy_resolution.resolved_workflow') AS resolved
+        FROM action_logs
+        WHERE action_type LIKE '{AI_EXECUTE_PREFIX}%'{{filters}}
+    ) AS logged
+"""
+
+_ROLLUP_KEY_COLUMNS = (
+    "user_id, bucket_start, action_type, capability_id, ok, policy_applied, "
+    "requested_workflow, resolved_workflow"
+)
+
+
+@dataclass
+class AIPolicyRollup:
+    """Aggregated count of AI executions sharing one rollup key."""
+
+    action_type: str
+    capability_id: str
+    ok: bool
+    policy_applied: bool
+    requested_workflow: str
+    resolved_workflow: str
+    count: int
+    bucket_index: int = 0
+
+    @property
+    def remap_key(self) -> str:
+        return f"{self.requested_workflow}->{self.resolved_workflow}"
+
+
+def record_ai_policy_rollup(conn: duckdb.DuckDBPyConnection, *, action_log_id: str) -> None:
+    """Count one newly written ``ai.execute.*`` action log into its rollup bucket."""
+    conn.execute(
+        f"""
+        INSERT INTO ai_policy_rollups
+        SELECT {_ROLLUP_KEY_COLUMNS}, 1
+        FROM ({_ROLLUP_SOURCE_SQL.format(filters=" AND id = ?")})
+        ON CONFLICT DO UPDATE SET count = ai_policy_rollups.count + excluded.count
+        """,
+        [action_log_id],
+    )
+
+
+def rebuild_ai_policy_rollups(
+    conn: duckdb.DuckDBPyConnection,
+    *,
+    user_id: str | None = None,
+) -> None:
+    """Recompute rollups from action logs (all users, or one user)."""
+    user_filter = " AND CAST(user_id AS TEXT) = ?" if user_id else ""
+    params = [user_id] if user_id else []
+    conn.execute(
+        "DELETE FROM ai_policy_rollups" + (" WHERE user_id = ?" if user_id else ""),
+        params,
+    )
+    conn.execute(
+        f"""
+        INSERT INTO ai_policy_rollups
+        SELECT {_ROLLUP_KEY_COLUMNS}, COUNT(*)
+        FROM ({_ROLLUP_SOURCE_SQL.format(filters=user_filter)})
+        GROUP BY ALL
+        """,
+        params,
+    )
+
+
+def summarize_ai_policy_rollups(
+    conn: duckdb.DuckDBPyConnection,
+    *,
+    user_id: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    bucket_seconds: int | None = None,
+) -> list[AIPolicyRollup]:
+    """Sum a user's rollups over ``[since, until)``.
+
+    With ``bucket_seconds``, counts are further split into consecutive
+    buckets of that length starting at ``since``, reported as ``bucket_index``.
+    """
+    query_filters = ["user_id = ?"]
+    params: list[object] = [user_id]
+    if since is not None:
+        query_filters.append("bucket_start >= date_trunc('minute', CAST(? AS TIMESTAMPTZ))")
+        params.append(since)
+    if until is not None:
+        query_filters.append("bucket_start < ?")
+        params.append(until)
+
+    bucket_expr = "0"
+    if bucket_seconds and since is not None:
+        bucket_expr = "GREATEST(0, CAST(FLOOR((epoch(bucket_start) - ?) / ?) AS INTEGER))"
+        params = [since.timestamp(), bucket_seconds, *params]
+
+    rows = conn.execute(
+        f"""
+        SELECT {bucket_expr} AS bucket_index, action_type, capability_id, ok,
+               policy_applied, requested_workflow, resolved_workflow, SUM(count)
+        FROM ai_policy_rollups
+        WHERE {" AND ".join(query_filters)}
+        GROUP BY ALL
+        ORDER BY bucket_index, action_type, capability_id
+        """,
+        params,
+    ).fetchall()
+    return [
+        AIPolicyRollup(
+            action_type=row[1],
+            capability_id=row[2],
+            ok=bool(row[3]),
+            policy_applied=bool(row[4]),
+            requested_workflow=row[5],
+            resolved_workflow=row[6],
+            count=int(row[7]),
+            bucket_index=int(row[0]),
+        )
+        for row in rows
+    ]
@@ -0,0 +1,340 @@
+"""Content-addressed cache for embedding vectors.
+
+Capabilities such as text ranking, similar-failure search and the PR/CI RAG
+flows re-embed the same texts (failure history, PR summaries) on every
+request.  Embeddings are a pure function of (model, options, text), so they are
+cached under ``(model, sha256(options), sha256(text))``, where ``model`` falls
+back to the backend's resolved default model when options do not name one:
+
+- an in-memory LRU answers repeated lookups within the process;
+- a DuckDB table persists vectors across restarts.
+
+:class:`CachedEmbeddingsRouter` wraps an embeddings router and sends only the
+cache misses of a request to the backend, deduplicated, in one ``embed_texts``
+call.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+EmbeddingKey = tuple[str, str, str]
+
+DEFAULT_MAX_ENTRIES = 4096
+_MODEL_OPTION_KEYS = ("model", "model_name")
+
+
+def embedding_options_digest(options: dict[str, Any] | None = None) -> str:
+    """Return the sha256 of the canonical JSON form of embedding ``options``."""
+    canonical_options = json.dumps(
+        options or {}, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical_options.encode("utf-8")).hexdigest()
+
+
+def resolve_embedding_model(options: dict[str, Any] | None, default_model: str = "") -> str:
+    """Return the model named by ``options``, or ``default_model`` when none is."""
+    options = options or {}
+    return next(
+        (str(options[key]) for key in _MODEL_OPTION_KEYS if options.get(key)), default_model
+    )
+
+
+def embedding_cache_key(
+    text: str, options: dict[str, Any] | None = None, default_model: str = ""
+) -> EmbeddingKey:
+    """Return the ``(model, options_sha256, text_sha256)`` cache key for one text.
+
+    ``default_model`` identifies the model the backend uses when ``options``
+    do not name one, so vectors from different default models never collide.
+    """
+    options = options or {}
+    return (
+        resolve_embedding_model(options, default_model),
+        embedding_options_digest(options),
+        hashlib.sha256(text.encode("utf-8")).hexdigest(),
+    )
+
+
+def _as_vector(value: Any) -> list[float] | None:
+    """Coerce a backend embedding to a list of floats, or None if it is not a vector."""
+    if isinstance(value, str | bytes | dict):
+        return None
+    try:
+        return [float(component) for component in value]
+    except (TypeError, ValueError):
+        return None
+
+
+class DuckDBEmbeddingStore:
+    """Persistent embedding vectors in a DuckDB table.
+
+    Vectors are stored as ``DOUBLE[]`` so cached results are identical to the
+    backend output.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = duckdb.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                options_sha256 TEXT NOT NULL,
+                text_sha256 TEXT NOT NULL,
+                vector DOUBLE[] NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT now(),
+                PRIMARY KEY (model, options_sha256, text_sha256)
+            )
+            """
+        )
+
+    def get_many(self, keys: Sequence[EmbeddingKey]) -> dict[EmbeddingKey, list[float]]:
+        """Return the stored vectors for ``keys`` (missing keys are omitted)."""
+        if not keys:
+            return {}
+        placeholders = ", ".join(["(?, ?, ?)"] * len(keys))
+        params = [part for key in keys for part in key]
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT model, options_sha256, text_sha256, vector
+                FROM embedding_cache
+                WHERE (model, options_sha256, text_sha256) IN ({placeholders})
+                """,
+                params,
+            ).fetchall()
+        return {(model, options, text): vector for model, options, text, vector in rows}
+
+    def put_many(self, items: dict[EmbeddingKey, list[float]]) -> None:
+        """Store vectors, keeping existing rows for keys already present."""
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT INTO embedding_cache (model, options_sha256, text_sha256, vector)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT DO NOTHING
+                """,
+                [[*key, vector] for key, vector in items.items()],
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()
+        return int(row[0]) if row else 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Lookup counters for an :class:`EmbeddingCache`."""
+
+    memory_hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+        }
+
+
+class EmbeddingCache:
+    """In-memory LRU of embedding vectors in front of an optional persistent store."""
+
+    def __init__(
+        self,
+        store: DuckDBEmbeddingStore | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.store = store
+        self.max_entries = max(0, max_entries)
+        self.stats = EmbeddingCacheStats()
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[EmbeddingKey, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: EmbeddingKey, vector: list[float]) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys: Sequence[EmbeddingKey]) -> dict[EmbeddingKey, list[float]]:
+        """Return cached vectors for ``keys``, consulting the store for LRU misses."""
+        found: dict[EmbeddingKey, list[float]] = {}
+        pending: list[EmbeddingKey] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                vector = self._entries.get(key)
+                if vector is None:
+                    pending.append(key)
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = vector
+            self.stats.memory_hits += len(found)
+
+        stored: dict[EmbeddingKey, list[float]] = {}
+        if pending and self.store is not None:
+            try:
+                stored = self.store.get_many(pending)
+            except duckdb.Error as exc:
+                logger.warning("Embedding cache store lookup failed: %s", exc)
+        with self._lock:
+            for key, vector in stored.items():
+                self._remember(key, vector)
+            self.stats.store_hits += len(stored)
+            self.stats.misses += len(pending) - len(stored)
+        found.update(stored)
+        return found
+
+    def put_many(self, items: dict[EmbeddingKey, list[float]]) -> None:
+        """Cache vectors in memory and in the persistent store."""
+        if not items:
+            return
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+        if self.store is not None:
+            try:
+                self.store.put_many(items)
+            except duckdb.Error as exc:
+                logger.warning("Embedding cache store write failed: %s", exc)
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (the persistent store is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = EmbeddingCacheStats()
+
+
+def resolve_embedding_model_identity(router: Any) -> str:
+    """Return ``router.model_identity()``, or ``""`` when it cannot be resolved."""
+    resolve = getattr(router, "model_identity", None)
+    if not callable(resolve):
+        return ""
+    try:
+        return str(resolve() or "")
+    except Exception as exc:
+        logger.warning("Embedding model identity unavailable: %s", exc)
+        return ""
+
+
+class CachedEmbeddingsRouter:
+    """Embeddings router that serves repeated texts from an :class:`EmbeddingCache`.
+
+    ``model_identity`` names the backend's default model and configuration; by
+    default it is resolved from ``router.model_identity()``.
+    """
+
+    def __init__(
+        self, router: Any, cache: EmbeddingCache, model_identity: str | None = None
+    ) -> None:
+        self._router = router
+        self.cache = cache
+        if model_identity is None:
+            model_identity = resolve_embedding_model_identity(router)
+        self._model_identity = model_identity
+
+    def model_identity(self) -> str:
+        return self._model_identity
+
+    def embed_text(self, text: str, **kwargs: Any) -> list[float]:
+        key = embedding_cache_key(text, kwargs, self._model_identity)
+        cached = self.cache.get_many([key])
+        if key in cached:
+            return list(cached[key])
+
+        output = self._router.embed_text(text, **kwargs)
+        vector = _as_vector(output)
+        if vector is not None:
+            self.cache.put_many({key: vector})
+        return output
+
+    def embed_texts(self, texts: list[str], **kwargs: Any) -> list[list[float]]:
+        keys = [embedding_cache_key(text, kwargs, self._model_identity) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        missing: dict[EmbeddingKey, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        if missing:
+            outputs = self._router.embed_texts(list(missing.values()), **kwargs)
+            vectors = [_as_vector(output) for output in outputs]
+            if len(vectors) != len(missing) or any(vector is None for vector in vectors):
+                # Unexpected backend shape: do not cache, and return an uncached
+                # result for the whole request so outputs stay aligned with texts.
+                if list(missing.values()) == list(texts):
+                    return outputs
+                return self._router.embed_texts(texts, **kwargs)
+            fresh = dict(zip(missing, vectors, strict=True))
+            self.cache.put_many(fresh)
+            cached = {**cached, **fresh}
+
+        return [list(cached[key]) for key in keys]
+
+
+def _default_store_path() -> str:
+    from handsfree.db.connection import get_db_path
+
+    db_path = get_db_path()
+    if db_path == ":memory:":
+        return ":memory:"
+    return str(Path(db_path).with_name("embedding_cache.duckdb"))
+
+
+def embedding_cache_enabled() -> bool:
+    """Whether embeddings routers should be wrapped with a cache."""
+    return os.getenv("HANDSFREE_EMBEDDING_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def build_embedding_cache(persistent: bool = True) -> EmbeddingCache:
+    """Build an embedding cache from environment configuration.
+
+    ``HANDSFREE_EMBEDDING_CACHE_PATH`` selects the DuckDB file (default:
+    ``embedding_cache.duckdb`` next to the main database; empty for memory
+    only) and ``HANDSFREE_EMBEDDING_CACHE_MAX_ENTRIES`` sizes the LRU.
+    ``persistent=False`` skips the DuckDB store, e.g. when the backend's model
+    cannot be identified and vectors must not outlive the process.
+    """
+    try:
+        max_entries = int(os.getenv("HANDSFREE_EMBEDDING_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    except ValueError:
+        max_entries = DEFAULT_MAX_ENTRIES
+
+    path = os.getenv("HANDSFREE_EMBEDDING_CACHE_PATH") if persistent else ""
+    if path is None:
+        path = _default_store_path()
+    store = None
+    if path:
+        try:
+            store = DuckDBEmbeddingStore(path)
+        except (duckdb.Error, OSError) as exc:
+            logger.warning("Embedding cache store unavailable at %s: %s", path, exc)
+    return EmbeddingCache(store=store, max_entries=max_entries)
@@ -0,0 +1,215 @@
+"""Incremental readers for append-only JSONL logs and rewritten JSON state files.
+
+Todo-daemon backed agent tasks are polled repeatedly, and every poll used to
+re-read and re-parse the daemon's state file and its ever-growing event log.
+This module keeps one shared reader per path (shared across all tasks watching
+the same file) that:
+
+- for JSONL logs, remembers the byte offset and file identity (device, inode)
+  and only parses lines appended since the previous read, keeping the most
+  recent ``max_records`` records; truncation or rotation resets the reader;
+- for JSON documents, re-parses only when the file's stat stamp changes.
+
+Change detection is stat-based, so a poll against an unchanged file costs a
+single ``os.stat`` call.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Filesystems with coarse timestamps can report an unchanged mtime for a
+# rewrite that lands shortly after a read.  Like git's "racily clean" check,
+# JSON documents modified within this window of the last read are re-parsed.
+_RACY_WINDOW_NS = 2_000_000_000
+
+DEFAULT_MAX_RECORDS = 10_000
+
+
+@dataclass(frozen=True)
+class FileStamp:
+    """Identity and change stamp for one file."""
+
+    device: int
+    inode: int
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_stat(cls, stat_result: os.stat_result) -> FileStamp:
+        return cls(
+            device=stat_result.st_dev,
+            inode=stat_result.st_ino,
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+        )
+
+    def same_file(self, other: FileStamp | None) -> bool:
+        return other is not None and (self.device, self.inode) == (other.device, other.inode)
+
+
+class JsonlTail:
+    """Incrementally parsed view of an append-only JSONL file."""
+
+    def __init__(
+        self, path: str | os.PathLike[str], *, max_records: int = DEFAULT_MAX_RECORDS
+    ) -> None:
+        self.path = Path(path)
+        self.max_records = max_records
+        self._lock = threading.Lock()
+        self._stamp: FileStamp | None = None
+        self._offset = 0
+        self._pending = b""
+        self._records: deque[dict[str, Any]] = deque(maxlen=max_records)
+
+    @property
+    def offset(self) -> int:
+        """Byte offset up to which the file has been consumed."""
+        return self._offset
+
+    def _reset(self) -> None:
+        self._stamp = None
+        self._offset = 0
+        self._pending = b""
+        self._records.clear()
+
+    def read(self) -> list[dict[str, Any]]:
+        """Return the most recent ``max_records`` records, oldest first.
+
+        Only bytes appended since the last read are parsed.  A missing file
+        yields an empty list.  Blank lines, invalid JSON and non-object
+        payloads are skipped.  A final line without a newline is returned once
+        it parses as a JSON object, which can only happen when the object is
+        complete; otherwise it is held back until more bytes arrive.  Each
+        call returns fresh copies of the records, so callers may modify them.
+        """
+        with self._lock:
+            try:
+                stamp = FileStamp.from_stat(os.stat(self.path))
+            except FileNotFoundError:
+                self._reset()
+                return []
+
+            if not stamp.same_file(self._stamp) or stamp.size < self._offset:
+                self._reset()
+            if stamp.size > self._offset:
+                with open(self.path, "rb") as handle:
+                    handle.seek(self._offset)
+                    chunk = handle.read(stamp.size - self._offset)
+                self._offset += len(chunk)
+                self._consume(chunk)
+            self._stamp = stamp
+            return [dict(record) for record in self._records]
+
+    def _consume(self, chunk: bytes) -> None:
+        lines = (self._pending + chunk).split(b"\n")
+        self._pending = lines.pop()
+        for raw_line in lines:
+            payload = _parse_line(raw_line)
+            if payload is not None:
+                self._records.append(payload)
+        tail = _parse_line(self._pending)
+        if tail is not None:
+            self._records.append(tail)
+            self._pending = b""
+
+
+def _parse_line(raw_line: bytes) -> dict[str, Any] | None:
+    raw_line = raw_line.strip()
+    if not raw_line:
+        return None
+    try:
+        payload = json.loads(raw_line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class JsonDocument:
+    """JSON object file that is re-parsed only when its stat stamp changes."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stamp: FileStamp | None = None
+        self._read_at_ns = 0
+        self._payload: dict[str, Any] = {}
+
+    def read(self) -> dict[str, Any]:
+        """Return the parsed document.
+
+        Raises the same errors as reading and decoding the file directly
+        (``FileNotFoundError``, ``json.JSONDecodeError``) so callers keep their
+        existing failure handling.  Non-object documents decode to ``{}``.
+        """
+        with self._lock:
+            stamp = FileStamp.from_stat(os.stat(self.path))
+            racy = stamp.mtime_ns + _RACY_WINDOW_NS >= self._read_at_ns
+            if stamp != self._stamp or racy:
+                read_at_ns = time.time_ns()
+                payload = json.loads(self.path.read_text(encoding="utf-8"))
+                self._payload = payload if isinstance(payload, dict) else {}
+                self._stamp = stamp
+                self._read_at_ns = read_at_ns
+            return dict(self._payload)
+
+
+class FileTailRegistry:
+    """Process-wide registry sharing readers across callers watching the same path."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._tails: dict[str, JsonlTail] = {}
+        self._documents: dict[str, JsonDocument] = {}
+
+    @staticmethod
+    def _key(path: str | os.PathLike[str]) -> str:
+        return os.path.abspath(os.fspath(path))
+
+    def jsonl(self, path: str | os.PathLike[str]) -> JsonlTail:
+        key = self._key(path)
+        with self._lock:
+            tail = self._tails.get(key)
+            if tail is None:
+                tail = self._tails[key] = JsonlTail(key)
+            return tail
+
+    def json_document(self, path: str | os.PathLike[str]) -> JsonDocument:
+        key = self._key(path)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                document = self._documents[key] = JsonDocument(key)
+            return document
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tails.clear()
+            self._documents.clear()
+
+
+_file_tail_registry = FileTailRegistry()
+
+
+def get_file_tail_registry() -> FileTailRegistry:
+    """Get the process-wide file tail registry."""
+    return _file_tail_registry
+
+
+def read_jsonl_records(path: str | None) -> list[dict[str, Any]]:
+    """Read all object records of a JSONL file incrementally."""
+    if not path:
+        return []
+    return _file_tail_registry.jsonl(path).read()
+
+
+def read_json_record(path: str) -> dict[str, Any]:
+    """Read a JSON object file, re-parsing only when it changed."""
+    return _file_tail_registry.json_document(path).read()
@@ -6,8 +6,11 @@ virtual desktop.
 
 Endpoints:
     GET  /v1/ipfs/status          - Health/availability of all IPFS adapters
+    GET  /v1/ipfs/modules         - Health of the warm accelerate/datasets clients
     POST /v1/ipfs/add             - Add bytes/content to IPFS
+    POST /v1/ipfs/add/raw         - Add a raw octet-stream body to IPFS
     POST /v1/ipfs/cat             - Retrieve content by CID
+    GET  /v1/ipfs/cat/{cid}       - Stream content by CID (supports Range)
     POST /v1/ipfs/pin             - Pin content by CID
     POST /v1/ipfs/unpin           - Unpin content by CID
     POST /v1/ipfs/resolve         - Resolve CID metadata
@@ -41,18 +44,33 @@ Endpoints:
 from __future__ import annotations
 
 import base64
+import itertools
 import logging
+import os
+import re
+import tempfile
 import time
-from typing import Any
-
-from fastapi import APIRouter, Body, HTTPException, status
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+from fastapi import APIRouter, Body, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRoute
 from pydantic import BaseModel, Field
 
+from handsfree.backend_pools import (
+    BackendPoolSaturatedError,
+    BackendPoolTimeoutError,
+    run_in_backend_pool,
+)
 from handsfree.ipfs_accelerate_adapters import (
     IPFSAccelerateUnavailableError,
     get_ipfs_accelerate_adapter,
 )
+from handsfree.ipfs_cat_cache import iter_byte_chunks
 from handsfree.ipfs_datasets_routers import (
     IPFSDatasetsRouterUnavailableError,
     get_embeddings_router,
@@ -63,11 +81,17 @@ from handsfree.ipfs_kit_adapters import (
     IPFSKitUnavailableError,
     get_ipfs_kit_adapter,
 )
+from handsfree.ipfs_module_registry import get_ipfs_module_registry
+from handsfree.ipfs_status import get_ipfs_status_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v1/ipfs", tags=["ipfs"])
 
+STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_STREAM_MAX_BYTES = 512 * 1024 * 1024
+_BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 
 # --------------------------------------------------------------------------- #
 # Request/Response models
@@ -81,6 +105,12 @@ class IPFSStatusResponse(BaseModel):
     ipfs_datasets: dict[str, Any] = Field(default_factory=dict)
     ipfs_accelerate: dict[str, Any] = Field(default_factory=dict)
     timestamp: float = Field(default_factory=time.time)
+    probed_at: float | None = Field(default=None, description="Oldest backend probe time")
+    age_seconds: float | None = Field(default=None, description="Age of the oldest probe")
+    health: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Per-backend probe history and latency percentiles",
+    )
 
 
 class IPFSAddRequest(BaseModel):
@@ -165,138 +195,349 @@ class IPFSGenerateResponse(BaseModel):
 
 @router.get("/status", response_model=IPFSStatusResponse)
 async def ipfs_status_endpoint() -> IPFSStatusResponse:
-    """Return health/availability of all IPFS adapters."""
-    kit_status: dict[str, Any] = {"available": False}
-    datasets_status: dict[str, Any] = {"available": False}
-    accelerate_status: dict[str, Any] = {"available": False}
+    """Return health/availability of all IPFS adapters.
+
+    Served from the background-probed status snapshot; backends are never
+    probed on the request path.
+    """
+    snapshot = get_ipfs_status_service().snapshot()
+    backends = snapshot["backends"]
+    return IPFSStatusResponse(
+        ipfs_kit=backends["ipfs_kit"]["status"],
+        ipfs_datasets=backends["ipfs_datasets"]["status"],
+        ipfs_accelerate=backends["ipfs_accelerate"]["status"],
+        timestamp=time.time(),
+        probed_at=snapshot["probed_at"],
+        age_seconds=snapshot["age_seconds"],
+        health={
+            name: {key: value for key, value in backend.items() if key != "status"}
+            for name, backend in backends.items()
+        },
+    )
 
-    # ipfs_kit_py
-    try:
-        kit_adapter = get_ipfs_kit_adapter()
-        kit_status["available"] = not isinstance(
-            kit_adapter,
-            type(None),  # never matches, but catches unavailable adapter below
-        )
-        # Check if it's the unavailable stub
-        kit_status["available"] = hasattr(kit_adapter, "get_backend_statuses")
-        backend_statuses = kit_adapter.get_backend_statuses()
-        kit_status["backends"] = backend_statuses
-        if not backend_statuses:
-            # Still available via adapter, just no backends configured
-            kit_status["available"] = True
-            kit_status["note"] = "adapter loaded, backends may need configuration"
-    except IPFSKitUnavailableError:
-        kit_status["available"] = False
-        kit_status["error"] = "ipfs_kit_py not installed"
-    except Exception as exc:
-        kit_status["available"] = False
-        kit_status["error"] = str(exc)
 
-    # ipfs_datasets_py routers
+@router.get("/modules")
+async def ipfs_modules_endpoint() -> dict[str, Any]:
+    """Report which accelerate/datasets clients are loaded, in use, idle, or failing."""
+    return {"modules": get_ipfs_module_registry().health()}
+
+
+def _no_backend_available(exc: Exception) -> HTTPException:
+    # Have the status service re-probe instead of waiting for its next cycle.
+    get_ipfs_status_service().signal_failure(
+        "ipfs_kit" if isinstance(exc, IPFSKitUnavailableError) else "ipfs_datasets"
+    )
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"No IPFS backend available: {exc}",
+    )
+
+
+async def _run_in_pool(pool: str, fn: Any, *args: Any) -> Any:
+    # Blocking backend calls run on their family's bulkheaded pool, so a slow
+    # backend fills its own pool rather than the shared threadpool.
     try:
-        embeddings = get_embeddings_router()
-        ipfs_router = get_ipfs_router()
-        llm = get_llm_router()
-        datasets_status["available"] = True
-        datasets_status["routers"] = {
-            "embeddings": type(embeddings).__name__,
-            "ipfs": type(ipfs_router).__name__,
-            "llm": type(llm).__name__,
-        }
-    except Exception as exc:
-        datasets_status["error"] = str(exc)
+        return await run_in_backend_pool(pool, fn, *args)
+    except BackendPoolSaturatedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
+    except BackendPoolTimeoutError as exc:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(exc)) from exc
+
+
+def _borrow_client(name: str) -> Any:
+    # Accelerate/datasets clients and tool modules are built once per process
+    # by the module registry and lent to each request.
+    return get_ipfs_module_registry().borrow(name)
+
+
+@contextmanager
+def _borrow_tool(module: str, tool: str) -> Iterator[Any]:
+    with _borrow_client(module) as tools:
+        tool_fn = getattr(tools, tool, None)
+        if not callable(tool_fn):
+            raise ImportError(f"{module}.{tool} is not available")
+        yield tool_fn
 
-    # ipfs_accelerate_py
+
+def _kit_add_response(result: Any) -> IPFSAddResponse:
+    # ipfs_kit returns dict with Hash/Name or just a CID string
+    if isinstance(result, dict):
+        cid = result.get("Hash") or result.get("cid") or result.get("Name")
+    else:
+        cid = str(result) if result else None
+    return IPFSAddResponse(cid=cid, raw_result=result)
+
+
+def _add_bytes(data: bytes, pin: bool) -> IPFSAddResponse:
+    # Try ipfs_datasets_py.ipfs_backend_router first (lighter weight)
     try:
-        accel = get_ipfs_accelerate_adapter()
-        accelerate_status = accel.status()
+        ipfs_be = get_ipfs_router()
+        cid = ipfs_be.add_bytes(data, pin=pin)
+        return IPFSAddResponse(cid=str(cid) if cid else None, raw_result=cid)
+    except IPFSDatasetsRouterUnavailableError:
+        pass
     except Exception as exc:
-        accelerate_status["error"] = str(exc)
+        logger.debug("ipfs_datasets_py add_bytes failed, trying ipfs_kit: %s", exc)
 
-    return IPFSStatusResponse(
-        ipfs_kit=kit_status,
-        ipfs_datasets=datasets_status,
-        ipfs_accelerate=accelerate_status,
-        timestamp=time.time(),
-    )
+    # Fallback to ipfs_kit_py
+    try:
+        kit = get_ipfs_kit_adapter()
+        return _kit_add_response(kit.add_bytes(data))
+    except IPFSKitUnavailableError as exc:
+        raise _no_backend_available(exc) from exc
 
 
 @router.post("/add", response_model=IPFSAddResponse)
 async def ipfs_add_endpoint(req: IPFSAddRequest) -> IPFSAddResponse:
     """Add content to IPFS via ipfs_kit or ipfs_datasets backend router."""
     data = base64.b64decode(req.data_base64)
+    return await _run_in_pool("ipfs_content_router", _add_bytes, data, req.pin)
 
-    # Try ipfs_datasets_py.ipfs_backend_router first (lighter weight)
+
+def _stream_max_bytes() -> int:
+    try:
+        return int(os.getenv("HANDSFREE_IPFS_STREAM_MAX_BYTES", DEFAULT_STREAM_MAX_BYTES))
+    except ValueError:
+        return DEFAULT_STREAM_MAX_BYTES
+
+
+def _payload_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Content too large (max {max_bytes} bytes)",
+    )
+
+
+def _add_spooled_file(path: str, pin: bool) -> IPFSAddResponse:
+    # Same backend order as /add; ipfs_kit adds straight from the file, while
+    # the datasets router only takes bytes.
     try:
         ipfs_be = get_ipfs_router()
-        cid = ipfs_be.add_bytes(data, pin=req.pin)
+        cid = ipfs_be.add_bytes(Path(path).read_bytes(), pin=pin)
         return IPFSAddResponse(cid=str(cid) if cid else None, raw_result=cid)
     except IPFSDatasetsRouterUnavailableError:
         pass
     except Exception as exc:
         logger.debug("ipfs_datasets_py add_bytes failed, trying ipfs_kit: %s", exc)
 
-    # Fallback to ipfs_kit_py
     try:
         kit = get_ipfs_kit_adapter()
-        result = kit.add_bytes(data)
-        # ipfs_kit returns dict with Hash/Name or just a CID string
-        if isinstance(result, dict):
-            cid = result.get("Hash") or result.get("cid") or result.get("Name")
-        else:
-            cid = str(result) if result else None
-        return IPFSAddResponse(cid=cid, raw_result=result)
+        return _kit_add_response(kit.add_file(path, pin=pin))
     except IPFSKitUnavailableError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"No IPFS backend available: {exc}",
-        ) from exc
+        raise _no_backend_available(exc) from exc
 
 
-@router.post("/cat", response_model=IPFSCatResponse)
-async def ipfs_cat_endpoint(req: IPFSCatRequest) -> IPFSCatResponse:
-    """Retrieve content by CID."""
-    # Try ipfs_datasets_py first
+def _new_spool_file() -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".bin") as spool:
+        return spool.name
+
+
+@router.post("/add/raw", response_model=IPFSAddResponse)
+async def ipfs_add_raw_endpoint(request: Request, pin: bool = True) -> IPFSAddResponse:
+    """Add a raw ``application/octet-stream`` body to IPFS.
+
+    The body is spooled to a temporary file as it arrives and rejected with
+    413 as soon as it exceeds ``HANDSFREE_IPFS_STREAM_MAX_BYTES``.
+    """
+    content_type = request.headers.get("content-type", "application/octet-stream")
+    if content_type.split(";")[0].strip().lower() != "application/octet-stream":
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Body must be application/octet-stream",
+        )
+    max_bytes = _stream_max_bytes()
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise _payload_too_large(max_bytes)
+
+    # File I/O runs on the threadpool so a slow disk never stalls the event loop.
+    tmp_path = await run_in_threadpool(_new_spool_file)
+    try:
+        size = 0
+        spool = await run_in_threadpool(open, tmp_path, "wb")
+        try:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _payload_too_large(max_bytes)
+                await run_in_threadpool(spool.write, chunk)
+        finally:
+            await run_in_threadpool(spool.close)
+        return await _run_in_pool("ipfs_content_router", _add_spooled_file, tmp_path, pin)
+    finally:
+        await run_in_threadpool(Path(tmp_path).unlink, missing_ok=True)
+
+
+def _cat_bytes(cid: str) -> bytes | None:
+    """Read content by CID from ipfs_datasets_py, falling back to ipfs_kit_py.
+
+    Raises IPFSKitUnavailableError when neither backend can serve the CID.
+    """
     try:
         ipfs_be = get_ipfs_router()
-        content = ipfs_be.cat(req.cid)
+        content = ipfs_be.cat(cid)
         if isinstance(content, bytes):
-            return IPFSCatResponse(
-                data_base64=base64.b64encode(content).decode("ascii"),
-                size=len(content),
-            )
+            return content
         elif isinstance(content, str):
-            encoded = content.encode("utf-8")
-            return IPFSCatResponse(
-                data_base64=base64.b64encode(encoded).decode("ascii"),
-                size=len(encoded),
-            )
+            return content.encode("utf-8")
     except IPFSDatasetsRouterUnavailableError:
         pass
     except Exception as exc:
         logger.debug("ipfs_datasets_py cat failed, trying ipfs_kit: %s", exc)
 
-    # Fallback to ipfs_kit_py
+    kit = get_ipfs_kit_adapter()
+    content = kit.cat(cid)
+    if isinstance(content, bytes):
+        return content
+    elif isinstance(content, str):
+        return content.encode("utf-8")
+    return None
+
+
+@router.post("/cat", response_model=IPFSCatResponse)
+async def ipfs_cat_endpoint(req: IPFSCatRequest) -> IPFSCatResponse:
+    """Retrieve content by CID."""
     try:
-        kit = get_ipfs_kit_adapter()
-        content = kit.cat(req.cid)
-        if isinstance(content, bytes):
-            return IPFSCatResponse(
-                data_base64=base64.b64encode(content).decode("ascii"),
-                size=len(content),
-            )
-        elif isinstance(content, str):
-            encoded = content.encode("utf-8")
-            return IPFSCatResponse(
-                data_base64=base64.b64encode(encoded).decode("ascii"),
-                size=len(encoded),
-            )
-        return IPFSCatResponse(data_base64=None, size=0)
+        content = await _run_in_pool("ipfs_content_router", _cat_bytes, req.cid)
     except IPFSKitUnavailableError as exc:
+        raise _no_backend_available(exc) from exc
+    if content is None:
+        return IPFSCatResponse(data_base64=None, size=0)
+    return IPFSCatResponse(
+        data_base64=base64.b64encode(content).decode("ascii"),
+        size=len(content),
+    )
+
+
+def _parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Return the inclusive ``(start, end)`` of a single ``bytes=`` range.
+
+    Malformed and multi-range headers are ignored (the full body is served);
+    ranges that start past the end raise 416.
+    """
+    match = _BYTE_RANGE.match(header.strip()) if header else None
+    if match is None or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        # Suffix range: the last N bytes; a zero-length suffix is unsatisfiable.
+        start = max(0, size - int(last)) if int(last) else size
+        end = size - 1
+    if start >= size:
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"No IPFS backend available: {exc}",
-        ) from exc
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _backend_chunks(backend: Any, cid: str) -> Iterator[bytes] | None:
+    """Open a chunk stream from one backend, pulling the first chunk eagerly.
+
+    Pulling the first chunk here surfaces backend errors before the response
+    starts.  Returns None when the backend has no content for ``cid``.
+    """
+    stream = getattr(backend, "cat_stream", None)
+    if callable(stream):
+        chunks = iter(stream(cid, chunk_size=STREAM_CHUNK_SIZE))
+    else:
+        chunks = iter_byte_chunks(backend.cat(cid), STREAM_CHUNK_SIZE)
+    first = next(chunks, None)
+    if first is None:
+        return None
+    return itertools.chain((first,), chunks)
+
+
+def _open_cat_stream(cid: str) -> Iterator[bytes] | None:
+    """Stream content by CID from ipfs_datasets_py, falling back to ipfs_kit_py.
+
+    Raises IPFSKitUnavailableError when neither backend can serve the CID.
+    """
+    try:
+        return _backend_chunks(get_ipfs_router(), cid)
+    except IPFSDatasetsRouterUnavailableError:
+        pass
+    except Exception as exc:
+        logger.debug("ipfs_datasets_py cat failed, trying ipfs_kit: %s", exc)
+    return _backend_chunks(get_ipfs_kit_adapter(), cid)
+
+
+def _spool_chunks(chunks: Iterator[bytes]) -> tuple[IO[bytes], int]:
+    # Range responses need the total size up front; spool to an anonymous
+    # temporary file (removed on close) rather than memory.
+    spool = tempfile.TemporaryFile()
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    return spool, size
+
+
+def _iter_spooled(spool: IO[bytes], start: int, stop: int) -> Iterator[bytes]:
+    with spool:
+        spool.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = spool.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@router.get("/cat/{cid}")
+async def ipfs_cat_raw_endpoint(cid: str, request: Request) -> StreamingResponse:
+    """Stream content by CID as ``application/octet-stream``.
+
+    Chunks are passed through from the backend as they are read.  A single
+    ``Range: bytes=`` request is answered with 206 from a temporary spool file,
+    since the total size must be known before the range can be resolved.
+    """
+    try:
+        chunks = await _run_in_pool("ipfs_content_router", _open_cat_stream, cid)
+    except IPFSKitUnavailableError as exc:
+        raise _no_backend_available(exc) from exc
+    if chunks is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No content for {cid}")
+
+    headers = {"Accept-Ranges": "bytes", "ETag": f'"{cid}"'}
+    range_header = request.headers.get("range")
+    if not range_header:
+        return StreamingResponse(chunks, media_type="application/octet-stream", headers=headers)
+
+    spool, size = await _run_in_pool("ipfs_content_router", _spool_chunks, chunks)
+    try:
+        byte_range = _parse_byte_range(range_header, size)
+    except HTTPException:
+        spool.close()
+        raise
+    status_code = status.HTTP_200_OK
+    start, end = 0, size - 1
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(max(end - start + 1, 0))
+    return StreamingResponse(
+        _iter_spooled(spool, start, end + 1),
+        status_code=status_code,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
 
 
 @router.post("/pin")
@@ -347,9 +588,7 @@ async def ipfs_resolve_endpoint(req: IPFSResolveRequest) -> dict[str, Any]:
         ) from exc
 
 
-@router.post("/embed", response_model=IPFSEmbedResponse)
-async def ipfs_embed_endpoint(req: IPFSEmbedRequest) -> IPFSEmbedResponse:
-    """Generate embeddings via ipfs_datasets or ipfs_accelerate routers."""
+def _embed(req: IPFSEmbedRequest) -> IPFSEmbedResponse:
     provider_used = req.provider or "datasets"
     datasets_error: str | None = None
     accelerate_error: str | None = None
@@ -391,9 +630,13 @@ async def ipfs_embed_endpoint(req: IPFSEmbedRequest) -> IPFSEmbedResponse:
     )
 
 
-@router.post("/generate", response_model=IPFSGenerateResponse)
-async def ipfs_generate_endpoint(req: IPFSGenerateRequest) -> IPFSGenerateResponse:
-    """Generate text via LLM router (ipfs_datasets or ipfs_accelerate)."""
+@router.post("/embed", response_model=IPFSEmbedResponse)
+async def ipfs_embed_endpoint(req: IPFSEmbedRequest) -> IPFSEmbedResponse:
+    """Generate embeddings via ipfs_datasets or ipfs_accelerate routers."""
+    return await _run_in_pool("ipfs_embeddings_router", _embed, req)
+
+
+def _generate(req: IPFSGenerateRequest) -> IPFSGenerateResponse:
     provider_used = req.provider or "datasets"
     datasets_error: str | None = None
     accelerate_error: str | None = None
@@ -434,13 +677,19 @@ async def ipfs_generate_endpoint(req: IPFSGenerateRequest) -> IPFSGenerateRespon
     )
 
 
+@router.post("/generate", response_model=IPFSGenerateResponse)
+async def ipfs_generate_endpoint(req: IPFSGenerateRequest) -> IPFSGenerateResponse:
+    """Generate text via LLM router (ipfs_datasets or ipfs_accelerate)."""
+    return await _run_in_pool("ipfs_llm_router", _generate, req)
+
+
 @router.get("/capabilities")
 async def ipfs_capabilities_endpoint() -> dict[str, Any]:
     """List accelerate hardware/model capabilities."""
     try:
-        accel = get_ipfs_accelerate_adapter()
-        caps = accel.get_capabilities(detail=True)
-        return {"ok": True, "capabilities": caps}
+        with _borrow_client("accelerate") as accel:
+            caps = accel.get_capabilities(detail=True)
+            return {"ok": True, "capabilities": caps}
     except IPFSAccelerateUnavailableError as exc:
         return {"ok": False, "capabilities": None, "error": str(exc)}
     except Exception as exc:
@@ -471,21 +720,21 @@ class IPFSListDatasetsRequest(BaseModel):
 async def ipfs_hardware_profile_endpoint() -> dict[str, Any]:
     """Return detailed hardware profile from ipfs_accelerate."""
     try:
-        accel = get_ipfs_accelerate_adapter()
-        caps = accel.get_capabilities(detail=True)
-        # Extract hardware-specific info
-        profile = {
-            "ok": True,
-            "gpu": caps.get("gpu") or caps.get("device"),
-            "vram": caps.get("vram") or caps.get("memory"),
-            "backends": caps.get("backends") or caps.get("supported_backends") or [],
-            "quantization_formats": caps.get("quantization_formats") or [],
-            "compute_capability": caps.get("compute_capability"),
-            "cpu_count": caps.get("cpu_count"),
-            "platform": caps.get("platform"),
-            "raw": caps,
-        }
-        return profile
+        with _borrow_client("accelerate") as accel:
+            caps = accel.get_capabilities(detail=True)
+            # Extract hardware-specific info
+            profile = {
+                "ok": True,
+                "gpu": caps.get("gpu") or caps.get("device"),
+                "vram": caps.get("vram") or caps.get("memory"),
+                "backends": caps.get("backends") or caps.get("supported_backends") or [],
+                "quantization_formats": caps.get("quantization_formats") or [],
+                "compute_capability": caps.get("compute_capability"),
+                "cpu_count": caps.get("cpu_count"),
+                "platform": caps.get("platform"),
+                "raw": caps,
+            }
+            return profile
     except IPFSAccelerateUnavailableError as exc:
         return {"ok": False, "error": str(exc)}
     except Exception as exc:
@@ -496,16 +745,16 @@ async def ipfs_hardware_profile_endpoint() -> dict[str, Any]:
 async def ipfs_list_models_endpoint() -> dict[str, Any]:
     """List available models from ipfs_accelerate backend."""
     try:
-        accel = get_ipfs_accelerate_adapter()
-        # Try various methods the adapter might expose
-        if hasattr(accel, "list_models"):
-            models = accel.list_models()
-        elif hasattr(accel, "get_capabilities"):
-            caps = accel.get_capabilities(detail=True)
-            models = caps.get("models") or caps.get("loaded_models") or []
-        else:
-            models = []
-        return {"ok": True, "models": models}
+        with _borrow_client("accelerate") as accel:
+            # Try various methods the adapter might expose
+            if hasattr(accel, "list_models"):
+                models = accel.list_models()
+            elif hasattr(accel, "get_capabilities"):
+                caps = accel.get_capabilities(detail=True)
+                models = caps.get("models") or caps.get("loaded_models") or []
+            else:
+                models = []
+            return {"ok": True, "models": models}
     except IPFSAccelerateUnavailableError as exc:
         return {"ok": False, "models": [], "error": str(exc)}
     except Exception as exc:
@@ -538,9 +787,9 @@ async def ipfs_list_datasets_endpoint(
 async def ipfs_inference_endpoint(req: IPFSInferenceRequest) -> dict[str, Any]:
     """Run inference via ipfs_accelerate (direct model execution)."""
     try:
-        accel = get_ipfs_accelerate_adapter()
-        result = accel.run_model(req.model_name, req.inputs, **req.parameters)
-        return {"ok": True, "model": req.model_name, "result": result}
+        with _borrow_client("accelerate") as accel:
+            result = accel.run_model(req.model_name, req.inputs, **req.parameters)
+            return {"ok": True, "model": req.model_name, "result": result}
     except IPFSAccelerateUnavailableError as exc:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -674,9 +923,9 @@ async def ipfs_name_resolve_endpoint(req: IPFSNameRequest) -> dict[str, Any]:
 async def ipfs_search_models_endpoint(req: IPFSSearchModelsRequest) -> dict[str, Any]:
     """Search available AI models via accelerate backend."""
     try:
-        accel = get_ipfs_accelerate_adapter()
-        results = accel.search_models(req.query)
-        return {"ok": True, "results": results}
+        with _borrow_client("accelerate") as accel:
+            results = accel.search_models(req.query)
+            return {"ok": True, "results": results}
     except IPFSAccelerateUnavailableError as exc:
         return {"ok": False, "results": [], "error": str(exc)}
     except Exception as exc:
@@ -687,9 +936,9 @@ async def ipfs_search_models_endpoint(req: IPFSSearchModelsRequest) -> dict[str,
 async def ipfs_metrics_endpoint() -> dict[str, Any]:
     """Get performance metrics from accelerate backend."""
     try:
-        accel = get_ipfs_accelerate_adapter()
-        metrics = accel.get_performance_metrics()
-        return {"ok": True, "metrics": metrics}
+        with _borrow_client("accelerate") as accel:
+            metrics = accel.get_performance_metrics()
+            return {"ok": True, "metrics": metrics}
     except IPFSAccelerateUnavailableError as exc:
         return {"ok": False, "metrics": {}, "error": str(exc)}
     except Exception as exc:
@@ -700,9 +949,9 @@ async def ipfs_metrics_endpoint() -> dict[str, Any]:
 async def ipfs_endpoints_endpoint() -> dict[str, Any]:
     """List configured inference endpoints."""
     try:
-        accel = get_ipfs_accelerate_adapter()
-        endpoints = accel.get_endpoints()
-        return {"ok": True, "endpoints": endpoints}
+        with _borrow_client("accelerate") as accel:
+            endpoints = accel.get_endpoints()
+            return {"ok": True, "endpoints": endpoints}
     except IPFSAccelerateUnavailableError as exc:
         return {"ok": False, "endpoints": [], "error": str(exc)}
     except Exception as exc:
@@ -716,15 +965,12 @@ async def ipfs_endpoints_endpoint() -> dict[str, Any]:
 async def vector_index_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any]:  # noqa: B008
     """Index content into the vector store."""
     try:
-        from ipfs_accelerate_py.mcp_server.tools.vector_store_tools.native_vector_store_tools import (
-            vector_index,
-        )
-
-        result = await vector_index(
-            content=body.get("content", ""),
-            metadata=body.get("metadata", {}),
-            collection=body.get("collection", "default"),
-        )
+        with _borrow_tool("vector_store_tools", "vector_index") as vector_index:
+            result = await vector_index(
+                content=body.get("content", ""),
+                metadata=body.get("metadata", {}),
+                collection=body.get("collection", "default"),
+            )
         return {"ok": True, "result": result}
     except ImportError:
         return {"ok": False, "error": "vector_store_tools not available"}
@@ -736,15 +982,12 @@ async def vector_index_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, A
 async def vector_search_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any]:  # noqa: B008
     """Search the vector store."""
     try:
-        from ipfs_accelerate_py.mcp_server.tools.vector_store_tools.native_vector_store_tools import (
-            vector_retrieval,
-        )
-
-        result = await vector_retrieval(
-            query=body.get("query", ""),
-            collection=body.get("collection", "default"),
-            top_k=body.get("top_k", 10),
-        )
+        with _borrow_tool("vector_store_tools", "vector_retrieval") as vector_retrieval:
+            result = await vector_retrieval(
+                query=body.get("query", ""),
+                collection=body.get("collection", "default"),
+                top_k=body.get("top_k", 10),
+            )
         return {"ok": True, "result": result}
     except ImportError:
         return {"ok": False, "error": "vector_store_tools not available"}
@@ -756,13 +999,10 @@ async def vector_search_endpoint(body: dict[str, Any] = Body(...)) -> dict[str,
 async def vector_metadata_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any]:  # noqa: B008
     """Get vector store metadata."""
     try:
-        from ipfs_accelerate_py.mcp_server.tools.vector_store_tools.native_vector_store_tools import (
-            vector_metadata,
-        )
-
-        result = await vector_metadata(
-            collection=body.get("collection", "default"),
-        )
+        with _borrow_tool("vector_store_tools", "vector_metadata") as vector_metadata:
+            result = await vector_metadata(
+                collection=body.get("collection", "default"),
+            )
         return {"ok": True, "result": result}
     except ImportError:
         return {"ok": False, "error": "vector_store_tools not available"}
@@ -774,15 +1014,12 @@ async def vector_metadata_endpoint(body: dict[str, Any] = Body(...)) -> dict[str
 async def semantic_search_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any]:  # noqa: B008
     """Perform semantic search across indexed content."""
     try:
-        from ipfs_accelerate_py.mcp_server.tools.search_tools.native_search_tools import (
-            semantic_search,
-        )
-
-        result = await semantic_search(
-            query=body.get("query", ""),
-            top_k=body.get("top_k", 10),
-            filters=body.get("filters", {}),
-        )
+        with _borrow_tool("search_tools", "semantic_search") as semantic_search:
+            result = await semantic_search(
+                query=body.get("query", ""),
+                top_k=body.get("top_k", 10),
+                filters=body.get("filters", {}),
+            )
         return {"ok": True, "result": result}
     except ImportError:
         return {"ok": False, "error": "search_tools not available"}
@@ -794,15 +1031,12 @@ async def semantic_search_endpoint(body: dict[str, Any] = Body(...)) -> dict[str
 async def similarity_search_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any]:  # noqa: B008
     """Find similar items by content or embedding."""
     try:
-        from ipfs_accelerate_py.mcp_server.tools.search_tools.native_search_tools import (
-            similarity_search,
-        )
-
-        result = await similarity_search(
-            query=body.get("query", ""),
-            threshold=body.get("threshold", 0.7),
-            max_results=body.get("max_results", 20),
-        )
+        with _borrow_tool("search_tools", "similarity_search") as similarity_search:
+            result = await similarity_search(
+                query=body.get("query", ""),
+                threshold=body.get("threshold", 0.7),
+                max_results=body.get("max_results", 20),
+            )
         return {"ok": True, "result": result}
     except ImportError:
         return {"ok": False, "error": "search_tools not available"}
@@ -814,15 +1048,12 @@ async def similarity_search_endpoint(body: dict[str, Any] = Body(...)) -> dict[s
 async def faceted_search_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any]:  # noqa: B008
     """Perform faceted search with filters and aggregations."""
     try:
-        from ipfs_accelerate_py.mcp_server.tools.search_tools.native_search_tools import (
-            faceted_search,
-        )
-
-        result = await faceted_search(
-            query=body.get("query", ""),
-            facets=body.get("facets", []),
-            filters=body.get("filters", {}),
-        )
+        with _borrow_tool("search_tools", "faceted_search") as faceted_search:
+            result = await faceted_search(
+                query=body.get("query", ""),
+                facets=body.get("facets", []),
+                filters=body.get("filters", {}),
+            )
         return {"ok": True, "result": result}
     except ImportError:
         return {"ok": False, "error": "search_tools not available"}
@@ -834,16 +1065,13 @@ async def faceted_search_endpoint(body: dict[str, Any] = Body(...)) -> dict[str,
 async def scrape_url_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any]:  # noqa: B008
     """Scrape content from a URL."""
     try:
-        from ipfs_accelerate_py.mcp_server.tools.web_scraping_tools.native_web_scraping_tools import (
-            scrape_url_tool,
-        )
-
-        result = await scrape_url_tool(
-            url=body.get("url", ""),
-            extract_text=body.get("extract_text", True),
-            extract_links=body.get("extract_links", False),
-            extract_images=body.get("extract_images", False),
-        )
+        with _borrow_tool("web_scraping_tools", "scrape_url_tool") as scrape_url_tool:
+            result = await scrape_url_tool(
+                url=body.get("url", ""),
+                extract_text=body.get("extract_text", True),
+                extract_links=body.get("extract_links", False),
+                extract_images=body.get("extract_images", False),
+            )
         return {"ok": True, "result": result}
     except ImportError:
         return {"ok": False, "error": "web_scraping_tools not available"}
@@ -855,14 +1083,13 @@ async def scrape_url_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any
 async def scrape_batch_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any]:  # noqa: B008
     """Scrape content from multiple URLs."""
     try:
-        from ipfs_accelerate_py.mcp_server.tools.web_scraping_tools.native_web_scraping_tools import (
-            scrape_multiple_urls_tool,
-        )
-
-        result = await scrape_multiple_urls_tool(
-            urls=body.get("urls", []),
-            extract_text=body.get("extract_text", True),
-        )
+        with _borrow_tool(
+            "web_scraping_tools", "scrape_multiple_urls_tool"
+        ) as scrape_multiple_urls_tool:
+            result = await scrape_multiple_urls_tool(
+                urls=body.get("urls", []),
+                extract_text=body.get("extract_text", True),
+            )
         return {"ok": True, "result": result}
     except ImportError:
         return {"ok": False, "error": "web_scraping_tools not available"}
@@ -874,15 +1101,12 @@ async def scrape_batch_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, A
 async def workflow_execute_endpoint(body: dict[str, Any] = Body(...)) -> dict[str, Any]:  # noqa: B008
     """Execute a workflow step or pipeline."""
     try:
-        from ipfs_accelerate_py.mcp_server.tools.workflow_tools.native_workflow_tools_category import (
-            execute_workflow_step,
-        )
-
-        result = await execute_workflow_step(
-            workflow_id=body.get("workflow_id", ""),
-            step=body.get("step", ""),
-            params=body.get("params", {}),
-        )
+        with _borrow_tool("workflow_tools", "execute_workflow_step") as execute_workflow_step:
+            result = await execute_workflow_step(
+                workflow_id=body.get("workflow_id", ""),
+                step=body.get("step", ""),
+                params=body.get("params", {}),
+            )
         return {"ok": True, "result": result}
     except (ImportError, AttributeError):
         return {"ok": False, "error": "workflow_tools not available"}
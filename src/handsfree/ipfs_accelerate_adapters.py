@@ -101,6 +101,21 @@ class _IPFSAccelerateModuleAdapter:
     def __init__(self, root_module: Any) -> None:
         self._root_module = root_module
         self._instance: Any | None = None
+        self._resolved: dict[tuple[tuple[str, str], ...], Callable[..., Any]] = {}
+
+    def warm_up(self) -> None:
+        """Resolve the router entry points and initialize the shared instance."""
+        for resolve in (self._generate_fn, self._embed_fn):
+            try:
+                resolve()
+            except IPFSAccelerateUnavailableError as exc:
+                logger.debug("ipfs_accelerate_py warm-up skipped: %s", exc)
+        self._get_instance()
+
+    def release(self) -> None:
+        """Drop the instance and resolved entry points; they are rebuilt on next use."""
+        self._instance = None
+        self._resolved.clear()
 
     def _get_instance(self) -> Any | None:
         """Get the singleton ipfs_accelerate_py instance."""
@@ -117,11 +132,15 @@ class _IPFSAccelerateModuleAdapter:
         return None
 
     def _resolve(self, *targets: tuple[str, str]) -> Callable[..., Any]:
+        resolved = self._resolved.get(targets)
+        if resolved is not None:
+            return resolved
         for module_name, attr_name in targets:
             try:
                 module = importlib.import_module(module_name)
                 candidate = getattr(module, attr_name, None)
                 if callable(candidate):
+                    self._resolved[targets] = candidate
                     return candidate
             except Exception:
                 continue
@@ -134,19 +153,23 @@ class _IPFSAccelerateModuleAdapter:
             "or compatible top-level helpers."
         )
 
-    def generate(self, prompt: str, **kwargs: Any) -> Any:
-        generate_fn = self._resolve(
+    def _generate_fn(self) -> Callable[..., Any]:
+        return self._resolve(
             ("ipfs_accelerate_py.llm_router", "generate_text"),
             ("ipfs_accelerate_py", "generate_text"),
         )
-        return generate_fn(prompt, **kwargs)
 
-    def embed(self, texts: list[str], **kwargs: Any) -> Any:
-        embed_fn = self._resolve(
+    def _embed_fn(self) -> Callable[..., Any]:
+        return self._resolve(
             ("ipfs_accelerate_py.embeddings_router", "embed_texts"),
             ("ipfs_accelerate_py", "embed_texts"),
         )
-        return embed_fn(texts, **kwargs)
+
+    def generate(self, prompt: str, **kwargs: Any) -> Any:
+        return self._generate_fn()(prompt, **kwargs)
+
+    def embed(self, texts: list[str], **kwargs: Any) -> Any:
+        return self._embed_fn()(texts, **kwargs)
 
     def get_capabilities(self, **kwargs: Any) -> Any:
         instance = self._get_instance()
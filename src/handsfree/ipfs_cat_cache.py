@@ -0,0 +1,439 @@
+"""Immutable read cache for IPFS ``cat``.
+
+A CID names its content, so bytes read for a CID never change and can be
+cached indefinitely.  :class:`CIDByteCache` keeps two tiers:
+
+- an in-memory LRU bounded by total bytes;
+- an optional on-disk tier (one file per CID) with its own byte budget.
+
+Concurrent misses for the same CID are single-flighted: one caller fetches
+from the backend while the others wait for its result.  Locks only guard the
+index and LRU bookkeeping; disk reads and writes happen outside them, so a
+slow disk never blocks memory hits.
+
+With verification enabled, bytes are checked against the CID's multihash
+before they are cached.  Only CIDv1 ``raw`` blocks (base32, the CIDv1 default)
+can be checked this way, because ``cat`` of a dag-pb (UnixFS) CID returns the
+file content rather than the hashed block; other CIDs are cached unverified.
+
+:class:`CachedIPFSRouter` wraps an IPFS router and serves ``cat`` through the
+cache.  ``cat_stream`` serves hits from the cache and streams misses from the
+router uncached, so large reads never pass through the memory tier.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_MAX_BYTES = 1024 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_RAW_CODEC = 0x55
+_MULTIHASHES: dict[int, Callable[[bytes], bytes]] = {
+    0x00: lambda data: data,
+    0x12: lambda data: hashlib.sha256(data).digest(),
+    0x13: lambda data: hashlib.sha512(data).digest(),
+    0xB220: lambda data: hashlib.blake2b(data, digest_size=32).digest(),
+}
+
+
+def iter_byte_chunks(content: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield ``cat`` output in ``chunk_size`` pieces; nothing for ``None``.
+
+    Text is UTF-8 encoded.  Empty content yields a single empty chunk so that
+    "no content" and "empty content" stay distinguishable.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if not isinstance(content, bytes | bytearray | memoryview):
+        return
+    view = memoryview(content)
+    for offset in range(0, max(len(view), 1), chunk_size):
+        yield bytes(view[offset : offset + chunk_size])
+
+
+class CIDVerificationError(ValueError):
+    """Raised when fetched bytes do not match the CID's multihash."""
+
+
+def _read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        if offset >= len(data) or shift > 63:
+            raise ValueError("truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def verify_cid_bytes(cid: str, data: bytes) -> bool | None:
+    """Check ``data`` against the multihash in ``cid``.
+
+    Returns:
+        True if the digest matches, False if it does not, and None when the
+        CID cannot be verified from ``cat`` output (not a base32 CIDv1 ``raw``
+        block, or an unsupported hash function).
+    """
+    if not cid.startswith("b"):
+        return None
+    encoded = cid[1:].upper()
+    try:
+        decoded = base64.b32decode(encoded + "=" * (-len(encoded) % 8))
+        version, offset = _read_varint(decoded, 0)
+        codec, offset = _read_varint(decoded, offset)
+        hash_code, offset = _read_varint(decoded, offset)
+        length, offset = _read_varint(decoded, offset)
+    except ValueError:
+        return None
+    digest = decoded[offset:]
+    hasher = _MULTIHASHES.get(hash_code)
+    if version != 1 or codec != _RAW_CODEC or hasher is None or len(digest) != length:
+        return None
+    return hasher(data)[:length] == digest
+
+
+@dataclass
+class CIDCacheStats:
+    """Lookup counters for a :class:`CIDByteCache`."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    shared_fetches: int = 0
+    verification_failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "shared_fetches": self.shared_fetches,
+            "verification_failures": self.verification_failures,
+        }
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _DiskTier:
+    """One file per CID under ``root``, evicted least-recently-used by total size.
+
+    Thread-safe; file I/O is done outside the lock that guards the size index.
+    """
+
+    def __init__(self, root: str | os.PathLike[str], max_bytes: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, max_bytes)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        self._writing: set[str] = set()
+        self.total_bytes = 0
+        entries = []
+        for path in self.root.glob("*/*"):
+            if path.suffix == ".tmp":
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._sizes[name] = size
+            self.total_bytes += size
+
+    def _path(self, name: str) -> Path:
+        return self.root / name[:2] / name
+
+    @staticmethod
+    def _name(cid: str) -> str:
+        return hashlib.sha256(cid.encode("utf-8")).hexdigest()
+
+    def _forget(self, name: str) -> None:
+        with self._lock:
+            size = self._sizes.pop(name, None)
+            if size is not None:
+                self.total_bytes -= size
+
+    def get(self, cid: str) -> bytes | None:
+        name = self._name(cid)
+        with self._lock:
+            if name not in self._sizes:
+                return None
+            self._sizes.move_to_end(name)
+        path = self._path(name)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            # Evicted concurrently or removed externally.
+            self._forget(name)
+            return None
+        return data
+
+    def put(self, cid: str, data: bytes) -> None:
+        name = self._name(cid)
+        with self._lock:
+            if name in self._sizes or name in self._writing or len(data) > self.max_bytes:
+                return
+            self._writing.add(name)
+        path = self._path(name)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=path.parent, suffix=".tmp", delete=False
+            ) as handle:
+                handle.write(data)
+            os.replace(handle.name, path)
+        finally:
+            with self._lock:
+                self._writing.discard(name)
+        evicted: list[str] = []
+        with self._lock:
+            self._sizes[name] = len(data)
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                evicted_name, size = self._sizes.popitem(last=False)
+                evicted.append(evicted_name)
+                self.total_bytes -= size
+        for evicted_name in evicted:
+            self._path(evicted_name).unlink(missing_ok=True)
+
+
+class CIDByteCache:
+    """Byte-budgeted memory LRU and optional disk tier for immutable CID content."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        *,
+        disk_path: str | os.PathLike[str] | None = None,
+        disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES,
+        verify: bool = False,
+    ) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self.verify = verify
+        self.stats = CIDCacheStats()
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._flights: dict[str, _Flight] = {}
+        self.disk = _DiskTier(disk_path, disk_max_bytes) if disk_path else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, cid: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(cid, None)
+        if previous is not None:
+            self.total_bytes -= len(previous)
+        self._entries[cid] = data
+        self.total_bytes += len(data)
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+
+    def _memory_lookup(self, cid: str) -> bytes | None:
+        # Caller holds self._lock.
+        data = self._entries.get(cid)
+        if data is not None:
+            self._entries.move_to_end(cid)
+            self.stats.memory_hits += 1
+        return data
+
+    def _disk_lookup(self, cid: str) -> bytes | None:
+        # Called without self._lock: the disk read must not block memory hits.
+        if self.disk is None:
+            return None
+        try:
+            data = self.disk.get(cid)
+        except OSError as exc:
+            logger.warning("IPFS cat cache disk read failed for %s: %s", cid, exc)
+            return None
+        if data is not None:
+            with self._lock:
+                self._remember(cid, data)
+                self.stats.disk_hits += 1
+        return data
+
+    def get(self, cid: str) -> bytes | None:
+        """Return cached bytes for ``cid`` without fetching."""
+        with self._lock:
+            data = self._memory_lookup(cid)
+        if data is not None:
+            return data
+        return self._disk_lookup(cid)
+
+    def put(self, cid: str, data: bytes) -> bool:
+        """Cache ``data`` for ``cid``; returns False if verification rejects it."""
+        if self.verify and verify_cid_bytes(cid, data) is False:
+            with self._lock:
+                self.stats.verification_failures += 1
+            return False
+        with self._lock:
+            self._remember(cid, data)
+        if self.disk is not None:
+            try:
+                self.disk.put(cid, data)
+            except OSError as exc:
+                logger.warning("IPFS cat cache disk write failed for %s: %s", cid, exc)
+        return True
+
+    def get_or_fetch(self, cid: str, fetch: Callable[[], Any]) -> Any:
+        """Return cached bytes for ``cid``, calling ``fetch`` once across concurrent misses.
+
+        Non-bytes results from ``fetch`` are returned uncached.
+
+        Raises:
+            CIDVerificationError: If verification is enabled and the fetched
+                bytes do not match the CID.
+        """
+        data = self.get(cid)
+        if data is not None:
+            return data
+        with self._lock:
+            # Another caller may have finished fetching since the lookup.
+            data = self._memory_lookup(cid)
+            if data is not None:
+                return data
+            flight = self._flights.get(cid)
+            leader = flight is None
+            if leader:
+                flight = self._flights[cid] = _Flight()
+                self.stats.misses += 1
+            else:
+                self.stats.shared_fetches += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            result = fetch()
+            if isinstance(result, bytes) and not self.put(cid, result):
+                raise CIDVerificationError(f"Content for {cid} does not match its multihash")
+            flight.result = result
+            return result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(cid, None)
+            flight.done.set()
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self.stats = CIDCacheStats()
+
+
+class CachedIPFSRouter:
+    """IPFS router that serves repeated ``cat`` calls from a :class:`CIDByteCache`."""
+
+    def __init__(self, router: Any, cache: CIDByteCache) -> None:
+        self._router = router
+        self.cache = cache
+
+    def _seed(self, cid: Any, data: bytes) -> None:
+        # Seed the cache only when the returned CID provably names ``data``.
+        if isinstance(cid, str) and verify_cid_bytes(cid, data):
+            self.cache.put(cid, data)
+
+    def add_bytes(self, data: bytes, **kwargs: Any) -> str:
+        cid = self._router.add_bytes(data, **kwargs)
+        self._seed(cid, data)
+        return cid
+
+    def add_many(self, items: list[bytes], **kwargs: Any) -> list[str]:
+        cids = self._router.add_many(items, **kwargs)
+        for cid, data in zip(cids, items, strict=False):
+            self._seed(cid, data)
+        return cids
+
+    def cat(self, cid: str) -> bytes:
+        return self.cache.get_or_fetch(cid, lambda: self._router.cat(cid))
+
+    def cat_stream(self, cid: str, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        data = self.cache.get(cid)
+        if data is not None:
+            return iter_byte_chunks(data, chunk_size)
+        stream = getattr(self._router, "cat_stream", None)
+        if callable(stream):
+            return iter(stream(cid, chunk_size=chunk_size))
+        return iter_byte_chunks(self.cat(cid), chunk_size)
+
+
+def _default_disk_path() -> str:
+    from handsfree.db.connection import get_db_path
+
+    db_path = get_db_path()
+    if db_path == ":memory:":
+        return ""
+    return str(Path(db_path).with_name("ipfs_cat_cache"))
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def ipfs_cat_cache_enabled() -> bool:
+    """Whether IPFS routers should be wrapped with a ``cat`` cache."""
+    return os.getenv("HANDSFREE_IPFS_CAT_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def build_ipfs_cat_cache() -> CIDByteCache:
+    """Build a CID read cache from environment configuration.
+
+    ``HANDSFREE_IPFS_CAT_CACHE_MAX_BYTES`` bounds the memory tier,
+    ``HANDSFREE_IPFS_CAT_CACHE_PATH`` selects the disk tier directory (default:
+    ``ipfs_cat_cache`` next to the main database; empty for memory only),
+    ``HANDSFREE_IPFS_CAT_CACHE_DISK_MAX_BYTES`` bounds it, and
+    ``HANDSFREE_IPFS_CAT_CACHE_VERIFY`` enables multihash verification.
+    """
+    disk_path = os.getenv("HANDSFREE_IPFS_CAT_CACHE_PATH")
+    if disk_path is None:
+        disk_path = _default_disk_path()
+    verify = os.getenv("HANDSFREE_IPFS_CAT_CACHE_VERIFY", "false").lower() in ("true", "1", "yes")
+    max_bytes = _int_env("HANDSFREE_IPFS_CAT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+    disk_max_bytes = _int_env("HANDSFREE_IPFS_CAT_CACHE_DISK_MAX_BYTES", DEFAULT_DISK_MAX_BYTES)
+    try:
+        return CIDByteCache(
+            max_bytes,
+            disk_path=disk_path or None,
+            disk_max_bytes=disk_max_bytes,
+            verify=verify,
+        )
+    except OSError as exc:
+        logger.warning("IPFS cat cache disk tier unavailable at %s: %s", disk_path, exc)
+        return CIDByteCache(max_bytes, verify=verify)
@@ -6,15 +6,33 @@ Provides lazy, optional integration with:
 - ipfs_datasets_py.llm_router
 
 When ipfs_datasets_py is unavailable, safe fallback stubs are returned.
+Available embeddings routers are wrapped with a content-addressed embedding
+cache (see ``handsfree.embedding_cache``), available IPFS routers with an
+immutable ``cat`` cache (see ``handsfree.ipfs_cat_cache``), and available LLM
+routers with a generation cache (see ``handsfree.llm_cache``).
 """
 
 from __future__ import annotations
 
 import importlib
 import logging
+from collections.abc import Iterator
 from functools import lru_cache
 from typing import Any, NoReturn, Protocol
 
+from handsfree.embedding_cache import (
+    CachedEmbeddingsRouter,
+    build_embedding_cache,
+    embedding_cache_enabled,
+)
+from handsfree.ipfs_cat_cache import (
+    CachedIPFSRouter,
+    build_ipfs_cat_cache,
+    ipfs_cat_cache_enabled,
+    iter_byte_chunks,
+)
+from handsfree.llm_cache import CachedLLMRouter, build_generation_cache, llm_cache_enabled
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,10 +59,18 @@ class IPFSRouter(Protocol):
         """Store bytes and return CID."""
         ...
 
+    def add_many(self, items: list[bytes], **kwargs: Any) -> list[str]:
+        """Store several payloads and return their CIDs in order."""
+        ...
+
     def cat(self, cid: str) -> bytes:
         """Load bytes from CID."""
         ...
 
+    def cat_stream(self, cid: str, *, chunk_size: int = ...) -> Iterator[bytes]:
+        """Yield the bytes of CID in chunks."""
+        ...
+
 
 class LLMRouter(Protocol):
     """LLM router interface."""
@@ -82,9 +108,15 @@ class _UnavailableIPFSRouter(_UnavailableRouter):
     def add_bytes(self, data: bytes, **kwargs: Any) -> NoReturn:
         self._raise("add_bytes")
 
+    def add_many(self, items: list[bytes], **kwargs: Any) -> NoReturn:
+        self._raise("add_many")
+
     def cat(self, cid: str) -> NoReturn:
         self._raise("cat")
 
+    def cat_stream(self, cid: str, **kwargs: Any) -> NoReturn:
+        self._raise("cat_stream")
+
 
 class _UnavailableLLMRouter(_UnavailableRouter):
     def __init__(self) -> None:
@@ -94,10 +126,32 @@ class _UnavailableLLMRouter(_UnavailableRouter):
         self._raise("generate_text")
 
 
+_DEFAULT_MODEL_ATTRS = ("get_default_model", "default_model", "DEFAULT_MODEL", "DEFAULT_MODEL_NAME")
+_DEFAULT_PROVIDER_ATTRS = ("get_default_provider", "default_provider", "DEFAULT_PROVIDER")
+
+
+def _resolve_module_setting(module: Any, names: tuple[str, ...]) -> str:
+    for name in names:
+        value = getattr(module, name, None)
+        if callable(value):
+            value = value()
+        if value:
+            return str(value)
+    return ""
+
+
 class _EmbeddingsRouterAdapter:
     def __init__(self, module: Any) -> None:
         self._module = module
 
+    def model_identity(self) -> str:
+        """Return ``provider/model`` for the router's defaults, or ``""`` if unknown."""
+        model = _resolve_module_setting(self._module, _DEFAULT_MODEL_ATTRS)
+        if not model:
+            return ""
+        provider = _resolve_module_setting(self._module, _DEFAULT_PROVIDER_ATTRS)
+        return f"{provider}/{model}" if provider else model
+
     def embed_text(self, text: str, **kwargs: Any) -> list[float]:
         return self._module.embed_text(text, **kwargs)
 
@@ -112,9 +166,22 @@ class _IPFSRouterAdapter:
     def add_bytes(self, data: bytes, **kwargs: Any) -> str:
         return self._module.add_bytes(data, **kwargs)
 
+    def add_many(self, items: list[bytes], **kwargs: Any) -> list[str]:
+        add_many = getattr(self._module, "add_many", None)
+        if callable(add_many):
+            return list(add_many(items, **kwargs))
+        return [self._module.add_bytes(data, **kwargs) for data in items]
+
     def cat(self, cid: str) -> bytes:
         return self._module.cat(cid)
 
+    def cat_stream(self, cid: str, *, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        # Routers without a streaming read still return the whole object.
+        stream = getattr(self._module, "cat_stream", None)
+        if callable(stream):
+            return iter(stream(cid, chunk_size=chunk_size))
+        return iter_byte_chunks(self._module.cat(cid), chunk_size)
+
 
 class _LLMRouterAdapter:
     def __init__(self, module: Any) -> None:
@@ -141,11 +208,23 @@ def _import_router_module(module_name: str) -> Any | None:
 
 @lru_cache(maxsize=1)
 def get_embeddings_router() -> EmbeddingsRouter:
-    """Get embeddings router adapter with safe fallback."""
+    """Get embeddings router adapter with safe fallback.
+
+    Unless ``HANDSFREE_EMBEDDING_CACHE_ENABLED`` is false, the adapter is wrapped
+    so repeated texts are served from the embedding cache. Cached vectors are
+    keyed on the router's resolved default model; when it cannot be resolved
+    the cache is kept in memory only.
+    """
     module = _import_router_module("ipfs_datasets_py.embeddings_router")
     if module is None:
         return _UnavailableEmbeddingsRouter()
-    return _EmbeddingsRouterAdapter(module)
+    adapter = _EmbeddingsRouterAdapter(module)
+    if not embedding_cache_enabled():
+        return adapter
+    model_identity = adapter.model_identity()
+    return CachedEmbeddingsRouter(
+        adapter, build_embedding_cache(persistent=bool(model_identity)), model_identity
+    )
 
 
 @lru_cache(maxsize=1)
@@ -153,20 +232,32 @@ def get_ipfs_router() -> IPFSRouter:
     """Get IPFS router adapter with safe fallback.
 
     Uses ipfs_backend_router from ipfs_datasets_py as the IPFS router source.
+    Unless ``HANDSFREE_IPFS_CAT_CACHE_ENABLED`` is false, ``cat`` results are
+    served from the CID read cache.
     """
     module = _import_router_module("ipfs_datasets_py.ipfs_backend_router")
     if module is None:
         return _UnavailableIPFSRouter()
-    return _IPFSRouterAdapter(module)
+    adapter = _IPFSRouterAdapter(module)
+    if not ipfs_cat_cache_enabled():
+        return adapter
+    return CachedIPFSRouter(adapter, build_ipfs_cat_cache())
 
 
 @lru_cache(maxsize=1)
 def get_llm_router() -> LLMRouter:
-    """Get LLM router adapter with safe fallback."""
+    """Get LLM router adapter with safe fallback.
+
+    Unless ``HANDSFREE_LLM_CACHE_ENABLED`` is false, deterministic generations
+    are served from the generation cache.
+    """
     module = _import_router_module("ipfs_datasets_py.llm_router")
     if module is None:
         return _UnavailableLLMRouter()
-    return _LLMRouterAdapter(module)
+    adapter = _LLMRouterAdapter(module)
+    if not llm_cache_enabled():
+        return adapter
+    return CachedLLMRouter(adapter, build_generation_cache())
 
 
 def reset_ipfs_datasets_router_caches() -> None:
@@ -17,10 +17,13 @@ import importlib
 import json
 import logging
 import tempfile
+from collections.abc import Iterator
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, NoReturn, Protocol
 
+from handsfree.ipfs_cat_cache import iter_byte_chunks
+
 logger = logging.getLogger(__name__)
 IPFS_KIT_CLI_COMMAND = "ipfs-kit"
 PACKAGE_DATASET_MANIFEST_SCHEMA = "handsfree.ipfs_kit.package_dataset.v1"
@@ -33,10 +36,22 @@ class IPFSKitAdapter(Protocol):
         """Add bytes to IPFS and return content metadata."""
         ...
 
+    def add_file(self, path: str, **kwargs: Any) -> Any:
+        """Add a local file to IPFS and return content metadata."""
+        ...
+
+    def add_many(self, items: list[bytes], **kwargs: Any) -> list[Any]:
+        """Add several payloads in one backend operation where possible."""
+        ...
+
     def cat(self, cid: str, **kwargs: Any) -> Any:
         """Read bytes or text content by CID."""
         ...
 
+    def cat_stream(self, cid: str, **kwargs: Any) -> Iterator[bytes]:
+        """Read content by CID as a stream of byte chunks."""
+        ...
+
     def pin(self, cid: str, **kwargs: Any) -> Any:
         """Pin content by CID."""
         ...
@@ -94,9 +109,18 @@ class _UnavailableIPFSKitAdapter:
     def add_bytes(self, data: bytes, **kwargs: Any) -> NoReturn:
         self._raise("add_bytes")
 
+    def add_file(self, path: str, **kwargs: Any) -> NoReturn:
+        self._raise("add_file")
+
+    def add_many(self, items: list[bytes], **kwargs: Any) -> NoReturn:
+        self._raise("add_many")
+
     def cat(self, cid: str, **kwargs: Any) -> NoReturn:
         self._raise("cat")
 
+    def cat_stream(self, cid: str, **kwargs: Any) -> NoReturn:
+        self._raise("cat_stream")
+
     def pin(self, cid: str, **kwargs: Any) -> NoReturn:
         self._raise("pin")
 
@@ -163,10 +187,13 @@ class _IPFSKitModuleAdapter:
         return manifest
 
     def add_bytes(self, data: bytes, **kwargs: Any) -> Any:
-        """Write bytes to a temp file and call ipfs_add on the kit instance."""
+        """Add bytes in memory when the kit supports it, else via a temp file."""
         kit = self._get_kit_instance()
+        add_in_memory = _kit_bytes_adder(kit)
+        if add_in_memory is not None:
+            return add_in_memory(data, **kwargs)
 
-        # The real API is ipfs_add(file_path) - write to temp file
+        # The path-only API is ipfs_add(file_path) - write to temp file
         with tempfile.NamedTemporaryFile(delete=False, suffix=".bin") as f:
             f.write(data)
             tmp_path = f.name
@@ -180,11 +207,57 @@ class _IPFSKitModuleAdapter:
             except Exception:
                 pass
 
+    def add_many(self, items: list[bytes], **kwargs: Any) -> list[Any]:
+        """Add several payloads, returning one add result per item in order.
+
+        Kits that add bytes in memory are called once per item.  Path-only kits
+        get every payload written into one temp directory that is added
+        recursively in a single ``ipfs_add`` call, and the per-file results are
+        matched back to the payloads by path.  If they cannot be matched,
+        :class:`IPFSKitUnavailableError` is raised rather than adding every
+        payload a second time.
+        """
+        if not items:
+            return []
+        kit = self._get_kit_instance()
+        add_in_memory = _kit_bytes_adder(kit)
+        if add_in_memory is not None:
+            return [add_in_memory(data, **kwargs) for data in items]
+
+        names = [f"{position:06d}.bin" for position in range(len(items))]
+        with tempfile.TemporaryDirectory(prefix="handsfree-ipfs-add-") as directory:
+            for name, data in zip(names, items, strict=True):
+                (Path(directory) / name).write_bytes(data)
+            result = kit.ipfs_add(directory, recursive=True, **kwargs)
+            by_name = _kit_results_by_name(result)
+            missing = [name for name in names if name not in by_name]
+            if missing:
+                raise IPFSKitUnavailableError(
+                    f"ipfs_kit_py directory add returned no result for {len(missing)} "
+                    f"of {len(names)} files"
+                )
+            return [by_name[name] for name in names]
+
+    def add_file(self, path: str, **kwargs: Any) -> Any:
+        """Add a local file via ipfs_add without reading it into memory."""
+        kit = self._get_kit_instance()
+        return kit.ipfs_add(path, **kwargs)
+
     def cat(self, cid: str, **kwargs: Any) -> Any:
         """Read content by CID via ipfs_cat."""
         kit = self._get_kit_instance()
         return kit.ipfs_cat(cid, **kwargs)
 
+    def cat_stream(
+        self, cid: str, *, chunk_size: int = 64 * 1024, **kwargs: Any
+    ) -> Iterator[bytes]:
+        """Read content by CID in chunks via ipfs_cat_stream, else chunk ipfs_cat."""
+        kit = self._get_kit_instance()
+        stream = getattr(kit, "ipfs_cat_stream", None)
+        if callable(stream):
+            return iter(stream(cid, chunk_size=chunk_size, **kwargs))
+        return iter_byte_chunks(kit.ipfs_cat(cid, **kwargs), chunk_size)
+
     def pin(self, cid: str, **kwargs: Any) -> Any:
         """Pin content by CID."""
         kit = self._get_kit_instance()
@@ -292,6 +365,37 @@ class _IPFSKitModuleAdapter:
         raise IPFSKitUnavailableError("ipfs_name_resolve not available on kit instance")
 
 
+def _kit_bytes_adder(kit: Any) -> Any | None:
+    """Return the kit's in-memory add method, if it has one."""
+    for method_name in ("ipfs_add_bytes", "add_bytes"):
+        adder = getattr(kit, method_name, None)
+        if callable(adder):
+            return adder
+    return None
+
+
+def _kit_results_by_name(result: Any) -> dict[str, Any]:
+    """Index the per-file entries of a recursive ipfs_add result by file name.
+
+    Entries name their file with ``Name``/``Path`` (daemon HTTP API) or
+    ``name``/``path`` (client libraries), relative to or including the
+    added directory.
+    """
+    if isinstance(result, dict):
+        entries = result.get("files") or result.get("results") or result.get("Objects") or []
+    else:
+        entries = result if isinstance(result, list) else []
+    by_name: dict[str, Any] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        for key in ("Name", "Path", "name", "path"):
+            if isinstance(entry.get(key), str) and entry[key]:
+                by_name[Path(entry[key]).name] = entry
+                break
+    return by_name
+
+
 def _import_kit_module() -> Any | None:
     module_name = "ipfs_kit_py"
     try:
@@ -0,0 +1,307 @@
+"""Process-wide registry of warm ipfs_accelerate and ipfs_datasets clients.
+
+The vector, search, scraping and inference endpoints used to import their
+``ipfs_accelerate_py`` tool modules and build clients inside every request.
+:class:`IPFSModuleRegistry` builds each named client once, on first use or
+during warm-up, and lends the same instance to every caller through
+:meth:`~IPFSModuleRegistry.borrow`.  Clients the registry owns that stay
+unused for ``idle_seconds`` are evicted (and released, when they define a
+``release`` hook).  Shared clients are never evicted: dropping them frees
+nothing, and releasing them would break the code that keeps using them
+outside the registry.  All default clients are shared.  A failed import is remembered for ``retry_seconds`` so a missing
+optional package is not re-resolved on every request.  :meth:`health`
+reports what is loaded, in use, idle, or failing.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from handsfree.ipfs_accelerate_adapters import get_ipfs_accelerate_adapter
+from handsfree.ipfs_datasets_routers import get_datasets_router
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_SECONDS = 900.0
+DEFAULT_RETRY_SECONDS = 30.0
+DEFAULT_SWEEP_SECONDS = 60.0
+
+ClientFactory = Callable[[], Any]
+
+
+@dataclass
+class _Entry:
+    factory: ClientFactory
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    instance: Any = None
+    loaded: bool = False
+    in_use: int = 0
+    borrows: int = 0
+    loaded_at: float | None = None
+    last_used: float | None = None
+    load_ms: float | None = None
+    error: BaseException | None = None
+    failed_at: float | None = None
+    shared: bool = False
+
+
+class IPFSModuleRegistry:
+    """Lazily built, shared clients keyed by name."""
+
+    def __init__(
+        self,
+        factories: dict[str, ClientFactory] | None = None,
+        *,
+        shared: Iterable[str] = (),
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        retry_seconds: float = DEFAULT_RETRY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.idle_seconds = idle_seconds
+        self.retry_seconds = retry_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+        shared_names = set(shared)
+        for name, factory in (factories or {}).items():
+            self.register(name, factory, shared=name in shared_names)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, name: str, factory: ClientFactory, *, shared: bool = False) -> None:
+        """Register ``factory`` for ``name``.
+
+        ``shared`` marks a client the registry does not own, such as a
+        process-wide singleton or an imported module; it is never evicted.
+        """
+        with self._lock:
+            self._entries[name] = _Entry(factory, shared=shared)
+
+    def _entry(self, name: str) -> _Entry:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"Unknown IPFS module client: {name}") from None
+
+    def _load(self, entry: _Entry) -> Any:
+        # Called with entry.lock held.
+        if entry.loaded:
+            return entry.instance
+        now = self._clock()
+        if entry.error is not None and now - (entry.failed_at or 0.0) < self.retry_seconds:
+            raise entry.error.with_traceback(None)
+        started = time.perf_counter()
+        try:
+            entry.instance = entry.factory()
+        except Exception as exc:
+            entry.error, entry.failed_at = exc, now
+            raise
+        entry.loaded, entry.error, entry.failed_at = True, None, None
+        entry.loaded_at = now
+        entry.load_ms = round((time.perf_counter() - started) * 1000, 3)
+        return entry.instance
+
+    @contextmanager
+    def borrow(self, name: str) -> Iterator[Any]:
+        """Lend the shared client for ``name``, building it on first use.
+
+        A borrowed client is never evicted until it is returned.  Factory
+        errors (typically :class:`ImportError`) propagate to the caller.
+        """
+        entry = self._entry(name)
+        with entry.lock:
+            instance = self._load(entry)
+            entry.in_use += 1
+            entry.borrows += 1
+        try:
+            yield instance
+        finally:
+            with entry.lock:
+                entry.in_use -= 1
+                entry.last_used = self._clock()
+
+    def warm(self, names: list[str] | None = None) -> dict[str, bool]:
+        """Build the clients for ``names`` (default: all) ahead of requests."""
+        warmed: dict[str, bool] = {}
+        for name in names or list(self._entries):
+            try:
+                with self.borrow(name):
+                    warmed[name] = True
+            except Exception as exc:  # noqa: BLE001 - warm-up is best effort
+                logger.info("IPFS module client %s did not warm up: %s", name, exc)
+                warmed[name] = False
+        return warmed
+
+    def evict_idle(self) -> list[str]:
+        """Drop owned clients unused for ``idle_seconds``; returns the evicted names."""
+        if self.idle_seconds <= 0:
+            return []
+        now = self._clock()
+        evicted: list[str] = []
+        for name, entry in list(self._entries.items()):
+            with entry.lock:
+                last_active = entry.last_used or entry.loaded_at
+                if (
+                    entry.shared
+                    or not entry.loaded
+                    or entry.in_use
+                    or last_active is None
+                    or now - last_active < self.idle_seconds
+                ):
+                    continue
+                instance = entry.instance
+                entry.instance, entry.loaded, entry.loaded_at = None, False, None
+            release = getattr(instance, "release", None)
+            if callable(release):
+                try:
+                    release()
+                except Exception as exc:  # noqa: BLE001 - eviction must not fail
+                    logger.debug("Releasing IPFS module client %s failed: %s", name, exc)
+            evicted.append(name)
+        return evicted
+
+    def health(self) -> dict[str, Any]:
+        """Report load state, usage and last error for every client."""
+        now = self._clock()
+        report: dict[str, Any] = {}
+        for name, entry in list(self._entries.items()):
+            with entry.lock:
+                last_active = entry.last_used or entry.loaded_at
+                report[name] = {
+                    "loaded": entry.loaded,
+                    "shared": entry.shared,
+                    "in_use": entry.in_use,
+                    "borrows": entry.borrows,
+                    "load_ms": entry.load_ms,
+                    "idle_seconds": round(now - last_active, 3)
+                    if entry.loaded and last_active is not None
+                    else None,
+                    "error": str(entry.error) if entry.error is not None else None,
+                }
+        return report
+
+    def _run(self, warm_names: list[str] | None, sweep_seconds: float) -> None:
+        if warm_names is None or warm_names:
+            self.warm(warm_names)
+        while not self._stopped.wait(sweep_seconds):
+            evicted = self.evict_idle()
+            if evicted:
+                logger.debug("Evicted idle IPFS module clients: %s", ", ".join(evicted))
+
+    def start(
+        self,
+        warm_names: list[str] | None = None,
+        *,
+        sweep_seconds: float = DEFAULT_SWEEP_SECONDS,
+    ) -> None:
+        """Warm ``warm_names`` (default: all) and sweep idle clients in the background.
+
+        Idempotent; an empty ``warm_names`` skips warm-up.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(warm_names, max(1.0, sweep_seconds)),
+                name="handsfree-ipfs-modules",
+                daemon=True,
+            )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+def _import_tools(module_name: str) -> ClientFactory:
+    return lambda: importlib.import_module(module_name)
+
+
+def _warm_accelerate_adapter() -> Any:
+    adapter = get_ipfs_accelerate_adapter()
+    warm_up = getattr(adapter, "warm_up", None)
+    if callable(warm_up):
+        warm_up()
+    return adapter
+
+
+_TOOLS_PACKAGE = "ipfs_accelerate_py.mcp_server.tools"
+
+DEFAULT_FACTORIES: dict[str, ClientFactory] = {
+    "accelerate": _warm_accelerate_adapter,
+    "datasets": get_datasets_router,
+    "vector_store_tools": _import_tools(
+        f"{_TOOLS_PACKAGE}.vector_store_tools.native_vector_store_tools"
+    ),
+    "search_tools": _import_tools(f"{_TOOLS_PACKAGE}.search_tools.native_search_tools"),
+    "web_scraping_tools": _import_tools(
+        f"{_TOOLS_PACKAGE}.web_scraping_tools.native_web_scraping_tools"
+    ),
+    "workflow_tools": _import_tools(
+        f"{_TOOLS_PACKAGE}.workflow_tools.native_workflow_tools_category"
+    ),
+}
+
+
+# None of the default clients is owned by the registry: the accelerate
+# adapter and datasets router are process-wide singletons that other code
+# paths use directly, and tool modules stay in ``sys.modules`` after import.
+SHARED_CLIENTS = frozenset(DEFAULT_FACTORIES)
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _warm_names_from_env() -> list[str] | None:
+    raw_value = os.getenv("HANDSFREE_IPFS_MODULE_WARMUP", "").strip()
+    if not raw_value:
+        return None
+    if raw_value.lower() in {"0", "false", "none", "off"}:
+        return []
+    return [name.strip() for name in raw_value.split(",") if name.strip()]
+
+
+@lru_cache(maxsize=1)
+def get_ipfs_module_registry() -> IPFSModuleRegistry:
+    """Get the process-wide client registry.
+
+    ``HANDSFREE_IPFS_MODULE_IDLE_SECONDS`` sets how long an unused owned
+    client is kept (``0`` keeps clients forever) and
+    ``HANDSFREE_IPFS_MODULE_RETRY_SECONDS`` how long a failed import is
+    remembered before it is retried.
+    """
+    return IPFSModuleRegistry(
+        DEFAULT_FACTORIES,
+        shared=SHARED_CLIENTS,
+        idle_seconds=_float_env("HANDSFREE_IPFS_MODULE_IDLE_SECONDS", DEFAULT_IDLE_SECONDS),
+        retry_seconds=_float_env("HANDSFREE_IPFS_MODULE_RETRY_SECONDS", DEFAULT_RETRY_SECONDS),
+    )
+
+
+def start_ipfs_module_registry() -> None:
+    """Application startup hook: warm clients and start idle eviction.
+
+    ``HANDSFREE_IPFS_MODULE_WARMUP`` lists the clients to warm (comma
+    separated; all by default, ``none`` to skip warm-up).
+    """
+    get_ipfs_module_registry().start(_warm_names_from_env())
+
+
+def reset_ipfs_module_registry() -> None:
+    """Stop and drop the process-wide registry (primarily for tests)."""
+    if get_ipfs_module_registry.cache_info().currsize:
+        get_ipfs_module_registry().stop()
+    get_ipfs_module_registry.cache_clear()
@@ -0,0 +1,248 @@
+"""Background-probed IPFS backend status.
+
+Probing the IPFS backends imports optional packages and calls into their
+adapters, which is too expensive to repeat for every status poll from the
+mobile app and dashboards.  :class:`IPFSStatusService` runs the probes on a
+background thread every ``interval_seconds`` (and immediately after a caller
+reports a backend failure) and serves the last results as a snapshot, with
+its age, a short per-backend health history, and probe latency percentiles.
+Reading a snapshot never touches a backend.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from handsfree.ipfs_accelerate_adapters import get_ipfs_accelerate_adapter
+from handsfree.ipfs_datasets_routers import (
+    get_embeddings_router,
+    get_ipfs_router,
+    get_llm_router,
+)
+from handsfree.ipfs_kit_adapters import IPFSKitUnavailableError, get_ipfs_kit_adapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 30.0
+DEFAULT_HISTORY_SIZE = 60
+MIN_REPROBE_SECONDS = 1.0
+_PERCENTILES = (50, 95, 99)
+
+Probe = Callable[[], dict[str, Any]]
+
+
+def probe_ipfs_kit() -> dict[str, Any]:
+    """Probe ipfs_kit_py availability and backend health."""
+    kit_status: dict[str, Any] = {"available": False}
+    try:
+        kit_adapter = get_ipfs_kit_adapter()
+        kit_status["available"] = hasattr(kit_adapter, "get_backend_statuses")
+        backend_statuses = kit_adapter.get_backend_statuses()
+        kit_status["backends"] = backend_statuses
+        if not backend_statuses:
+            # Still available via adapter, just no backends configured
+            kit_status["available"] = True
+            kit_status["note"] = "adapter loaded, backends may need configuration"
+    except IPFSKitUnavailableError:
+        kit_status["available"] = False
+        kit_status["error"] = "ipfs_kit_py not installed"
+    except Exception as exc:
+        kit_status["available"] = False
+        kit_status["error"] = str(exc)
+    return kit_status
+
+
+def probe_ipfs_datasets() -> dict[str, Any]:
+    """Probe the ipfs_datasets_py routers."""
+    datasets_status: dict[str, Any] = {"available": False}
+    try:
+        embeddings = get_embeddings_router()
+        ipfs_router = get_ipfs_router()
+        llm = get_llm_router()
+        datasets_status["available"] = True
+        datasets_status["routers"] = {
+            "embeddings": type(embeddings).__name__,
+            "ipfs": type(ipfs_router).__name__,
+            "llm": type(llm).__name__,
+        }
+    except Exception as exc:
+        datasets_status["error"] = str(exc)
+    return datasets_status
+
+
+def probe_ipfs_accelerate() -> dict[str, Any]:
+    """Probe ipfs_accelerate_py runtime status."""
+    try:
+        return get_ipfs_accelerate_adapter().status()
+    except Exception as exc:
+        return {"available": False, "error": str(exc)}
+
+
+DEFAULT_PROBES: dict[str, Probe] = {
+    "ipfs_kit": probe_ipfs_kit,
+    "ipfs_datasets": probe_ipfs_datasets,
+    "ipfs_accelerate": probe_ipfs_accelerate,
+}
+
+
+@dataclass
+class _ProbeSample:
+    probed_at: float
+    available: bool
+    latency_ms: float
+
+
+def _percentile(sorted_values: list[float], percentile: int) -> float:
+    # Nearest-rank percentile over an already sorted list.
+    rank = max(1, -(-percentile * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+class IPFSStatusService:
+    """Probes IPFS backends off the request path and caches the results."""
+
+    def __init__(
+        self,
+        probes: dict[str, Probe] | None = None,
+        *,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.probes = dict(DEFAULT_PROBES if probes is None else probes)
+        self.interval_seconds = interval_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._statuses: dict[str, dict[str, Any]] = {}
+        self._history: dict[str, deque[_ProbeSample]] = {
+            name: deque(maxlen=max(1, history_size)) for name in self.probes
+        }
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def probe_now(self, names: list[str] | None = None) -> None:
+        """Run the probes for ``names`` (default: all) and record the results."""
+        for name in names or list(self.probes):
+            started = time.perf_counter()
+            try:
+                status = dict(self.probes[name]())
+            except Exception as exc:  # noqa: BLE001 - probes report, never raise
+                status = {"available": False, "error": str(exc)}
+            latency_ms = round((time.perf_counter() - started) * 1000, 3)
+            sample = _ProbeSample(self._clock(), bool(status.get("available")), latency_ms)
+            with self._lock:
+                self._statuses[name] = status
+                self._history[name].append(sample)
+
+    def signal_failure(self, name: str) -> None:
+        """Ask the background thread to re-probe now (``name`` is informational)."""
+        logger.debug("IPFS backend failure reported for %s; re-probing", name)
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.clear()
+            started = time.monotonic()
+            self.probe_now()
+            self._wake.wait(self.interval_seconds)
+            # Bound re-probing when failures are reported in a burst.
+            self._stopped.wait(max(0.0, started + MIN_REPROBE_SECONDS - time.monotonic()))
+
+    def start(self) -> None:
+        """Start the background probe thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="handsfree-ipfs-status", daemon=True
+            )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the cached statuses, their ages, history, and latency percentiles.
+
+        Backends that have not been probed yet report ``{"available": False,
+        "pending": True}``.
+        """
+        now = self._clock()
+        backends: dict[str, Any] = {}
+        with self._lock:
+            for name in self.probes:
+                history = list(self._history[name])
+                status = self._statuses.get(name, {"available": False, "pending": True})
+                latencies = sorted(sample.latency_ms for sample in history)
+                backends[name] = {
+                    "status": dict(status),
+                    "probed_at": history[-1].probed_at if history else None,
+                    "age_seconds": round(now - history[-1].probed_at, 3) if history else None,
+                    "latency_ms": {
+                        f"p{percentile}": _percentile(latencies, percentile)
+                        for percentile in _PERCENTILES
+                    }
+                    if latencies
+                    else {},
+                    "history": [
+                        {
+                            "probed_at": sample.probed_at,
+                            "available": sample.available,
+                            "latency_ms": sample.latency_ms,
+                        }
+                        for sample in history
+                    ],
+                }
+        probed = [entry["probed_at"] for entry in backends.values() if entry["probed_at"]]
+        oldest = min(probed) if len(probed) == len(backends) and probed else None
+        return {
+            "backends": backends,
+            "probed_at": oldest,
+            "age_seconds": round(now - oldest, 3) if oldest is not None else None,
+        }
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+@lru_cache(maxsize=1)
+def get_ipfs_status_service() -> IPFSStatusService:
+    """Get the process-wide status service, starting its probe thread.
+
+    ``HANDSFREE_IPFS_STATUS_PROBE_INTERVAL_SECONDS`` sets the probe period and
+    ``HANDSFREE_IPFS_STATUS_HISTORY_SIZE`` how many probes are kept per backend.
+    """
+    service = IPFSStatusService(
+        interval_seconds=_float_env(
+            "HANDSFREE_IPFS_STATUS_PROBE_INTERVAL_SECONDS", DEFAULT_INTERVAL_SECONDS
+        ),
+        history_size=int(_float_env("HANDSFREE_IPFS_STATUS_HISTORY_SIZE", DEFAULT_HISTORY_SIZE)),
+    )
+    service.start()
+    return service
+
+
+def start_ipfs_status_service() -> None:
+    """Application startup hook: start probing before the first status request."""
+    get_ipfs_status_service()
+
+
+def reset_ipfs_status_service() -> None:
+    """Stop and drop the process-wide status service (primarily for tests)."""
+    if get_ipfs_status_service.cache_info().currsize:
+        get_ipfs_status_service().stop()
+    get_ipfs_status_service.cache_clear()
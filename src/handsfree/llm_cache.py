@@ -0,0 +1,195 @@
+"""Generation cache for the LLM router.
+
+PR summaries and failure explanations build their prompts deterministically
+from the same PR or check data, so repeated questions about one PR send the
+same prompt again.  :class:`CachedLLMRouter` answers those from a TTL cache
+keyed by ``(model, sha256(options), sha256(prompt))`` and coalesces identical
+prompts that are already in flight into one backend call.
+
+Only deterministic option sets are cached (see
+:func:`is_deterministic_generation`); sampled generations always reach the
+backend.  Lookup outcomes are recorded as ``llm_generation_cache`` metrics.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from handsfree.embedding_cache import embedding_options_digest
+from handsfree.metrics import get_metrics_collector
+
+GenerationKey = tuple[str, str, str]
+
+DEFAULT_TTL_SECONDS = 600.0
+DEFAULT_MAX_ENTRIES = 256
+_MODEL_OPTION_KEYS = ("model", "model_name")
+_SAMPLING_OPTION_KEYS = ("top_p", "top_k", "do_sample", "seed")
+
+
+def generation_cache_key(prompt: str, options: dict[str, Any] | None = None) -> GenerationKey:
+    """Return the ``(model, options_sha256, prompt_sha256)`` cache key for one prompt."""
+    options = options or {}
+    model = next((str(options[key]) for key in _MODEL_OPTION_KEYS if options.get(key)), "")
+    return (
+        model,
+        embedding_options_digest(options),
+        hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+    )
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("true", "1", "yes")
+
+
+def is_deterministic_generation(options: dict[str, Any]) -> bool:
+    """Whether generating with ``options`` should return the same text every time.
+
+    True for greedy decoding (``temperature`` 0 or ``do_sample`` False) and
+    False for streaming or any other sampling configuration.  Options that
+    leave sampling to the backend default are treated as deterministic only
+    when ``HANDSFREE_LLM_CACHE_DEFAULT_DETERMINISTIC`` is true.
+    """
+    if options.get("stream"):
+        return False
+    if options.get("do_sample") is False:
+        return True
+    if "temperature" in options:
+        try:
+            return float(options["temperature"]) == 0.0
+        except (TypeError, ValueError):
+            return False
+    if any(key in options for key in _SAMPLING_OPTION_KEYS):
+        return False
+    return _env_flag("HANDSFREE_LLM_CACHE_DEFAULT_DETERMINISTIC", "false")
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class GenerationCache:
+    """TTL + LRU cache of generated texts with single-flight misses."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(0, max_entries)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[GenerationKey, tuple[float, str]] = OrderedDict()
+        self._flights: dict[GenerationKey, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: GenerationKey) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return text
+
+    def _remember(self, key: GenerationKey, text: str) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_or_generate(self, key: GenerationKey, generate: Callable[[], Any]) -> Any:
+        """Return the cached text for ``key`` or run ``generate`` once for concurrent callers.
+
+        Only string results are cached.  Errors are shared with callers that
+        joined the failed generation and are not cached.
+        """
+        metrics = get_metrics_collector()
+        with self._lock:
+            text = self._lookup(key)
+            flight = None if text is not None else self._flights.get(key)
+            leader = text is None and flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if text is not None:
+            metrics.record_llm_generation_cache("hit")
+            return text
+        if not leader:
+            metrics.record_llm_generation_cache("coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        metrics.record_llm_generation_cache("miss")
+        try:
+            result = generate()
+            flight.result = result
+            if isinstance(result, str):
+                with self._lock:
+                    self._remember(key, result)
+            return result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class CachedLLMRouter:
+    """LLM router that serves repeated deterministic prompts from a :class:`GenerationCache`."""
+
+    def __init__(self, router: Any, cache: GenerationCache) -> None:
+        self._router = router
+        self.cache = cache
+
+    def generate_text(self, prompt: str, **kwargs: Any) -> str:
+        if self.cache.ttl_seconds <= 0 or not is_deterministic_generation(kwargs):
+            get_metrics_collector().record_llm_generation_cache("bypass")
+            return self._router.generate_text(prompt, **kwargs)
+        return self.cache.get_or_generate(
+            generation_cache_key(prompt, kwargs),
+            lambda: self._router.generate_text(prompt, **kwargs),
+        )
+
+
+def llm_cache_enabled() -> bool:
+    """Whether LLM routers should be wrapped with a generation cache."""
+    return _env_flag("HANDSFREE_LLM_CACHE_ENABLED", "true")
+
+
+def build_generation_cache() -> GenerationCache:
+    """Build a generation cache from environment configuration.
+
+    ``HANDSFREE_LLM_CACHE_TTL_SECONDS`` sets how long a generated text is
+    reused and ``HANDSFREE_LLM_CACHE_MAX_ENTRIES`` sizes the LRU.
+    """
+    try:
+        ttl_seconds = float(os.getenv("HANDSFREE_LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    except ValueError:
+        ttl_seconds = DEFAULT_TTL_SECONDS
+    try:
+        max_entries = int(os.getenv("HANDSFREE_LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+    except ValueError:
+        max_entries = DEFAULT_MAX_ENTRIES
+    return GenerationCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
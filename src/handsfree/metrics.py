@@ -40,6 +40,13 @@ class MetricsCollector:
     display_widget_bridge_error_counts: dict[str, int] = field(default_factory=dict)
     display_widget_render_latencies: list[float] = field(default_factory=list)
 
+    # LLM generation cache outcomes (hit, miss, coalesced, bypass)
+    llm_generation_cache_counts: dict[str, int] = field(default_factory=dict)
+
+    # Backend pool outcomes (completed, failed, rejected, timed_out) and gauges, by pool
+    backend_pool_counts: dict[str, dict[str, int]] = field(default_factory=dict)
+    backend_pool_gauges: dict[str, dict[str, int]] = field(default_factory=dict)
+
     # Thread lock for safe concurrent access
     _lock: threading.Lock = field(default_factory=threading.Lock)
 
@@ -124,6 +131,47 @@ class MetricsCollector:
         with self._lock:
             self.display_widget_render_latencies.append(latency_ms)
 
+    def record_llm_generation_cache(self, outcome: str) -> None:
+        """Record an LLM generation cache lookup outcome.
+
+        Args:
+            outcome: hit, miss, coalesced (joined an identical in-flight
+                generation), or bypass (non-deterministic options)
+        """
+        key = _metric_label(outcome)
+        with self._lock:
+            self.llm_generation_cache_counts[key] = self.llm_generation_cache_counts.get(key, 0) + 1
+
+    def record_backend_pool(self, pool: str, outcome: str) -> None:
+        """Record the outcome of one unit of work submitted to a backend pool.
+
+        Args:
+            pool: Backend pool name (backend family)
+            outcome: completed, failed, rejected (pool saturated), or timed_out
+        """
+        key = _metric_label(outcome)
+        with self._lock:
+            counts = self.backend_pool_counts.setdefault(_metric_label(pool), {})
+            counts[key] = counts.get(key, 0) + 1
+
+    def set_backend_pool_gauges(
+        self,
+        pool: str,
+        *,
+        active: int,
+        queued: int,
+        max_workers: int,
+        max_queue: int,
+    ) -> None:
+        """Record the current occupancy of a backend pool."""
+        with self._lock:
+            self.backend_pool_gauges[_metric_label(pool)] = {
+                "active": active,
+                "queued": queued,
+                "max_workers": max_workers,
+                "max_queue": max_queue,
+            }
+
     def _calculate_percentile(self, sorted_values: list[float], percentile: float) -> float | None:
         """Calculate a percentile from sorted values.
 
@@ -192,6 +240,20 @@ class MetricsCollector:
                         "count": len(self.display_widget_render_latencies),
                     },
                 },
+                "llm_generation_cache": dict(self.llm_generation_cache_counts),
+                "backend_pools": {
+                    pool: {
+                        **self.backend_pool_gauges.get(pool, {}),
+                        "utilization": (
+                            self.backend_pool_gauges[pool]["active"]
+                            / self.backend_pool_gauges[pool]["max_workers"]
+                            if pool in self.backend_pool_gauges
+                            else 0.0
+                        ),
+                        "outcomes": dict(self.backend_pool_counts.get(pool, {})),
+                    }
+                    for pool in sorted({*self.backend_pool_gauges, *self.backend_pool_counts})
+                },
             }
 
     def reset(self) -> None:
@@ -205,6 +267,9 @@ class MetricsCollector:
             self.display_widget_policy_denial_counts.clear()
             self.display_widget_bridge_error_counts.clear()
             self.display_widget_render_latencies.clear()
+            self.llm_generation_cache_counts.clear()
+            self.backend_pool_counts.clear()
+            self.backend_pool_gauges.clear()
 
 
 # Global metrics collector instance
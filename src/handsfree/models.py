@@ -1526,9 +1526,17 @@ class AIBackendPolicyConfig(BaseModel):
 
 
 class AIBackendPolicyWindow(BaseModel):
-    """Recent action-log window summary for AI policy observability."""
+    """Recent action-log window summary for AI policy observability.
 
-    log_limit: int
+    Counts cover the last ``window_hours``, or all recorded activity when it
+    is null.
+    """
+
+    log_limit: int = Field(
+        deprecated="Counts are no longer taken from the latest N logs; use window_hours.",
+        description="Deprecated echo of the ignored limit parameter.",
+    )
+    window_hours: int | None = None
     ai_execute_logs: int
     policy_applied_count: int
 
@@ -1712,6 +1720,27 @@ class Error(BaseModel):
     details: dict[str, Any] | None = None
 
 
+class AICapabilityBatchExecuteRequest(BaseModel):
+    """API request for executing several AI capabilities together."""
+
+    items: list[AICapabilityExecuteRequest] = Field(..., min_length=1, max_length=64)
+
+
+class AICapabilityBatchItemResult(BaseModel):
+    """Outcome of one item of a batch AI execution."""
+
+    index: int
+    ok: bool
+    response: AICapabilityExecuteResponse | None = None
+    error: Error | None = None
+
+
+class AICapabilityBatchExecuteResponse(BaseModel):
+    """API response for a batch AI execution, in item order."""
+
+    results: list[AICapabilityBatchItemResult]
+
+
 class CreateGitHubConnectionRequest(BaseModel):
     """Request to create a GitHub connection."""
 
@@ -1,7 +1,12 @@
 """Shared MCP++ Profile H Python seller runtime."""
 
 from .adapters import CallbackFacilitator, SettlementResult, VerificationResult, X402SDKAdapter
-from .artifacts import ArtifactStore, FileCIDArtifactStore, IPFSArtifactStore
+from .artifacts import (
+    ArtifactStore,
+    FileCIDArtifactStore,
+    IPFSArtifactStore,
+    PackfileCIDArtifactStore,
+)
 from .batch import (
     DepositIntent,
     DepositStatus,
@@ -28,7 +33,7 @@ from .control_plane import (
 )
 from .errors import ProfileHError
 from .http import ProfileHHttpApp
-from .ledger import DuckDBPaymentLedger, LedgerEntry
+from .ledger import AsyncPaymentLedger, DuckDBPaymentLedger, LedgerEntry
 from .metering import (
     ArtifactSigner,
     DeterministicMeter,
@@ -37,11 +42,13 @@ from .metering import (
     MaximumAuthorization,
     MeterDefinition,
     MeterUnit,
+    SignatureVerifier,
     UsageResult,
 )
 from .operations import (
     BackupManager,
     KillSwitches,
+    KillSwitchState,
     RedactedMetrics,
     alert_definitions,
     dashboard_definition,
@@ -56,6 +63,7 @@ SellerPaymentRuntime = SellerRuntime
 
 __all__ = [
     "ArtifactStore",
+    "AsyncPaymentLedger",
     "CallbackFacilitator",
     "CapabilityCatalog",
     "Decision",
@@ -64,6 +72,7 @@ __all__ = [
     "IPFSArtifactStore",
     "LedgerEntry",
     "Operation",
+    "PackfileCIDArtifactStore",
     "PaidCapability",
     "PaymentContext",
     "PaymentDecision",
@@ -87,9 +96,11 @@ __all__ = [
     "MaximumAuthorization",
     "MeterDefinition",
     "MeterUnit",
+    "SignatureVerifier",
     "UsageResult",
     "BackupManager",
     "KillSwitches",
+    "KillSwitchState",
     "RedactedMetrics",
     "alert_definitions",
     "dashboard_definition",
@@ -2,27 +2,60 @@
 
 from __future__ import annotations
 
+import json
 import os
 import tempfile
 import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
 
 from .canonical import assert_public, canonical_json, cid_for
 
+if TYPE_CHECKING:
+    from .operations import RedactedMetrics
+
 
 class ArtifactStore(Protocol):
     def put(self, artifact: dict[str, Any]) -> str: ...
     def get(self, cid: str) -> dict[str, Any] | None: ...
 
 
+def _check_cid(cid: str) -> None:
+    if not cid.startswith("b") or not cid[1:].isalnum() or cid.lower() != cid:
+        raise ValueError("invalid artifact CID")
+
+
 class FileCIDArtifactStore:
-    """Atomic local block store suitable as an IPFS adapter boundary."""
+    """Atomic local block store suitable as an IPFS adapter boundary.
 
-    def __init__(self, root: str | Path) -> None:
+    Verified reads are kept in a bounded LRU cache of up to ``cache_size``
+    artifacts, so a block's hash is checked once when it is first loaded.
+    A cached entry is reused only while the file's inode, size and mtime
+    are unchanged; any rewrite or removal invalidates it. Lookups are
+    counted in ``metrics`` when given.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        cache_size: int = 1024,
+        metrics: RedactedMetrics | None = None,
+    ) -> None:
+        if cache_size < 0:
+            raise ValueError("cache_size must not be negative")
         self.root = Path(root)
         self.root.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+        self.metrics = metrics
         self._lock = threading.RLock()
+        self._cache_lock = threading.Lock()
+        self._cache: OrderedDict[str, tuple[tuple[int, int, int], bytes]] = OrderedDict()
 
     def put(self, artifact: dict[str, Any]) -> str:
         assert_public(artifact)
@@ -44,21 +77,404 @@ class FileCIDArtifactStore:
             finally:
                 if os.path.exists(temporary):
                     os.unlink(temporary)
+            self._remember(cid, _file_signature(target), raw)
         return cid
 
     def get(self, cid: str) -> dict[str, Any] | None:
-        import json
-
-        if not cid.startswith("b") or not cid[1:].isalnum() or cid.lower() != cid:
-            raise ValueError("invalid artifact CID")
+        _check_cid(cid)
         target = self.root / cid
-        if not target.exists():
+        try:
+            signature = _file_signature(target)
+        except FileNotFoundError:
+            self._forget(cid)
             return None
-        value = json.loads(target.read_text(encoding="utf-8"))
+        with self._cache_lock:
+            cached = self._cache.get(cid)
+            if cached is not None and cached[0] == signature:
+                self._cache.move_to_end(cid)
+                self._observe("hit")
+                return json.loads(cached[1])
+        if cached is not None:
+            self._forget(cid)
+        self._observe("miss")
+        raw = target.read_bytes()
+        value = json.loads(raw.decode("utf-8"))
+        if cid_for(value) != cid:
+            raise OSError("artifact CID does not match stored content")
+        self._remember(cid, signature, raw)
+        return value
+
+    def _remember(self, cid: str, signature: tuple[int, int, int], raw: bytes) -> None:
+        if not self.cache_size:
+            return
+        evicted = 0
+        with self._cache_lock:
+            self._cache[cid] = (signature, raw)
+            self._cache.move_to_end(cid)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                evicted += 1
+        for _ in range(evicted):
+            self._observe("evicted")
+
+    def _forget(self, cid: str) -> None:
+        with self._cache_lock:
+            dropped = self._cache.pop(cid, None)
+        if dropped is not None:
+            self._observe("invalidated")
+
+    def _observe(self, outcome: str) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_cache("artifact", outcome)
+
+
+def _file_signature(path: Path) -> tuple[int, int, int]:
+    status = path.stat()
+    return status.st_ino, status.st_size, status.st_mtime_ns
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@dataclass(frozen=True, slots=True)
+class _PackLocation:
+    pack: int
+    offset: int
+    length: int
+
+
+@dataclass
+class _PackShard:
+    """One shard: append-only pack files plus a CID index log.
+
+    Index lines are ``"<cid> <pack> <offset> <length>"``; ``"<cid> -"`` is a
+    tombstone. Lines are appended only after the pack bytes they describe
+    have been fsynced, so the on-disk index never points at lost data.
+    """
+
+    root: Path
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    sync_lock: threading.Lock = field(default_factory=threading.Lock)
+    index: dict[str, _PackLocation] = field(default_factory=dict)
+    pack: int = 1
+    pack_fd: int = -1
+    pack_size: int = 0
+    pack_bytes: int = 0
+    index_fd: int = -1
+    retired_fds: list[int] = field(default_factory=list)
+    pending: list[bytes] = field(default_factory=list)
+    written: int = 0
+    synced: int = 0
+    fsyncs: int = 0
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.log"
+
+    def pack_path(self, number: int) -> Path:
+        return self.root / f"pack-{number:06d}.dat"
+
+    def pack_numbers(self) -> list[int]:
+        return sorted(int(path.stem[5:]) for path in self.root.glob("pack-*.dat"))
+
+    def open(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        sizes = {number: self.pack_path(number).stat().st_size for number in self.pack_numbers()}
+        data = self.index_path.read_bytes() if self.index_path.exists() else b""
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].decode("ascii").splitlines():
+            cid, *location = line.split(" ")
+            if location == ["-"]:
+                self.index.pop(cid, None)
+                continue
+            entry = _PackLocation(*(int(part) for part in location))
+            if entry.offset + entry.length <= sizes.get(entry.pack, -1):
+                self.index[cid] = entry
+        self.index_fd = os.open(self.index_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        if complete < len(data):
+            # Torn final line from a crash mid-append.
+            os.ftruncate(self.index_fd, complete)
+        self.pack = max(sizes, default=1)
+        self.pack_bytes = sum(sizes.values())
+        self._open_pack()
+        _fsync_dir(self.root)
+
+    def _open_pack(self) -> None:
+        self.pack_fd = os.open(
+            self.pack_path(self.pack), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        self.pack_size = os.fstat(self.pack_fd).st_size
+
+    def append(self, cid: str, raw: bytes, max_pack_bytes: int) -> _PackLocation:
+        # Called with ``lock`` held.
+        if self.pack_size and self.pack_size + len(raw) > max_pack_bytes:
+            self.retired_fds.append(self.pack_fd)
+            self.pack += 1
+            self._open_pack()
+            _fsync_dir(self.root)
+        entry = _PackLocation(self.pack, self.pack_size, len(raw))
+        _write_all(self.pack_fd, raw)
+        self.pack_size += len(raw)
+        self.pack_bytes += len(raw)
+        self.index[cid] = entry
+        self.pending.append(f"{cid} {entry.pack} {entry.offset} {entry.length}\n".encode())
+        self.written += 1
+        return entry
+
+    def delete(self, cid: str) -> bool:
+        # Called with ``lock`` held.
+        if self.index.pop(cid, None) is None:
+            return False
+        self.pending.append(f"{cid} -\n".encode())
+        self.written += 1
+        return True
+
+    def read(self, entry: _PackLocation) -> bytes:
+        with open(self.pack_path(entry.pack), "rb") as stream:
+            stream.seek(entry.offset)
+            return stream.read(entry.length)
+
+    def sync(self, through: int | None = None) -> None:
+        """Make writes up to sequence ``through`` (default: all) durable.
+
+        Concurrent callers queue on ``sync_lock``; whoever holds it fsyncs
+        every write appended so far, so later callers usually return
+        without another fsync.
+        """
+        with self.sync_lock:
+            if self.synced >= (self.written if through is None else through):
+                return
+            with self.lock:
+                target, lines, self.pending = self.written, self.pending, []
+                fds, self.retired_fds = [*self.retired_fds, self.pack_fd], []
+            self._flush(fds, lines)
+            for fd in fds[:-1]:
+                os.close(fd)
+            self.synced = target
+
+    def _flush(self, fds: list[int], lines: list[bytes]) -> None:
+        for fd in fds:
+            os.fsync(fd)
+        _write_all(self.index_fd, b"".join(lines))
+        os.fsync(self.index_fd)
+        self.fsyncs += len(fds) + 1
+
+    def dead_bytes(self) -> int:
+        return self.pack_bytes - sum(entry.length for entry in self.index.values())
+
+    def compact(self, max_pack_bytes: int) -> int:
+        """Rewrite live artifacts into fresh packs and drop the old ones.
+
+        Returns the number of bytes reclaimed. Crash-safe: the new index
+        replaces the old one atomically after the new packs are durable,
+        and old packs are removed only afterwards.
+        """
+        with self.sync_lock, self.lock:
+            dead = self.dead_bytes()
+            old_packs = self.pack_numbers()
+            old_fds = [*self.retired_fds, self.pack_fd]
+            first = self.pack + 1
+            pack, offset, index = first, 0, {}
+            stream = open(self.pack_path(pack), "wb")
+            try:
+                for cid, entry in sorted(self.index.items(), key=lambda item: item[1].pack):
+                    raw = self.read(entry)
+                    if offset and offset + len(raw) > max_pack_bytes:
+                        stream.flush()
+                        os.fsync(stream.fileno())
+                        stream.close()
+                        pack, offset = pack + 1, 0
+                        stream = open(self.pack_path(pack), "wb")
+                    stream.write(raw)
+                    index[cid] = _PackLocation(pack, offset, len(raw))
+                    offset += len(raw)
+                stream.flush()
+                os.fsync(stream.fileno())
+            finally:
+                stream.close()
+            fd, temporary = tempfile.mkstemp(prefix=".index-", dir=self.root)
+            with os.fdopen(fd, "wb") as snapshot:
+                for cid, entry in index.items():
+                    snapshot.write(f"{cid} {entry.pack} {entry.offset} {entry.length}\n".encode())
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(temporary, self.index_path)
+            _fsync_dir(self.root)
+            for fd in [*old_fds, self.index_fd]:
+                os.close(fd)
+            for number in old_packs:
+                self.pack_path(number).unlink()
+            _fsync_dir(self.root)
+            self.index, self.pack, self.retired_fds, self.pending = index, pack, [], []
+            self.pack_bytes = sum(entry.length for entry in index.values())
+            self.index_fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND)
+            self._open_pack()
+            self.synced = self.written
+            return dead
+
+    def close(self) -> None:
+        self.sync()
+        with self.lock:
+            for fd in [self.pack_fd, self.index_fd]:
+                os.close(fd)
+            self.pack_fd = self.index_fd = -1
+
+
+class PackfileCIDArtifactStore:
+    """CID block store that appends artifacts to sharded, rotating pack files.
+
+    Each CID hashes to one of ``shards`` subdirectories holding append-only
+    pack files (rotated at ``max_pack_bytes``) and an index log mapping the
+    CID to its pack, offset and length. A ``put`` outside :meth:`batch` is
+    durable when it returns, but concurrent puts share fsyncs; inside
+    :meth:`batch` the fsync is deferred to the end of the batch. Deleted
+    artifacts and bytes orphaned by a crash are reclaimed by :meth:`compact`.
+    """
+
+    LAYOUT_FILE = "layout.json"
+
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        shards: int = 16,
+        max_pack_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        if not 1 <= shards <= 256:
+            raise ValueError("shards must be in [1, 256]")
+        if max_pack_bytes < 1:
+            raise ValueError("max_pack_bytes must be positive")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        layout_path = self.root / self.LAYOUT_FILE
+        if layout_path.exists():
+            layout = json.loads(layout_path.read_text(encoding="utf-8"))
+            if layout.get("shards") != shards:
+                raise ValueError(f"artifact store was created with {layout.get('shards')} shards")
+        else:
+            layout_path.write_text(json.dumps({"version": 1, "shards": shards}), encoding="utf-8")
+            _fsync_dir(self.root)
+        self.max_pack_bytes = max_pack_bytes
+        self._shards = [_PackShard(self.root / f"{number:02x}") for number in range(shards)]
+        for shard in self._shards:
+            shard.open()
+        self._local = threading.local()
+
+    def _shard(self, cid: str) -> _PackShard:
+        return self._shards[zlib.crc32(cid.encode("ascii")) % len(self._shards)]
+
+    def put(self, artifact: dict[str, Any]) -> str:
+        assert_public(artifact)
+        raw = canonical_json(artifact)
+        cid = cid_for(artifact)
+        shard = self._shard(cid)
+        with shard.lock:
+            entry = shard.index.get(cid)
+            if entry is None:
+                shard.append(cid, raw, self.max_pack_bytes)
+            through = shard.written
+        if entry is not None and shard.read(entry) != raw:
+            raise OSError("CID collision or corrupt artifact")
+        if not getattr(self._local, "batch_depth", 0):
+            shard.sync(through)
+        return cid
+
+    def get(self, cid: str) -> dict[str, Any] | None:
+        _check_cid(cid)
+        shard = self._shard(cid)
+        for _ in range(2):
+            with shard.lock:
+                entry = shard.index.get(cid)
+            if entry is None:
+                return None
+            try:
+                raw = shard.read(entry)
+                break
+            except FileNotFoundError:
+                continue  # Compacted between the lookup and the read.
+        else:
+            raise OSError("artifact pack disappeared during read")
+        value = json.loads(raw.decode("utf-8"))
         if cid_for(value) != cid:
             raise OSError("artifact CID does not match stored content")
         return value
 
+    def delete(self, cid: str) -> bool:
+        """Drop ``cid`` from the index; its bytes are reclaimed by :meth:`compact`."""
+        _check_cid(cid)
+        shard = self._shard(cid)
+        with shard.lock:
+            deleted = shard.delete(cid)
+        if deleted and not getattr(self._local, "batch_depth", 0):
+            shard.sync()
+        return deleted
+
+    @contextmanager
+    def batch(self) -> Iterator[PackfileCIDArtifactStore]:
+        """Defer this thread's fsyncs to one commit when the batch exits."""
+        self._local.batch_depth = getattr(self._local, "batch_depth", 0) + 1
+        try:
+            yield self
+        finally:
+            self._local.batch_depth -= 1
+            if not self._local.batch_depth:
+                self.commit()
+
+    def commit(self) -> None:
+        """Make every write so far durable."""
+        for shard in self._shards:
+            shard.sync()
+
+    def compact(self, *, min_dead_ratio: float = 0.25) -> dict[str, int]:
+        """Rewrite shards whose dead bytes exceed ``min_dead_ratio`` of their packs."""
+        self.commit()
+        shards = reclaimed = 0
+        for shard in self._shards:
+            with shard.lock:
+                dead, total = shard.dead_bytes(), shard.pack_bytes
+            if dead and dead >= min_dead_ratio * total:
+                reclaimed += shard.compact(self.max_pack_bytes)
+                shards += 1
+        return {"shards": shards, "reclaimedBytes": reclaimed}
+
+    def stats(self) -> dict[str, int]:
+        artifacts = packs = live = dead = fsyncs = 0
+        for shard in self._shards:
+            with shard.lock:
+                artifacts += len(shard.index)
+                packs += len(shard.pack_numbers())
+                dead += shard.dead_bytes()
+                live += shard.pack_bytes - shard.dead_bytes()
+                fsyncs += shard.fsyncs
+        return {
+            "artifacts": artifacts,
+            "packs": packs,
+            "liveBytes": live,
+            "deadBytes": dead,
+            "fsyncs": fsyncs,
+        }
+
+    def close(self) -> None:
+        for shard in self._shards:
+            shard.close()
+
+    def __enter__(self) -> PackfileCIDArtifactStore:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
 
 class IPFSArtifactStore:
     """Adapter for an IPFS-like client exposing ``add_bytes`` and ``cat``."""
@@ -76,8 +492,6 @@ class IPFSArtifactStore:
         return expected
 
     def get(self, cid: str) -> dict[str, Any] | None:
-        import json
-
         try:
             raw = self.client.cat(cid)
         except (KeyError, FileNotFoundError):
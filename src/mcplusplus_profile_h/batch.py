@@ -10,7 +10,7 @@ from __future__ import annotations
 
 import json
 import threading
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -19,7 +19,7 @@ import duckdb
 
 from .canonical import canonical_json, cid_for
 from .errors import ProfileHError
-from .metering import ArtifactSigner, _canonical_uint
+from .metering import ArtifactSigner, SignatureVerifier, _canonical_uint
 
 BATCH_DISABLED = "H_BATCH_SETTLEMENT_DISABLED"
 BATCH_INVALID = "H_BATCH_INVALID"
@@ -141,8 +141,11 @@ class VoucherStatus:
 class DuckDBVoucherLedger:
     """Transactional test ledger for deposits, vouchers, redemption, and recovery."""
 
-    def __init__(self, path: str | Path = ":memory:") -> None:
+    def __init__(
+        self, path: str | Path = ":memory:", *, verifier: SignatureVerifier | None = None
+    ) -> None:
         self.path = str(path)
+        self.verifier = verifier
         if self.path != ":memory:":
             Path(self.path).parent.mkdir(parents=True, exist_ok=True)
         self.connection = duckdb.connect(self.path)
@@ -281,12 +284,64 @@ class DuckDBVoucherLedger:
     ) -> dict[str, Any]:
         if outcome not in {"confirmed", "failed", "unknown"}:
             raise ValueError("outcome must be confirmed, failed, or unknown")
-        value = dict(voucher)
-        voucher_id = str(value.pop("voucherId", cid_for(value)))
+        voucher_id, value = _voucher_body(voucher)
         if voucher_id != cid_for(value) or not ArtifactSigner.verify(
-            value, expected_public_key=expected_buyer_public_key
+            value, expected_public_key=expected_buyer_public_key, verifier=self.verifier
         ):
             raise ProfileHError(BATCH_INVALID, "voucher signature or CID is invalid")
+        return self._redeem_verified(
+            voucher_id,
+            value,
+            seller_did=seller_did,
+            now_ms=now_ms,
+            outcome=outcome,
+            outcome_reference=outcome_reference,
+        )
+
+    def redeem_many(
+        self,
+        vouchers: Sequence[Mapping[str, Any]],
+        *,
+        seller_did: str,
+        now_ms: int,
+        expected_buyer_public_key: str,
+    ) -> list[dict[str, Any]]:
+        """Redeem a seller's queued vouchers as confirmed, verifying them in one batch.
+
+        Results keep the order of ``vouchers``.  A voucher that cannot be
+        redeemed gets ``state: "rejected"`` and the error instead of failing
+        the rest of the batch.
+        """
+        bodies = [_voucher_body(voucher) for voucher in vouchers]
+        valid = ArtifactSigner.verify_many(
+            (value for _, value in bodies),
+            expected_public_key=expected_buyer_public_key,
+            verifier=self.verifier,
+        )
+        results: list[dict[str, Any]] = []
+        for (voucher_id, value), signed in zip(bodies, valid, strict=True):
+            try:
+                if voucher_id != cid_for(value) or not signed:
+                    raise ProfileHError(BATCH_INVALID, "voucher signature or CID is invalid")
+                results.append(
+                    self._redeem_verified(voucher_id, value, seller_did=seller_did, now_ms=now_ms)
+                )
+            except ProfileHError as exc:
+                results.append(
+                    {"voucherId": voucher_id, "state": "rejected", "error": exc.as_dict()}
+                )
+        return results
+
+    def _redeem_verified(
+        self,
+        voucher_id: str,
+        value: Mapping[str, Any],
+        *,
+        seller_did: str,
+        now_ms: int,
+        outcome: str = "confirmed",
+        outcome_reference: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any]:
         if value.get("sellerDid") != seller_did:
             raise ProfileHError(BATCH_INVALID, "voucher belongs to another seller")
         with self._lock:
@@ -512,6 +567,12 @@ class DuckDBVoucherLedger:
         self.connection.close()
 
 
+def _voucher_body(voucher: Mapping[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Split a voucher into its claimed ID and the signed body the ID must address."""
+    value = dict(voucher)
+    return str(value.pop("voucherId", cid_for(value))), value
+
+
 def evaluate_batch_enablement(evidence: Mapping[str, Any]) -> dict[str, Any]:
     """Return a fail-closed rollout decision from independently supplied evidence."""
     controls = {name: evidence.get(name) is True for name in REQUIRED_ENABLEMENT_CONTROLS}
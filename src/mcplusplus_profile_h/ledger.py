@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import os
+import queue
 import shutil
 import tempfile
 import threading
 import time
+from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -47,7 +52,9 @@ class DuckDBPaymentLedger:
     DuckDB is the derived query index. Immutable receipt/artifact CIDs remain
     the provenance records. A process-local lock serializes transitions on one
     ledger instance; database uniqueness constraints provide replay fencing
-    between instances and after restart.
+    between instances and after restart. Public reads run on a per-thread
+    cursor without that lock, so they never wait on a transition or an
+    :class:`AsyncPaymentLedger` group commit and only see committed state.
     """
 
     def __init__(self, path: str | Path = ":memory:", *, connection: Any | None = None) -> None:
@@ -57,7 +64,16 @@ class DuckDBPaymentLedger:
         self._owns_connection = connection is None
         self.connection = connection or duckdb.connect(self.path)
         self._lock = threading.RLock()
+        # Set while AsyncPaymentLedger commits a group of writes as one
+        # transaction; individual writes then join it instead of committing.
+        self._group_active = False
         self._initialize()
+        # Reader cursors are opened from a cursor the writer never uses, so
+        # opening one doesn't touch the writer's connection or lock.
+        self._reader_root = self.connection.cursor()
+        self._readers = threading.local()
+        self._reader_cursors: list[Any] = []
+        self._readers_lock = threading.Lock()
 
     def _initialize(self) -> None:
         with self._lock:
@@ -98,6 +114,19 @@ class DuckDBPaymentLedger:
                 "CREATE SEQUENCE IF NOT EXISTS profile_h_transition_sequence START 1"
             )
 
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        if self._group_active:
+            yield
+            return
+        self.connection.execute("BEGIN TRANSACTION")
+        try:
+            yield
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
     @staticmethod
     def _now() -> int:
         return time.time_ns() // 1_000_000
@@ -106,34 +135,40 @@ class DuckDBPaymentLedger:
     def _entry(row: tuple[Any, ...] | None) -> LedgerEntry | None:
         return LedgerEntry(*row) if row else None
 
+    def _read(self, query: str, params: list[Any] | None = None) -> Any:
+        """Run a read-only query on this thread's cursor, outside the writer lock."""
+        cursor = getattr(self._readers, "cursor", None)
+        if cursor is None:
+            with self._readers_lock:
+                cursor = self._reader_root.cursor()
+                self._reader_cursors.append(cursor)
+            self._readers.cursor = cursor
+        return cursor.execute(query, params or [])
+
     def get(self, idempotency_key: str) -> LedgerEntry | None:
+        return self._entry(self._read(_SELECT_ENTRY, [idempotency_key]).fetchone())
+
+    def _current(self, idempotency_key: str) -> LedgerEntry | None:
+        # Transitions read on the writer connection, inside their transaction.
         with self._lock:
-            row = self.connection.execute(
-                """SELECT idempotency_key, request_cid, operation_key, capability_cid,
-                          state, quote_cid, payment_commitment, verification_cid,
-                          settlement_cid, result_cid, error_code, lease_token,
-                          created_at_ms, updated_at_ms
-                   FROM profile_h_payments WHERE idempotency_key = ?""",
-                [idempotency_key],
-            ).fetchone()
+            row = self.connection.execute(_SELECT_ENTRY, [idempotency_key]).fetchone()
             return self._entry(row)
 
     def get_by_artifact(self, artifact_cid: str) -> LedgerEntry | None:
         """Resolve a public payment artifact without exposing arbitrary blocks."""
         if not artifact_cid:
             return None
-        with self._lock:
-            row = self.connection.execute(
-                """SELECT idempotency_key, request_cid, operation_key, capability_cid,
-                          state, quote_cid, payment_commitment, verification_cid,
-                          settlement_cid, result_cid, error_code, lease_token,
-                          created_at_ms, updated_at_ms
-                   FROM profile_h_payments
-                   WHERE quote_cid = ? OR verification_cid = ? OR settlement_cid = ? OR result_cid = ?
-                   ORDER BY updated_at_ms DESC LIMIT 1""",
-                [artifact_cid, artifact_cid, artifact_cid, artifact_cid],
-            ).fetchone()
-            return self._entry(row)
+        row = self._read(
+            """SELECT idempotency_key, request_cid, operation_key, capability_cid,
+                      state, quote_cid, payment_commitment, verification_cid,
+                      settlement_cid, result_cid, error_code, lease_token,
+                      created_at_ms, updated_at_ms
+               FROM profile_h_payments
+               WHERE quote_cid = ? OR verification_cid = ? OR settlement_cid = ? OR result_cid = ?
+               ORDER BY updated_at_ms DESC LIMIT 1""",
+            [artifact_cid, artifact_cid, artifact_cid, artifact_cid],
+        ).fetchone()
+        return self._entry(row)
 
     def create_quote(
         self,
@@ -146,7 +181,7 @@ class DuckDBPaymentLedger:
         if not all((idempotency_key, request_cid, operation_key, capability_cid, quote_cid)):
             raise ValueError("ledger identity and quote fields must be non-empty")
         with self._lock:
-            existing = self.get(idempotency_key)
+            existing = self._current(idempotency_key)
             if existing:
                 if (existing.request_cid, existing.operation_key, existing.capability_cid) != (
                     request_cid,
@@ -159,28 +194,29 @@ class DuckDBPaymentLedger:
                 return existing
             now = self._now()
             try:
-                self.connection.execute("BEGIN TRANSACTION")
-                self.connection.execute(
-                    """INSERT INTO profile_h_payments
-                       (idempotency_key, request_cid, operation_key, capability_cid,
-                        state, quote_cid, created_at_ms, updated_at_ms)
-                       VALUES (?, ?, ?, ?, 'quoted', ?, ?, ?)""",
-                    [
-                        idempotency_key,
-                        request_cid,
-                        operation_key,
-                        capability_cid,
-                        quote_cid,
-                        now,
-                        now,
-                    ],
-                )
-                self._transition_row(idempotency_key, None, "quoted", quote_cid, None, now)
-                self.connection.execute("COMMIT")
+                with self._transaction():
+                    self.connection.execute(
+                        """INSERT INTO profile_h_payments
+                           (idempotency_key, request_cid, operation_key, capability_cid,
+                            state, quote_cid, created_at_ms, updated_at_ms)
+                           VALUES (?, ?, ?, ?, 'quoted', ?, ?, ?)""",
+                        [
+                            idempotency_key,
+                            request_cid,
+                            operation_key,
+                            capability_cid,
+                            quote_cid,
+                            now,
+                            now,
+                        ],
+                    )
+                    self._transition_row(idempotency_key, None, "quoted", quote_cid, None, now)
             except Exception:
-                self.connection.execute("ROLLBACK")
+                if self._group_active:
+                    # The group is rolled back and this write retried alone.
+                    raise
                 # A competing connection may have won the uniqueness race.
-                existing = self.get(idempotency_key)
+                existing = self._current(idempotency_key)
                 if existing and (
                     existing.request_cid,
                     existing.operation_key,
@@ -188,7 +224,7 @@ class DuckDBPaymentLedger:
                 ) == (request_cid, operation_key, capability_cid):
                     return existing
                 raise
-            result = self.get(idempotency_key)
+            result = self._current(idempotency_key)
             assert result is not None
             return result
 
@@ -286,38 +322,35 @@ class DuckDBPaymentLedger:
 
     def paid_evidence(self, request_cid: str, capability_cid: str) -> str | None:
         """Return settled evidence for the exact request and capability."""
-        with self._lock:
-            row = self.connection.execute(
-                """SELECT settlement_cid FROM profile_h_payments
-                   WHERE request_cid = ? AND capability_cid = ?
-                     AND state IN ('settled', 'executing', 'executed')
-                   ORDER BY updated_at_ms DESC LIMIT 1""",
-                [request_cid, capability_cid],
-            ).fetchone()
-            return row[0] if row else None
+        row = self._read(
+            """SELECT settlement_cid FROM profile_h_payments
+               WHERE request_cid = ? AND capability_cid = ?
+                 AND state IN ('settled', 'executing', 'executed')
+               ORDER BY updated_at_ms DESC LIMIT 1""",
+            [request_cid, capability_cid],
+        ).fetchone()
+        return row[0] if row else None
 
     def pending_reconciliation(self, *, stale_before_ms: int | None = None) -> list[LedgerEntry]:
-        with self._lock:
-            query = """SELECT idempotency_key, request_cid, operation_key, capability_cid,
-                              state, quote_cid, payment_commitment, verification_cid,
-                              settlement_cid, result_cid, error_code, lease_token,
-                              created_at_ms, updated_at_ms
-                       FROM profile_h_payments
-                       WHERE state IN ('verified','settling','settled','executing','reconciliation_required')"""
-            params: list[Any] = []
-            if stale_before_ms is not None:
-                query += " AND updated_at_ms <= ?"
-                params.append(stale_before_ms)
-            query += " ORDER BY updated_at_ms, idempotency_key"
-            return [self._entry(row) for row in self.connection.execute(query, params).fetchall()]  # type: ignore[misc]
+        query = """SELECT idempotency_key, request_cid, operation_key, capability_cid,
+                          state, quote_cid, payment_commitment, verification_cid,
+                          settlement_cid, result_cid, error_code, lease_token,
+                          created_at_ms, updated_at_ms
+                   FROM profile_h_payments
+                   WHERE state IN ('verified','settling','settled','executing','reconciliation_required')"""
+        params: list[Any] = []
+        if stale_before_ms is not None:
+            query += " AND updated_at_ms <= ?"
+            params.append(stale_before_ms)
+        query += " ORDER BY updated_at_ms, idempotency_key"
+        return [self._entry(row) for row in self._read(query, params).fetchall()]  # type: ignore[misc]
 
     def history(self, idempotency_key: str) -> list[dict[str, Any]]:
-        with self._lock:
-            rows = self.connection.execute(
-                """SELECT sequence, from_state, to_state, artifact_cid, reason_code, occurred_at_ms
-                   FROM profile_h_transitions WHERE idempotency_key = ? ORDER BY sequence""",
-                [idempotency_key],
-            ).fetchall()
+        rows = self._read(
+            """SELECT sequence, from_state, to_state, artifact_cid, reason_code, occurred_at_ms
+               FROM profile_h_transitions WHERE idempotency_key = ? ORDER BY sequence""",
+            [idempotency_key],
+        ).fetchall()
         return [
             {
                 "sequence": row[0],
@@ -331,10 +364,9 @@ class DuckDBPaymentLedger:
         ]
 
     def diagnostics(self) -> dict[str, Any]:
-        with self._lock:
-            rows = self.connection.execute(
-                "SELECT state, count(*) FROM profile_h_payments GROUP BY state ORDER BY state"
-            ).fetchall()
+        rows = self._read(
+            "SELECT state, count(*) FROM profile_h_payments GROUP BY state ORDER BY state"
+        ).fetchall()
         return redact(
             {
                 "ready": True,
@@ -447,7 +479,7 @@ class DuckDBPaymentLedger:
             temporary.unlink(missing_ok=True)
 
     def _require(self, idempotency_key: str) -> LedgerEntry:
-        entry = self.get(idempotency_key)
+        entry = self._current(idempotency_key)
         if entry is None:
             raise KeyError(idempotency_key)
         return entry
@@ -486,8 +518,7 @@ class DuckDBPaymentLedger:
                 assignments.append(f"{name} = ?")
                 params.append(value)
             params.extend([idempotency_key, entry.state])
-            try:
-                self.connection.execute("BEGIN TRANSACTION")
+            with self._transaction():
                 self.connection.execute(
                     f"UPDATE profile_h_payments SET {', '.join(assignments)} WHERE idempotency_key = ? AND state = ?",
                     params,
@@ -501,10 +532,6 @@ class DuckDBPaymentLedger:
                 self._transition_row(
                     idempotency_key, entry.state, target, artifact_cid, reason_code, now
                 )
-                self.connection.execute("COMMIT")
-            except Exception:
-                self.connection.execute("ROLLBACK")
-                raise
             return self._require(idempotency_key)
 
     def _transition_row(
@@ -517,8 +544,13 @@ class DuckDBPaymentLedger:
         )
 
     def close(self) -> None:
-        if self._owns_connection:
-            with self._lock:
+        with self._readers_lock:
+            for cursor in [*self._reader_cursors, self._reader_root]:
+                with suppress(duckdb.Error):
+                    cursor.close()
+            self._reader_cursors.clear()
+        with self._lock:
+            if self._owns_connection:
                 self.connection.close()
 
     def __enter__(self) -> DuckDBPaymentLedger:
@@ -526,3 +558,173 @@ class DuckDBPaymentLedger:
 
     def __exit__(self, *_: object) -> None:
         self.close()
+
+
+_SELECT_ENTRY = """SELECT idempotency_key, request_cid, operation_key, capability_cid,
+                          state, quote_cid, payment_commitment, verification_cid,
+                          settlement_cid, result_cid, error_code, lease_token,
+                          created_at_ms, updated_at_ms
+                   FROM profile_h_payments WHERE idempotency_key = ?"""
+
+_WRITE_METHODS = frozenset(
+    {
+        "create_quote",
+        "bind_payment",
+        "mark_verified",
+        "begin_settlement",
+        "mark_settled",
+        "claim_execution",
+        "mark_executed",
+        "mark_failed",
+        "reset_for_reconciliation",
+    }
+)
+
+
+@dataclass(slots=True)
+class _QueuedWrite:
+    method: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    future: Future[LedgerEntry]
+
+
+class AsyncPaymentLedger:
+    """Group-commit front-end that moves ledger writes off the event loop.
+
+    Writes are queued to one writer thread, which applies them in submission
+    order and commits up to ``max_group`` of them per transaction, waiting at
+    most ``max_delay_ms`` for a group to fill. Each write still runs the
+    ledger's own state checks, so idempotency and replay fencing are
+    unchanged. If any write in a group fails, the group is rolled back and
+    its writes are retried one transaction each, so a failure only reaches
+    its own caller. Reads go straight to :attr:`ledger`.
+    """
+
+    def __init__(
+        self,
+        ledger: DuckDBPaymentLedger,
+        *,
+        max_group: int = 64,
+        max_delay_ms: float = 2.0,
+    ) -> None:
+        if max_group < 1:
+            raise ValueError("max_group must be positive")
+        self.ledger = ledger
+        self.max_group = max_group
+        self.max_delay_ms = max(0.0, max_delay_ms)
+        self._queue: queue.SimpleQueue[_QueuedWrite | None] = queue.SimpleQueue()
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._stats = {"writes": 0, "groups": 0, "fallbacks": 0}
+        self._thread = threading.Thread(
+            target=self._run, name="profile-h-ledger-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, method: str, *args: Any, **kwargs: Any) -> Future[LedgerEntry]:
+        """Queue a ledger write and return a future for the resulting entry."""
+        if method not in _WRITE_METHODS:
+            raise ValueError(f"unsupported ledger write: {method}")
+        future: Future[LedgerEntry] = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("ledger writer is closed")
+            self._queue.put(_QueuedWrite(method, args, kwargs, future))
+        return future
+
+    async def write(self, method: str, *args: Any, **kwargs: Any) -> LedgerEntry:
+        """Queue a ledger write and await its commit."""
+        return await asyncio.wrap_future(self.submit(method, *args, **kwargs))
+
+    def stats(self) -> dict[str, int]:
+        return dict(self._stats)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            group = [first]
+            deadline = time.monotonic() + self.max_delay_ms / 1000
+            while len(group) < self.max_group:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                group.append(item)
+            try:
+                self._commit_group(group)
+            except Exception as exc:
+                # Keep the writer alive; the group's unresolved callers get the error.
+                self._fail_group(group, exc)
+
+    def _apply(self, write: _QueuedWrite) -> LedgerEntry:
+        return getattr(self.ledger, write.method)(*write.args, **write.kwargs)
+
+    def _commit_group(self, group: list[_QueuedWrite]) -> None:
+        ledger = self.ledger
+        results: list[LedgerEntry] = []
+        with ledger._lock:
+            if len(group) > 1:
+                ledger.connection.execute("BEGIN TRANSACTION")
+                ledger._group_active = True
+                try:
+                    for write in group:
+                        results.append(self._apply(write))
+                except Exception:
+                    results = []
+                finally:
+                    ledger._group_active = False
+                try:
+                    if results:
+                        ledger.connection.execute("COMMIT")
+                    else:
+                        ledger.connection.execute("ROLLBACK")
+                except duckdb.Error:
+                    results = []
+                    # A failed COMMIT may already have ended the transaction.
+                    with suppress(duckdb.Error):
+                        ledger.connection.execute("ROLLBACK")
+                if not results:
+                    self._stats["fallbacks"] += 1
+            if not results:
+                # Single writes, or a group that failed: one transaction each.
+                for write in group:
+                    try:
+                        write.future.set_result(self._apply(write))
+                    except Exception as exc:
+                        write.future.set_exception(exc)
+            self._stats["writes"] += len(group)
+            self._stats["groups"] += 1
+        for write, result in zip(group, results, strict=False):
+            write.future.set_result(result)
+
+    def _fail_group(self, group: list[_QueuedWrite], exc: Exception) -> None:
+        ledger = self.ledger
+        with ledger._lock:
+            ledger._group_active = False
+            with suppress(duckdb.Error):
+                ledger.connection.execute("ROLLBACK")
+        for write in group:
+            if not write.future.done():
+                write.future.set_exception(exc)
+
+    def close(self) -> None:
+        """Commit queued writes, stop the writer, and close the ledger."""
+        with self._submit_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+        self.ledger.close()
+
+    def __enter__(self) -> AsyncPaymentLedger:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
@@ -9,11 +9,13 @@ records commit to protected inputs/outputs and are signed by the seller.
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import os
 import threading
 import time
-from collections.abc import Mapping
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
 from types import MappingProxyType
@@ -148,6 +150,84 @@ class MeterDefinition:
         return cid_for(self.wire())
 
 
+class SignatureVerifier:
+    """Ed25519 verification with a bounded cache of verified signatures.
+
+    The cache is keyed by the raw public key, the SHA-256 of the exact signed
+    message, and the raw signature, so any change to the message, key, or
+    signature misses and is verified from scratch. Only successful
+    verifications are cached, least recently used first out.
+    """
+
+    def __init__(self, *, max_entries: int = 4096) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must not be negative")
+        self.max_entries = max_entries
+        self._verified: OrderedDict[tuple[bytes, bytes, bytes], None] = OrderedDict()
+        self._public_keys: dict[bytes, Ed25519PublicKey] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "verified": 0, "rejected": 0}
+
+    def verify(self, public_key: bytes, signature: bytes, message: bytes) -> bool:
+        return self.verify_many([(public_key, signature, message)])[0]
+
+    def verify_many(self, items: Iterable[tuple[bytes, bytes, bytes]]) -> list[bool]:
+        """Verify ``(public_key, signature, message)`` triples that arrived together.
+
+        Cached triples are answered under one lock acquisition, and a triple
+        repeated within the batch is verified only once.
+        """
+        queued = [
+            ((public_key, hashlib.sha256(message).digest(), signature), message)
+            for public_key, signature, message in items
+        ]
+        results: list[bool] = [False] * len(queued)
+        pending: dict[tuple[bytes, bytes, bytes], list[int]] = {}
+        with self._lock:
+            for index, (key, _) in enumerate(queued):
+                if key in self._verified:
+                    self._verified.move_to_end(key)
+                    self._stats["hits"] += 1
+                    results[index] = True
+                else:
+                    pending.setdefault(key, []).append(index)
+        valid_keys = []
+        for key, indexes in pending.items():
+            if self._check(key[0], key[2], queued[indexes[0]][1]):
+                valid_keys.append(key)
+                for index in indexes:
+                    results[index] = True
+        with self._lock:
+            self._stats["verified"] += len(valid_keys)
+            self._stats["rejected"] += len(pending) - len(valid_keys)
+            if self.max_entries:
+                for key in valid_keys:
+                    self._verified[key] = None
+                while len(self._verified) > self.max_entries:
+                    self._verified.popitem(last=False)
+        return results
+
+    def _check(self, public_key: bytes, signature: bytes, message: bytes) -> bool:
+        try:
+            parsed = self._public_keys.get(public_key)
+            if parsed is None:
+                parsed = Ed25519PublicKey.from_public_bytes(public_key)
+                if len(self._public_keys) >= 256:
+                    self._public_keys.clear()
+                self._public_keys[public_key] = parsed
+            parsed.verify(signature, message)
+            return True
+        except (ValueError, InvalidSignature):
+            return False
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._stats, "cached": len(self._verified)}
+
+
+_DEFAULT_VERIFIER = SignatureVerifier()
+
+
 class ArtifactSigner:
     """Ed25519 signer for public artifacts; private key material is never exposed."""
 
@@ -209,7 +289,9 @@ class ArtifactSigner:
         }
 
     @staticmethod
-    def verify(artifact: Mapping[str, Any], *, expected_public_key: str | None = None) -> bool:
+    def _signed_parts(
+        artifact: Mapping[str, Any], expected_public_key: str | None
+    ) -> tuple[bytes, bytes, bytes] | None:
         try:
             unsigned = dict(artifact)
             signature = base64.b64decode(str(unsigned.pop("signature")), validate=True)
@@ -217,12 +299,36 @@ class ArtifactSigner:
             if unsigned.get("signatureAlg") != "Ed25519" or (
                 expected_public_key and public_text != expected_public_key
             ):
-                return False
+                return None
             public = base64.b64decode(public_text, validate=True)
-            Ed25519PublicKey.from_public_bytes(public).verify(signature, canonical_json(unsigned))
-            return True
-        except (KeyError, ValueError, TypeError, InvalidSignature):
-            return False
+            return public, signature, canonical_json(unsigned)
+        except (KeyError, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def verify(
+        artifact: Mapping[str, Any],
+        *,
+        expected_public_key: str | None = None,
+        verifier: SignatureVerifier | None = None,
+    ) -> bool:
+        return ArtifactSigner.verify_many(
+            [artifact], expected_public_key=expected_public_key, verifier=verifier
+        )[0]
+
+    @staticmethod
+    def verify_many(
+        artifacts: Iterable[Mapping[str, Any]],
+        *,
+        expected_public_key: str | None = None,
+        verifier: SignatureVerifier | None = None,
+    ) -> list[bool]:
+        """Verify several signed artifacts in one verifier batch."""
+        parts = [ArtifactSigner._signed_parts(item, expected_public_key) for item in artifacts]
+        checked = iter(
+            (verifier or _DEFAULT_VERIFIER).verify_many(item for item in parts if item is not None)
+        )
+        return [item is not None and next(checked) for item in parts]
 
 
 @dataclass(frozen=True, slots=True)
@@ -461,8 +567,11 @@ class EntitlementStatus:
 class DuckDBEntitlementLedger:
     """Transactional quota consumption indexed by immutable usage CIDs."""
 
-    def __init__(self, path: str | Path = ":memory:") -> None:
+    def __init__(
+        self, path: str | Path = ":memory:", *, verifier: SignatureVerifier | None = None
+    ) -> None:
         self.path = str(path)
+        self.verifier = verifier
         if self.path != ":memory:":
             Path(self.path).parent.mkdir(parents=True, exist_ok=True)
         self.connection = duckdb.connect(self.path)
@@ -488,7 +597,9 @@ class DuckDBEntitlementLedger:
         if not expected_authorization_public_key:
             raise ProfileHError(METER_INVALID, "no trusted buyer authorization key is configured")
         if not ArtifactSigner.verify(
-            authorization, expected_public_key=expected_authorization_public_key
+            authorization,
+            expected_public_key=expected_authorization_public_key,
+            verifier=self.verifier,
         ):
             raise ProfileHError(
                 METER_INVALID, "cannot issue entitlement from invalid authorization"
@@ -539,7 +650,9 @@ class DuckDBEntitlementLedger:
         now = now_ms if now_ms is not None else time.time_ns() // 1_000_000
         record = dict(usage.record if isinstance(usage, UsageResult) else usage)
         usage_cid = usage.usage_cid if isinstance(usage, UsageResult) else cid_for(record)
-        if not ArtifactSigner.verify(record, expected_public_key=expected_seller_public_key):
+        if not ArtifactSigner.verify(
+            record, expected_public_key=expected_seller_public_key, verifier=self.verifier
+        ):
             raise ProfileHError(USAGE_DISPUTED, "usage record signature is invalid")
         units = _canonical_uint(record.get("billedUnits"), "billed units")
         amount = _canonical_uint(record.get("actualCharge"), "actual charge")
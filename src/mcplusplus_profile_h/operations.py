@@ -17,9 +17,10 @@ import tempfile
 import threading
 import time
 from collections import Counter, defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from .canonical import canonical_json, cid_for
@@ -38,6 +39,8 @@ STAGES = frozenset(
     }
 )
 OUTCOMES = frozenset({"success", "failure", "denied", "timeout", "paused", "pending"})
+CACHES = frozenset({"artifact"})
+CACHE_OUTCOMES = frozenset({"hit", "miss", "invalidated", "evicted"})
 _SAFE_VALUE = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9_.:-]{0,63}$")
 _SAFE_REASON = re.compile(r"^H_[A-Z0-9_]{1,61}$")
 
@@ -52,6 +55,7 @@ class RedactedMetrics:
         self._sellers = configured
         self._events: Counter[tuple[str, str, str, str]] = Counter()
         self._duration_ms: dict[tuple[str, str, str], list[int]] = defaultdict(list)
+        self._cache: Counter[tuple[str, str]] = Counter()
         self._lock = threading.RLock()
 
     def observe(
@@ -81,6 +85,13 @@ class RedactedMetrics:
             if len(samples) > 1024:
                 del samples[:-1024]
 
+    def observe_cache(self, cache: str, outcome: str) -> None:
+        """Count a read-cache lookup; caches are process-wide, not per seller."""
+        if cache not in CACHES or outcome not in CACHE_OUTCOMES:
+            raise ValueError("unbounded Profile H cache metric dimension")
+        with self._lock:
+            self._cache[(cache, outcome)] += 1
+
     def snapshot(self) -> dict[str, Any]:
         with self._lock:
             events = [
@@ -107,10 +118,15 @@ class RedactedMetrics:
                         "p95Ms": ordered[min(len(ordered) - 1, (len(ordered) * 95) // 100)],
                     }
                 )
+            cache = [
+                {"cache": cache, "outcome": outcome, "count": count}
+                for (cache, outcome), count in sorted(self._cache.items())
+            ]
         return {
             "schema": "mcp++/profile-h/redacted-metrics@1.0",
             "events": events,
             "latency": latency,
+            "cache": cache,
         }
 
     def prometheus(self) -> str:
@@ -137,18 +153,77 @@ class RedactedMetrics:
             )
             lines.append(f"mcplusplus_profile_h_stage_latency_ms_sum{{{labels}}} {item['sumMs']}")
             lines.append(f"mcplusplus_profile_h_stage_latency_ms_count{{{labels}}} {item['count']}")
+        lines.extend(
+            [
+                "# HELP mcplusplus_profile_h_cache_total Profile H read-cache lookups by outcome.",
+                "# TYPE mcplusplus_profile_h_cache_total counter",
+            ]
+        )
+        for item in snapshot["cache"]:
+            labels = f'cache="{item["cache"]}",outcome="{item["outcome"]}"'
+            lines.append(f"mcplusplus_profile_h_cache_total{{{labels}}} {item['count']}")
         return "\n".join(lines) + "\n"
 
 
-class KillSwitches:
-    """Durable global/per-seller pause controls; recovery is never disabled."""
+@dataclass(frozen=True, slots=True)
+class KillSwitchState:
+    """Immutable view of one generation of the kill-switch file."""
+
+    generation: int
+    global_paused: bool
+    sellers: Mapping[str, bool]
+    reason_code: str
+    updated_at: int
+
+    @classmethod
+    def from_document(cls, value: dict[str, Any]) -> KillSwitchState:
+        return cls(
+            generation=int(value["generation"]),
+            global_paused=bool(value["globalPaused"]),
+            sellers=MappingProxyType({key: bool(item) for key, item in value["sellers"].items()}),
+            reason_code=str(value["reasonCode"]),
+            updated_at=int(value["updatedAt"]),
+        )
 
-    def __init__(self, path: str | Path, *, sellers: Iterable[str]) -> None:
+    def allows_new_work(self, seller: str) -> bool:
+        return not self.global_paused and not self.sellers[seller]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "schema": "mcp++/profile-h/kill-switches@1.0",
+            "generation": self.generation,
+            "globalPaused": self.global_paused,
+            "sellers": dict(self.sellers),
+            "reasonCode": self.reason_code,
+            "updatedAt": self.updated_at,
+        }
+
+
+class KillSwitches:
+    """Durable global/per-seller pause controls; recovery is never disabled.
+
+    The parsed file is published as an immutable :class:`KillSwitchState`
+    and reloaded only when the file's inode, size or mtime changes, so the
+    per-request check is a single ``stat``. With ``max_staleness_ms`` the
+    stat itself is skipped for that long after the last check; changes made
+    through this instance are always visible immediately. An unreadable or
+    invalid file still fails closed: the cached state is dropped and every
+    check raises until the file is valid again.
+    """
+
+    def __init__(
+        self, path: str | Path, *, sellers: Iterable[str], max_staleness_ms: int = 0
+    ) -> None:
+        if max_staleness_ms < 0:
+            raise ValueError("max_staleness_ms must not be negative")
         self.path = Path(path)
+        self.max_staleness_ns = max_staleness_ms * 1_000_000
         self.sellers = frozenset(sellers)
         if not self.sellers or any(not _SAFE_VALUE.fullmatch(item) for item in self.sellers):
             raise ValueError("invalid seller set")
         self._lock = threading.RLock()
+        self._current: tuple[tuple[int, int, int], KillSwitchState] | None = None
+        self._checked_at = 0
         if not self.path.exists():
             self._write(
                 {
@@ -160,15 +235,20 @@ class KillSwitches:
                     "updatedAt": 0,
                 }
             )
-        self._read()
+        self.snapshot()
 
     def _read(self) -> dict[str, Any]:
-        value = json.loads(self.path.read_text(encoding="utf-8"))
+        return self._load()[1]
+
+    def _load(self) -> tuple[tuple[int, int, int], dict[str, Any]]:
+        with self.path.open("rb") as stream:
+            status = os.fstat(stream.fileno())
+            value = json.loads(stream.read().decode("utf-8"))
         if value.get("schema") != "mcp++/profile-h/kill-switches@1.0":
             raise OSError("invalid kill-switch state")
         if set(value.get("sellers", {})) != self.sellers:
             raise OSError("kill-switch seller set does not match configuration")
-        return value
+        return (status.st_ino, status.st_size, status.st_mtime_ns), value
 
     def _write(self, value: dict[str, Any]) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
@@ -183,6 +263,38 @@ class KillSwitches:
             if os.path.exists(name):
                 os.unlink(name)
 
+    def snapshot(self) -> KillSwitchState:
+        """Return the current state, reloading the file only if it changed."""
+        current = self._current
+        if current is not None and self.max_staleness_ns:
+            if time.monotonic_ns() - self._checked_at < self.max_staleness_ns:
+                return current[1]
+        return self._refresh()
+
+    def _refresh(self) -> KillSwitchState:
+        current = self._current
+        self._checked_at = time.monotonic_ns()
+        try:
+            status = os.stat(self.path)
+        except OSError:
+            self._current = None
+            raise
+        if current is not None and current[0] == (
+            status.st_ino,
+            status.st_size,
+            status.st_mtime_ns,
+        ):
+            return current[1]
+        with self._lock:
+            try:
+                stamp, value = self._load()
+                state = KillSwitchState.from_document(value)
+            except (OSError, ValueError, KeyError, TypeError):
+                self._current = None
+                raise
+            self._current = (stamp, state)
+            return state
+
     def set_pause(
         self, *, paused: bool, seller: str | None = None, reason_code: str = "H_OPERATOR_PAUSE"
     ) -> dict[str, Any]:
@@ -200,20 +312,20 @@ class KillSwitches:
             state["reasonCode"] = reason_code
             state["updatedAt"] = time.time_ns() // 1_000_000
             self._write(state)
+            self._refresh()
             return state
 
     def allows_new_work(self, seller: str) -> bool:
         if seller not in self.sellers:
             raise KeyError(seller)
-        state = self._read()
-        return not state["globalPaused"] and not state["sellers"][seller]
+        return self.snapshot().allows_new_work(seller)
 
     @staticmethod
     def allows_recovery() -> bool:
         return True
 
     def status(self) -> dict[str, Any]:
-        return self._read()
+        return self.snapshot().as_dict()
 
 
 async def facilitator_health_probe(facilitator: Any, *, timeout_ms: int = 2_000) -> dict[str, Any]:
@@ -67,7 +67,7 @@ def run_operations_gate(*, state_dir: Path | None = None) -> dict[str, Any]:
             raise AssertionError("metric label accepted request-controlled data")
 
         artifact_root = state_dir / "artifacts"
-        artifacts = FileCIDArtifactStore(artifact_root)
+        artifacts = FileCIDArtifactStore(artifact_root, metrics=metrics)
         ledger_path = state_dir / "ledger.duckdb"
         ledger = DuckDBPaymentLedger(ledger_path)
         quote = artifacts.put({"schema": "mcp++/profile-h/ops-fixture@1.0", "kind": "quote"})
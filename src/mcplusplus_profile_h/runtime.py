@@ -31,7 +31,7 @@ from .errors import (
     VERIFICATION_FAILED,
     ProfileHError,
 )
-from .ledger import DuckDBPaymentLedger, LedgerEntry
+from .ledger import AsyncPaymentLedger, DuckDBPaymentLedger, LedgerEntry
 from .operations import KillSwitches, RedactedMetrics, facilitator_health_probe
 
 
@@ -62,7 +62,7 @@ class SellerRuntime:
     def __init__(
         self,
         policy: PaymentPolicyEngine,
-        ledger: DuckDBPaymentLedger,
+        ledger: DuckDBPaymentLedger | AsyncPaymentLedger,
         facilitator: VerifierFacilitator,
         artifacts: ArtifactStore,
         *,
@@ -77,7 +77,10 @@ class SellerRuntime:
         if not 1_000 <= quote_lifetime_ms <= 300_000:
             raise ValueError("quote_lifetime_ms must be in [1000, 300000]")
         self.policy = policy
-        self.ledger = ledger
+        # With an AsyncPaymentLedger, writes are group-committed on its writer
+        # thread; reads always use the underlying DuckDB ledger.
+        self.ledger_writer = ledger if isinstance(ledger, AsyncPaymentLedger) else None
+        self.ledger = ledger.ledger if isinstance(ledger, AsyncPaymentLedger) else ledger
         self.facilitator = facilitator
         self.artifacts = artifacts
         self.seller_did = seller_did
@@ -180,7 +183,8 @@ class SellerRuntime:
 
         if payment is None:
             quote, quote_cid = self._issue_quote(decision, context)
-            self.ledger.create_quote(
+            await self._ledger_write(
+                "create_quote",
                 context.idempotency_key,
                 context.request_cid,
                 decision.operation.key,
@@ -204,7 +208,7 @@ class SellerRuntime:
         requirement = capability.requirements[payment.requirement_index]
         self._validate_selected_requirement(payment.payload, requirement)
         payment_commitment = commitment(payment.payload)
-        self.ledger.bind_payment(context.idempotency_key, payment_commitment)
+        await self._ledger_write("bind_payment", context.idempotency_key, payment_commitment)
 
         current = self.ledger.get(context.idempotency_key)
         assert current is not None
@@ -215,8 +219,10 @@ class SellerRuntime:
                 self._observe(
                     "verify", "failure", verification.reason_code or VERIFICATION_FAILED, started
                 )
-                self.ledger.mark_failed(
-                    context.idempotency_key, verification.reason_code or VERIFICATION_FAILED
+                await self._ledger_write(
+                    "mark_failed",
+                    context.idempotency_key,
+                    verification.reason_code or VERIFICATION_FAILED,
                 )
                 raise ProfileHError(PAYMENT_DECLINED, "payment verification declined")
             self._observe("verify", "success", "H_PAYMENT_VERIFIED", started)
@@ -230,7 +236,9 @@ class SellerRuntime:
                 "evidenceCid": commitment(dict(verification.evidence)),
             }
             verification_cid = self.artifacts.put(verification_artifact)
-            current = self.ledger.mark_verified(context.idempotency_key, verification_cid)
+            current = await self._ledger_write(
+                "mark_verified", context.idempotency_key, verification_cid
+            )
         elif current.state != "verified":
             raise ProfileHError(
                 "H_RECONCILIATION_REQUIRED",
@@ -244,19 +252,24 @@ class SellerRuntime:
         # irreversible settlement call. Payment never substitutes for policy.
         post_verification = self.policy.evaluate(operation, context)
         if post_verification.decision in (Decision.DENIED, Decision.UNAVAILABLE):
-            self.ledger.mark_failed(context.idempotency_key, post_verification.reason_code)
+            await self._ledger_write(
+                "mark_failed", context.idempotency_key, post_verification.reason_code
+            )
             return SellerResult(post_verification)
 
         settlement_lease = secrets.token_urlsafe(24)
-        self.ledger.begin_settlement(context.idempotency_key, settlement_lease)
+        await self._ledger_write("begin_settlement", context.idempotency_key, settlement_lease)
         settlement_started = time.monotonic_ns()
         try:
             settlement = await self.facilitator.settle(payment.payload, requirement)
         except Exception:
             # Outcome is unknown after an I/O failure; reconciliation must query
             # by the non-secret payment commitment before any retry settles.
-            self.ledger.mark_failed(
-                context.idempotency_key, "H_RECONCILIATION_REQUIRED", reconciliation=True
+            await self._ledger_write(
+                "mark_failed",
+                context.idempotency_key,
+                "H_RECONCILIATION_REQUIRED",
+                reconciliation=True,
             )
             self._observe("settlement", "failure", "H_RECONCILIATION_REQUIRED", settlement_started)
             raise
@@ -267,13 +280,13 @@ class SellerRuntime:
                 settlement.reason_code or SETTLEMENT_FAILED,
                 settlement_started,
             )
-            self.ledger.mark_failed(
-                context.idempotency_key, settlement.reason_code or SETTLEMENT_FAILED
+            await self._ledger_write(
+                "mark_failed", context.idempotency_key, settlement.reason_code or SETTLEMENT_FAILED
             )
             raise ProfileHError(SETTLEMENT_FAILED, "payment settlement failed", retryable=True)
         self._observe("settlement", "success", "H_PAYMENT_SETTLED", settlement_started)
         settlement_cid = self._persist_settlement(verification_cid, requirement, settlement)
-        self.ledger.mark_settled(context.idempotency_key, settlement_cid)
+        await self._ledger_write("mark_settled", context.idempotency_key, settlement_cid)
         paid = PaymentDecision(
             Decision.PAID,
             decision.operation,
@@ -325,7 +338,8 @@ class SellerRuntime:
                 replayed=True,
             )
         quote, quote_cid = self._issue_quote(decision, context)
-        self.ledger.create_quote(
+        await self._ledger_write(
+            "create_quote",
             context.idempotency_key,
             context.request_cid,
             decision.operation.key,
@@ -365,7 +379,9 @@ class SellerRuntime:
         if entry.payment_commitment and entry.payment_commitment != payment_commitment:
             raise ProfileHError("H_PAYMENT_REPLAY", "different payment already bound to request")
         if not entry.payment_commitment:
-            entry = self.ledger.bind_payment(context.idempotency_key, payment_commitment)
+            entry = await self._ledger_write(
+                "bind_payment", context.idempotency_key, payment_commitment
+            )
         if entry.state in {"verified", "settling", "settled", "executing", "executed"}:
             paid = PaymentDecision(
                 Decision.PAID,
@@ -387,8 +403,10 @@ class SellerRuntime:
             self._observe(
                 "verify", "failure", verification.reason_code or VERIFICATION_FAILED, started
             )
-            self.ledger.mark_failed(
-                context.idempotency_key, verification.reason_code or VERIFICATION_FAILED
+            await self._ledger_write(
+                "mark_failed",
+                context.idempotency_key,
+                verification.reason_code or VERIFICATION_FAILED,
             )
             raise ProfileHError(PAYMENT_DECLINED, "payment verification declined")
         artifact = {
@@ -401,7 +419,7 @@ class SellerRuntime:
             "evidenceCid": commitment(dict(verification.evidence)),
         }
         verification_cid = self.artifacts.put(artifact)
-        self.ledger.mark_verified(context.idempotency_key, verification_cid)
+        await self._ledger_write("mark_verified", context.idempotency_key, verification_cid)
         self._observe("verify", "success", "H_PAYMENT_VERIFIED", started)
         verified = PaymentDecision(
             Decision.PAID,
@@ -424,7 +442,7 @@ class SellerRuntime:
             return verified
         decision = self.policy.evaluate(operation, context)
         if decision.decision in (Decision.DENIED, Decision.UNAVAILABLE):
-            self.ledger.mark_failed(context.idempotency_key, decision.reason_code)
+            await self._ledger_write("mark_failed", context.idempotency_key, decision.reason_code)
             return SellerResult(decision)
         capability = decision.capability
         assert capability is not None
@@ -452,19 +470,22 @@ class SellerRuntime:
             )
         requirement = capability.requirements[payment.requirement_index]
         lease = secrets.token_urlsafe(24)
-        self.ledger.begin_settlement(context.idempotency_key, lease)
+        await self._ledger_write("begin_settlement", context.idempotency_key, lease)
         started = time.monotonic_ns()
         try:
             settlement = await self.facilitator.settle(payment.payload, requirement)
         except Exception:
-            self.ledger.mark_failed(
-                context.idempotency_key, "H_RECONCILIATION_REQUIRED", reconciliation=True
+            await self._ledger_write(
+                "mark_failed",
+                context.idempotency_key,
+                "H_RECONCILIATION_REQUIRED",
+                reconciliation=True,
             )
             self._observe("settlement", "failure", "H_RECONCILIATION_REQUIRED", started)
             raise
         if not settlement.success:
-            self.ledger.mark_failed(
-                context.idempotency_key, settlement.reason_code or SETTLEMENT_FAILED
+            await self._ledger_write(
+                "mark_failed", context.idempotency_key, settlement.reason_code or SETTLEMENT_FAILED
             )
             self._observe(
                 "settlement", "failure", settlement.reason_code or SETTLEMENT_FAILED, started
@@ -473,7 +494,7 @@ class SellerRuntime:
         settlement_cid = self._persist_settlement(
             entry.verification_cid or commitment({}), requirement, settlement
         )
-        self.ledger.mark_settled(context.idempotency_key, settlement_cid)
+        await self._ledger_write("mark_settled", context.idempotency_key, settlement_cid)
         self._observe("settlement", "success", "H_PAYMENT_SETTLED", started)
         paid = PaymentDecision(
             Decision.PAID,
@@ -497,8 +518,11 @@ class SellerRuntime:
                 # Whether the domain effect happened is unknowable here. Keep it
                 # fenced for operator/domain-specific idempotency reconciliation.
                 if entry.state != "reconciliation_required":
-                    self.ledger.mark_failed(
-                        entry.idempotency_key, "H_RECONCILIATION_REQUIRED", reconciliation=True
+                    await self._ledger_write(
+                        "mark_failed",
+                        entry.idempotency_key,
+                        "H_RECONCILIATION_REQUIRED",
+                        reconciliation=True,
                     )
                 outcomes.append(
                     {"idempotencyKey": entry.idempotency_key, "state": "reconciliation_required"}
@@ -508,7 +532,9 @@ class SellerRuntime:
                 outcomes.append({"idempotencyKey": entry.idempotency_key, "state": entry.state})
                 continue
             if not entry.payment_commitment:
-                self.ledger.reset_for_reconciliation(entry.idempotency_key, "failed")
+                await self._ledger_write(
+                    "reset_for_reconciliation", entry.idempotency_key, "failed"
+                )
                 outcomes.append({"idempotencyKey": entry.idempotency_key, "state": "failed"})
                 continue
             status = await self.facilitator.lookup(entry.payment_commitment)
@@ -517,7 +543,9 @@ class SellerRuntime:
                 cid = self._persist_settlement(
                     entry.verification_cid or commitment({}), requirement, status
                 )
-                self.ledger.reset_for_reconciliation(entry.idempotency_key, "settled", cid)
+                await self._ledger_write(
+                    "reset_for_reconciliation", entry.idempotency_key, "settled", cid
+                )
                 outcomes.append(
                     {
                         "idempotencyKey": entry.idempotency_key,
@@ -526,7 +554,9 @@ class SellerRuntime:
                     }
                 )
             elif status is not None:
-                self.ledger.reset_for_reconciliation(entry.idempotency_key, "failed")
+                await self._ledger_write(
+                    "reset_for_reconciliation", entry.idempotency_key, "failed"
+                )
                 outcomes.append({"idempotencyKey": entry.idempotency_key, "state": "failed"})
             else:
                 outcomes.append(
@@ -642,15 +672,18 @@ class SellerRuntime:
         if final_policy.decision in (Decision.DENIED, Decision.UNAVAILABLE):
             return SellerResult(final_policy)
         execution_lease = secrets.token_urlsafe(24)
-        self.ledger.claim_execution(context.idempotency_key, execution_lease)
+        await self._ledger_write("claim_execution", context.idempotency_key, execution_lease)
         execution_started = time.monotonic_ns()
         try:
             # This call is deliberately adjacent to claim_execution: no payment
             # or policy work can drift below the final effect boundary.
             value = await self._call(effect)
         except Exception:
-            self.ledger.mark_failed(
-                context.idempotency_key, "H_RECONCILIATION_REQUIRED", reconciliation=True
+            await self._ledger_write(
+                "mark_failed",
+                context.idempotency_key,
+                "H_RECONCILIATION_REQUIRED",
+                reconciliation=True,
             )
             self._observe("execution", "failure", "H_RECONCILIATION_REQUIRED", execution_started)
             raise
@@ -665,7 +698,7 @@ class SellerRuntime:
             "decidedAt": self.clock_ms(),
         }
         access_cid = self.artifacts.put(access)
-        self.ledger.mark_executed(context.idempotency_key, access_cid)
+        await self._ledger_write("mark_executed", context.idempotency_key, access_cid)
         self._observe("execution", "success", "H_PAYMENT_SATISFIED", execution_started)
         response = self._settlement_response(settlement) if settlement else None
         return SellerResult(
@@ -687,6 +720,11 @@ class SellerRuntime:
             raise KeyError(entry.operation_key)
         return capability.requirements[0]
 
+    async def _ledger_write(self, method: str, *args: Any, **kwargs: Any) -> LedgerEntry:
+        if self.ledger_writer is not None:
+            return await self.ledger_writer.write(method, *args, **kwargs)
+        return getattr(self.ledger, method)(*args, **kwargs)
+
     @staticmethod
     async def _call(callback: Callable[[], Any | Awaitable[Any]]) -> Any:
         value = callback()
@@ -10,6 +10,7 @@ from handsfree.commands.profiles import Profile
 from handsfree.commands.router import CommandRouter
 from handsfree.db import init_db
 from handsfree.db.action_logs import write_action_log
+from handsfree.db.ai_history_index import backfill_ai_history_index
 
 
 @pytest.fixture
@@ -1108,6 +1109,8 @@ class TestAIExecutionIntents:
                 }
             },
         )
+        # The maintenance backfill indexes the logged analyses.
+        backfill_ai_history_index(db_conn)
         intent = parser.parse(
             "find similar workflow CI Linux failures for pr 125 on openai/example"
         )
@@ -1160,6 +1163,8 @@ class TestAIExecutionIntents:
                 }
             },
         )
+        # The maintenance backfill indexes the logged analyses.
+        backfill_ai_history_index(db_conn)
         intent = parser.parse("explain workflow CI Linux for pr 123 on openai/example")
         router = CommandRouter(PendingActionManager(), db_conn=db_conn, github_provider=object())
 
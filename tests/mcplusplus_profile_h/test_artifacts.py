@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import threading
+
+import pytest
+
+import mcplusplus_profile_h.artifacts as artifacts_module
+from mcplusplus_profile_h import FileCIDArtifactStore, PackfileCIDArtifactStore, RedactedMetrics
+from mcplusplus_profile_h.canonical import cid_for
+
+
+def receipt(number: int) -> dict:
+    return {"type": "usage", "sequence": number, "unit": "call"}
+
+
+def test_packfile_store_round_trips_file_store_cids_across_rotation_and_reopen(tmp_path):
+    with PackfileCIDArtifactStore(tmp_path, shards=2, max_pack_bytes=128) as store:
+        cids = [store.put(receipt(number)) for number in range(20)]
+        assert store.put(receipt(0)) == cids[0]
+        assert store.stats()["packs"] > 2
+    files = FileCIDArtifactStore(tmp_path / "files")
+    assert [files.put(receipt(number)) for number in range(20)] == cids
+
+    reopened = PackfileCIDArtifactStore(tmp_path, shards=2, max_pack_bytes=128)
+    assert [reopened.get(cid) for cid in cids] == [receipt(number) for number in range(20)]
+    assert reopened.get(cid_for({"missing": True})) is None
+    with pytest.raises(ValueError):
+        reopened.get("../layout.json")
+    with pytest.raises(ValueError):
+        PackfileCIDArtifactStore(tmp_path, shards=4)
+    reopened.close()
+
+
+def test_batches_and_concurrent_puts_share_fsyncs(tmp_path):
+    store = PackfileCIDArtifactStore(tmp_path, shards=1)
+    with store.batch():
+        for number in range(50):
+            store.put(receipt(number))
+    # One pack fsync and one index fsync for the whole batch.
+    assert store.stats()["fsyncs"] == 2
+
+    threads = [
+        threading.Thread(target=store.put, args=(receipt(number),)) for number in range(50, 90)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.stats()["artifacts"] == 90
+    assert store.stats()["fsyncs"] <= 2 + 2 * 40
+    store.close()
+
+
+def test_torn_index_tail_and_unsynced_pack_bytes_are_dropped_on_reopen(tmp_path):
+    store = PackfileCIDArtifactStore(tmp_path, shards=1)
+    durable = store.put(receipt(1))
+    with store.batch():
+        lost = store.put(receipt(2))
+        # Simulate a crash before the batch commits: nothing was indexed yet.
+        reopened = PackfileCIDArtifactStore(tmp_path, shards=1)
+        assert reopened.get(durable) == receipt(1)
+        assert reopened.get(lost) is None
+        assert reopened.stats()["deadBytes"] > 0
+    with open(tmp_path / "00" / "index.log", "ab") as index:
+        index.write(b"bafy-torn")
+    recovered = PackfileCIDArtifactStore(tmp_path, shards=1)
+    assert recovered.get(lost) == receipt(2)
+    assert (tmp_path / "00" / "index.log").read_bytes().endswith(b"\n")
+    for opened in (store, reopened, recovered):
+        opened.close()
+
+
+def test_compaction_reclaims_deleted_artifacts(tmp_path):
+    store = PackfileCIDArtifactStore(tmp_path, shards=1, max_pack_bytes=256)
+    cids = [store.put(receipt(number)) for number in range(30)]
+    for cid in cids[::2]:
+        assert store.delete(cid) is True
+    assert store.delete(cids[0]) is False
+    before = store.stats()
+
+    assert store.compact(min_dead_ratio=0.9) == {"shards": 0, "reclaimedBytes": 0}
+    result = store.compact()
+    assert result == {"shards": 1, "reclaimedBytes": before["deadBytes"]}
+    after = store.stats()
+    assert after["deadBytes"] == 0
+    assert after["liveBytes"] == before["liveBytes"]
+    assert after["packs"] < before["packs"]
+    store.put(receipt(100))
+    store.close()
+
+    reopened = PackfileCIDArtifactStore(tmp_path, shards=1, max_pack_bytes=256)
+    assert [reopened.get(cid) is not None for cid in cids] == [False, True] * 15
+    assert reopened.get(cid_for(receipt(100))) == receipt(100)
+    reopened.close()
+
+
+def cache_counts(metrics: RedactedMetrics) -> dict[str, int]:
+    return {item["outcome"]: item["count"] for item in metrics.snapshot()["cache"]}
+
+
+def test_file_store_serves_verified_reads_from_cache_until_the_file_changes(tmp_path, monkeypatch):
+    metrics = RedactedMetrics(sellers={"seller-a"})
+    writer = FileCIDArtifactStore(tmp_path)
+    store = FileCIDArtifactStore(tmp_path, cache_size=2, metrics=metrics)
+    cid = writer.put(receipt(1))
+
+    hashed: list[str] = []
+
+    def counting_cid_for(value):
+        hashed.append("hash")
+        return cid_for(value)
+
+    monkeypatch.setattr(artifacts_module, "cid_for", counting_cid_for)
+    first = store.get(cid)
+    first["sequence"] = 99
+    assert store.get(cid) == receipt(1)
+    assert hashed == ["hash"]
+    assert cache_counts(metrics) == {"hit": 1, "miss": 1}
+
+    path = tmp_path / cid
+    path.write_text('{"sequence":2,"type":"usage","unit":"call"}', encoding="utf-8")
+    os.utime(path, ns=(0, 0))
+    with pytest.raises(OSError):
+        store.get(cid)
+    path.unlink()
+    assert store.get(cid) is None
+
+    others = [store.put(receipt(number)) for number in range(2, 5)]
+    assert [store.get(other) for other in others[-2:]] == [receipt(3), receipt(4)]
+    assert cache_counts(metrics) == {"evicted": 1, "hit": 3, "invalidated": 1, "miss": 2}
+    assert 'mcplusplus_profile_h_cache_total{cache="artifact",outcome="hit"} 3' in (
+        metrics.prometheus()
+    )
@@ -11,11 +11,13 @@ from mcplusplus_profile_h import (
 from mcplusplus_profile_h.batch import (
     BATCH_DISABLED,
     BATCH_INSOLVENT,
+    BATCH_INVALID,
     BATCH_RECONCILIATION_REQUIRED,
     REQUIRED_ENABLEMENT_CONTROLS,
 )
 from mcplusplus_profile_h.canonical import cid_for
 from mcplusplus_profile_h.errors import ProfileHError
+from mcplusplus_profile_h.metering import SignatureVerifier
 
 NOW = 1_783_843_200_000
 BUYER = ArtifactSigner.from_seed(b"v" * 32, key_id="buyer")
@@ -128,6 +130,42 @@ def test_unknown_redemption_blocks_replay_until_reconciled(tmp_path):
     assert result["state"] == "redeemed"
 
 
+def test_redeem_many_verifies_queued_vouchers_in_one_batch(tmp_path):
+    verifier = SignatureVerifier()
+    ledger = DuckDBVoucherLedger(tmp_path / "many.duckdb", verifier=verifier)
+    ledger.record_deposit(intent(), confirmed_at_ms=NOW)
+    vouchers = [
+        ledger.issue_voucher(
+            "deposit-1",
+            seller_did="did:web:seller.test",
+            nonce=nonce,
+            atomic_amount=100,
+            expires_at_ms=NOW + 900,
+            issued_at_ms=NOW + 1,
+            buyer_signer=BUYER,
+        )
+        for nonce in range(3)
+    ]
+    tampered = {**vouchers[2], "amount": "1"}
+    results = ledger.redeem_many(
+        [vouchers[0], vouchers[1], vouchers[0], tampered],
+        seller_did="did:web:seller.test",
+        now_ms=NOW + 2,
+        expected_buyer_public_key=BUYER.public_key,
+    )
+    assert [result["state"] for result in results] == [
+        "redeemed",
+        "redeemed",
+        "redeemed",
+        "rejected",
+    ]
+    assert results[2]["duplicate"] is True
+    assert results[3]["error"]["code"] == BATCH_INVALID
+    assert verifier.stats()["verified"] == 2
+    assert ledger.voucher_status(vouchers[2]["voucherId"]).state == "issued"
+    assert ledger.audit("deposit-1")["solvent"] is True
+
+
 def test_enablement_requires_every_control_and_never_enables_mainnet():
     evidence = {name: True for name in REQUIRED_ENABLEMENT_CONTROLS}
     enabled = evaluate_batch_enablement({**evidence, "network": "eip155:84532"})
@@ -8,6 +8,7 @@ from mcplusplus_profile_h import (
     DuckDBEntitlementLedger,
     MeterDefinition,
     MeterUnit,
+    SignatureVerifier,
 )
 from mcplusplus_profile_h.canonical import cid_for, commitment
 from mcplusplus_profile_h.errors import ProfileHError
@@ -162,3 +163,51 @@ def test_entitlements_are_scoped_and_tampered_usage_is_disputed(tmp_path):
             expected_seller_public_key=SELLER.public_key,
         )
     assert disputed.value.code == USAGE_DISPUTED
+
+
+def test_verified_signatures_are_cached_and_batched_but_never_reused_for_changes(tmp_path):
+    meter, authorization = build()
+    verifier = SignatureVerifier(max_entries=3)
+    ledger = DuckDBEntitlementLedger(tmp_path / "cache.duckdb", verifier=verifier)
+    scope = cid_for({"scope": 1})
+    entitlement = ledger.issue(
+        authorization,
+        scope_cid=scope,
+        issued_at_ms=NOW,
+        seller_signer=SELLER,
+        expected_authorization_public_key=BUYER.public_key,
+    )
+    record = usage(meter, authorization)
+    for attempt in range(2):
+        ledger.consume(
+            entitlement["entitlementCid"],
+            record,
+            scope_cid=scope,
+            now_ms=NOW + 3 + attempt,
+            expected_seller_public_key=SELLER.public_key,
+        )
+    assert verifier.stats() == {"hits": 1, "verified": 2, "rejected": 0, "cached": 2}
+
+    tampered = {**record.record, "actualCharge": "1"}
+    with pytest.raises(ProfileHError) as disputed:
+        ledger.consume(
+            entitlement["entitlementCid"],
+            tampered,
+            scope_cid=scope,
+            now_ms=NOW + 5,
+            expected_seller_public_key=SELLER.public_key,
+        )
+    assert disputed.value.code == USAGE_DISPUTED
+
+    records = [usage(meter, authorization, sequence=index).record for index in range(1, 4)]
+    batch = [records[0], records[1], records[0], tampered, records[2], {"signature": "x"}]
+    assert ArtifactSigner.verify_many(batch, verifier=verifier) == [
+        True,
+        True,
+        True,
+        False,
+        True,
+        False,
+    ]
+    stats = verifier.stats()
+    assert stats["verified"] == 5 and stats["rejected"] == 2 and stats["cached"] == 3
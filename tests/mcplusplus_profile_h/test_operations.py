@@ -47,6 +47,47 @@ def test_kill_switch_state_survives_restart_and_recovery_is_available(tmp_path):
     assert second.allows_recovery() is True
 
 
+def test_kill_switches_reload_only_on_change_and_fail_closed(tmp_path, monkeypatch):
+    path = tmp_path / "controls.json"
+    controls = KillSwitches(path, sellers={"seller-a", "seller-b"})
+    operator = KillSwitches(path, sellers={"seller-a", "seller-b"})
+    loads: list[str] = []
+    original_load = KillSwitches._load
+
+    def counting_load(self):
+        loads.append("load")
+        return original_load(self)
+
+    monkeypatch.setattr(KillSwitches, "_load", counting_load)
+    first = controls.snapshot()
+    assert all(controls.allows_new_work("seller-a") for _ in range(100))
+    assert controls.snapshot() is first
+    assert loads == []
+
+    operator.set_pause(paused=True, seller="seller-b")
+    assert controls.allows_new_work("seller-b") is False
+    assert controls.status()["generation"] == first.generation + 1
+    loads.clear()
+    controls.allows_new_work("seller-a")
+    assert loads == []
+
+    bounded = KillSwitches(path, sellers={"seller-a", "seller-b"}, max_staleness_ms=60_000)
+    operator.set_pause(paused=True)
+    assert bounded.allows_new_work("seller-a") is True
+    # Its own change reloads the file, picking up the operator's pause too.
+    bounded.set_pause(paused=False, seller="seller-b")
+    assert bounded.allows_new_work("seller-a") is False
+    assert bounded.status()["sellers"]["seller-b"] is False
+
+    path.write_text("{not json", encoding="utf-8")
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            controls.allows_new_work("seller-a")
+    path.unlink()
+    with pytest.raises(OSError):
+        controls.allows_new_work("seller-a")
+
+
 def test_health_probes_collapse_dependency_exceptions(tmp_path):
     ledger = DuckDBPaymentLedger(tmp_path / "ledger.duckdb")
     assert ledger.health_probe()["ready"] is True
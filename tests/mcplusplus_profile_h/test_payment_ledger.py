@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import threading
+import time
+
+import duckdb
 import pytest
 
-from mcplusplus_profile_h import DuckDBPaymentLedger
+from mcplusplus_profile_h import AsyncPaymentLedger, DuckDBPaymentLedger
 from mcplusplus_profile_h.errors import PAYMENT_REPLAY, RECONCILIATION_REQUIRED, ProfileHError
 
 
@@ -66,3 +70,141 @@ def test_invalid_transition_fails_closed_and_crash_states_are_reconcilable(tmp_p
     ledger.mark_failed("key", "H_RECONCILIATION_REQUIRED", reconciliation=True)
     assert ledger.get("key").lease_token is None
     assert ledger.diagnostics()["reconciliationRequired"] == 1
+
+
+def test_async_ledger_group_commits_in_order_and_isolates_failures(tmp_path):
+    path = tmp_path / "ledger.duckdb"
+    with AsyncPaymentLedger(DuckDBPaymentLedger(path), max_group=3, max_delay_ms=1_000) as writer:
+        grouped = [
+            writer.submit("create_quote", "a", "request-a", "tool:pin", "capability", "quote-a"),
+            writer.submit("bind_payment", "a", "payment-a"),
+            writer.submit("create_quote", "b", "request-b", "tool:pin", "capability", "quote-b"),
+        ]
+        assert [future.result(5).state for future in grouped] == ["quoted", "quoted", "quoted"]
+        assert writer.stats() == {"writes": 3, "groups": 1, "fallbacks": 0}
+
+        mixed = [
+            writer.submit("create_quote", "c", "request-c", "tool:pin", "capability", "quote-c"),
+            writer.submit("bind_payment", "b", "payment-a"),
+            writer.submit("mark_verified", "a", "verification-a"),
+        ]
+        assert mixed[0].result(5).state == "quoted"
+        with pytest.raises(ProfileHError) as replay:
+            mixed[1].result(5)
+        assert replay.value.code == PAYMENT_REPLAY
+        assert mixed[2].result(5).state == "verified"
+        assert writer.stats() == {"writes": 6, "groups": 2, "fallbacks": 1}
+
+    reopened = DuckDBPaymentLedger(path)
+    assert reopened.get("a").state == "verified"
+    assert reopened.get("b").payment_commitment is None
+    assert reopened.get("c").state == "quoted"
+
+
+class FailingConnection:
+    """Delegates to a DuckDB connection, failing the next statements in ``failures``."""
+
+    def __init__(self, connection, failures):
+        self.connection = connection
+        self.failures = failures
+
+    def execute(self, sql, *args):
+        if self.failures and self.failures[0][0] == sql:
+            _, exc = self.failures.pop(0)
+            if sql == "COMMIT":
+                # DuckDB ends the transaction when a commit fails.
+                self.connection.execute("ROLLBACK")
+            raise exc
+        return self.connection.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def test_async_ledger_writer_survives_commit_and_rollback_failures(tmp_path):
+    path = tmp_path / "ledger.duckdb"
+    ledger = DuckDBPaymentLedger(path)
+    connection = FailingConnection(ledger.connection, [("COMMIT", duckdb.IOException("full"))])
+    ledger.connection = connection
+    with AsyncPaymentLedger(ledger, max_group=2, max_delay_ms=1_000) as writer:
+        # The failed COMMIT leaves no transaction to roll back; the group is
+        # retried one write at a time.
+        retried = [
+            writer.submit("create_quote", "a", "request-a", "tool:pin", "capability", "quote-a"),
+            writer.submit("create_quote", "b", "request-b", "tool:pin", "capability", "quote-b"),
+        ]
+        assert [future.result(5).state for future in retried] == ["quoted", "quoted"]
+        assert writer.stats() == {"writes": 2, "groups": 1, "fallbacks": 1}
+
+        connection.failures.append(("BEGIN TRANSACTION", RuntimeError("connection lost")))
+        failed = [
+            writer.submit("bind_payment", "a", "payment-a"),
+            writer.submit("bind_payment", "b", "payment-b"),
+        ]
+        for future in failed:
+            with pytest.raises(RuntimeError, match="connection lost"):
+                future.result(5)
+
+        assert writer.submit("bind_payment", "a", "payment-a").result(5).state == "quoted"
+
+    reopened = DuckDBPaymentLedger(path)
+    assert reopened.get("a").payment_commitment == "payment-a"
+    assert reopened.get("b").payment_commitment is None
+
+
+class SlowCommitConnection(FailingConnection):
+    """Holds every COMMIT until ``release`` is set."""
+
+    def __init__(self, connection):
+        super().__init__(connection, [])
+        self.committing = threading.Event()
+        self.release = threading.Event()
+
+    def execute(self, sql, *args):
+        if sql == "COMMIT":
+            self.committing.set()
+            self.release.wait(5)
+        return super().execute(sql, *args)
+
+
+def test_async_ledger_reads_do_not_wait_for_a_slow_group_commit(tmp_path):
+    ledger = DuckDBPaymentLedger(tmp_path / "ledger.duckdb")
+    quoted(ledger, key="committed", request="request-committed")
+    connection = SlowCommitConnection(ledger.connection)
+    ledger.connection = connection
+    with AsyncPaymentLedger(ledger, max_group=2, max_delay_ms=1_000) as writer:
+        grouped = [
+            writer.submit("bind_payment", "committed", "payment"),
+            writer.submit("create_quote", "new", "request-new", "tool:pin", "capability", "quote"),
+        ]
+        assert connection.committing.wait(5)
+        try:
+            started = time.monotonic()
+            # Served from committed state while the writer holds the ledger lock.
+            assert ledger.get("committed").payment_commitment is None
+            assert ledger.get("new") is None
+            assert ledger.history("committed")[0]["to"] == "quoted"
+            assert ledger.diagnostics()["states"] == {"quoted": 1}
+            assert time.monotonic() - started < 1
+            assert not any(future.done() for future in grouped)
+        finally:
+            connection.release.set()
+        assert [future.result(5).state for future in grouped] == ["quoted", "quoted"]
+        assert ledger.get("committed").payment_commitment == "payment"
+        assert ledger.get("new").quote_cid == "quote"
+
+
+@pytest.mark.asyncio
+async def test_async_ledger_write_awaits_commit(tmp_path):
+    writer = AsyncPaymentLedger(DuckDBPaymentLedger(tmp_path / "ledger.duckdb"))
+    try:
+        entry = await writer.write(
+            "create_quote", "key", "request", "tool:pin", "capability", "quote"
+        )
+        assert writer.ledger.get("key") == entry
+        with pytest.raises(ValueError):
+            writer.submit("history", "key")
+    finally:
+        writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit("bind_payment", "key", "payment")
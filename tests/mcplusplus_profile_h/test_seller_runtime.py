@@ -5,6 +5,7 @@ import asyncio
 import pytest
 
 from mcplusplus_profile_h import (
+    AsyncPaymentLedger,
     CallbackFacilitator,
     CapabilityCatalog,
     Decision,
@@ -32,10 +33,12 @@ def context(key: str = "request-1", *, authorized: bool = True) -> RequestContex
     return RequestContext(cid_for({"request": key}), key, authorized=authorized)
 
 
-def build(tmp_path, *, pause=False):
+def build(tmp_path, *, pause=False, group_commit=False):
     paid = PaidCapability("tool:pin", (requirement(),))
     catalog = CapabilityCatalog([PaidCapability("tool:status", free=True), paid])
     ledger = DuckDBPaymentLedger(tmp_path / "payments.duckdb")
+    if group_commit:
+        ledger = AsyncPaymentLedger(ledger)
     calls = {"verify": 0, "settle": 0}
 
     def verify(payload, selected):
@@ -111,6 +114,40 @@ async def test_paid_dispatch_settles_immediately_before_effect_and_replays_resul
     assert "0xprivate-transaction-reference" not in stored
 
 
+@pytest.mark.asyncio
+async def test_concurrent_paid_dispatches_share_group_commits(tmp_path):
+    runtime, calls = build(tmp_path, group_commit=True)
+    contexts = [context(f"request-{index}") for index in range(8)]
+    required = await asyncio.gather(
+        *(runtime.dispatch("tool:pin", ctx, lambda: None) for ctx in contexts)
+    )
+
+    async def effect():
+        return "done"
+
+    paid = await asyncio.gather(
+        *(
+            runtime.dispatch(
+                "tool:pin",
+                ctx,
+                effect,
+                payment=PaymentContext(
+                    {"x402Version": 2, "accepted": requirement().wire(), "payload": {"n": i}},
+                    quote.receipt_cid,
+                    ctx.request_cid,
+                ),
+            )
+            for i, (ctx, quote) in enumerate(zip(contexts, required, strict=True))
+        )
+    )
+    assert {result.decision.decision for result in paid} == {Decision.PAID}
+    assert calls == {"verify": 8, "settle": 8}
+    assert {runtime.ledger.get(ctx.idempotency_key).state for ctx in contexts} == {"executed"}
+    stats = runtime.ledger_writer.stats()
+    assert stats["groups"] < stats["writes"]
+    runtime.ledger_writer.close()
+
+
 @pytest.mark.asyncio
 async def test_substitution_rejected_before_verification_or_effect(tmp_path):
     runtime, calls = build(tmp_path)
@@ -141,3 +141,22 @@ def test_action_log_ordering(db_conn):
     assert logs[0].id == log3.id
     assert logs[1].id == log2.id
     assert logs[2].id == log1.id
+
+
+def test_ai_action_log_and_rollup_commit_together(db_conn, monkeypatch):
+    """A failed rollup update rolls back its action log."""
+    import handsfree.db.action_logs as action_logs
+
+    user_id = str(uuid.uuid4())
+
+    def failing_rollup(conn, *, action_log_id):
+        raise RuntimeError("rollup write failed")
+
+    monkeypatch.setattr(action_logs, "record_ai_policy_rollup", failing_rollup)
+    with pytest.raises(RuntimeError):
+        write_action_log(db_conn, user_id=user_id, action_type="ai.execute.summary", ok=True)
+    assert get_action_logs(db_conn, user_id=user_id) == []
+
+    monkeypatch.undo()
+    write_action_log(db_conn, user_id=user_id, action_type="ai.execute.summary", ok=True)
+    assert db_conn.execute("SELECT SUM(count) FROM ai_policy_rollups").fetchone()[0] == 1
@@ -0,0 +1,102 @@
+"""Tests for mirror and worktree management in agent-runner/runner.py."""
+
+import importlib.util
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("github")
+
+RUNNER_PATH = Path(__file__).resolve().parent.parent / "agent-runner" / "runner.py"
+REPO = "example/project"
+
+
+def _git(*args: str, cwd: Path) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(repo: Path, name: str) -> str:
+    (repo / name).write_text(name)
+    _git("add", name, cwd=repo)
+    _git("commit", "-m", f"Add {name}", cwd=repo)
+    return _git("rev-parse", "HEAD", cwd=repo)
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    spec = importlib.util.spec_from_file_location("agent_runner_under_test", RUNNER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+    _git("init", "-b", "main", cwd=upstream)
+    _commit(upstream, "README.md")
+
+    monkeypatch.setattr(module, "MIRROR_DIR", tmp_path / "workspace" / "mirrors")
+    monkeypatch.setattr(module, "WORKTREE_DIR", tmp_path / "workspace" / "worktrees")
+    monkeypatch.setattr(module, "_clone_url", lambda repo_full_name: str(upstream))
+    module.upstream = upstream
+    return module
+
+
+def test_ensure_mirror_clones_once_then_fetches_new_commits(runner):
+    mirror = runner.ensure_mirror(REPO)
+    assert mirror == runner.MIRROR_DIR / "example_project.git"
+    assert _git("rev-parse", "--is-bare-repository", cwd=mirror) == "true"
+    marker = mirror / "objects" / "mirror-marker"
+    marker.write_text("kept")
+
+    head = _commit(runner.upstream, "feature.py")
+    assert runner.ensure_mirror(REPO) == mirror
+    assert _git("rev-parse", "refs/heads/main", cwd=mirror) == head
+    # Refreshed in place rather than re-cloned.
+    assert marker.exists()
+
+
+def test_task_worktrees_start_from_existing_branch_and_are_released(runner):
+    base = _git("rev-parse", "HEAD", cwd=runner.upstream)
+    _git("checkout", "-b", "agent/task-1", cwd=runner.upstream)
+    branch_head = _commit(runner.upstream, "task.py")
+    _git("checkout", "main", cwd=runner.upstream)
+
+    fresh = runner.create_task_worktree(REPO, "agent/task-2")
+    retried = runner.create_task_worktree(REPO, "agent/task-1")
+
+    assert _git("rev-parse", "HEAD", cwd=fresh) == base
+    assert _git("rev-parse", "HEAD", cwd=retried) == branch_head
+    assert {fresh, retried} <= runner._active_worktrees
+
+    runner.release_task_worktree(REPO, fresh)
+    mirror = runner.MIRROR_DIR / "example_project.git"
+    assert not fresh.exists()
+    assert fresh not in runner._active_worktrees
+    assert str(fresh) not in _git("worktree", "list", cwd=mirror)
+    assert str(retried) in _git("worktree", "list", cwd=mirror)
+
+
+def test_gc_removes_stale_worktrees_but_skips_live_tasks(runner):
+    live = runner.create_task_worktree(REPO, "agent/live")
+    crashed = runner.create_task_worktree(REPO, "agent/crashed")
+    # A crashed task never released its worktree; it is no longer tracked.
+    runner._active_worktrees.discard(crashed)
+    for path in (live, crashed):
+        os.utime(path, (0, 0))
+
+    recent = runner.create_task_worktree(REPO, "agent/recent")
+    runner._active_worktrees.discard(recent)
+
+    assert runner.gc_stale_worktrees(max_age_seconds=3600) == 1
+    assert live.exists()
+    assert recent.exists()
+    assert not crashed.exists()
+    mirror = runner.MIRROR_DIR / "example_project.git"
+    assert str(crashed) not in _git("worktree", "list", cwd=mirror)
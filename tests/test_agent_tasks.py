@@ -1,17 +1,29 @@
 """Tests for agent tasks persistence."""
 
+import json
 import uuid
+from pathlib import Path
 
 import pytest
 
 from handsfree.db import init_db
 from handsfree.db.agent_tasks import (
+    TRACE_SUMMARY_TEXT_LIMIT,
     create_agent_task,
+    encode_agent_task_cursor,
     get_agent_task_by_id,
     get_agent_tasks,
+    summarize_agent_task_results,
+    summarize_agent_task_trace,
     update_agent_task_state,
 )
 
+MIGRATION_020 = (
+    Path(__file__).resolve().parent.parent
+    / "migrations"
+    / "020_backfill_agent_task_trace_summary.sql"
+)
+
 
 @pytest.fixture
 def db_conn():
@@ -297,6 +309,257 @@ class TestAgentTaskQueries:
 
         assert len(tasks) == 5
 
+    def test_result_filters_are_pushed_into_sql(self, db_conn, test_user_id):
+        """Capability, result availability and CID filters match indexed columns."""
+        with_result = create_agent_task(
+            conn=db_conn,
+            user_id=test_user_id,
+            provider="ipfs_datasets_mcp",
+            trace={"mcp_capability": "dataset_discovery"},
+        )
+        update_agent_task_state(db_conn, with_result.id, "running")
+        update_agent_task_state(
+            db_conn,
+            with_result.id,
+            "completed",
+            trace_update={
+                "mcp_result_envelope": {
+                    "summary": "done",
+                    "artifact_refs": {"result_cid": "bafy-result"},
+                }
+            },
+        )
+        without_result = create_agent_task(
+            conn=db_conn,
+            user_id=test_user_id,
+            provider="ipfs_datasets_mcp",
+            trace={"mcp_capability": "dataset_discovery"},
+        )
+        update_agent_task_state(db_conn, without_result.id, "running")
+        update_agent_task_state(db_conn, without_result.id, "completed")
+        create_agent_task(
+            conn=db_conn,
+            user_id=test_user_id,
+            provider="ipfs_accelerate_mcp",
+            trace={"mcp_capability": "agentic_fetch"},
+        )
+
+        by_capability = get_agent_tasks(
+            conn=db_conn, user_id=test_user_id, capability="dataset_discovery"
+        )
+        results = get_agent_tasks(conn=db_conn, user_id=test_user_id, results_only=True)
+        by_cid = get_agent_tasks(conn=db_conn, user_id=test_user_id, result_cid="bafy-result")
+
+        assert {task.id for task in by_capability} == {with_result.id, without_result.id}
+        assert [task.id for task in results] == [with_result.id]
+        assert [task.id for task in by_cid] == [with_result.id]
+
+    def test_keyset_cursor_pages_without_overlap(self, db_conn, test_user_id):
+        """Cursor pagination walks every task exactly once in sort order."""
+        created = [
+            create_agent_task(
+                conn=db_conn, user_id=test_user_id, provider="copilot", instruction=f"task {i}"
+            )
+            for i in range(7)
+        ]
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            page = get_agent_tasks(
+                conn=db_conn,
+                user_id=test_user_id,
+                sort_by="updated_at",
+                limit=3,
+                cursor=cursor,
+            )
+            seen.extend(task.id for task in page)
+            if len(page) < 3:
+                break
+            cursor = encode_agent_task_cursor(page[-1], "updated_at")
+
+        assert seen == [task.id for task in reversed(created)]
+
+    def _complete_with_result(self, db_conn, user_id, provider, capability):
+        task = create_agent_task(
+            conn=db_conn,
+            user_id=user_id,
+            provider=provider,
+            trace={"mcp_capability": capability} if capability else None,
+        )
+        update_agent_task_state(db_conn, task.id, "running")
+        return update_agent_task_state(
+            db_conn, task.id, "completed", trace_update={"mcp_result_preview": "ok"}
+        )
+
+    def test_summarize_results_groups_in_sql(self, db_conn, test_user_id, test_user_id_2):
+        """Result summaries count by provider and capability for one user."""
+        self._complete_with_result(db_conn, test_user_id, "ipfs_kit_mcp", "ipfs_pin")
+        self._complete_with_result(db_conn, test_user_id, "ipfs_kit_mcp", "ipfs_pin")
+        self._complete_with_result(db_conn, test_user_id, "ipfs_kit_mcp", None)
+        self._complete_with_result(db_conn, test_user_id, "ipfs_accelerate_mcp", "agentic_fetch")
+        self._complete_with_result(db_conn, test_user_id_2, "ipfs_kit_mcp", "ipfs_pin")
+        create_agent_task(
+            conn=db_conn,
+            user_id=test_user_id,
+            provider="ipfs_kit_mcp",
+            trace={"mcp_capability": "ipfs_pin"},
+        )
+
+        summary = summarize_agent_task_results(db_conn, user_id=test_user_id)
+
+        assert summary == {
+            "total_results": 4,
+            "by_provider": {"ipfs_kit_mcp": 3, "ipfs_accelerate_mcp": 1},
+            "by_capability": {"ipfs_pin": 2, "agentic_fetch": 1},
+        }
+        assert summarize_agent_task_results(
+            db_conn, user_id=test_user_id, capability="ipfs_pin"
+        ) == {
+            "total_results": 2,
+            "by_provider": {"ipfs_kit_mcp": 2},
+            "by_capability": {"ipfs_pin": 2},
+        }
+
+    def test_latest_per_result_key_uses_window_ranking(self, db_conn, test_user_id):
+        """Only the first task per provider/capability survives, in sort order."""
+        older_pin = self._complete_with_result(db_conn, test_user_id, "ipfs_kit_mcp", "ipfs_pin")
+        fetch = self._complete_with_result(
+            db_conn, test_user_id, "ipfs_accelerate_mcp", "agentic_fetch"
+        )
+        newer_pin = self._complete_with_result(db_conn, test_user_id, "ipfs_kit_mcp", "ipfs_pin")
+
+        latest = get_agent_tasks(
+            conn=db_conn,
+            user_id=test_user_id,
+            sort_by="updated_at",
+            results_only=True,
+            latest_per_result_key=True,
+        )
+        earliest = get_agent_tasks(
+            conn=db_conn,
+            user_id=test_user_id,
+            sort_by="updated_at",
+            direction="asc",
+            results_only=True,
+            latest_per_result_key=True,
+        )
+        second_page = get_agent_tasks(
+            conn=db_conn,
+            user_id=test_user_id,
+            sort_by="updated_at",
+            results_only=True,
+            latest_per_result_key=True,
+            cursor=encode_agent_task_cursor(latest[0], "updated_at"),
+        )
+
+        assert [task.id for task in latest] == [newer_pin.id, fetch.id]
+        assert [task.id for task in earliest] == [older_pin.id, fetch.id]
+        assert [task.id for task in second_page] == [fetch.id]
+
+    def test_cursor_rejects_mismatched_sort_or_garbage(self, db_conn, test_user_id):
+        """Malformed cursors and cursors for another sort field raise ValueError."""
+        task = create_agent_task(conn=db_conn, user_id=test_user_id, provider="copilot")
+
+        with pytest.raises(ValueError):
+            get_agent_tasks(conn=db_conn, cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            get_agent_tasks(
+                conn=db_conn,
+                sort_by="updated_at",
+                cursor=encode_agent_task_cursor(task, "created_at"),
+            )
+
+
+class TestAgentTaskTraceSummary:
+    """Test the hot trace summary and lazily loaded trace blob."""
+
+    TRACE = {
+        "mcp_capability": "dataset_discovery",
+        "mcp_cid": "bafy-result",
+        "mcp_result_preview": None,
+        "mcp_request_payload": {"query": "x" * 2000},
+        "mcp_result_output": "raw text output",
+        "mcp_result_envelope": {
+            "summary": "Found datasets",
+            "status": "completed",
+            "raw_response": {"rows": list(range(500))},
+            "structured_output": {
+                "message": "Found datasets",
+                "expanded_queries": ["legal datasets"],
+                "rows": list(range(500)),
+            },
+        },
+    }
+
+    def test_summary_keeps_compact_result_fields_only(self):
+        """The summary keeps scalar result fields, drops payloads and is idempotent."""
+        summary = summarize_agent_task_trace(
+            {**self.TRACE, "provider_label": "Datasets " + "x" * 400}
+        )
+
+        assert summary == {
+            "provider_label": ("Datasets " + "x" * 400)[:TRACE_SUMMARY_TEXT_LIMIT],
+            "mcp_capability": "dataset_discovery",
+            "mcp_cid": "bafy-result",
+            "mcp_result_envelope": {"summary": "Found datasets", "status": "completed"},
+            "mcp_result_cid": "bafy-result",
+        }
+        assert summarize_agent_task_trace(summary) == summary
+        assert summarize_agent_task_trace(None) is None
+        assert summarize_agent_task_trace({}) is None
+
+    def test_backfill_migration_matches_summarize(self, db_conn, test_user_id):
+        """Migration 020 recomputes the same summary in SQL from the trace blob."""
+        traces = [
+            self.TRACE,
+            {"mcp_result_output": {"status": "done", "message": "m" * 400, "rows": [1]}},
+            {"pr_url": "u", "mcp_timeout_s": 30, "mcp_poll_interval_s": 1.5},
+            {"mcp_request_payload": {"query": "q"}},
+        ]
+        for trace in traces:
+            create_agent_task(
+                conn=db_conn, user_id=test_user_id, provider="ipfs_datasets_mcp", trace=trace
+            )
+        db_conn.execute("UPDATE agent_tasks SET trace_summary = NULL")
+
+        db_conn.execute(MIGRATION_020.read_text())
+
+        rows = db_conn.execute("SELECT last_update, trace_summary FROM agent_tasks").fetchall()
+        assert len(rows) == len(traces)
+        for trace_json, summary_json in rows:
+            expected = summarize_agent_task_trace(json.loads(trace_json))
+            assert (json.loads(summary_json) if summary_json else None) == expected
+
+    def test_list_without_trace_defers_blob_until_accessed(self, db_conn, test_user_id):
+        """include_trace=False reads the summary and loads the trace on first access."""
+        task = create_agent_task(
+            conn=db_conn, user_id=test_user_id, provider="ipfs_datasets_mcp", trace=self.TRACE
+        )
+        update_agent_task_state(db_conn, task.id, "running", trace_update={"pr_url": "u"})
+
+        listed = get_agent_tasks(conn=db_conn, user_id=test_user_id, include_trace=False)[0]
+
+        assert listed.trace_summary["pr_url"] == "u"
+        assert listed.trace_summary["mcp_cid"] == "bafy-result"
+        assert not listed.trace_loaded
+        assert listed.trace["mcp_request_payload"] == self.TRACE["mcp_request_payload"]
+        assert listed.trace_loaded
+        assert get_agent_task_by_id(db_conn, task.id).trace == listed.trace
+
+    def test_list_without_trace_falls_back_for_rows_without_summary(self, db_conn, test_user_id):
+        """Rows written before the summary column existed derive it from the blob."""
+        task = create_agent_task(
+            conn=db_conn, user_id=test_user_id, provider="ipfs_datasets_mcp", trace=self.TRACE
+        )
+        db_conn.execute("UPDATE agent_tasks SET trace_summary = NULL")
+
+        listed = get_agent_tasks(conn=db_conn, user_id=test_user_id, include_trace=False)[0]
+
+        assert listed.id == task.id
+        assert listed.trace_loaded
+        assert listed.trace_summary == summarize_agent_task_trace(self.TRACE)
+
 
 class TestAgentServicePauseResume:
     """Test agent service pause and resume functionality."""
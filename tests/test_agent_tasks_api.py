@@ -240,6 +240,42 @@ class TestListAgentTasks:
         assert len(page1_ids & page3_ids) == 0
         assert len(page2_ids & page3_ids) == 0
 
+    def test_list_tasks_keyset_cursor(self, reset_db):
+        """Test cursor pagination via pagination.next_cursor."""
+        from handsfree.api import get_db
+        from handsfree.auth import FIXTURE_USER_ID
+
+        db = get_db()
+        for i in range(5):
+            create_agent_task(
+                conn=db,
+                user_id=FIXTURE_USER_ID,
+                provider="copilot",
+                instruction=f"Task {i}",
+            )
+
+        page1 = client.get("/v1/agents/tasks?limit=2").json()
+        cursor = page1["pagination"]["next_cursor"]
+        assert cursor
+
+        page2 = client.get(f"/v1/agents/tasks?limit=2&cursor={cursor}").json()
+        page3 = client.get(
+            f"/v1/agents/tasks?limit=2&cursor={page2['pagination']['next_cursor']}"
+        ).json()
+
+        ids = [t["id"] for page in (page1, page2, page3) for t in page["tasks"]]
+        assert len(ids) == len(set(ids)) == 5
+        assert page3["pagination"]["has_more"] is False
+        assert page3["pagination"]["next_cursor"] is None
+
+    def test_list_tasks_invalid_cursor(self, reset_db):
+        """Test malformed cursors and cursor+offset are rejected."""
+        response = client.get("/v1/agents/tasks?cursor=bogus")
+        assert response.status_code == 400
+
+        response = client.get("/v1/agents/tasks?cursor=bogus&offset=2")
+        assert response.status_code == 400
+
     def test_list_tasks_with_pr_url(self, reset_db):
         """Test that pr_url from trace is included in response."""
         from handsfree.api import get_db
@@ -350,6 +386,62 @@ class TestListAgentTasks:
         assert "result_output" not in data["tasks"][0]
         assert data["filters"]["result_view"] == "normalized"
 
+    def test_list_tasks_result_view_normalized_skips_trace_blob(self, reset_db, monkeypatch):
+        """Normalized listings are served from the hot trace summary."""
+        from handsfree.api import get_db
+        from handsfree.auth import FIXTURE_USER_ID
+        from handsfree.db import agent_tasks
+
+        db = get_db()
+        created = create_agent_task(
+            conn=db,
+            user_id=FIXTURE_USER_ID,
+            provider="ipfs_datasets_mcp",
+            instruction="Find legal datasets",
+            trace={
+                "mcp_capability": "dataset_discovery",
+                "mcp_request_payload": {"query": "x" * 2000},
+                "mcp_result_envelope": {
+                    "summary": "Expanded legal query",
+                    "status": "completed",
+                    "preferred_execution_mode": "direct_import",
+                    "follow_up_actions": [{"id": "pin", "label": "Pin result"}],
+                    "structured_output": {
+                        "message": "Expanded legal query",
+                        "cid": "bafy-result",
+                        "expanded_queries": ["legal datasets"],
+                        "rows": list(range(100)),
+                    },
+                },
+            },
+        )
+        monkeypatch.setattr(
+            agent_tasks,
+            "_load_agent_task_trace",
+            lambda *_args: pytest.fail("normalized listing loaded the trace blob"),
+        )
+
+        response = client.get("/v1/agents/tasks?result_view=normalized")
+
+        assert response.status_code == 200
+        task = response.json()["tasks"][0]
+        assert task["result_preview"] == "Expanded legal query"
+        assert task["result"]["cid"] == "bafy-result"
+        assert task["result"]["status"] == "completed"
+        assert task["result"]["execution_mode"] is None
+        # Result payloads are left out of the list; the detail endpoint serves them.
+        for key in ("result_envelope", "follow_up_actions"):
+            assert key not in task
+        assert "dataset_queries" not in task["result"]
+
+        monkeypatch.undo()
+        single = client.get(f"/v1/agents/tasks/{created.id}").json()
+        assert single["result_preview"] == task["result_preview"]
+        assert single["result"]["cid"] == task["result"]["cid"]
+        assert single["result_envelope"]["structured_output"]["rows"] == list(range(100))
+        assert single["follow_up_actions"] == [{"id": "pin", "label": "Pin result"}]
+        assert single["result"]["dataset_queries"] == ["legal datasets"]
+
     def test_list_tasks_result_view_raw(self, reset_db):
         """Raw result view should omit the normalized projection."""
         from handsfree.api import get_db
@@ -0,0 +1,109 @@
+"""Tests for batched AI capability execution."""
+
+import threading
+
+from fastapi.testclient import TestClient
+
+import handsfree.api as api_module
+from handsfree.ai import AICapabilityRequest, execute_ai_requests, plan_ai_request_batch
+
+
+class _StubEmbeddingsRouter:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def embed_text(self, text, **kwargs):
+        raise AssertionError("embed_text should be coalesced into embed_texts")
+
+    def embed_texts(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.0] for text in texts]
+
+
+def test_embedding_requests_are_coalesced_into_one_call(monkeypatch):
+    router = _StubEmbeddingsRouter()
+    monkeypatch.setattr("handsfree.ai.capabilities.get_embeddings_router", lambda: router)
+
+    results = execute_ai_requests(
+        [
+            AICapabilityRequest("ipfs.embeddings.embed_text", inputs={"text": "a"}),
+            AICapabilityRequest("ipfs.embeddings.embed_texts", inputs={"texts": ["bb", "ccc"]}),
+            AICapabilityRequest("ipfs.embeddings.embed_text", inputs={"text": "dddd"}),
+        ]
+    )
+
+    assert router.calls == [["a", "bb", "ccc", "dddd"]]
+    assert [result.capability_id for result in results] == [
+        "ipfs.embeddings.embed_text",
+        "ipfs.embeddings.embed_texts",
+        "ipfs.embeddings.embed_text",
+    ]
+    assert results[0].output == [1.0, 0.0]
+    assert results[1].output == [[2.0, 0.0], [3.0, 0.0]]
+    assert results[2].output == [4.0, 0.0]
+    assert results[0].trace["coalesced_requests"] == 3
+
+
+def test_incompatible_requests_run_concurrently_with_errors_in_place(monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+
+    class StubLLMRouter:
+        def generate_text(self, prompt, **kwargs):
+            barrier.wait()
+            return f"generated {prompt}"
+
+    class StubEmbeddingsRouter(_StubEmbeddingsRouter):
+        def embed_text(self, text, **kwargs):
+            return [0.0, 1.0]
+
+        def embed_texts(self, texts, **kwargs):
+            barrier.wait()
+            return super().embed_texts(texts, **kwargs)
+
+    monkeypatch.setattr("handsfree.ai.capabilities.get_llm_router", StubLLMRouter)
+    monkeypatch.setattr("handsfree.ai.capabilities.get_embeddings_router", StubEmbeddingsRouter)
+    requests = [
+        AICapabilityRequest("ipfs.llm.generate", inputs={"prompt": "hi"}),
+        AICapabilityRequest("ipfs.nope", inputs={}),
+        AICapabilityRequest(
+            "ipfs.embeddings.embed_texts",
+            inputs={"texts": ["x"]},
+            options={"embedding_options": {"dimensions": 2}},
+        ),
+        AICapabilityRequest("ipfs.embeddings.embed_text", inputs={"text": "y"}),
+    ]
+
+    assert [group.indexes for group in plan_ai_request_batch(requests)] == [(0,), (1,), (2,), (3,)]
+    results = execute_ai_requests(requests)
+
+    assert results[0].output == "generated hi"
+    assert isinstance(results[1], KeyError)
+    assert results[2].output == [[1.0, 0.0]]
+    assert results[3].output == [0.0, 1.0]
+
+
+def test_batch_endpoint_returns_per_item_results_in_order(monkeypatch):
+    router = _StubEmbeddingsRouter()
+    monkeypatch.setattr("handsfree.ai.capabilities.get_embeddings_router", lambda: router)
+    client = TestClient(api_module.app)
+
+    response = client.post(
+        "/v1/ai/execute/batch",
+        json={
+            "items": [
+                {"capability_id": "ipfs.embeddings.embed_text", "inputs": {"text": "one"}},
+                {"workflow": "pr_rag_summary"},
+                {"capability_id": "ipfs.embeddings.embed_text", "inputs": {"text": "three"}},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert results[0]["ok"] is True
+    assert results[0]["response"]["output"] == {"value": [3.0, 0.0]}
+    assert results[1]["ok"] is False
+    assert results[1]["error"]["error"] == "invalid_request"
+    assert results[2]["response"]["output"] == {"value": [5.0, 0.0]}
+    assert router.calls == [["one", "three"]]
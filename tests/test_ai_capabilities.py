@@ -1,6 +1,8 @@
 """Tests for shared AI capability registry and execution."""
 
 import json
+import threading
+import time
 
 from handsfree.ai import (
     AIBackendFamily,
@@ -442,7 +444,7 @@ def test_execute_github_pr_rag_summary_orchestrates_multiple_backends(monkeypatc
     class StubLLMRouter:
         def generate_text(self, prompt: str, **kwargs: object) -> str:
             assert "pull request #123" in prompt.lower()
-            assert "Embedding dimensions: 4" in prompt
+            assert "Embedding dimensions" not in prompt
             assert kwargs["model"] == "llama3"
             return "Augmented summary with risks and next action."
 
@@ -494,7 +496,7 @@ def test_execute_github_failure_rag_explain_with_github_checks(monkeypatch):
     class StubLLMRouter:
         def generate_text(self, prompt: str, **kwargs: object) -> str:
             assert "CI Linux" in prompt
-            assert "Embedding dimensions: 2" in prompt
+            assert "Embedding dimensions" not in prompt
             assert kwargs["model"] == "llama3"
             return "The CI Linux job is failing during setup. Check dependency installation."
 
@@ -918,6 +920,98 @@ def test_execute_github_failure_rag_explain_can_persist_to_ipfs_via_env(monkeypa
     assert result.output["ipfs_cid"] == "bafy-failure"
 
 
+def test_concurrent_composite_persists_share_one_add_many_call(monkeypatch):
+    """Composite outputs persisted while an add is in flight reach IPFS in one batched add."""
+    from handsfree.ai import capabilities
+
+    adding = threading.Event()
+    release = threading.Event()
+    single_adds: list[bytes] = []
+    batched_adds: list[list[bytes]] = []
+
+    class StubIPFSRouter:
+        def add_bytes(self, data: bytes, **kwargs: object) -> str:
+            assert kwargs == {"pin": True}
+            single_adds.append(data)
+            adding.set()
+            assert release.wait(timeout=5)
+            return "bafy-first"
+
+        def add_many(self, items: list[bytes], **kwargs: object) -> list[str]:
+            assert kwargs == {"pin": True}
+            batched_adds.append(items)
+            return [f"bafy-{index}" for index in range(len(items))]
+
+    monkeypatch.setattr("handsfree.ai.capabilities.get_ipfs_router", StubIPFSRouter)
+
+    def persist(pr: int, results: dict[int, dict]) -> None:
+        results[pr] = capabilities._persist_composite_output_if_enabled(
+            capability_id="github.pr.rag_summary",
+            payload={"pr": pr},
+            metadata={},
+            persist_output=True,
+            ipfs_options={"pin": True},
+        )
+
+    results: dict[int, dict] = {}
+    first = threading.Thread(target=persist, args=(0, results))
+    first.start()
+    assert adding.wait(timeout=5)
+    followers = [threading.Thread(target=persist, args=(pr, results)) for pr in (1, 2, 3)]
+    for thread in followers:
+        thread.start()
+    batcher = capabilities._composite_output_batcher
+    while len(batcher._pending.get(json.dumps({"pin": True}), [])) < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [first, *followers]:
+        thread.join(timeout=5)
+
+    assert len(single_adds) == 1
+    assert len(batched_adds) == 1
+    assert sorted(json.loads(item)["payload"]["pr"] for item in batched_adds[0]) == [1, 2, 3]
+    assert results[0] == {"persisted": True, "cid": "bafy-first"}
+    assert sorted(result["cid"] for pr, result in results.items() if pr) == [
+        "bafy-0",
+        "bafy-1",
+        "bafy-2",
+    ]
+    assert capabilities._persist_composite_output_if_enabled(
+        capability_id="github.pr.rag_summary",
+        payload={},
+        metadata={},
+        persist_output=False,
+        ipfs_options=None,
+    ) == {"persisted": False, "cid": None}
+
+
+def test_failed_composite_batch_is_retried_per_output(monkeypatch):
+    """One bad output in a batch only fails its own caller."""
+    from handsfree.ai import capabilities
+
+    class StubIPFSRouter:
+        def add_bytes(self, data: bytes, **kwargs: object) -> str:
+            if data == b"bad":
+                raise ValueError("rejected")
+            return f"bafy-{data.decode()}"
+
+        def add_many(self, items: list[bytes], **kwargs: object) -> list[str]:
+            raise ValueError("batch rejected")
+
+    monkeypatch.setattr("handsfree.ai.capabilities.get_ipfs_router", StubIPFSRouter)
+    batch = [capabilities._PendingCompositeOutput(data) for data in (b"a", b"bad", b"b")]
+
+    capabilities._CompositeOutputBatcher()._flush("{}", batch, {})
+
+    assert [entry.cid for entry in batch] == ["bafy-a", None, "bafy-b"]
+    assert [str(entry.error) if entry.error else None for entry in batch] == [
+        None,
+        "rejected",
+        None,
+    ]
+    assert all(entry.done for entry in batch)
+
+
 def test_execute_github_accelerated_failure_explain(monkeypatch):
     """Accelerated failure analysis should use ipfs_accelerate for synthesis."""
 
@@ -0,0 +1,197 @@
+"""Tests for the persistent CI failure similarity index."""
+
+import random
+import uuid
+
+import pytest
+
+from handsfree.ai import failure_index as failure_index_module
+from handsfree.ai import ranking
+from handsfree.ai.capabilities import execute_ai_capability
+from handsfree.ai.failure_index import (
+    FailureVectorIndex,
+    get_failure_index,
+    reset_failure_index_cache,
+)
+from handsfree.ai_history_maintenance import AIHistoryMaintenance
+from handsfree.db import init_db
+from handsfree.db.ai_history_index import store_ai_history_record
+
+requires_numpy = pytest.mark.skipif(not ranking.NUMPY_AVAILABLE, reason="numpy not installed")
+
+
+def _candidate(summary: str) -> dict:
+    return {"summary": summary, "match_text": summary, "repo": "openai/example"}
+
+
+def _clustered_vectors(count: int, dimensions: int, clusters: int, seed: int = 5):
+    rng = random.Random(seed)
+    centers = [[rng.gauss(0, 1) for _ in range(dimensions)] for _ in range(clusters)]
+    return [
+        [value + rng.gauss(0, 0.35) for value in centers[index % clusters]]
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def failure_index_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("HANDSFREE_AI_FAILURE_INDEX_PATH", str(tmp_path / "failure_index"))
+    reset_failure_index_cache()
+    yield tmp_path / "failure_index"
+    reset_failure_index_cache()
+
+
+def test_index_persists_and_drops_torn_trailing_rows(tmp_path):
+    index = FailureVectorIndex(tmp_path)
+    assert index.add("cid-a", _candidate("alpha"), [1.0, 0.0])
+    assert index.add("cid-b", _candidate("beta"), [0.0, 2.0])
+    assert not index.add("cid-a", _candidate("alpha again"), [1.0, 0.0])
+    assert not index.add("cid-c", _candidate("wrong size"), [1.0, 0.0, 0.0])
+
+    # Simulate a crash midway through appending a third row.
+    with open(tmp_path / "vectors.f32", "ab") as handle:
+        handle.write(b"\x00\x00")
+
+    reopened = FailureVectorIndex(tmp_path)
+    assert len(reopened) == 2
+    assert reopened.get("cid-b")["summary"] == "beta"
+    assert reopened.search([0.0, 1.0], top_k=1) == [("cid-b", pytest.approx(1.0))]
+    assert (tmp_path / "vectors.f32").stat().st_size == 2 * 2 * 4
+
+    assert reopened.add("cid-c", _candidate("gamma"), [1.0, 1.0])
+    assert len(FailureVectorIndex(tmp_path)) == 3
+
+
+def test_search_can_be_restricted_to_cids(tmp_path):
+    index = FailureVectorIndex(tmp_path)
+    for position, vector in enumerate([[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]]):
+        index.add(f"cid-{position}", _candidate(str(position)), vector)
+
+    assert [cid for cid, _ in index.search([1.0, 0.0], top_k=2)] == ["cid-0", "cid-1"]
+    assert [cid for cid, _ in index.search([1.0, 0.0], cids=["cid-2", "cid-1", "nope"])] == [
+        "cid-1",
+        "cid-2",
+    ]
+    assert index.search([1.0, 0.0], cids=["nope"]) == []
+    assert index.partition(["cid-1", "x", "cid-1"]) == (["cid-1"], ["x"])
+
+
+@requires_numpy
+def test_ivf_search_recall_matches_exact_search(tmp_path, monkeypatch):
+    monkeypatch.setattr(failure_index_module, "EXACT_SEARCH_MAX_ROWS", 0)
+    vectors = _clustered_vectors(1220, 16, clusters=24)
+    vectors, queries = vectors[:1200], vectors[1200:]
+    index = FailureVectorIndex(tmp_path, nprobe=4)
+    for position, vector in enumerate(vectors):
+        index.add(f"cid-{position}", _candidate(str(position)), vector)
+    assert index.train(nlist=24)
+
+    hits = 0
+    for query in queries:
+        exact = {cid for cid, _ in index.search(query, top_k=10, exact=True)}
+        approximate = {cid for cid, _ in index.search(query, top_k=10)}
+        hits += len(exact & approximate)
+    assert hits / (10 * len(queries)) >= 0.9
+
+    # Rows added after training are assigned to lists and survive a reload.
+    index.add("cid-new", _candidate("new"), queries[0])
+    reopened = FailureVectorIndex(tmp_path, nprobe=4)
+    assert reopened.trained
+    assert reopened.search(queries[0], top_k=1)[0][0] == "cid-new"
+
+
+def test_index_is_disabled_for_in_memory_database(monkeypatch):
+    monkeypatch.delenv("HANDSFREE_AI_FAILURE_INDEX_PATH", raising=False)
+    monkeypatch.setenv("DUCKDB_PATH", ":memory:")
+    assert get_failure_index() is None
+    monkeypatch.setenv("HANDSFREE_AI_FAILURE_INDEX_PATH", "")
+    assert get_failure_index() is None
+
+
+def test_stored_history_is_indexed_and_served_without_ipfs_reads(failure_index_dir, monkeypatch):
+    class StubEmbeddingsRouter:
+        def embed_text(self, text: str, **kwargs: object) -> list[float]:
+            if "status=" in text or "failure focus" in text:
+                # The current failure context.
+                return [1.0, 0.1]
+            return [1.0, 0.0] if "Dependency" in text else [0.0, 1.0]
+
+        def embed_texts(self, texts: list[str], **kwargs: object) -> list[list[float]]:
+            return [self.embed_text(text) for text in texts]
+
+    class StubIPFSRouter:
+        def cat(self, cid: str) -> bytes:
+            assert cid == "bafy-unindexed"
+            return b'{"metadata":{"pr_number":97},"payload":{"summary":"Lint drift."}}'
+
+    monkeypatch.setattr(
+        "handsfree.ipfs_datasets_routers.get_embeddings_router", StubEmbeddingsRouter
+    )
+    monkeypatch.setattr("handsfree.ai.capabilities.get_embeddings_router", StubEmbeddingsRouter)
+    monkeypatch.setattr("handsfree.ai.capabilities.get_ipfs_router", StubIPFSRouter)
+
+    conn = init_db(":memory:")
+    for cid, pr_number, summary in [
+        ("bafy-dependency", 101, "Dependency install failed."),
+        ("bafy-snapshot", 99, "Snapshot changed."),
+    ]:
+        store_ai_history_record(
+            conn,
+            user_id=str(uuid.uuid4()),
+            capability_id="github.check.failure_rag_explain",
+            ipfs_cid=cid,
+            repo="openai/example",
+            pr_number=pr_number,
+            summary=summary,
+        )
+    # Storing only queues the records; the maintenance job embeds them.
+    assert len(get_failure_index()) == 0
+    assert AIHistoryMaintenance(conn).run_once()["indexed"] == 2
+    assert len(get_failure_index()) == 2
+
+    result = execute_ai_capability(
+        "github.check.find_similar_failures",
+        pr_number=125,
+        history_cids=["bafy-snapshot", "bafy-dependency", "bafy-unindexed"],
+        top_k=2,
+    )
+
+    matches = result.output["ranked_matches"]
+    assert [match["pr_number"] for match in matches] == [101, 99]
+    assert matches[0]["summary"] == "Dependency install failed."
+    index_trace = result.trace["steps"]["retrieval"]["failure_index"]
+    assert index_trace == {"indexed_cids": 2, "loaded_cids": 1, "size": 3, "ivf": False}
+    assert "bafy-unindexed" in get_failure_index()
+
+
+def test_index_is_keyed_on_the_backend_model(failure_index_dir, monkeypatch):
+    identity = {"model": "local/mini"}
+
+    class StubEmbeddingsRouter:
+        def model_identity(self) -> str:
+            return identity["model"]
+
+    monkeypatch.setattr(
+        "handsfree.ipfs_datasets_routers.get_embeddings_router", StubEmbeddingsRouter
+    )
+    mini = get_failure_index()
+    pinned = get_failure_index({"model": "local/mini"})
+    assert get_failure_index() is mini
+
+    identity["model"] = "local/large"
+    assert get_failure_index() is not mini
+    # Options that name the model are unaffected by the backend default.
+    assert get_failure_index({"model": "local/mini"}) is pinned
+
+
+def test_rows_appended_by_another_process_for_the_same_cid_load_once(tmp_path):
+    first = FailureVectorIndex(tmp_path)
+    second = FailureVectorIndex(tmp_path)
+    first.add("bafy-a", _candidate("a"), [1.0, 0.0])
+    second.add("bafy-a", _candidate("a"), [1.0, 0.0])
+    second.add("bafy-b", _candidate("b"), [0.0, 1.0])
+
+    reopened = FailureVectorIndex(tmp_path)
+    assert len(reopened) == 2
+    assert [cid for cid, _ in reopened.search([0.0, 1.0])] == ["bafy-b", "bafy-a"]
+    assert (tmp_path / ".lock").exists()
@@ -5,6 +5,7 @@ import uuid
 from handsfree.ai.history import discover_failure_history_cids
 from handsfree.db import init_db
 from handsfree.db.action_logs import write_action_log
+from handsfree.db.ai_history_index import backfill_ai_history_index
 
 
 def test_discover_failure_history_cids_filters_by_repo_and_target() -> None:
@@ -57,15 +58,19 @@ def test_discover_failure_history_cids_filters_by_repo_and_target() -> None:
         },
     )
 
-    discovered = discover_failure_history_cids(
-        db,
-        user_id=user_id,
-        repo="openai/example",
-        pr_number=125,
-        workflow_name="CI Linux",
-    )
+    def discover() -> list[str]:
+        return discover_failure_history_cids(
+            db,
+            user_id=user_id,
+            repo="openai/example",
+            pr_number=125,
+            workflow_name="CI Linux",
+        )
 
-    assert discovered == ["bafy-keep"]
+    # Lookups only read the index; the maintenance backfill indexes the logs.
+    assert discover() == []
+    backfill_ai_history_index(db)
+    assert discover() == ["bafy-keep"]
     db.close()
 
 
@@ -89,6 +94,7 @@ def test_discover_failure_history_cids_reads_typed_output_fallback() -> None:
         },
     )
 
+    backfill_ai_history_index(db)
     discovered = discover_failure_history_cids(
         db,
         user_id=user_id,
@@ -3,8 +3,13 @@
 import uuid
 from datetime import UTC, datetime, timedelta
 
+from handsfree.ai_history_maintenance import AIHistoryMaintenance
 from handsfree.db import init_db
+from handsfree.db.action_logs import write_action_log
 from handsfree.db.ai_history_index import (
+    ai_history_backfill_complete,
+    backfill_ai_history_index,
+    compact_ai_history_index,
     get_ai_history_records,
     prune_ai_history_records,
     prune_ai_history_records_to_limit,
@@ -136,7 +141,7 @@ def test_prune_ai_history_records_removes_old_rows() -> None:
     db.close()
 
 
-def test_store_ai_history_record_can_prune_via_env(monkeypatch) -> None:
+def test_maintenance_prunes_expired_records_via_env(monkeypatch) -> None:
     db = init_db(":memory:")
     user_id = str(uuid.uuid4())
 
@@ -164,7 +169,9 @@ def test_store_ai_history_record_can_prune_via_env(monkeypatch) -> None:
         failure_target_type="workflow",
         ipfs_cid="bafy-fresh",
     )
+    assert len(get_ai_history_records(db, user_id=user_id)) == 2
 
+    summary = AIHistoryMaintenance(db).run_once()
     records = get_ai_history_records(
         db,
         user_id=user_id,
@@ -172,6 +179,7 @@ def test_store_ai_history_record_can_prune_via_env(monkeypatch) -> None:
     )
 
     assert [record.ipfs_cid for record in records] == ["bafy-fresh"]
+    assert summary["removed"]["expired"] == 1
     db.close()
 
 
@@ -234,7 +242,7 @@ def test_prune_ai_history_records_to_limit_keeps_newest_records() -> None:
     db.close()
 
 
-def test_store_ai_history_record_can_prune_to_env_max_records(monkeypatch) -> None:
+def test_maintenance_prunes_to_env_max_records(monkeypatch) -> None:
     db = init_db(":memory:")
     user_id = str(uuid.uuid4())
     monkeypatch.setenv("HANDSFREE_AI_HISTORY_MAX_RECORDS_PER_USER", "2")
@@ -270,6 +278,7 @@ def test_store_ai_history_record_can_prune_to_env_max_records(monkeypatch) -> No
         ipfs_cid="bafy-three",
     )
 
+    AIHistoryMaintenance(db).run_once()
     records = get_ai_history_records(
         db,
         user_id=user_id,
@@ -278,3 +287,66 @@ def test_store_ai_history_record_can_prune_to_env_max_records(monkeypatch) -> No
 
     assert [record.ipfs_cid for record in records] == ["bafy-three", "bafy-two"]
     db.close()
+
+
+def test_compaction_removes_duplicates_in_bounded_batches() -> None:
+    db = init_db(":memory:")
+    user_id = str(uuid.uuid4())
+    base_time = datetime.now(UTC) - timedelta(hours=1)
+    for offset in range(5):
+        db.execute(
+            """
+            INSERT INTO ai_history_index (id, user_id, capability_id, ipfs_cid, created_at)
+            VALUES (?, ?, 'github.check.failure_rag_explain', 'bafy-dup', ?)
+            """,
+            [str(uuid.uuid4()), user_id, base_time + timedelta(minutes=offset)],
+        )
+
+    first_pass = compact_ai_history_index(db, batch_size=3)
+    second_pass = compact_ai_history_index(db, batch_size=3)
+    final_pass = compact_ai_history_index(db, batch_size=3)
+    records = get_ai_history_records(db, user_id=user_id)
+
+    assert (first_pass.duplicates, second_pass.duplicates, final_pass.total) == (3, 1, 0)
+    assert len(records) == 1
+    assert records[0].created_at == base_time
+    db.close()
+
+
+def test_backfill_indexes_action_logs_resuming_from_cursor() -> None:
+    db = init_db(":memory:")
+    user_id = str(uuid.uuid4())
+
+    def log_failure_analysis(cid: str) -> None:
+        write_action_log(
+            db,
+            user_id=user_id,
+            action_type="ai.execute.github.check.failure_rag_explain",
+            ok=True,
+            result={"output": {"repo": "openai/example", "pr_number": 7, "ipfs_cid": cid}},
+        )
+
+    for cid in ("bafy-a", "bafy-b", "bafy-a", "bafy-c"):
+        log_failure_analysis(cid)
+
+    assert backfill_ai_history_index(db, batch_size=2, max_batches=1) == 2
+    assert not ai_history_backfill_complete(db)
+    assert backfill_ai_history_index(db, batch_size=2) == 2
+    assert ai_history_backfill_complete(db)
+
+    assert backfill_ai_history_index(db, batch_size=2) == 0
+
+    # A later log whose write-path indexing failed is picked up from the cursor.
+    log_failure_analysis("bafy-after")
+    assert backfill_ai_history_index(db, batch_size=2) == 1
+    assert ai_history_backfill_complete(db)
+
+    records = get_ai_history_records(db, user_id=user_id)
+    assert sorted(record.ipfs_cid for record in records) == [
+        "bafy-a",
+        "bafy-after",
+        "bafy-b",
+        "bafy-c",
+    ]
+    assert {record.repo for record in records} == {"openai/example"}
+    db.close()
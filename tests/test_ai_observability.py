@@ -12,6 +12,7 @@ from handsfree.ai.observability import (
 from handsfree.db import init_db
 from handsfree.db.action_logs import write_action_log
 from handsfree.db.ai_backend_policy_snapshots import store_ai_backend_policy_snapshot
+from handsfree.db.ai_policy_rollups import rebuild_ai_policy_rollups
 from handsfree.github.auth import GhCliTokenProvider
 
 
@@ -83,7 +84,8 @@ def test_build_ai_backend_policy_report_returns_typed_summary(db_conn, monkeypat
     assert report.policy.snapshot_retention_days == 30
     assert report.policy.snapshot_max_records_per_user == 25
     assert report.policy.snapshot_min_interval_seconds == 300
-    assert report.recent_window.log_limit == 50
+    with pytest.deprecated_call():
+        assert report.recent_window.log_limit == 50
     assert report.recent_window.ai_execute_logs == 2
     assert report.recent_window.policy_applied_count == 1
     assert [(item.capability_id, item.count) for item in report.top_capabilities.overall] == [
@@ -238,6 +240,8 @@ def test_build_ai_backend_policy_report_includes_time_buckets(db_conn, monkeypat
         "UPDATE action_logs SET created_at = ? WHERE id = ?",
         [datetime.now(UTC) - timedelta(days=2), recent.id],
     )
+    # Backdating logs in SQL bypasses the write-time rollup update.
+    rebuild_ai_policy_rollups(db_conn, user_id=user_id)
 
     latest = write_action_log(
         db_conn,
@@ -356,6 +360,7 @@ def test_build_ai_backend_policy_history_report_buckets_activity(db_conn, monkey
         "UPDATE action_logs SET created_at = ? WHERE id = ?",
         [now - timedelta(hours=1, minutes=15), second.id],
     )
+    rebuild_ai_policy_rollups(db_conn, user_id=user_id)
 
     report = build_ai_backend_policy_history_report(
         db_conn,
@@ -438,3 +443,62 @@ def test_build_ai_backend_policy_report_marks_latest_snapshot_stale_when_old(db_
     assert refreshed.latest_snapshot.freshness == "stale"
     assert refreshed.snapshot_health.status == "stale"
     assert refreshed.snapshot_summary.snapshot_health.status == "stale"
+
+
+def test_policy_rollups_cover_all_logs_and_match_a_rebuild(db_conn, monkeypatch):
+    """Rollups maintained on write should count every log and match a full rebuild."""
+    user_id = str(uuid.uuid4())
+    monkeypatch.setattr(GhCliTokenProvider, "get_token", lambda self: None)
+
+    for index in range(250):
+        applied = index % 5 == 0
+        write_action_log(
+            db_conn,
+            user_id=user_id,
+            action_type="ai.execute.github.pr.accelerated_summary",
+            ok=index % 7 != 0,
+            result={
+                "capability_id": "github.pr.accelerated_summary",
+                "policy_resolution": {
+                    "requested_workflow": "pr_rag_summary",
+                    "resolved_workflow": "accelerated_pr_summary" if applied else None,
+                    "policy_applied": applied,
+                },
+            },
+        )
+    write_action_log(db_conn, user_id=user_id, action_type="merge_pr", ok=True)
+
+    report = build_ai_backend_policy_report(db_conn, user_id=user_id, limit=200)
+
+    assert report.recent_window.ai_execute_logs == 250
+    assert report.recent_window.policy_applied_count == 50
+    assert report.remap_counts == {"pr_rag_summary->accelerated_pr_summary": 50}
+    assert report.direct_capability_counts == {"github.pr.accelerated_summary": 200}
+
+    query = "SELECT * FROM ai_policy_rollups ORDER BY ALL"
+    incremental = db_conn.execute(query).fetchall()
+    rebuild_ai_policy_rollups(db_conn)
+    assert db_conn.execute(query).fetchall() == incremental
+
+
+def test_build_ai_backend_policy_report_respects_window_hours(db_conn, monkeypatch):
+    """Overall counts should be limited to the requested window."""
+    user_id = str(uuid.uuid4())
+    monkeypatch.setattr(GhCliTokenProvider, "get_token", lambda self: None)
+    old = write_action_log(
+        db_conn, user_id=user_id, action_type="ai.execute.ipfs.llm.generate", ok=True
+    )
+    write_action_log(db_conn, user_id=user_id, action_type="ai.execute.ipfs.llm.generate", ok=True)
+    db_conn.execute(
+        "UPDATE action_logs SET created_at = ? WHERE id = ?",
+        [datetime.now(UTC) - timedelta(days=3), old.id],
+    )
+    rebuild_ai_policy_rollups(db_conn, user_id=user_id)
+
+    all_time = build_ai_backend_policy_report(db_conn, user_id=user_id)
+    last_day = build_ai_backend_policy_report(db_conn, user_id=user_id, window_hours=24)
+
+    assert all_time.action_counts == {"ai.execute.ipfs.llm.generate": 2}
+    assert last_day.action_counts == {"ai.execute.ipfs.llm.generate": 1}
+    assert last_day.recent_window.window_hours == 24
+    assert last_day.direct_capability_counts == {"ipfs.llm.generate": 1}
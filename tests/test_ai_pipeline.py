@@ -0,0 +1,136 @@
+"""Tests for the composite AI pipeline executor."""
+
+import threading
+import time
+
+import pytest
+
+from handsfree.ai.capabilities import execute_ai_capability
+from handsfree.ai.pipeline import CompositePipeline, PipelineStep
+
+
+def test_independent_steps_run_concurrently_and_feed_dependents():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(value: int):
+        def run(source: int) -> int:
+            barrier.wait()
+            return source + value
+
+        return run
+
+    pipeline = CompositePipeline(
+        [
+            PipelineStep("source", lambda: 1),
+            PipelineStep("left", branch(10), ("source",)),
+            PipelineStep("right", branch(20), ("source",)),
+            PipelineStep("total", lambda left, right: left + right, ("left", "right")),
+        ]
+    )
+    run = pipeline.run()
+
+    assert run["total"] == 32
+    assert set(run.timings_ms) == {"source", "left", "right", "total"}
+
+
+def test_targets_skip_steps_whose_outputs_are_unused():
+    calls = []
+
+    def step(name: str, result: int):
+        def run(**_: int) -> int:
+            calls.append(name)
+            return result
+
+        return run
+
+    pipeline = CompositePipeline(
+        [
+            PipelineStep("checks", step("checks", 1)),
+            PipelineStep("embeddings", step("embeddings", 2), ("checks",)),
+            PipelineStep("generate", step("generate", 3), ("checks",)),
+        ]
+    )
+    run = pipeline.run(["generate"])
+
+    assert sorted(calls) == ["checks", "generate"]
+    assert run.get("embeddings") is None
+    assert "embeddings" not in run.timings_ms
+
+
+def test_first_failure_is_raised_and_stops_later_steps():
+    calls = []
+
+    def fail() -> None:
+        raise RuntimeError("backend down")
+
+    pipeline = CompositePipeline(
+        [
+            PipelineStep("fail", fail),
+            PipelineStep("slow", lambda: time.sleep(0.05)),
+            PipelineStep("after", lambda fail: calls.append("after"), ("fail",)),
+        ]
+    )
+    with pytest.raises(RuntimeError, match="backend down"):
+        pipeline.run()
+    assert calls == []
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        CompositePipeline([PipelineStep("a", lambda b: b, ("b",))])
+    with pytest.raises(ValueError, match="cycle"):
+        CompositePipeline(
+            [
+                PipelineStep("a", lambda b: b, ("b",)),
+                PipelineStep("b", lambda a: a, ("a",)),
+            ]
+        )
+
+
+def test_failure_explain_embeds_while_generating(monkeypatch):
+    generating = threading.Event()
+
+    class StubEmbeddingsRouter:
+        def embed_text(self, text, **kwargs):
+            assert generating.wait(timeout=5)
+            return [1.0, 0.0, 0.0]
+
+    class StubLLMRouter:
+        def generate_text(self, prompt, **kwargs):
+            generating.set()
+            return "The lint job failed."
+
+    monkeypatch.setattr("handsfree.ai.capabilities.get_embeddings_router", StubEmbeddingsRouter)
+    monkeypatch.setattr("handsfree.ai.capabilities.get_llm_router", StubLLMRouter)
+
+    result = execute_ai_capability("github.check.failure_rag_explain", pr_number=88)
+
+    assert result.output["embedding_dimensions"] == 3
+    assert set(result.output["trace"]["timings_ms"]) == {
+        "github_checks",
+        "embeddings",
+        "llm",
+        "ipfs_persist",
+    }
+
+
+@pytest.mark.parametrize(
+    "capability_id", ["github.pr.rag_summary", "github.check.failure_rag_explain"]
+)
+def test_composite_pipelines_report_embedding_dimensions_by_default(monkeypatch, capability_id):
+    class StubEmbeddingsRouter:
+        def embed_text(self, text, **kwargs):
+            return [0.1, 0.2]
+
+    class StubLLMRouter:
+        def generate_text(self, prompt, **kwargs):
+            return "Generated."
+
+    monkeypatch.setattr("handsfree.ai.capabilities.get_embeddings_router", StubEmbeddingsRouter)
+    monkeypatch.setattr("handsfree.ai.capabilities.get_llm_router", StubLLMRouter)
+
+    result = execute_ai_capability(capability_id, pr_number=123)
+
+    assert result.output["embedding_dimensions"] == 2
+    assert result.output["trace"]["steps"]["embeddings"]["dimensions"] == 2
+    assert "embeddings" in result.output["trace"]["timings_ms"]
@@ -0,0 +1,79 @@
+"""Tests for vectorized and pure-Python similarity ranking."""
+
+import random
+
+import pytest
+
+from handsfree.ai import ranking
+from handsfree.ai.ranking import (
+    VECTORIZED_MIN_CANDIDATES,
+    cosine_similarity,
+    rank_by_similarity,
+    rank_by_similarity_numpy,
+    rank_by_similarity_python,
+)
+
+requires_numpy = pytest.mark.skipif(not ranking.NUMPY_AVAILABLE, reason="numpy not installed")
+
+
+def _vectors(count: int, dimensions: int, seed: int = 7) -> list[list[float]]:
+    rng = random.Random(seed)
+    return [[rng.uniform(-1, 1) for _ in range(dimensions)] for _ in range(count)]
+
+
+def test_cosine_similarity_handles_degenerate_vectors():
+    assert cosine_similarity([1.0, 0.0], [1.0, 0.0]) == pytest.approx(1.0)
+    assert cosine_similarity([1.0, 0.0], [0.0, 1.0]) == 0.0
+    assert cosine_similarity([], [1.0]) == 0.0
+    assert cosine_similarity([1.0], [1.0, 2.0]) == 0.0
+    assert cosine_similarity([0.0, 0.0], [1.0, 1.0]) == 0.0
+
+
+def test_python_ranking_sorts_descending_and_keeps_ties_in_order():
+    ranked = rank_by_similarity_python([1.0, 0.0], [[0.0, 1.0], [1.0, 0.0], [2.0, 0.0]], top_k=2)
+
+    assert [index for index, _ in ranked] == [1, 2]
+    assert rank_by_similarity_python([1.0, 0.0], [[0.0, 1.0]], top_k=0) == [(0, 0.0)]
+
+
+@requires_numpy
+@pytest.mark.parametrize("top_k", [None, 1, 5, 64, 500])
+def test_numpy_ranking_matches_python_ranking(top_k):
+    candidates = _vectors(64, 24)
+    query = _vectors(1, 24, seed=11)[0]
+    candidates[10] = [0.0] * 24
+    candidates[20] = list(candidates[3])
+
+    expected = rank_by_similarity_python(query, candidates, top_k)
+    actual = rank_by_similarity_numpy(query, candidates, top_k)
+
+    assert [index for index, _ in actual] == [index for index, _ in expected]
+    assert [score for _, score in actual] == pytest.approx([score for _, score in expected])
+    assert all(isinstance(score, float) for _, score in actual)
+
+
+@requires_numpy
+def test_numpy_top_k_keeps_earliest_of_tied_candidates():
+    candidates = [[0.0, 1.0]] * 20 + [[1.0, 0.0]] * 20
+
+    ranked = rank_by_similarity_numpy([1.0, 0.0], candidates, top_k=3)
+
+    assert ranked == rank_by_similarity_python([1.0, 0.0], candidates, top_k=3)
+    assert [index for index, _ in ranked] == [20, 21, 22]
+
+
+@requires_numpy
+def test_numpy_ranking_defers_ragged_or_zero_query_inputs():
+    assert rank_by_similarity_numpy([1.0, 0.0], [[1.0, 0.0], [1.0]]) is None
+    ranked = rank_by_similarity_numpy([0.0, 0.0], [[1.0, 0.0], [0.0, 1.0]])
+    assert ranked == [(0, 0.0), (1, 0.0)]
+
+
+def test_rank_by_similarity_falls_back_without_numpy(monkeypatch):
+    monkeypatch.setattr(ranking, "np", None)
+    candidates = _vectors(VECTORIZED_MIN_CANDIDATES * 2, 8)
+    query = _vectors(1, 8, seed=3)[0]
+
+    assert rank_by_similarity(query, candidates, 3) == rank_by_similarity_python(
+        query, candidates, 3
+    )
@@ -0,0 +1,170 @@
+"""Tests for the bulkheaded backend executor pools."""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import handsfree.handlers.ipfs_integration as ipfs_integration
+from handsfree.backend_pools import (
+    BackendPool,
+    BackendPoolSaturatedError,
+    BackendPoolTimeoutError,
+    get_backend_pool,
+    reset_backend_pools,
+)
+from handsfree.metrics import get_metrics_collector
+
+
+@pytest.fixture(autouse=True)
+def _reset_pools():
+    reset_backend_pools()
+    get_metrics_collector().reset()
+    yield
+    reset_backend_pools()
+
+
+def test_full_pool_rejects_immediately_and_reports_utilization():
+    release = threading.Event()
+    pool = BackendPool("slow", max_workers=1, max_queue=1)
+    try:
+        running = pool.submit(release.wait, 5)
+        queued = pool.submit(lambda: "queued")
+        with pytest.raises(BackendPoolSaturatedError):
+            pool.submit(lambda: "rejected")
+
+        pools = get_metrics_collector().get_snapshot()["backend_pools"]
+        assert pools["slow"]["outcomes"] == {"rejected": 1}
+        assert pools["slow"]["queued"] == 1
+        assert pools["slow"]["utilization"] == 1.0
+
+        release.set()
+        assert running.result(timeout=5) is True
+        assert queued.result(timeout=5) == "queued"
+    finally:
+        release.set()
+        pool.shutdown()
+    assert pool.stats()["active"] == 0
+
+
+def test_deadline_times_out_and_cancels_queued_work():
+    release = threading.Event()
+    calls: list[str] = []
+    pool = BackendPool("stuck", max_workers=1, max_queue=4, deadline_seconds=0.05)
+
+    async def scenario() -> None:
+        pool.submit(release.wait, 5)
+        with pytest.raises(BackendPoolTimeoutError):
+            await pool.run(calls.append, "late")
+
+    try:
+        asyncio.run(scenario())
+        assert pool.stats()["queued"] == 0
+        release.set()
+    finally:
+        release.set()
+        pool.shutdown()
+    assert calls == []
+    outcomes = get_metrics_collector().get_snapshot()["backend_pools"]["stuck"]["outcomes"]
+    assert outcomes["timed_out"] == 1
+
+
+def test_saturated_family_does_not_block_other_families(monkeypatch):
+    monkeypatch.setenv("HANDSFREE_BACKEND_POOL_IPFS_LLM_ROUTER_MAX_WORKERS", "1")
+    monkeypatch.setenv("HANDSFREE_BACKEND_POOL_IPFS_LLM_ROUTER_MAX_QUEUE", "0")
+    release = threading.Event()
+
+    class StubLLMRouter:
+        def generate_text(self, prompt, **kwargs):
+            return "generated"
+
+    class StubEmbeddingsRouter:
+        def embed_texts(self, texts, **kwargs):
+            return [[1.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(ipfs_integration, "get_llm_router", StubLLMRouter)
+    monkeypatch.setattr(ipfs_integration, "get_embeddings_router", StubEmbeddingsRouter)
+    app = FastAPI()
+    app.include_router(ipfs_integration.router)
+    client = TestClient(app)
+
+    llm_pool = get_backend_pool("ipfs_llm_router")
+    assert llm_pool.max_workers == 1
+    llm_pool.submit(release.wait, 5)
+    try:
+        response = client.post("/v1/ipfs/generate", json={"prompt": "hi"})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+        response = client.post("/v1/ipfs/embed", json={"texts": ["a", "b"]})
+        assert response.status_code == 200
+        assert response.json()["embeddings"] == [[1.0, 0.0], [1.0, 0.0]]
+    finally:
+        release.set()
+
+    pools = get_metrics_collector().get_snapshot()["backend_pools"]
+    assert pools["ipfs_llm_router"]["outcomes"]["rejected"] == 1
+    assert pools["ipfs_embeddings_router"]["outcomes"]["completed"] == 1
+
+
+def test_ai_voice_commands_route_on_their_backend_family_pool(monkeypatch):
+    import handsfree.api as api_module
+    from handsfree.commands.router import CommandRouter
+
+    api_module._db_conn = None
+    api_module._command_router = None
+    base_conn = api_module.get_db()
+    seen: list[tuple[str, str, bool]] = []
+    original_route = CommandRouter.route
+
+    def recording_route(self, intent, *args, **kwargs):
+        seen.append((intent.name, threading.current_thread().name, self.db_conn is base_conn))
+        return original_route(self, intent, *args, **kwargs)
+
+    monkeypatch.setattr(CommandRouter, "route", recording_route)
+    client = TestClient(api_module.app)
+
+    def post(text: str):
+        return client.post(
+            "/v1/command",
+            json={
+                "input": {"type": "text", "text": text},
+                "profile": "default",
+                "client_context": {
+                    "device": "simulator",
+                    "locale": "en-US",
+                    "timezone": "America/Los_Angeles",
+                    "app_version": "0.1.0",
+                },
+            },
+        )
+
+    try:
+        assert post("explain pr 123").status_code == 200
+        assert post("inbox").status_code == 200
+        (ai_name, ai_thread, ai_on_base), (name, thread, on_base) = seen
+        assert ai_name == "ai.explain_pr"
+        assert ai_thread.startswith("handsfree-pool-copilot_cli")
+        assert not ai_on_base
+        assert name == "inbox.list"
+        assert not thread.startswith("handsfree-pool-")
+        assert on_base
+
+        # A saturated family rejects its own voice commands but not other families'.
+        monkeypatch.setenv("HANDSFREE_BACKEND_POOL_COPILOT_CLI_MAX_WORKERS", "1")
+        monkeypatch.setenv("HANDSFREE_BACKEND_POOL_COPILOT_CLI_MAX_QUEUE", "0")
+        reset_backend_pools()
+        release = threading.Event()
+        get_backend_pool("copilot_cli").submit(release.wait, 5)
+        try:
+            assert post("explain pr 123").status_code == 503
+            assert post("read summary from cid bafy123").status_code == 200
+            assert seen[-1][0] == "ai.read_cid"
+            assert seen[-1][1].startswith("handsfree-pool-ipfs_content_router")
+        finally:
+            release.set()
+    finally:
+        api_module._db_conn = None
+        api_module._command_router = None
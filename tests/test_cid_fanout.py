@@ -0,0 +1,130 @@
+"""Tests for bounded parallel CID loading."""
+
+import threading
+import time
+
+from handsfree.ai.capabilities import execute_ai_capability
+from handsfree.cid_fanout import load_cids
+
+
+def test_partial_results_keep_request_order_and_record_errors():
+    def loader(cid: str) -> str:
+        if cid == "bad":
+            raise KeyError(cid)
+        time.sleep(0.02 if cid == "slow" else 0)
+        return cid.upper()
+
+    result = load_cids(["slow", " fast ", "bad", "", None, "fast"], loader)
+
+    assert list(result.values) == ["slow", "fast"]
+    assert result.values["slow"] == "SLOW"
+    assert result.errors == {"bad": "KeyError: 'bad'"}
+    assert result.as_trace()["requested"] == 3
+
+
+def test_concurrency_is_bounded():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def loader(cid: str) -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return cid
+
+    started = time.monotonic()
+    result = load_cids([f"cid-{index}" for index in range(12)], loader, max_concurrency=4)
+
+    assert len(result.values) == 12
+    assert peak == 4
+    assert time.monotonic() - started < 12 * 0.02
+
+
+def test_slow_cid_times_out_without_stalling_others():
+    release = threading.Event()
+
+    def loader(cid: str) -> str:
+        if cid == "stuck":
+            release.wait(timeout=5)
+        return cid
+
+    started = time.monotonic()
+    result = load_cids(["a", "stuck", "b"], loader, timeout_seconds=0.1)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert list(result.values) == ["a", "b"]
+    assert result.timed_out == ["stuck"]
+    assert result.errors["stuck"].startswith("TimeoutError")
+    assert elapsed < 1
+
+
+def test_find_similar_failures_skips_unreadable_history_cids(monkeypatch):
+    class StubEmbeddingsRouter:
+        def embed_texts(self, texts, **kwargs):
+            return [[1.0, 0.0] for _ in texts]
+
+    class StubIPFSRouter:
+        def cat(self, cid: str) -> bytes:
+            if cid == "bafy-missing":
+                raise FileNotFoundError(cid)
+            return b'{"metadata":{"pr_number":101},"payload":{"summary":"Stored failure."}}'
+
+    monkeypatch.setattr("handsfree.ai.capabilities.get_embeddings_router", StubEmbeddingsRouter)
+    monkeypatch.setattr("handsfree.ai.capabilities.get_ipfs_router", StubIPFSRouter)
+
+    result = execute_ai_capability(
+        "github.check.find_similar_failures",
+        pr_number=125,
+        history_cids=["bafy-missing", "bafy-history-1"],
+    )
+
+    assert [match["pr_number"] for match in result.output["ranked_matches"]] == [101]
+    history_trace = result.trace["steps"]["retrieval"]["history_cids"]
+    assert history_trace["loaded"] == 1
+    assert history_trace["errors"] == {"bafy-missing": "FileNotFoundError: bafy-missing"}
+
+
+def test_deadline_fails_queued_cids_when_every_slot_hangs():
+    release = threading.Event()
+
+    def loader(cid: str) -> str:
+        if cid.startswith("stuck"):
+            release.wait(timeout=5)
+        return cid
+
+    started = time.monotonic()
+    result = load_cids(
+        ["stuck-1", "stuck-2", "queued"],
+        loader,
+        max_concurrency=2,
+        timeout_seconds=0,
+        deadline_seconds=0.1,
+    )
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert result.values == {}
+    assert result.timed_out == ["stuck-1", "stuck-2", "queued"]
+    assert result.errors["queued"] == "TimeoutError: not loaded within the 0.1s deadline"
+    assert elapsed < 1
+
+
+def test_timed_out_loads_release_their_slot():
+    release = threading.Event()
+
+    def loader(cid: str) -> str:
+        if cid == "stuck":
+            release.wait(timeout=5)
+        return cid
+
+    result = load_cids(["stuck", "a", "b"], loader, max_concurrency=1, timeout_seconds=0.1)
+    release.set()
+
+    assert list(result.values) == ["a", "b"]
+    assert result.timed_out == ["stuck"]
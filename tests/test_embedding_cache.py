@@ -0,0 +1,151 @@
+"""Tests for the content-addressed embedding cache."""
+
+import sys
+from types import ModuleType
+
+import handsfree.ipfs_datasets_routers as routers
+from handsfree.embedding_cache import (
+    CachedEmbeddingsRouter,
+    DuckDBEmbeddingStore,
+    EmbeddingCache,
+    embedding_cache_key,
+)
+
+
+class _CountingRouter:
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+        self.singles: list[str] = []
+
+    def embed_text(self, text, **kwargs):
+        self.singles.append(text)
+        return [float(len(text)), float(len(kwargs))]
+
+    def embed_texts(self, texts, **kwargs):
+        self.batches.append(list(texts))
+        return [[float(len(text)), float(len(kwargs))] for text in texts]
+
+
+def test_only_deduplicated_misses_reach_backend_in_one_batch():
+    backend = _CountingRouter()
+    router = CachedEmbeddingsRouter(backend, EmbeddingCache())
+
+    assert router.embed_texts(["a", "bb", "a"]) == [[1.0, 0.0], [2.0, 0.0], [1.0, 0.0]]
+    assert router.embed_texts(["bb", "ccc", "a", "ccc"]) == [
+        [2.0, 0.0],
+        [3.0, 0.0],
+        [1.0, 0.0],
+        [3.0, 0.0],
+    ]
+    assert router.embed_texts(["ccc"]) == [[3.0, 0.0]]
+    assert router.embed_text("bb") == [2.0, 0.0]
+
+    assert backend.batches == [["a", "bb"], ["ccc"]]
+    assert backend.singles == []
+    assert router.cache.stats.misses == 3
+
+
+def test_options_and_model_are_part_of_the_key():
+    backend = _CountingRouter()
+    router = CachedEmbeddingsRouter(backend, EmbeddingCache())
+
+    router.embed_text("hello")
+    router.embed_text("hello", model_name="mini")
+    router.embed_text("hello", model_name="mini", normalize=True)
+    router.embed_text("hello", model_name="mini")
+
+    assert backend.singles == ["hello", "hello", "hello"]
+    assert embedding_cache_key("hello", {"model_name": "mini"})[0] == "mini"
+    assert embedding_cache_key("hello", {"b": 1, "a": 2}) == embedding_cache_key(
+        "hello", {"a": 2, "b": 1}
+    )
+
+
+def test_lru_evicts_oldest_and_store_persists_across_caches(tmp_path):
+    path = str(tmp_path / "embedding_cache.duckdb")
+    backend = _CountingRouter()
+    router = CachedEmbeddingsRouter(
+        backend, EmbeddingCache(store=DuckDBEmbeddingStore(path), max_entries=2)
+    )
+    router.embed_texts(["a", "bb", "ccc"])
+
+    assert len(router.cache) == 2
+    assert router.embed_texts(["a"]) == [[1.0, 0.0]]
+    assert router.cache.stats.store_hits == 1
+    router.cache.store.close()
+
+    reopened = CachedEmbeddingsRouter(backend, EmbeddingCache(store=DuckDBEmbeddingStore(path)))
+    assert reopened.embed_texts(["ccc", "bb"]) == [[3.0, 0.0], [2.0, 0.0]]
+    assert backend.batches == [["a", "bb", "ccc"]]
+
+
+def test_unexpected_backend_output_is_not_cached():
+    class _OddRouter:
+        calls = 0
+
+        def embed_texts(self, texts, **kwargs):
+            self.calls += 1
+            return {"vectors": texts}
+
+    backend = _OddRouter()
+    router = CachedEmbeddingsRouter(backend, EmbeddingCache())
+
+    assert router.embed_texts(["a"]) == {"vectors": ["a"]}
+    assert router.embed_texts(["a"]) == {"vectors": ["a"]}
+    assert backend.calls == 2
+    assert len(router.cache) == 0
+
+
+def test_embeddings_router_is_cached_unless_disabled(monkeypatch):
+    module = ModuleType("ipfs_datasets_py.embeddings_router")
+    calls: list[list[str]] = []
+    module.embed_text = lambda text, **kwargs: [float(len(text))]
+    module.embed_texts = lambda texts, **kwargs: calls.append(texts) or [[1.0] for _ in texts]
+    monkeypatch.setitem(sys.modules, "ipfs_datasets_py.embeddings_router", module)
+
+    routers.reset_ipfs_datasets_router_caches()
+    router = routers.get_embeddings_router()
+    assert isinstance(router, CachedEmbeddingsRouter)
+    router.embed_texts(["x"])
+    router.embed_texts(["x"])
+    assert calls == [["x"]]
+
+    monkeypatch.setenv("HANDSFREE_EMBEDDING_CACHE_ENABLED", "false")
+    routers.reset_ipfs_datasets_router_caches()
+    assert not isinstance(routers.get_embeddings_router(), CachedEmbeddingsRouter)
+    routers.reset_ipfs_datasets_router_caches()
+
+
+def test_backend_default_model_is_part_of_the_key(tmp_path, monkeypatch):
+    path = str(tmp_path / "embedding_cache.duckdb")
+    store = DuckDBEmbeddingStore(path)
+    first = _CountingRouter()
+    first.model_identity = lambda: "local/mini"
+    CachedEmbeddingsRouter(first, EmbeddingCache(store=store)).embed_texts(["a"])
+
+    # Same options and text, but the backend now defaults to another model.
+    second = _CountingRouter()
+    second.model_identity = lambda: "local/large"
+    router = CachedEmbeddingsRouter(second, EmbeddingCache(store=store))
+    router.embed_texts(["a"])
+    assert second.batches == [["a"]]
+    assert router.model_identity() == "local/large"
+    assert store.count() == 2
+    store.close()
+
+    module = ModuleType("ipfs_datasets_py.embeddings_router")
+    module.embed_texts = lambda texts, **kwargs: [[1.0] for _ in texts]
+    monkeypatch.setitem(sys.modules, "ipfs_datasets_py.embeddings_router", module)
+    monkeypatch.setenv("HANDSFREE_EMBEDDING_CACHE_PATH", path)
+    routers.reset_ipfs_datasets_router_caches()
+    # Without a resolvable default model the cache is not persisted.
+    assert routers.get_embeddings_router().cache.store is None
+
+    module.DEFAULT_PROVIDER = "local"
+    module.get_default_model = lambda: "mini"
+    routers.reset_ipfs_datasets_router_caches()
+    router = routers.get_embeddings_router()
+    assert router.model_identity() == "local/mini"
+    assert router.cache.store is not None
+    router.cache.store.close()
+    routers.reset_ipfs_datasets_router_caches()
@@ -0,0 +1,138 @@
+"""Tests for incremental JSON/JSONL file readers."""
+
+import json
+import os
+
+import pytest
+
+from handsfree.file_tail import (
+    FileTailRegistry,
+    JsonDocument,
+    JsonlTail,
+    read_jsonl_records,
+)
+
+
+def _append(path, *records, raw: str = "") -> None:
+    with open(path, "a", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record) + "\n")
+        handle.write(raw)
+
+
+def test_jsonl_tail_parses_only_appended_lines(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "events.jsonl"
+    _append(path, {"n": 1}, {"n": 2})
+    tail = JsonlTail(path)
+
+    assert [record["n"] for record in tail.read()] == [1, 2]
+    first_offset = tail.offset
+
+    decoded: list[bytes] = []
+    real_loads = json.loads
+    monkeypatch.setattr(
+        "handsfree.file_tail.json.loads",
+        lambda raw: decoded.append(raw) or real_loads(raw),
+    )
+    _append(path, {"n": 3})
+
+    assert [record["n"] for record in tail.read()] == [1, 2, 3]
+    assert decoded == [b'{"n": 3}']
+    assert tail.offset > first_offset
+
+
+def test_jsonl_tail_holds_back_partial_line_and_skips_junk(tmp_path) -> None:
+    path = tmp_path / "events.jsonl"
+    _append(path, {"n": 1}, raw='not json\n\n[1, 2]\n{"n": ')
+    tail = JsonlTail(path)
+
+    assert tail.read() == [{"n": 1}]
+
+    _append(path, raw="2}\n")
+    assert tail.read() == [{"n": 1}, {"n": 2}]
+
+
+def test_jsonl_tail_returns_a_complete_final_record_without_newline(tmp_path) -> None:
+    path = tmp_path / "events.jsonl"
+    _append(path, {"n": 1}, raw='{"n": 2}')
+    tail = JsonlTail(path)
+
+    assert tail.read() == [{"n": 1}, {"n": 2}]
+    assert tail.read() == [{"n": 1}, {"n": 2}]
+
+    _append(path, {"n": 3})
+    assert tail.read() == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+
+def test_jsonl_tail_bounds_records_and_returns_copies(tmp_path) -> None:
+    path = tmp_path / "events.jsonl"
+    _append(path, *({"n": n} for n in range(5)))
+    tail = JsonlTail(path, max_records=3)
+
+    records = tail.read()
+    assert [record["n"] for record in records] == [2, 3, 4]
+
+    records[1]["n"] = "mutated"
+    _append(path, {"n": 5})
+    assert [record["n"] for record in tail.read()] == [3, 4, 5]
+
+
+def test_jsonl_tail_resets_on_truncation_and_rotation(tmp_path) -> None:
+    path = tmp_path / "events.jsonl"
+    _append(path, {"n": 1}, {"n": 2})
+    tail = JsonlTail(path)
+    assert len(tail.read()) == 2
+
+    path.write_text(json.dumps({"n": 9}) + "\n", encoding="utf-8")
+    assert tail.read() == [{"n": 9}]
+
+    rotated = tmp_path / "events.jsonl.new"
+    _append(rotated, {"n": 10}, {"n": 11}, {"n": 12})
+    os.replace(rotated, path)
+    assert [record["n"] for record in tail.read()] == [10, 11, 12]
+
+    path.unlink()
+    assert tail.read() == []
+
+
+def test_json_document_reparses_only_when_stamp_changes(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"status": "ready"}), encoding="utf-8")
+    old_ns = 1_000_000_000
+    os.utime(path, ns=(old_ns, old_ns))
+    document = JsonDocument(path)
+
+    assert document.read() == {"status": "ready"}
+
+    reads = []
+    real_read_text = type(path).read_text
+    monkeypatch.setattr(
+        type(path),
+        "read_text",
+        lambda self, *a, **kw: reads.append(self) or real_read_text(self, *a, **kw),
+    )
+    assert document.read() == {"status": "ready"}
+    assert reads == []
+
+    path.write_text(json.dumps({"status": "completed"}), encoding="utf-8")
+    assert document.read() == {"status": "completed"}
+    assert len(reads) == 1
+
+
+def test_json_document_preserves_read_errors(tmp_path) -> None:
+    path = tmp_path / "state.json"
+    with pytest.raises(FileNotFoundError):
+        JsonDocument(path).read()
+
+    path.write_text("{broken", encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        JsonDocument(path).read()
+
+
+def test_registry_shares_readers_per_path(tmp_path) -> None:
+    registry = FileTailRegistry()
+    path = tmp_path / "events.jsonl"
+
+    assert registry.jsonl(path) is registry.jsonl(str(path))
+    assert registry.json_document(path) is registry.json_document(str(path))
+    assert read_jsonl_records(None) == []
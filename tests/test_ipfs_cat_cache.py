@@ -0,0 +1,187 @@
+"""Tests for the immutable IPFS cat cache."""
+
+import base64
+import hashlib
+import sys
+import threading
+import time
+from types import ModuleType
+
+import pytest
+
+import handsfree.ipfs_datasets_routers as routers
+from handsfree.ipfs_cat_cache import (
+    CachedIPFSRouter,
+    CIDByteCache,
+    CIDVerificationError,
+    iter_byte_chunks,
+    verify_cid_bytes,
+)
+
+
+def _raw_cid(data: bytes) -> str:
+    encoded = base64.b32encode(bytes([0x01, 0x55, 0x12, 0x20]) + hashlib.sha256(data).digest())
+    return "b" + encoded.decode("ascii").lower().rstrip("=")
+
+
+class _CountingRouter:
+    def __init__(self, blocks: dict[str, bytes]) -> None:
+        self.blocks = blocks
+        self.cats: list[str] = []
+
+    def add_bytes(self, data: bytes, **kwargs) -> str:
+        cid = _raw_cid(data)
+        self.blocks[cid] = data
+        return cid
+
+    def cat(self, cid: str) -> bytes:
+        self.cats.append(cid)
+        return self.blocks[cid]
+
+
+def test_verify_cid_bytes_checks_raw_cidv1_only():
+    cid = _raw_cid(b"hello")
+    assert cid.startswith("bafkrei")
+    assert verify_cid_bytes(cid, b"hello") is True
+    assert verify_cid_bytes(cid, b"tampered") is False
+    assert verify_cid_bytes("QmYwAPJzv5CZsnAzt8auVZRn8hVsQNAfqX4F6gUJmR6Wmn", b"x") is None
+    assert verify_cid_bytes("bafy-not-a-cid!", b"x") is None
+
+
+def test_memory_tier_evicts_by_bytes_and_disk_tier_survives(tmp_path):
+    blocks = {"a": b"a" * 40, "b": b"b" * 40, "c": b"c" * 40}
+    backend = _CountingRouter(blocks)
+    router = CachedIPFSRouter(backend, CIDByteCache(100, disk_path=tmp_path, disk_max_bytes=80))
+
+    for cid in ["a", "b", "c", "c"]:
+        assert router.cat(cid) == blocks[cid]
+    assert backend.cats == ["a", "b", "c"]
+    assert router.cache.total_bytes == 80
+    assert router.cache.get("a") is None  # evicted from memory and disk
+
+    reopened = CachedIPFSRouter(backend, CIDByteCache(100, disk_path=tmp_path, disk_max_bytes=80))
+    assert reopened.cat("b") == blocks["b"]
+    assert reopened.cat("c") == blocks["c"]
+    assert reopened.cache.stats.disk_hits == 2
+    assert backend.cats == ["a", "b", "c"]
+
+
+def test_cat_stream_serves_hits_from_cache_and_streams_misses_uncached():
+    class StreamingRouter(_CountingRouter):
+        def cat_stream(self, cid: str, *, chunk_size: int):
+            self.cats.append(f"stream:{cid}")
+            return iter_byte_chunks(self.blocks[cid], chunk_size)
+
+    blocks = {"a": b"a" * 40, "b": b"b" * 40}
+    backend = StreamingRouter(blocks)
+    router = CachedIPFSRouter(backend, CIDByteCache(100))
+    router.cat("a")
+
+    assert list(router.cat_stream("a", chunk_size=16)) == [b"a" * 16, b"a" * 16, b"a" * 8]
+    assert b"".join(router.cat_stream("b", chunk_size=16)) == blocks["b"]
+    assert backend.cats == ["a", "stream:b"]
+    assert router.cache.get("b") is None
+    assert list(iter_byte_chunks(b"")) == [b""]
+    assert list(iter_byte_chunks(None)) == []
+
+
+def test_concurrent_misses_share_one_fetch():
+    release = threading.Event()
+    calls = []
+
+    def slow_cat(cid):
+        calls.append(cid)
+        release.wait(timeout=5)
+        return b"payload"
+
+    cache = CIDByteCache()
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.get_or_fetch("cid", lambda: slow_cat("cid")))
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats.misses + cache.stats.shared_fetches < 8 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["cid"]
+    assert results == [b"payload"] * 8
+    assert cache.stats.shared_fetches == 7
+
+
+def test_verification_rejects_mismatched_bytes_and_seeds_on_add():
+    data = b'{"payload": {"summary": "ok"}}'
+    backend = _CountingRouter({})
+    router = CachedIPFSRouter(backend, CIDByteCache(verify=True))
+
+    cid = router.add_bytes(data)
+    assert router.cat(cid) == data
+    assert backend.cats == []
+
+    bad_cid = _raw_cid(b"expected")
+    backend.blocks[bad_cid] = b"corrupted"
+    with pytest.raises(CIDVerificationError):
+        router.cat(bad_cid)
+    assert router.cache.get(bad_cid) is None
+    assert router.cache.stats.verification_failures == 1
+
+
+def test_ipfs_router_is_cached_unless_disabled(monkeypatch):
+    module = ModuleType("ipfs_datasets_py.ipfs_backend_router")
+    calls: list[str] = []
+    module.add_bytes = lambda data, **kwargs: "cid"
+    module.cat = lambda cid: calls.append(cid) or b"bytes"
+    monkeypatch.setitem(sys.modules, "ipfs_datasets_py.ipfs_backend_router", module)
+
+    routers.reset_ipfs_datasets_router_caches()
+    router = routers.get_ipfs_router()
+    assert isinstance(router, CachedIPFSRouter)
+    assert router.cat("cid") == router.cat("cid") == b"bytes"
+    assert calls == ["cid"]
+
+    monkeypatch.setenv("HANDSFREE_IPFS_CAT_CACHE_ENABLED", "false")
+    routers.reset_ipfs_datasets_router_caches()
+    assert not isinstance(routers.get_ipfs_router(), CachedIPFSRouter)
+    routers.reset_ipfs_datasets_router_caches()
+
+
+def test_slow_disk_reads_do_not_block_memory_hits(tmp_path):
+    cache = CIDByteCache(disk_path=tmp_path)
+    cache.put("on-disk", b"disk")
+    cache.put("in-memory", b"memory")
+    cache.clear()
+    cache.put("in-memory", b"memory")
+
+    reading = threading.Event()
+    release = threading.Event()
+    disk_get = cache.disk.get
+
+    def slow_disk_get(cid):
+        reading.set()
+        release.wait(timeout=5)
+        return disk_get(cid)
+
+    cache.disk.get = slow_disk_get
+    results = []
+    reader = threading.Thread(target=lambda: results.append(cache.get("on-disk")))
+    reader.start()
+    assert reading.wait(timeout=5)
+
+    # The disk read is in progress; memory hits and writes still go through.
+    memory_hit = threading.Thread(target=lambda: results.append(cache.get("in-memory")))
+    memory_hit.start()
+    memory_hit.join(timeout=1)
+    assert not memory_hit.is_alive()
+    assert results == [b"memory"]
+
+    release.set()
+    reader.join()
+    assert results == [b"memory", b"disk"]
+    assert cache.stats.disk_hits == 1
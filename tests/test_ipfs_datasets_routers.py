@@ -102,6 +102,7 @@ def test_delegates_to_ipfs_backend_router_module(monkeypatch):
 
     assert router.add_bytes(b"abcd") == "cid-4"
     assert router.cat("cid-4") == b"payload:cid-4"
+    assert router.add_many([b"a", b"abc"]) == ["cid-1", "cid-3"]
 
 
 def test_delegates_to_llm_router_module(monkeypatch):
@@ -73,13 +73,13 @@ def test_module_adapter_delegates_to_ipfs_kit_class():
 
 
 def test_module_adapter_add_bytes_uses_temp_file():
-    """add_bytes should write to temp file and call ipfs_add."""
+    """add_bytes should write to temp file and call ipfs_add on path-only kits."""
     from handsfree.ipfs_kit_adapters import _IPFSKitModuleAdapter
 
     mock_root = MagicMock()
     adapter = _IPFSKitModuleAdapter(mock_root)
 
-    mock_kit_instance = MagicMock()
+    mock_kit_instance = MagicMock(spec=["ipfs_add"])
     mock_kit_instance.ipfs_add.return_value = {"Hash": "QmNewCID", "Name": "file.bin"}
 
     mock_kit_cls = MagicMock()
@@ -124,7 +124,7 @@ def test_module_adapter_package_dataset_stores_manifest():
     mock_root = MagicMock()
     adapter = _IPFSKitModuleAdapter(mock_root)
 
-    mock_kit_instance = MagicMock()
+    mock_kit_instance = MagicMock(spec=["ipfs_add"])
     mock_kit_instance.ipfs_add.return_value = {"Hash": "QmManifestCID"}
 
     mock_kit_cls = MagicMock()
@@ -195,3 +195,73 @@ def test_kit_all_init_paths_fail_raises_unavailable():
     with patch("importlib.import_module", return_value=mock_kit_module):
         with pytest.raises(IPFSKitUnavailableError, match="failed to initialize"):
             adapter.cat("bafy123")
+
+
+def test_module_adapter_add_bytes_prefers_in_memory_add():
+    """add_bytes should skip the temp file when the kit can add bytes directly."""
+    from handsfree.ipfs_kit_adapters import _IPFSKitModuleAdapter
+
+    adapter = _IPFSKitModuleAdapter(MagicMock())
+    mock_kit_instance = MagicMock(spec=["ipfs_add", "ipfs_add_bytes"])
+    mock_kit_instance.ipfs_add_bytes.return_value = {"Hash": "QmInMemory"}
+    adapter._kit_instance = mock_kit_instance
+
+    assert adapter.add_bytes(b"payload") == {"Hash": "QmInMemory"}
+    assert adapter.add_many([b"a", b"b"]) == [{"Hash": "QmInMemory"}] * 2
+    mock_kit_instance.ipfs_add_bytes.assert_called_with(b"b")
+    mock_kit_instance.ipfs_add.assert_not_called()
+
+
+def test_module_adapter_add_many_adds_one_directory():
+    """add_many should add every payload with a single recursive ipfs_add."""
+    from pathlib import Path
+
+    from handsfree.ipfs_kit_adapters import _IPFSKitModuleAdapter
+
+    adapter = _IPFSKitModuleAdapter(MagicMock())
+    seen: dict[str, bytes] = {}
+
+    def ipfs_add(path, **kwargs):
+        assert kwargs == {"recursive": True}
+        for child in sorted(Path(path).iterdir()):
+            seen[child.name] = child.read_bytes()
+        return [
+            {"Name": f"{Path(path).name}/{name}", "Hash": f"Qm{data.decode()}"}
+            for name, data in reversed(list(seen.items()))
+        ] + [{"Name": Path(path).name, "Hash": "QmDirectory"}]
+
+    mock_kit_instance = MagicMock(spec=["ipfs_add"])
+    mock_kit_instance.ipfs_add.side_effect = ipfs_add
+    adapter._kit_instance = mock_kit_instance
+
+    results = adapter.add_many([b"one", b"two", b"three"])
+
+    assert [result["Hash"] for result in results] == ["Qmone", "Qmtwo", "Qmthree"]
+    assert mock_kit_instance.ipfs_add.call_count == 1
+
+
+def test_module_adapter_add_many_matches_paths_and_raises_when_unmatched():
+    """Directory-add results are matched by path; unmatched results are not re-added."""
+    from pathlib import Path
+
+    from handsfree.ipfs_kit_adapters import IPFSKitUnavailableError, _IPFSKitModuleAdapter
+
+    adapter = _IPFSKitModuleAdapter(MagicMock())
+    mock_kit_instance = MagicMock(spec=["ipfs_add"])
+    mock_kit_instance.ipfs_add.side_effect = lambda path, **kwargs: {
+        "files": [
+            {"path": str(child), "cid": f"bafy-{child.read_bytes().decode()}"}
+            for child in Path(path).iterdir()
+        ]
+    }
+    adapter._kit_instance = mock_kit_instance
+
+    assert [result["cid"] for result in adapter.add_many([b"one", b"two"])] == [
+        "bafy-one",
+        "bafy-two",
+    ]
+
+    mock_kit_instance.ipfs_add.side_effect = lambda path, **kwargs: {"Hash": "QmDirectory"}
+    with pytest.raises(IPFSKitUnavailableError):
+        adapter.add_many([b"one", b"two"])
+    assert mock_kit_instance.ipfs_add.call_count == 2
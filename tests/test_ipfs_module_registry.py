@@ -0,0 +1,142 @@
+"""Tests for the warm ipfs_accelerate/ipfs_datasets client registry."""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import handsfree.handlers.ipfs_integration as ipfs_integration
+from handsfree.ipfs_module_registry import (
+    DEFAULT_FACTORIES,
+    IPFSModuleRegistry,
+    get_ipfs_module_registry,
+    reset_ipfs_module_registry,
+)
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.released = False
+
+    def release(self) -> None:
+        self.released = True
+
+
+def test_clients_are_built_once_and_failed_imports_are_remembered():
+    now = [0.0]
+    built: list[str] = []
+    attempts: list[str] = []
+
+    def build_client() -> _Client:
+        built.append("client")
+        return _Client()
+
+    def missing_module():
+        attempts.append("missing")
+        raise ImportError("No module named 'ipfs_accelerate_py'")
+
+    registry = IPFSModuleRegistry(
+        {"client": build_client, "missing": missing_module},
+        retry_seconds=30,
+        clock=lambda: now[0],
+    )
+
+    assert registry.warm() == {"client": True, "missing": False}
+    with registry.borrow("client") as first, registry.borrow("client") as second:
+        assert first is second
+        assert registry.health()["client"]["in_use"] == 2
+    assert built == ["client"]
+
+    with pytest.raises(ImportError):
+        with registry.borrow("missing"):
+            pass
+    now[0] = 31.0
+    with pytest.raises(ImportError):
+        with registry.borrow("missing"):
+            pass
+    assert attempts == ["missing", "missing"]
+
+    health = registry.health()
+    assert health["client"]["loaded"] is True
+    assert health["client"]["borrows"] == 3
+    assert health["missing"]["loaded"] is False
+    assert "ipfs_accelerate_py" in health["missing"]["error"]
+
+
+def test_idle_clients_are_evicted_and_rebuilt_but_borrowed_ones_are_kept():
+    now = [0.0]
+    clients: list[_Client] = []
+
+    def build_client() -> _Client:
+        clients.append(_Client())
+        return clients[-1]
+
+    registry = IPFSModuleRegistry(
+        {"idle": build_client, "busy": build_client}, idle_seconds=60, clock=lambda: now[0]
+    )
+    registry.warm(["idle"])
+
+    with registry.borrow("busy"):
+        now[0] = 120.0
+        assert registry.evict_idle() == ["idle"]
+    assert clients[0].released is True
+    assert registry.health()["idle"]["loaded"] is False
+    assert registry.health()["busy"]["idle_seconds"] == 0.0
+
+    with registry.borrow("idle") as rebuilt:
+        assert rebuilt is clients[2]
+
+
+def test_shared_clients_are_never_evicted_or_released():
+    now = [0.0]
+    shared_client = _Client()
+    registry = IPFSModuleRegistry(
+        {"shared": lambda: shared_client, "owned": _Client},
+        shared=["shared"],
+        idle_seconds=60,
+        clock=lambda: now[0],
+    )
+    registry.warm()
+
+    now[0] = 120.0
+    assert registry.evict_idle() == ["owned"]
+    assert shared_client.released is False
+    assert registry.health()["shared"]["loaded"] is True
+
+    reset_ipfs_module_registry()
+    try:
+        health = get_ipfs_module_registry().health()
+        assert all(health[name]["shared"] for name in DEFAULT_FACTORIES)
+    finally:
+        reset_ipfs_module_registry()
+
+
+def test_tool_endpoints_borrow_the_shared_tool_module(monkeypatch):
+    imports: list[str] = []
+    indexed: list[str] = []
+
+    async def vector_index(content, metadata, collection):
+        indexed.append(content)
+        return {"collection": collection}
+
+    def import_tools():
+        imports.append("vector_store_tools")
+        return SimpleNamespace(vector_index=vector_index)
+
+    registry = IPFSModuleRegistry({"vector_store_tools": import_tools})
+    monkeypatch.setattr(ipfs_integration, "get_ipfs_module_registry", lambda: registry)
+    app = FastAPI()
+    app.include_router(ipfs_integration.router)
+    client = TestClient(app)
+
+    for content in ("first", "second"):
+        response = client.post("/v1/ipfs/vector/index", json={"content": content})
+        assert response.json() == {"ok": True, "result": {"collection": "default"}}
+    response = client.post("/v1/ipfs/vector/search", json={"query": "first"})
+
+    assert response.json() == {"ok": False, "error": "vector_store_tools not available"}
+    assert imports == ["vector_store_tools"]
+    assert indexed == ["first", "second"]
+    modules = client.get("/v1/ipfs/modules").json()["modules"]
+    assert modules["vector_store_tools"]["borrows"] == 3
@@ -0,0 +1,111 @@
+"""Tests for the background-probed IPFS status service."""
+
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import handsfree.handlers.ipfs_integration as ipfs_integration
+import handsfree.ipfs_status as ipfs_status
+from handsfree.ipfs_status import IPFSStatusService
+
+
+def _service(calls: list[str], now: list[float]) -> IPFSStatusService:
+    def probe(name: str, available: bool):
+        def run() -> dict:
+            calls.append(name)
+            if name == "broken":
+                raise RuntimeError("probe exploded")
+            return {"available": available}
+
+        return run
+
+    return IPFSStatusService(
+        {"kit": probe("kit", True), "broken": probe("broken", False)},
+        history_size=3,
+        clock=lambda: now[0],
+    )
+
+
+def test_snapshot_reports_age_history_and_percentiles_without_probing():
+    calls: list[str] = []
+    now = [100.0]
+    service = _service(calls, now)
+
+    pending = service.snapshot()
+    assert pending["backends"]["kit"]["status"] == {"available": False, "pending": True}
+    assert pending["age_seconds"] is None
+
+    for _ in range(4):
+        service.probe_now()
+        now[0] += 10
+    calls.clear()
+    snapshot = service.snapshot()
+
+    assert calls == []
+    assert snapshot["age_seconds"] == 10.0
+    kit = snapshot["backends"]["kit"]
+    assert kit["status"] == {"available": True}
+    assert [sample["probed_at"] for sample in kit["history"]] == [110.0, 120.0, 130.0]
+    assert set(kit["latency_ms"]) == {"p50", "p95", "p99"}
+    broken = snapshot["backends"]["broken"]
+    assert broken["status"] == {"available": False, "error": "probe exploded"}
+    assert [sample["available"] for sample in broken["history"]] == [False] * 3
+
+
+def test_failure_signal_triggers_background_reprobe(monkeypatch):
+    monkeypatch.setattr(ipfs_status, "MIN_REPROBE_SECONDS", 0.0)
+    probed = threading.Semaphore(0)
+
+    def probe() -> dict:
+        probed.release()
+        return {"available": True}
+
+    service = IPFSStatusService({"kit": probe}, interval_seconds=60)
+    service.start()
+    try:
+        assert probed.acquire(timeout=5)
+        service.signal_failure("kit")
+        assert probed.acquire(timeout=5)
+    finally:
+        service.stop()
+
+
+def test_status_endpoint_serves_cached_snapshot(monkeypatch):
+    calls: list[str] = []
+    service = IPFSStatusService(
+        {
+            name: (lambda name=name: calls.append(name) or {"available": True})
+            for name in ("ipfs_kit", "ipfs_datasets", "ipfs_accelerate")
+        }
+    )
+    service.probe_now()
+    calls.clear()
+    monkeypatch.setattr(ipfs_integration, "get_ipfs_status_service", lambda: service)
+    app = FastAPI()
+    app.include_router(ipfs_integration.router)
+    client = TestClient(app)
+
+    for _ in range(3):
+        data = client.get("/v1/ipfs/status").json()
+
+    assert calls == []
+    assert data["ipfs_kit"] == {"available": True}
+    assert data["age_seconds"] >= 0
+    assert len(data["health"]["ipfs_accelerate"]["history"]) == 1
+
+
+def test_app_startup_starts_status_probes(monkeypatch):
+    from handsfree.api import app as api_app
+
+    started: list[IPFSStatusService] = []
+    monkeypatch.setattr(IPFSStatusService, "start", lambda self: started.append(self))
+    ipfs_status.reset_ipfs_status_service()
+    app = FastAPI()
+    app.router.add_event_handler("startup", ipfs_status.start_ipfs_status_service)
+    try:
+        with TestClient(app):
+            assert started == [ipfs_status.get_ipfs_status_service()]
+        assert ipfs_status.start_ipfs_status_service in api_app.router.on_startup
+    finally:
+        ipfs_status.reset_ipfs_status_service()
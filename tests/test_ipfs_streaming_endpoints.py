@@ -0,0 +1,184 @@
+"""Tests for the raw-byte IPFS add/cat endpoints."""
+
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import handsfree.handlers.ipfs_integration as ipfs_integration
+from handsfree.ipfs_datasets_routers import IPFSDatasetsRouterUnavailableError
+from handsfree.ipfs_kit_adapters import IPFSKitUnavailableError
+
+CONTENT = bytes(range(256)) * 1024
+
+
+class _StubRouter:
+    def __init__(self) -> None:
+        self.added: list[bytes] = []
+
+    def add_bytes(self, data: bytes, **kwargs) -> str:
+        self.added.append(data)
+        return "bafy-router"
+
+    def cat(self, cid: str) -> bytes:
+        return CONTENT
+
+
+class _StubKit:
+    def __init__(self) -> None:
+        self.paths: list[str] = []
+        self.contents: list[bytes] = []
+        self.kwargs: list[dict] = []
+
+    def add_file(self, path: str, **kwargs):
+        self.paths.append(path)
+        self.kwargs.append(kwargs)
+        with open(path, "rb") as handle:
+            self.contents.append(handle.read())
+        return {"Hash": "bafy-kit"}
+
+
+class _UnavailableRouter:
+    def add_bytes(self, data: bytes, **kwargs):
+        raise IPFSDatasetsRouterUnavailableError("ipfs_router.add_bytes is unavailable")
+
+    def cat(self, cid: str) -> bytes:
+        raise IPFSDatasetsRouterUnavailableError("ipfs_router.cat is unavailable")
+
+
+class _StreamingRouter:
+    def __init__(self) -> None:
+        self.pulled = 0  # chunks handed out; ``cat`` must never be used
+
+    def cat_stream(self, cid: str, *, chunk_size: int):
+        for offset in range(0, len(CONTENT), chunk_size):
+            self.pulled += 1
+            yield CONTENT[offset : offset + chunk_size]
+
+    def cat(self, cid: str) -> bytes:
+        raise AssertionError("streaming routers must not be read whole")
+
+
+class _UnavailableKit:
+    def add_file(self, path: str, **kwargs):
+        raise IPFSKitUnavailableError("ipfs_kit_py.add_file is unavailable")
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(ipfs_integration.router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def stub_router(monkeypatch):
+    router = _StubRouter()
+    monkeypatch.setattr(ipfs_integration, "get_ipfs_router", lambda: router)
+    return router
+
+
+def test_raw_add_streams_body_to_kit_file(client, monkeypatch):
+    kit = _StubKit()
+    monkeypatch.setattr(ipfs_integration, "get_ipfs_router", _UnavailableRouter)
+    monkeypatch.setattr(ipfs_integration, "get_ipfs_kit_adapter", lambda: kit)
+
+    chunks = (CONTENT[offset : offset + 4096] for offset in range(0, len(CONTENT), 4096))
+    response = client.post(
+        "/v1/ipfs/add/raw",
+        content=chunks,
+        headers={"Content-Type": "application/octet-stream"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["cid"] == "bafy-kit"
+    assert kit.contents == [CONTENT]
+    assert kit.kwargs == [{"pin": True}]
+    assert not any(os.path.exists(path) for path in kit.paths)
+
+    response = client.post(
+        "/v1/ipfs/add/raw?pin=false",
+        content=b"hello",
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert kit.kwargs[-1] == {"pin": False}
+
+
+def test_raw_add_prefers_router_like_json_add_and_enforces_limit(client, stub_router, monkeypatch):
+    kit = _StubKit()
+    monkeypatch.setattr(ipfs_integration, "get_ipfs_kit_adapter", lambda: kit)
+
+    response = client.post(
+        "/v1/ipfs/add/raw?pin=false",
+        content=b"hello",
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert response.json()["cid"] == "bafy-router"
+    assert stub_router.added == [b"hello"]
+    assert kit.paths == []
+
+    monkeypatch.setenv("HANDSFREE_IPFS_STREAM_MAX_BYTES", "1024")
+    response = client.post(
+        "/v1/ipfs/add/raw",
+        content=iter([b"x" * 800, b"x" * 800]),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert response.status_code == 413
+    assert stub_router.added == [b"hello"]
+
+    response = client.post(
+        "/v1/ipfs/add/raw", content=b"{}", headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 415
+
+
+def test_raw_cat_streams_full_content_and_ranges(client, stub_router):
+    response = client.get("/v1/ipfs/cat/bafy-one")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.content == CONTENT
+
+    response = client.get("/v1/ipfs/cat/bafy-one", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+    assert response.content == CONTENT[100:200]
+
+    response = client.get("/v1/ipfs/cat/bafy-one", headers={"Range": "bytes=-10"})
+    assert response.content == CONTENT[-10:]
+
+    response = client.get("/v1/ipfs/cat/bafy-one", headers={"Range": "bytes=70000-"})
+    assert response.content == CONTENT[70000:]
+
+    response = client.get("/v1/ipfs/cat/bafy-one", headers={"Range": "bytes=0-1,5-6"})
+    assert response.status_code == 200
+
+    response = client.get("/v1/ipfs/cat/bafy-one", headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+
+
+def test_raw_cat_passes_backend_chunks_through(client, monkeypatch):
+    router = _StreamingRouter()
+    monkeypatch.setattr(ipfs_integration, "get_ipfs_router", lambda: router)
+
+    response = client.get("/v1/ipfs/cat/bafy-one")
+    assert response.status_code == 200
+    assert "content-length" not in response.headers
+    assert response.content == CONTENT
+    assert router.pulled == len(CONTENT) // ipfs_integration.STREAM_CHUNK_SIZE
+
+    response = client.get("/v1/ipfs/cat/bafy-one", headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.content == CONTENT[100:200]
+
+
+def test_raw_cat_without_backend_is_unavailable(client, monkeypatch):
+    class UnavailableKit:
+        def cat(self, cid: str, **kwargs):
+            raise IPFSKitUnavailableError("ipfs_kit_py.cat is unavailable")
+
+    monkeypatch.setattr(ipfs_integration, "get_ipfs_router", _UnavailableRouter)
+    monkeypatch.setattr(ipfs_integration, "get_ipfs_kit_adapter", UnavailableKit)
+
+    assert client.get("/v1/ipfs/cat/bafy-one").status_code == 503
@@ -0,0 +1,128 @@
+"""Tests for the LLM generation cache."""
+
+import sys
+import threading
+import time
+from types import ModuleType
+
+import pytest
+
+import handsfree.ipfs_datasets_routers as routers
+from handsfree.llm_cache import (
+    CachedLLMRouter,
+    GenerationCache,
+    is_deterministic_generation,
+)
+from handsfree.metrics import get_metrics_collector
+
+
+class _CountingRouter:
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def generate_text(self, prompt: str, **kwargs) -> str:
+        self.prompts.append(prompt)
+        return f"answer {len(self.prompts)}"
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    get_metrics_collector().reset()
+    yield
+    get_metrics_collector().reset()
+
+
+def _cache_counts() -> dict[str, int]:
+    return get_metrics_collector().get_snapshot()["llm_generation_cache"]
+
+
+def test_deterministic_options_are_detected(monkeypatch):
+    assert is_deterministic_generation({"temperature": 0})
+    assert is_deterministic_generation({"do_sample": False, "top_p": 0.9})
+    assert not is_deterministic_generation({"temperature": 0.7})
+    assert not is_deterministic_generation({"temperature": 0, "stream": True})
+    assert not is_deterministic_generation({"top_p": 0.9})
+    assert not is_deterministic_generation({})
+
+    monkeypatch.setenv("HANDSFREE_LLM_CACHE_DEFAULT_DETERMINISTIC", "true")
+    assert is_deterministic_generation({"max_tokens": 64})
+    assert not is_deterministic_generation({"seed": 7})
+
+
+def test_repeated_deterministic_prompts_hit_until_ttl_expires():
+    now = [0.0]
+    backend = _CountingRouter()
+    router = CachedLLMRouter(backend, GenerationCache(ttl_seconds=60, clock=lambda: now[0]))
+
+    assert router.generate_text("explain PR 7", temperature=0) == "answer 1"
+    assert router.generate_text("explain PR 7", temperature=0) == "answer 1"
+    assert router.generate_text("explain PR 7", temperature=0, model="other") == "answer 2"
+    assert router.generate_text("explain PR 7", temperature=0.8) == "answer 3"
+    assert router.generate_text("explain PR 7", temperature=0.8) == "answer 4"
+    now[0] = 61.0
+    assert router.generate_text("explain PR 7", temperature=0) == "answer 5"
+
+    assert _cache_counts() == {"miss": 3, "hit": 1, "bypass": 2}
+
+
+def test_identical_in_flight_prompts_share_one_generation():
+    release = threading.Event()
+    calls = []
+
+    class SlowRouter:
+        def generate_text(self, prompt: str, **kwargs) -> str:
+            calls.append(prompt)
+            release.wait(timeout=5)
+            return "shared"
+
+    router = CachedLLMRouter(SlowRouter(), GenerationCache())
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(router.generate_text("p", temperature=0)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while sum(_cache_counts().values()) < 5 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["p"]
+    assert results == ["shared"] * 5
+    assert _cache_counts() == {"miss": 1, "coalesced": 4}
+
+
+def test_failed_generation_is_not_cached():
+    class FlakyRouter:
+        calls = 0
+
+        def generate_text(self, prompt: str, **kwargs) -> str:
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("backend down")
+            return "recovered"
+
+    backend = FlakyRouter()
+    router = CachedLLMRouter(backend, GenerationCache())
+    with pytest.raises(RuntimeError):
+        router.generate_text("p", temperature=0)
+    assert router.generate_text("p", temperature=0) == "recovered"
+    assert router.generate_text("p", temperature=0) == "recovered"
+    assert backend.calls == 2
+
+
+def test_llm_router_is_cached_unless_disabled(monkeypatch):
+    module = ModuleType("ipfs_datasets_py.llm_router")
+    module.generate_text = lambda prompt, **kwargs: f"generated:{prompt}"
+    monkeypatch.setitem(sys.modules, "ipfs_datasets_py.llm_router", module)
+
+    routers.reset_ipfs_datasets_router_caches()
+    assert isinstance(routers.get_llm_router(), CachedLLMRouter)
+
+    monkeypatch.setenv("HANDSFREE_LLM_CACHE_ENABLED", "false")
+    routers.reset_ipfs_datasets_router_caches()
+    assert not isinstance(routers.get_llm_router(), CachedLLMRouter)
+    routers.reset_ipfs_datasets_router_caches()
@@ -29,6 +29,8 @@ def mock_db(tmp_path):
     conn = get_connection()
 
     # Create agent_tasks table matching the schema in migrations/001_initial_schema.sql
+    # plus the result columns from 016_add_agent_task_result_columns.sql and the
+    # hot trace summary from 017_add_agent_task_trace_summary.sql
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS agent_tasks (
@@ -41,6 +43,10 @@ def mock_db(tmp_path):
             instruction TEXT,
             status VARCHAR NOT NULL,
             last_update TEXT,
+            mcp_capability TEXT,
+            has_result BOOLEAN DEFAULT FALSE,
+            result_cid TEXT,
+            trace_summary TEXT,
             created_at TIMESTAMP NOT NULL,
             updated_at TIMESTAMP NOT NULL
         )